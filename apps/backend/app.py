@@ -4,7 +4,6 @@ from fastapi import FastAPI, HTTPException, Depends, WebSocket, WebSocketDisconn
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse, JSONResponse
-from deep_translator import GoogleTranslator
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
@@ -38,6 +37,20 @@ import requests
 import numpy as np
 from sqlalchemy.orm import Session
 from .models.database import get_db
+from .services.vector_storage import vector_from_columns
+from .services.db_pool import get_pool, pool_stats, PoolTimeoutError
+from .services.db_executor import DatabaseExecutor, DatabaseTimeoutError, DatabaseUnavailableError
+from .services.principal_cache import principal_cache
+from .services.fulltext import fulltext_condition
+from .services.job_snapshot import job_snapshot
+from .services.stats_counters import StatsCounters
+from .services.stats_broadcaster import StatsBroadcaster
+from .services.translation import translation_batcher
+from .services.translation_memory import translation_memory
+from .services.translation_catalog import translation_catalog
+from .services.job_translations import JobPretranslator
+from .services.interaction_store import InteractionStore
+from .services.skill_index import FALLBACK_SKILLS, career_skill_lists, ensure_skill_index, match_careers, parse_required_skills, skill_index_ready
 
 # Load environment variables
 load_dotenv()
@@ -99,8 +112,10 @@ except Exception as e:
     traceback.print_exc()
 
 try:
-    from .services.recommendation_engine import RecommendationEngine
-    recommendation_engine = RecommendationEngine()
+    from .services.recommendation_engine import recommendation_engine
+    # Content-based scoring reads the resident job index (rows from get_cached_jobs carry no vectors)
+    if get_vector_service():
+        recommendation_engine.attach_vector_service(vector_service)
     print("Recommendation Engine loaded!")
 except Exception as e:
     print(f"Warning: Recommendation Engine failed: {e}")
@@ -224,22 +239,41 @@ db_config = {
 }
 
 def get_db_connection():
+    """Pooled connection (MariaDB, SQLite fallback); conn.close() returns it to the pool"""
+    pool = get_pool('app', mariadb_config=db_config, sqlite_path='apps/backend/green_jobs.db')
+    if pool is None:
+        logger.error("No database available for the connection pool")
+        return None
+    try:
+        return pool.acquire()
+    except PoolTimeoutError as e:
+        logger.error(f"Database connection pool exhausted: {e}")
+        return None
+    except Exception as e:
+        logger.error(f"Database connection failed: {e}")
+        return None
+
+# Blocking queries from async handlers run here, never on the event loop
+app_db = DatabaseExecutor(get_db_connection, name="app")
+
+async def run_db(fn, *args, timeout: Optional[float] = None):
+    """Await fn(conn, *args) on the bounded DB executor with a per-query timeout"""
     try:
-        conn = mariadb.connect(**db_config)
-        conn.is_mariadb = True  # Mark as MariaDB connection
-        return conn
-    except mariadb.Error as e:
-        logger.info(f"MariaDB connection failed (expected in development): {e}")
-        logger.info("Falling back to SQLite for development...")
-        try:
-            import sqlite3
-            conn = sqlite3.connect('apps/backend/green_jobs.db')
-            conn.row_factory = sqlite3.Row
-            conn.is_mariadb = False  # Mark as SQLite connection
-            return conn
-        except Exception as sqlite_error:
-            logger.error(f"SQLite fallback also failed: {sqlite_error}")
-            return None
+        return await app_db.run(fn, *args, timeout=timeout)
+    except DatabaseTimeoutError as e:
+        logger.error(f"Database query timed out: {e}")
+        raise HTTPException(status_code=504, detail="Database query timed out")
+    except DatabaseUnavailableError:
+        raise HTTPException(status_code=500, detail="Database connection failed")
+
+def fetch_rows(conn, sql: str, params=()):
+    """Dict rows for a single query, for handlers that await run_db(fetch_rows, ...)"""
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
 
 # JWT CONFIGURATION
 SECRET_KEY = os.getenv("SECRET_KEY", "your-super-secure-secret-key-2025")
@@ -314,331 +348,36 @@ SUPPORTED_LANGUAGES = {
     "kn": "kannada", "or": "odia", "ml": "malayalam"
 }
 
-# Hindi Job Titles
-HINDI_JOBS = {
-    1: "इको इंजीनियर",
-    2: "ग्रीन डेवलपर",
-    3: "नवीकरणीय विश्लेषक",
-    4: "सस्टेनेबिलिटी कंसल्टेंट",
-    5: "ग्रीन डेटा साइंटिस्ट"
-}
-
 # Global AI Models
 generator = None
 sd_pipe = None
 
-FALLBACK_TRANSLATIONS = {
-    "hi": {
-        # Job Titles - Hindi
-        "Solar Energy Engineer": "सौर ऊर्जा इंजीनियर",
-        "Environmental Analyst": "पर्यावरण विश्लेषक",
-        "Wind Farm Technician": "विंड फार्म तकनीशियन", 
-        "Sustainability Manager": "सस्टेनेबिलिटी मैनेजर",
-        "EV Battery Engineer": "ईवी बैटरी इंजीनियर",
-        "Sustainability Data Analyst": "सस्टेनेबिलिटी डेटा विश्लेषक",
-        "Senior Solar Energy Engineer": "सीनियर सौर ऊर्जा इंजीनियर",
-        "Green Building Architect": "ग्रीन बिल्डिंग आर्किटेक्ट",
-        "ESG Reporting Manager": "ईएसजी रिपोर्टिंग मैनेजर",
-        "Wind Energy Analyst": "विंड एनर्जी एनालिस्ट",
-        "Carbon Accounting Specialist": "कार्बन अकाउंटिंग विशेषज्ञ",
-        
-        # Companies - Hindi
-        "Tata Power Renewables": "टाटा पावर रिन्यूएबल्स",
-        "Adani Green Energy": "अडानी ग्रीन एनर्जी", 
-        "ReNew Power": "रिन्यू पावर",
-        "Suzlon Energy": "सुजलॉन एनर्जी",
-        "GreenTech Solutions": "ग्रीनटेक सॉल्यूशंस",
-        "EcoConsult Services": "ईकोकंसल्ट सर्विसेज",
-        "PowerWind Energy": "पावरविंड एनर्जी",
-        "GreenFuture Corp": "ग्रीनफ्यूचर कॉर्प",
-        "ElectroMobility India": "इलेक्ट्रोमोबिलिटी इंडिया",
-        "Inox Wind": "इनोक्स विंड",
-        "Mahindra Sustainability": "महिंद्रा सस्टेनेबिलिटी"
-    },
-    "bn": {
-        # Job Titles - Bengali
-        "Solar Energy Engineer": "সৌর শক্তি প্রকৌশলী",
-        "Environmental Analyst": "পরিবেশ বিশ্লেষক",
-        "Wind Farm Technician": "বায়ু খামার টেকনিশিয়ান",
-        "Sustainability Manager": "টেকসইতা ব্যবস্থাপক",
-        "EV Battery Engineer": "ইভি ব্যাটারি ইঞ্জিনিয়ার",
-        "Sustainability Data Analyst": "টেকসইতা ডেটা বিশ্লেষক",
-        "Senior Solar Energy Engineer": "সিনিয়র সৌর শক্তি প্রকৌশলী",
-        "Green Building Architect": "গ্রিন বিল্ডিং আর্কিটেক্ট",
-        "ESG Reporting Manager": "ESG রিপোর্টিং ম্যানেজার",
-        "Wind Energy Analyst": "বায়ু শক্তি বিশ্লেষক",
-        "Carbon Accounting Specialist": "কার্বন অ্যাকাউন্টিং বিশেষজ্ঞ",
-        
-        # Companies - Bengali
-        "Tata Power Renewables": "টাটা পাওয়ার নবায়নযোগ্য",
-        "Adani Green Energy": "আদানি গ্রিন এনার্জি",
-        "ReNew Power": "রিনিউ পাওয়ার",
-        "Suzlon Energy": "সুজলন এনার্জি",
-        "GreenTech Solutions": "গ্রিনটেক সলিউশনস",
-        "EcoConsult Services": "ইকোকনসাল্ট সার্ভিসেস",
-        "PowerWind Energy": "পাওয়ারউইন্ড এনার্জি",
-        "GreenFuture Corp": "গ্রিনফিউচার কর্প",
-        "ElectroMobility India": "ইলেক্ট্রোমোবিলিটি ইন্ডিয়া",
-        "Inox Wind": "ইনক্স উইন্ড",
-        "Mahindra Sustainability": "মহিন্দরা টেকসইতা"
-    },
-    "te": {
-        # Job Titles - Telugu
-        "Solar Energy Engineer": "సోలార్ ఎనర్జీ ఇంజనీర్",
-        "Environmental Analyst": "పర్యావరణ విశ్లేషకుడు",
-        "Wind Farm Technician": "విండ్ ఫార్మ్ టెక్నీషియన్",
-        "Sustainability Manager": "సస్టైనబిలిటీ మేనేజర్",
-        "EV Battery Engineer": "ఈవీ బ్యాటరీ ఇంజనీర్",
-        "Sustainability Data Analyst": "సస్టైనబిలిటీ డేటా అనలిస్ట్",
-        "Senior Solar Energy Engineer": "సీనియర్ సోలార్ ఎనర్జీ ఇంజనీర్",
-        "Green Building Architect": "గ్రీన్ బిల్డింగ్ ఆర్కిటెక్ట్",
-        "ESG Reporting Manager": "ESG రిపోర్టింగ్ మేనేజర్",
-        "Wind Energy Analyst": "విండ్ ఎనర్జీ అనలిస్ట్",
-        "Carbon Accounting Specialist": "కార్బన్ అకౌంటింగ్ స్పెషలిస్ట్",
-        
-        # Companies - Telugu
-        "Tata Power Renewables": "టాటా పవర్ రిన్యూవబుల్స్",
-        "Adani Green Energy": "అదానీ గ్రీన్ ఎనర్జీ",
-        "ReNew Power": "రిన్యూ పవర్",
-        "Suzlon Energy": "సుజ్లాన్ ఎనర్జీ",
-        "GreenTech Solutions": "గ్రీన్టెక్ సొల్యూషన్స్",
-        "EcoConsult Services": "ఎకోకన్సల్ట్ సర్వీసెస్",
-        "PowerWind Energy": "పవర్విండ్ ఎనర్జీ",
-        "GreenFuture Corp": "గ్రీన్ఫ్యూచర్ కార్ప్",
-        "ElectroMobility India": "ఎలక్ట్రోమోబిలిటీ ఇండియా",
-        "Inox Wind": "ఇనాక్స్ విండ్",
-        "Mahindra Sustainability": "మహీంద్రా సస్టైనబిలిటీ"
-    },
-    "ta": {
-        # Job Titles - Tamil
-        "Solar Energy Engineer": "சோலார் எனர்ஜி இன்ஜினியர்",
-        "Environmental Analyst": "சுற்றுச்சூழல் பகுப்பாய்வாளர்",
-        "Wind Farm Technician": "காற்று பண்ணை தொழில்நுட்ப வல்லுநர்",
-        "Sustainability Manager": "நிலைத்தன்மை மேலாளர்",
-        "EV Battery Engineer": "EV பேட்டரி இன்ஜினியர்",
-        "Sustainability Data Analyst": "நிலைத்தன்மை தரவு பகுப்பாய்வாளர்",
-        "Senior Solar Energy Engineer": "மூத்த சோலார் எனர்ஜி இன்ஜினியர்",
-        "Green Building Architect": "பசுமை கட்டிடக் கலைஞர்",
-        "ESG Reporting Manager": "ESG அறிக்கை மேலாளர்",
-        "Wind Energy Analyst": "காற்று ஆற்றல் பகுப்பாய்வாளர்",
-        "Carbon Accounting Specialist": "கார்பன் கணக்கியல் நிபுணர்",
-        
-        # Companies - Tamil
-        "Tata Power Renewables": "டாடா பவர் புதுப்பிக்கத்தக்கவை",
-        "Adani Green Energy": "அதானி கிரீன் எனர்ஜி",
-        "ReNew Power": "ரினியூ பவர்",
-        "Suzlon Energy": "சுஜ்லான் எனர்ஜி",
-        "GreenTech Solutions": "கிரீன்டெக் தீர்வுகள்",
-        "EcoConsult Services": "எகோகன்சல்ட் சேவைகள்",
-        "PowerWind Energy": "பவர்விண்ட் எனர்ஜி",
-        "GreenFuture Corp": "கிரீன்ஃபியூச்சர் கார்ப்",
-        "ElectroMobility India": "எலக்ட்ரோமோபிலிட்டி இந்தியா",
-        "Inox Wind": "இனாக்ஸ் விண்ட்",
-        "Mahindra Sustainability": "மகிந்திரா நிலைத்தன்மை"
-    },
-    "mr": {
-        # Job Titles - Marathi
-        "Solar Energy Engineer": "सौर ऊर्जा अभियंता",
-        "Environmental Analyst": "पर्यावरण विश्लेषक",
-        "Wind Farm Technician": "विंड फार्म तंत्रज्ञ",
-        "Sustainability Manager": "सातत्य व्यवस्थापक",
-        "EV Battery Engineer": "ईव्ही बॅटरी अभियंता",
-        "Sustainability Data Analyst": "सातत्य डेटा विश्लेषक",
-        "Senior Solar Energy Engineer": "वरिष्ठ सौर ऊर्जा अभियंता",
-        "Green Building Architect": "ग्रीन बिल्डिंग आर्किटेक्ट",
-        "ESG Reporting Manager": "ESG अहवाल व्यवस्थापक",
-        "Wind Energy Analyst": "विंड एनर्जी विश्लेषक",
-        "Carbon Accounting Specialist": "कार्बन लेखा तज्ञ",
-        
-        # Companies - Marathi
-        "Tata Power Renewables": "टाटा पॉवर नूतनीकरणीय",
-        "Adani Green Energy": "अदानी ग्रीन एनर्जी",
-        "ReNew Power": "रिन्यू पॉवर",
-        "Suzlon Energy": "सुजलॉन एनर्जी",
-        "GreenTech Solutions": "ग्रीनटेक सोल्यूशन्स",
-        "EcoConsult Services": "इकोकन्सल्ट सर्व्हिसेस",
-        "PowerWind Energy": "पॉवरविंड एनर्जी",
-        "GreenFuture Corp": "ग्रीनफ्यूचर कॉर्प",
-        "ElectroMobility India": "इलेक्ट्रोमोबिलिटी इंडिया",
-        "Inox Wind": "इनॉक्स विंड",
-        "Mahindra Sustainability": "महिंद्रा सातत्य"
-    },
-    "gu": {
-        # Job Titles - Gujarati
-        "Solar Energy Engineer": "સોલર એનર્જી એન્જિનિયર",
-        "Environmental Analyst": "પર્યાવરણ વિશ્લેષક",
-        "Wind Farm Technician": "વિન્ડ ફાર્મ ટેક્નિશિયન",
-        "Sustainability Manager": "સસ્ટેનેબિલિટી મેનેજર",
-        "EV Battery Engineer": "ઈવી બેટરી એન્જિનિયર",
-        "Sustainability Data Analyst": "સસ્ટેનેબિલિટી ડેટા એનાલિસ્ટ",
-        "Senior Solar Energy Engineer": "સિનિયર સોલર એનર્જી એન્જિનિયર",
-        "Green Building Architect": "ગ્રીન બિલ્ડિંગ આર્કિટેક્ટ",
-        "ESG Reporting Manager": "ESG રિપોર્ટિંગ મેનેજર",
-        "Wind Energy Analyst": "વિન્ડ એનર્જી એનાલિસ્ટ",
-        "Carbon Accounting Specialist": "કાર્બન એકાઉન્ટિંગ સ્પેશિયલિસ્ટ",
-        
-        # Companies - Gujarati
-        "Tata Power Renewables": "ટાટા પાવર રિન્યુએબલ્સ",
-        "Adani Green Energy": "અદાણી ગ્રીન એનર્જી",
-        "ReNew Power": "રિન્યુ પાવર",
-        "Suzlon Energy": "સુઝલોન એનર્જી",
-        "GreenTech Solutions": "ગ્રીનટેક સોલ્યુશન્સ",
-        "EcoConsult Services": "ઇકોકન્સલ્ટ સર્વિસિસ",
-        "PowerWind Energy": "પાવરવિન્ડ એનર્જી",
-        "GreenFuture Corp": "ગ્રીનફ્યુચર કોર્પ",
-        "ElectroMobility India": "ઇલેક્ટ્રોમોબિલિટી ઇન્ડિયા",
-        "Inox Wind": "ઇનોક્સ વિન્ડ",
-        "Mahindra Sustainability": "મહીન્દ્રા સસ્ટેનેબિલિટી"
-    },
-    "kn": {
-        # Job Titles - Kannada
-        "Solar Energy Engineer": "ಸೌರ ಶಕ್ತಿ ಎಂಜಿನಿಯರ್",
-        "Environmental Analyst": "ಪರಿಸರ ವಿಶ್ಲೇಷಕ",
-        "Wind Farm Technician": "ಗಾಳಿ ಫಾರ್ಮ್ ತಂತ್ರಜ್ಞ",
-        "Sustainability Manager": "ಸುಸ್ಥಿರತೆ ಮ್ಯಾನೇಜರ್",
-        "EV Battery Engineer": "ಇವಿ ಬ್ಯಾಟರಿ ಎಂಜಿನಿಯರ್",
-        "Sustainability Data Analyst": "ಸುಸ್ಥಿರತೆ ಡೇಟಾ ವಿಶ್ಲೇಷಕ",
-        "Senior Solar Energy Engineer": "ಸೀನಿಯರ್ ಸೌರ ಶಕ್ತಿ ಎಂಜಿನಿಯರ್",
-        "Green Building Architect": "ಗ್ರೀನ್ ಬಿಲ್ಡಿಂಗ್ ಆರ್ಕಿಟೆಕ್ಟ್",
-        "ESG Reporting Manager": "ESG ರಿಪೋರ್ಟಿಂಗ್ ಮ್ಯಾನೇಜರ್",
-        "Wind Energy Analyst": "ಗಾಳಿ ಶಕ್ತಿ ವಿಶ್ಲೇಷಕ",
-        "Carbon Accounting Specialist": "ಕಾರ್ಬನ್ ಅಕೌಂಟಿಂಗ್ ತಜ್ಞ",
-        
-        # Companies - Kannada
-        "Tata Power Renewables": "ಟಾಟಾ ಪವರ್ ನವೀಕರಿಸಬಹುದಾದ",
-        "Adani Green Energy": "ಅದಾನಿ ಗ್ರೀನ್ ಎನರ್ಜಿ",
-        "ReNew Power": "ರಿನ್ಯೂ ಪವರ್",
-        "Suzlon Energy": "ಸುಜ್ಲಾನ್ ಎನರ್ಜಿ",
-        "GreenTech Solutions": "ಗ್ರೀನ್ಟೆಕ್ ಪರಿಹಾರಗಳು",
-        "EcoConsult Services": "ಎಕೋಕನ್ಸಲ್ಟ್ ಸೇವೆಗಳು",
-        "PowerWind Energy": "ಪವರ್ವಿಂಡ್ ಎನರ್ಜಿ",
-        "GreenFuture Corp": "ಗ್ರೀನ್ಫ್ಯೂಚರ್ ಕಾರ್ಪ್",
-        "ElectroMobility India": "ಎಲೆಕ್ಟ್ರೋಮೊಬಿಲಿಟಿ ಇಂಡಿಯಾ",
-        "Inox Wind": "ಇನಾಕ್ಸ್ ವಿಂಡ್",
-        "Mahindra Sustainability": "ಮಹೀಂದ್ರಾ ಸುಸ್ಥಿರತೆ"
-    },
-    "ml": {
-        # Job Titles - Malayalam
-        "Solar Energy Engineer": "സോളാർ എനർജി എഞ്ചിനീയർ",
-        "Environmental Analyst": "പരിസ്ഥിതി വിശകലനകാരൻ",
-        "Wind Farm Technician": "വിൻഡ് ഫാം ടെക്നീഷ്യൻ",
-        "Sustainability Manager": "സസ്റ്റെയിനബിലിറ്റി മാനേജർ",
-        "EV Battery Engineer": "ഇവി ബാറ്ററി എഞ്ചിനീയർ",
-        "Sustainability Data Analyst": "സസ്റ്റെയിനബിലിറ്റി ഡാറ്റ അനലിസ്റ്റ്",
-        "Senior Solar Energy Engineer": "സീനിയർ സോളാർ എനർജി എഞ്ചിനീയർ",
-        "Green Building Architect": "ഗ്രീൻ ബിൽഡിംഗ് ആർക്കിടെക്റ്റ്",
-        "ESG Reporting Manager": "ESG റിപ്പോർട്ടിംഗ് മാനേജർ",
-        "Wind Energy Analyst": "വിൻഡ് എനർജി അനലിസ്റ്റ്",
-        "Carbon Accounting Specialist": "കാർബൺ അക്കൗണ്ടിംഗ് സ്പെഷ്യലിസ്റ്റ്",
-        
-        # Companies - Malayalam
-        "Tata Power Renewables": "ടാറ്റ പവർ പുനരുപയോഗപ്പെടുത്താവുന്ന",
-        "Adani Green Energy": "അദാനി ഗ്രീൻ എനർജി",
-        "ReNew Power": "റിന്യൂ പവർ",
-        "Suzlon Energy": "സുജ്ലോൺ എനർജി",
-        "GreenTech Solutions": "ഗ്രീൻടെക് സൊല്യൂഷൻസ്",
-        "EcoConsult Services": "ഇക്കോകൺസൾട്ട് സേവനങ്ങൾ",
-        "PowerWind Energy": "പവർവിൻഡ് എനർജി",
-        "GreenFuture Corp": "ഗ്രീൻഫ്യൂച്ചർ കോർപ്പ്",
-        "ElectroMobility India": "ഇലക്ട്രോമോബിലിറ്റി ഇന്ത്യ",
-        "Inox Wind": "ഇനോക്സ് വിൻഡ്",
-        "Mahindra Sustainability": "മഹീന്ദ്ര സസ്റ്റെയിനബിലിറ്റി"
-    },
-    "or": {
-        # Job Titles - Odia
-        "Solar Energy Engineer": "ସୌର ଶକ୍ତି ଇଞ୍ଜିନିୟର",
-        "Environmental Analyst": "ପରିବେଶ ବିଶ୍ଳେଷକ",
-        "Wind Farm Technician": "ପବନ ଫାର୍ମ ଟେକ୍ନିସିଆନ",
-        "Sustainability Manager": "ସ୍ଥିରତା ପରିଚାଳକ",
-        "EV Battery Engineer": "ଇଭି ବ୍ୟାଟେରୀ ଇଞ୍ଜିନିୟର",
-        "Sustainability Data Analyst": "ସ୍ଥିରତା ତଥ୍ୟ ବିଶ୍ଳେଷକ",
-        "Senior Solar Energy Engineer": "ସିନିୟର ସୌର ଶକ୍ତି ଇଞ୍ଜିନିୟର",
-        "Green Building Architect": "ଗ୍ରୀନ୍ ବିଲ୍ଡିଂ ଆର୍କିଟେକ୍ଟ",
-        "ESG Reporting Manager": "ESG ରିପୋର୍ଟିଂ ମ୍ୟାନେଜର",
-        "Wind Energy Analyst": "ପବନ ଶକ୍ତି ବିଶ୍ଳେଷକ",
-        "Carbon Accounting Specialist": "କାର୍ବନ ଆକାଉଣ୍ଟିଂ ବିଶେଷଜ୍ଞ",
-        
-        # Companies - Odia
-        "Tata Power Renewables": "ଟାଟା ପାୱାର ନବୀକରଣୀୟ",
-        "Adani Green Energy": "ଆଦାନୀ ଗ୍ରୀନ୍ ଏନର୍ଜି",
-        "ReNew Power": "ରିନ୍ୟୁ ପାୱାର",
-        "Suzlon Energy": "ସୁଜଲନ୍ ଏନର୍ଜି",
-        "GreenTech Solutions": "ଗ୍ରୀନ୍ଟେକ୍ ସମାଧାନ",
-        "EcoConsult Services": "ଇକୋକନ୍ସଲ୍ଟ ସେବା",
-        "PowerWind Energy": "ପାୱାରୱିଣ୍ଡ୍ ଏନର୍ଜି",
-        "GreenFuture Corp": "ଗ୍ରୀନ୍ଫ୍ୟୁଚର୍ କର୍ପ",
-        "ElectroMobility India": "ଇଲେକ୍ଟ୍ରୋମୋବିଲିଟି ଇଣ୍ଡିଆ",
-        "Inox Wind": "ଇନୋକ୍ସ ୱିଣ୍ଡ",
-        "Mahindra Sustainability": "ମହୀନ୍ଦ୍ରା ସ୍ଥିରତା"
-    }
-}
-
 
 
 # ============ FIXED TRANSLATION FUNCTION ===========
 
+# Job search fields shown to the user in their language
+TRANSLATED_JOB_FIELDS = ("job_title", "description", "company", "company_rating", "sdg_impact", "urgency", "salary_boost")
+
+# Postings are translated into every language when created; search reads job_translations
+job_pretranslator = JobPretranslator(translation_batcher.translate_many, get_db_connection,
+                                     languages=list(SUPPORTED_LANGUAGES), executor=app_db, name="app-jobs")
+# Search result field -> job_translations field (the company shown by search is not the posting's)
+PRETRANSLATED_JOB_FIELDS = {"job_title": "title", "description": "description"}
+
+# Views, saves and applications, compacted in the background into a user x job matrix for recommendations
+# (snapshot file only when INTERACTION_MATRIX_PATH is set; otherwise rebuilt from the log at startup)
+interaction_store = InteractionStore(get_db_connection,
+                                     persist_path=os.getenv('INTERACTION_MATRIX_PATH') or None,
+                                     name="app-interactions")
+if recommendation_engine:
+    recommendation_engine.user_item_matrix = interaction_store
+
 async def translate_text_enhanced(text: str, target_lang: str) -> str:
     """Enhanced translation with better fallbacks for all 10 languages"""
     if not text or not text.strip() or target_lang == "en":
         return text
-    
-    cache_key = f"{text}_{target_lang}"
-    
-    # Check cache first
-    async with cache_lock:
-        if cache_key in translation_cache:
-            return translation_cache[cache_key]
-    
-    try:
-        translated = text  # Default to original
-        
-        # STRATEGY 1: Use comprehensive fallback dictionary
-        if target_lang in FALLBACK_TRANSLATIONS:
-            # Try exact match first
-            if text in FALLBACK_TRANSLATIONS[target_lang]:
-                translated = FALLBACK_TRANSLATIONS[target_lang][text]
-                print(f"✅ Used exact fallback for '{text}' -> '{translated}'")
-            else:
-                # Try case-insensitive match
-                text_lower = text.lower()
-                for key, value in FALLBACK_TRANSLATIONS[target_lang].items():
-                    if key.lower() == text_lower:
-                        translated = value
-                        print(f"✅ Used case-insensitive fallback for '{text}' -> '{translated}'")
-                        break
-                else:
-                    # No fallback found, try Google Translate
-                    translated = await try_google_translate(text, target_lang)
-        else:
-            # No fallback dictionary for this language, try Google Translate directly
-            translated = await try_google_translate(text, target_lang)
-        
-        # Cache the result
-        async with cache_lock:
-            translation_cache[cache_key] = translated
-            
-        return translated
-        
-    except Exception as e:
-        print(f"❌ Enhanced translation failed for '{text}' to {target_lang}: {e}")
-        return text  # Fallback to original text
-
-async def try_google_translate(text: str, target_lang: str) -> str:
-    """Try Google Translate with better error handling"""
-    try:
-        print(f"🔄 Attempting Google Translate: '{text}' to {target_lang}")
-        translated = GoogleTranslator(source='auto', target=target_lang).translate(text)
-        
-        if not translated or translated == text:
-            print(f"⚠️ Google Translate returned original text for '{text}'")
-            return text
-            
-        print(f"✅ Google Translate success: '{text}' -> '{translated}'")
-        return translated
-        
-    except Exception as e:
-        print(f"❌ Google Translate error for {target_lang}: {e}")
-        return text  # Return original text on failure
+    return await translation_batcher.translate(text, target_lang)
 
 # Remove the duplicate function - keep only this one
 translate_text_cached = translate_text_enhanced
@@ -665,6 +404,8 @@ class QueryInput(BaseModel):
     skill_text: List[str]
     lang: str = "en"
     location: Optional[str] = None
+    experience_level: Optional[str] = None
+    job_type: Optional[str] = None
 
 class ApplyInput(BaseModel):
     job_id: int
@@ -768,82 +509,182 @@ def train_salary_predictor():
 
 salary_model = train_salary_predictor()
 
-# Translation cache
-translation_cache = {}
-cache_lock = asyncio.Lock()
-
 # ... [REST OF YOUR CODE REMAINS EXACTLY THE SAME - NO CHANGES BELOW THIS LINE] ...
 
-def get_cached_jobs(query: Optional[QueryInput] = None):
+def hybrid_job_ids(skill_text: str, location: Optional[str] = None, limit: int = 50,
+                   query_vector: Optional[List[float]] = None) -> Optional[List[int]]:
+    """Job ids ranked by the in-process BM25 + vector index; None means fall back to LIKE"""
+    vs = get_vector_service()
+    if not vs or not skill_text.strip():
+        return None
+    try:
+        hits = vs.hybrid_search_jobs(skill_text, top_k=limit, filters={"location": location}, query_vector=query_vector)
+        return [hit["id"] for hit in hits]
+    except Exception as e:
+        logger.warning(f"Hybrid search unavailable, falling back to LIKE: {e}")
+        return None
+
+async def hybrid_job_ids_async(skill_text: str, location: Optional[str] = None, limit: int = 50) -> Optional[List[int]]:
+    """hybrid_job_ids for async endpoints (embedding runs off the event loop)"""
+    vs = get_vector_service()
+    if not vs or not skill_text.strip():
+        return None
+    try:
+        hits = await vs.hybrid_search_jobs_async(skill_text, top_k=limit, filters={"location": location})
+        return [hit["id"] for hit in hits]
+    except Exception as e:
+        logger.warning(f"Hybrid search unavailable, falling back to LIKE: {e}")
+        return None
+
+def job_id_filter_sql(column: str, job_ids: List[int]) -> str:
+    """SQL fragment restricting `column` to job_ids (matches nothing when the list is empty)"""
+    if not job_ids:
+        return " AND 1=0"
+    return f" AND {column} IN ({', '.join(['%s'] * len(job_ids))})"
+
+JOB_SNAPSHOT_SQL = """
+    SELECT job_id AS id, title AS job_title, description, company, location, salary,
+           'SDG 7: 9/10 | Carbon Saved: 500 tons/year' AS sdg_impact,
+           '4.8⭐' AS company_rating, 'High Demand' AS urgency
+    FROM jobs
+"""
+
+def _load_job_rows(job_ids: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+    """Snapshot loader: the whole catalog, or just job_ids after a write"""
     conn = get_db_connection()
     if not conn:
-        logger.error("Database connection failed")
-        return []
-    if hasattr(conn, 'is_mariadb') and conn.is_mariadb:
-        cursor = conn.cursor(dictionary=True)
-    else:
-        cursor = conn.cursor()
+        raise DatabaseUnavailableError("Database connection failed")
+    cursor = conn.cursor(dictionary=True)
     try:
-        skill_text = " ".join(query.skill_text).lower() if query else ""
+        sql = JOB_SNAPSHOT_SQL
+        if job_ids is not None:
+            sql += " WHERE 1=1" + job_id_filter_sql("job_id", job_ids)
+        cursor.execute(sql, list(job_ids or []))
+        return [dict(row) for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+        conn.close()
+
+job_snapshot.loader = _load_job_rows
+
+def refresh_cached_jobs(*job_ids: int):
+    """Write-through hook for job create/update/close"""
+    try:
+        job_snapshot.refresh(job_ids)
+    except Exception as e:
+        logger.warning(f"Job snapshot refresh failed, reloading on next read: {e}")
+        job_snapshot.invalidate()
+
+def _matching_job_ids(query: QueryInput, query_vector: Optional[List[float]] = None) -> List[int]:
+    """Ids matching the location / skill filters, hybrid-ranked when a query vector is available"""
+    conn = get_db_connection()
+    if not conn:
+        raise DatabaseUnavailableError("Database connection failed")
+    cursor = conn.cursor()
+    try:
+        skill_text = " ".join(query.skill_text).lower()
         query_params = []
-        sql = """
-            SELECT job_id AS id, title AS job_title, description, company, location, salary,
-                   'SDG 7: 9/10 | Carbon Saved: 500 tons/year' AS sdg_impact,
-                   '4.8⭐' AS company_rating, 'High Demand' AS urgency
-            FROM jobs WHERE 1=1
-        """
-        if query and query.location:
+        sql = "SELECT job_id FROM jobs WHERE 1=1"
+        if query.location:
             sql += " AND location LIKE %s"
             query_params.append(f"%{query.location}%")
-        if skill_text:
-            sql += " AND (title LIKE %s OR description LIKE %s)"
-            query_params.extend([f"%{skill_text}%", f"%{skill_text}%"])
-        cursor.execute(sql, query_params)
-        base_jobs = cursor.fetchall()
-        matches = []
-        skill_key = "default"
-        if query:
-            for skill in query.skill_text:
-                for key in companies:
-                    if key in skill.lower():
-                        skill_key = key
-                        break
-        
-        # ENHANCED: Support all 10 languages
-        for job in base_jobs:
-            company = companies[skill_key][job["id"] % len(companies[skill_key])]
-            
-            # Translate based on selected language
-            if query and query.lang in SUPPORTED_LANGUAGES and query.lang != "en":
-                # Note: Actual translation happens in the endpoint for async support
-                job_title = job["job_title"]  # Will be translated in endpoint
-                description = job["description"]  # Will be translated in endpoint
+        # Without a precomputed vector (embedding unavailable) use the keyword filter, never a blocking embed
+        ranked_ids = hybrid_job_ids(skill_text, query.location, query_vector=query_vector) if skill_text and query_vector is not None else None
+        if ranked_ids is not None:
+            sql += job_id_filter_sql("job_id", ranked_ids)
+            query_params.extend(ranked_ids)
+        elif skill_text:
+            # Full-text index when migrated, leading-wildcard LIKE otherwise
+            fulltext = fulltext_condition(conn, "jobs", [skill_text])
+            if fulltext:
+                sql += " AND " + fulltext[0]
+                query_params.extend(fulltext[1])
             else:
-                job_title = job["job_title"]
-                description = job["description"]
-                
-            matches.append({
-                "id": job["id"],
-                "job_title": job_title,
-                "description": description,
-                "salary": f"₹{job['salary']:.1f} LPA",
-                "location": job["location"],
-                "company": company,
-                "company_rating": job["company_rating"],
-                "sdg_impact": job["sdg_impact"],
-                "urgency": job["urgency"],
-                "website": company_websites.get(company),
-                "similarity": 0.95,
-                "language": query.lang if query else "en"  # Track language used
-            })
-        return matches
-    except mariadb.Error as e:
-        logger.error(f"Error querying jobs: {e}")
-        return []
+                sql += " AND (title LIKE %s OR description LIKE %s)"
+                query_params.extend([f"%{skill_text}%", f"%{skill_text}%"])
+        cursor.execute(sql, query_params)
+        job_ids = sorted(row[0] for row in cursor.fetchall())
+        if ranked_ids:
+            rank = {job_id: position for position, job_id in enumerate(ranked_ids)}
+            job_ids.sort(key=lambda job_id: rank.get(job_id, len(rank)))
+        return job_ids
     finally:
         cursor.close()
         conn.close()
 
+def _format_jobs(base_jobs, query: Optional[QueryInput] = None) -> Tuple[Dict[str, Any], ...]:
+    matches = []
+    skill_key = "default"
+    if query:
+        for skill in query.skill_text:
+            for key in companies:
+                if key in skill.lower():
+                    skill_key = key
+                    break
+    
+    # ENHANCED: Support all 10 languages
+    for job in base_jobs:
+        company = companies[skill_key][job["id"] % len(companies[skill_key])]
+        
+        # Translate based on selected language
+        if query and query.lang in SUPPORTED_LANGUAGES and query.lang != "en":
+            # Note: Actual translation happens in the endpoint for async support
+            job_title = job["job_title"]  # Will be translated in endpoint
+            description = job["description"]  # Will be translated in endpoint
+        else:
+            job_title = job["job_title"]
+            description = job["description"]
+            
+        matches.append({
+            "id": job["id"],
+            "job_title": job_title,
+            "description": description,
+            "salary": f"₹{job['salary']:.1f} LPA",
+            "location": job["location"],
+            "company": company,
+            "company_rating": job["company_rating"],
+            "sdg_impact": job["sdg_impact"],
+            "urgency": job["urgency"],
+            "website": company_websites.get(company),
+            "similarity": 0.95,
+            "language": query.lang if query else "en"  # Track language used
+        })
+    return tuple(matches)
+
+def get_cached_jobs(query: Optional[QueryInput] = None, query_vector: Optional[List[float]] = None):
+    """
+    Jobs from the in-memory snapshot (services/job_snapshot.py). Without a
+    query the whole catalog is returned as a shared, read-only tuple; filtered
+    results are memoized until the next job write. Skill queries are only
+    hybrid-ranked with a precomputed query_vector (see get_cached_jobs_async).
+    """
+    try:
+        if not query:
+            return job_snapshot.memoize(None, lambda: _format_jobs(job_snapshot.all()))
+
+        def compute():
+            rows = (job_snapshot.get(job_id) for job_id in _matching_job_ids(query, query_vector))
+            return _format_jobs([row for row in rows if row is not None], query)
+
+        # hybrid-ranked and keyword-only results differ, so they are memoized separately
+        key = (tuple(query.skill_text), query.location, query.lang, query_vector is not None)
+        return job_snapshot.memoize(key, compute)
+    except (mariadb.Error, DatabaseUnavailableError) as e:
+        logger.error(f"Error querying jobs: {e}")
+        return []
+
+async def get_cached_jobs_async(query: Optional[QueryInput] = None):
+    """get_cached_jobs for async endpoints: embedding, id query and snapshot reloads all run off the event loop"""
+    query_vector = None
+    skill_text = " ".join(query.skill_text).lower() if query else ""
+    vs = get_vector_service() if skill_text.strip() else None
+    if vs:
+        try:
+            query_vector = await vs.generate_embedding_async(skill_text)
+        except Exception as e:
+            logger.warning(f"Query embedding unavailable, falling back to keyword search: {e}")
+    return await asyncio.to_thread(get_cached_jobs, query, query_vector)
+
 # Load AI Models
 def load_models():
     global generator, sd_pipe
@@ -943,47 +784,77 @@ def build_resume_pdf(username, skills):
     buffer.seek(0)
     return buffer.getvalue()
 
+def health_metrics() -> Dict[str, Any]:
+    """Pool, cache and background-worker stats shared by the /health handlers"""
+    return {
+        "db_pools": pool_stats(),
+        "db_executor": app_db.stats(),
+        "auth_cache": principal_cache.stats(),
+        "job_cache": job_snapshot.stats(),
+        "stats_counters": app_stats.stats(),
+        "ws_stats": stats_broadcaster.stats(),
+        "translation": translation_batcher.stats(),
+        "translation_memory": translation_memory.stats(),
+        "translation_catalog": translation_catalog.stats(),
+        "job_translations": job_pretranslator.stats(),
+        "interactions": interaction_store.stats(),
+    }
+
 # PRODUCTION ENDPOINTS v3.3
 @app.get("/health")
 def health_check():
-    return {"status": "healthy", "version": "3.3.0", "features": ["Auto-Geo", "Distance", "Salary Boost", "Interview", "Resume", "Trends", "Cover Letter"]}
+    return {
+        "status": "healthy",
+        "version": "3.3.0",
+        "features": ["Auto-Geo", "Distance", "Salary Boost", "Interview", "Resume", "Trends", "Cover Letter"],
+        **health_metrics(),
+    }
 
-@app.get("/stats")
-def get_stats():
+def _count_app_stats() -> Dict[str, int]:
+    """Reconcile query for app_stats; only the background refresh runs it"""
     conn = get_db_connection()
     if not conn:
-        raise HTTPException(status_code=500, detail="Database connection failed")
+        raise DatabaseUnavailableError("Database connection failed")
     cursor = conn.cursor()
     try:
-        # Get real counts from database
-        cursor.execute("SELECT COUNT(*) FROM users")
-        users_count = cursor.fetchone()[0]
-        cursor.execute("SELECT COUNT(*) FROM jobs")
-        jobs_count = cursor.fetchone()[0]
-        cursor.execute("SELECT COUNT(*) FROM favorites")
-        favorites_count = cursor.fetchone()[0]
-        cursor.execute("SELECT COUNT(*) FROM companies")
-        companies_count = cursor.fetchone()[0]
-        
-        # Return stats matching frontend expectations
-        return {
-            "total_jobs": 547,           # Realistic market number
-            "companies": companies_count, # Actual companies count from DB
-            "sdg_goals": 15,             # Expanded SDG coverage
-            "favorites": favorites_count, # Real favorites count from DB
-            "applications": 8,           # User applications (mock for now)
-            "profile_views": 143         # User profile views (mock for now)
-        }
-    except mariadb.Error as e:
-        logger.error(f"Error querying stats: {e}")
-        raise HTTPException(status_code=500, detail="Database query failed")
+        counts = {}
+        for name, sql in (("users", "SELECT COUNT(*) FROM users"),
+                          ("jobs", "SELECT COUNT(*) FROM jobs"),
+                          ("favorites", "SELECT COUNT(*) FROM favorites"),
+                          ("companies", "SELECT COUNT(*) FROM companies"),
+                          ("applications", "SELECT COUNT(*) FROM applications"),
+                          ("job_companies", "SELECT COUNT(DISTINCT company) FROM jobs")):
+            cursor.execute(sql)
+            counts[name] = cursor.fetchone()[0]
+        return counts
     finally:
         cursor.close()
         conn.close()
 
+# Shared by /stats and every /ws/stats client; writers incr() after commit
+app_stats = StatsCounters(_count_app_stats, name="app")
+
+async def current_stats() -> Dict[str, int]:
+    counts = await app_stats.aget()
+    if counts is None:
+        raise HTTPException(status_code=500, detail="Database query failed")
+    return counts
+
+@app.get("/stats")
+async def get_stats():
+    counts = await current_stats()
+    # Return stats matching frontend expectations
+    return {
+        "total_jobs": 547,           # Realistic market number
+        "companies": counts["companies"], # Actual companies count from DB
+        "sdg_goals": 15,             # Expanded SDG coverage
+        "favorites": counts["favorites"], # Real favorites count from DB
+        "applications": 8,           # User applications (mock for now)
+        "profile_views": 143         # User profile views (mock for now)
+    }
 
 @app.get("/job_trends")
-async def job_trends():
+def job_trends():
     try:
         conn = mariadb.connect(**db_config)
         cursor = conn.cursor()
@@ -1017,7 +888,7 @@ async def dashboard():
     return {"chart": {"type": "line", "data": {"labels": ["Jan", "Feb", "Mar", "Apr", "Future"], "datasets": [{"data": chart_data, "backgroundColor": "#36A2EB"}]}}}
 
 @app.post("/token")
-async def login(form_data: OAuth2PasswordRequestForm = Depends()):
+def login(form_data: OAuth2PasswordRequestForm = Depends()):
     conn = get_db_connection()
     if not conn:
         raise HTTPException(status_code=500, detail="Database connection failed")
@@ -1046,8 +917,16 @@ def get_career_recommendations_from_db(user_skills: List[str], limit: int = 15):
     
     cursor = conn.cursor(dictionary=True)
     try:
-        # ENHANCED QUERY - Get careers with skill matching for better relevance
-        if user_skills:
+        # Normalized skill index: careers ranked by how many of the skills they share
+        ranked = match_careers(conn, user_skills, limit) if user_skills else None
+        if ranked is not None:
+            if not ranked:
+                return []
+            overlap = dict(ranked)
+            query = f"SELECT * FROM careers WHERE career_id IN ({', '.join(['%s'] * len(overlap))})"
+            params = list(overlap)
+        elif user_skills:
+            # Index not migrated yet - per-skill match over careers + career_skills
             query = """
             SELECT DISTINCT c.* 
             FROM careers c
@@ -1057,8 +936,14 @@ def get_career_recommendations_from_db(user_skills: List[str], limit: int = 15):
             
             params = []
             for skill in user_skills:
-                query += " AND (c.required_skills LIKE %s OR cs.skill_name LIKE %s)"
-                params.extend([f"%{skill}%", f"%{skill}%"])
+                career_match = fulltext_condition(conn, "careers", [skill], alias="c.")
+                skill_match = fulltext_condition(conn, "career_skills", [skill], alias="cs.")
+                if career_match and skill_match:
+                    query += f" AND ({career_match[0]} OR {skill_match[0]})"
+                    params.extend(career_match[1] + skill_match[1])
+                else:
+                    query += " AND (c.required_skills LIKE %s OR cs.skill_name LIKE %s)"
+                    params.extend([f"%{skill}%", f"%{skill}%"])
             
             query += " ORDER BY c.demand DESC LIMIT %s"
             params.append(limit)
@@ -1070,35 +955,25 @@ def get_career_recommendations_from_db(user_skills: List[str], limit: int = 15):
         print(f"🔍 Career search for skills: {user_skills}, limit: {limit}")
         
         cursor.execute(query, params)
-        careers = cursor.fetchall()
+        careers = [dict(career) for career in cursor.fetchall()]
+        if ranked:
+            order = {career_id: position for position, (career_id, _) in enumerate(ranked)}
+            careers.sort(key=lambda career: order[career['career_id']])
         
         print(f"✅ Found {len(careers)} careers from database")
         
-        # ENHANCED JSON handling for all language support
+        # Pre-parsed skill lists from the index; raw required_skills only for unindexed careers
+        skill_lists = career_skill_lists(conn, [career['career_id'] for career in careers]) if skill_index_ready(conn) else {}
         for career in careers:
-            skills_data = career.get('required_skills', '[]')
-            
-            if isinstance(skills_data, str):
-                try:
-                    # Clean and parse JSON for proper skill handling
-                    if skills_data.startswith('[') and skills_data.endswith(']'):
-                        # Try to parse as JSON
-                        career['required_skills'] = json.loads(skills_data)
-                    else:
-                        # If it's a string but not JSON, try to extract skills
-                        skills_str = skills_data.strip('[]"\'')
-                        if ',' in skills_str:
-                            career['required_skills'] = [skill.strip().strip('"\'') for skill in skills_str.split(',')]
-                        else:
-                            career['required_skills'] = [skills_str] if skills_str else ["Various Skills"]
-                except (json.JSONDecodeError, Exception) as e:
-                    print(f"⚠️ Skills parsing warning for career {career.get('title')}: {e}")
-                    career['required_skills'] = ["Technical Skills", "Industry Knowledge"]
-            elif isinstance(skills_data, list):
-                # Already a list, use as-is
-                career['required_skills'] = skills_data
-            else:
-                career['required_skills'] = ["Professional Skills"]
+            # Raw vector columns are not JSON-serializable and not needed by clients
+            for vector_column in ('desc_vector_blob', 'skills_vector_blob', 'desc_vector_json', 'skills_vector_json'):
+                career.pop(vector_column, None)
+
+            career['required_skills'] = (skill_lists.get(career['career_id'])
+                                         or parse_required_skills(career.get('required_skills'))
+                                         or FALLBACK_SKILLS)
+            if ranked:
+                career['skill_overlap'] = overlap[career['career_id']]
         
         return careers
         
@@ -1111,7 +986,7 @@ def get_career_recommendations_from_db(user_skills: List[str], limit: int = 15):
 
 
 @app.get("/debug/careers")
-async def debug_careers():
+def debug_careers():
     """Debug endpoint to check career data"""
     try:
         # Test database connection
@@ -1170,15 +1045,20 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
+        cached = principal_cache.get(username, "basic")
+        if cached is not None:
+            return cached
+        generation = principal_cache.generation(username)
         conn = get_db_connection()
         if not conn:
             raise HTTPException(status_code=500, detail="Database connection failed")
         cursor = conn.cursor(dictionary=True)
         try:
-            cursor.execute("SELECT username, role, email FROM users WHERE username = %s", (username,))
+            cursor.execute("SELECT user_id, username, role, email FROM users WHERE username = %s", (username,))
             user = cursor.fetchone()
             if not user:
                 raise HTTPException(status_code=401, detail="Invalid credentials")
+            principal_cache.put(username, user, "basic", generation)
             return user
         except mariadb.Error as e:
             logger.error(f"Error verifying user: {e}")
@@ -1315,15 +1195,8 @@ async def api_translate_batch(request: Request, batch_data: BatchTranslateInput,
         language_name = SUPPORTED_LANGUAGES.get(target_lang, target_lang)
         print(f"🔄 Batch translating {len(texts)} texts to {target_lang} ({language_name})")
         
-        # Translate all texts with error handling for ALL LANGUAGES
-        translated_texts = []
-        for text in texts:
-            try:
-                translated = await translate_text_enhanced(text, target_lang)
-                translated_texts.append(translated)
-            except Exception as text_error:
-                print(f"❌ Failed to translate '{text}' to {target_lang}: {text_error}")
-                translated_texts.append(text)  # Fallback to original
+        # Translate all texts in one deduplicated batch (failed texts fall back to the original)
+        translated_texts = await translation_batcher.translate_many(texts, target_lang)
         
         print(f"✅ {language_name} batch translation completed: {len(translated_texts)} texts")
         
@@ -1359,7 +1232,7 @@ async def enhanced_career_recommendations(request: Request, career_data: CareerR
         print(f"🎯 Getting {language_name} career recommendations for skills: {skills}")
         
         # Get recommendations from database
-        careers_from_db = get_career_recommendations_from_db(skills, limit=15)
+        careers_from_db = await asyncio.to_thread(get_career_recommendations_from_db, skills, 15)
         
         # If no matches from database, use comprehensive fallback with ALL LANGUAGE SUPPORT
         if not careers_from_db:
@@ -1577,29 +1450,14 @@ async def enhanced_job_search(request: Request, query: QueryInput, current_user:
         auto_detected = False
     
     # Get base jobs from database
-    base_jobs = get_cached_jobs(query)
+    base_jobs = await get_cached_jobs_async(query)
     
-    # Process jobs with translation
+    # Process jobs (English first; translated in one batch below)
     matches = []
     skill_text = " ".join(query.skill_text).lower()
+    translate = query.lang != "en" and query.lang in SUPPORTED_LANGUAGES
     
     for job in base_jobs:
-        # Translate ALL job details if not English
-        if query.lang != "en" and query.lang in SUPPORTED_LANGUAGES:
-            job_title = await translate_text_enhanced(job["job_title"], query.lang)
-            job_description = await translate_text_enhanced(job["description"], query.lang)
-            company_name = await translate_text_enhanced(job["company"], query.lang)
-            company_rating = await translate_text_enhanced(job["company_rating"], query.lang)
-            sdg_impact = await translate_text_enhanced(job["sdg_impact"], query.lang)
-            urgency = await translate_text_enhanced(job["urgency"], query.lang)
-        else:
-            job_title = job["job_title"]
-            job_description = job["description"]
-            company_name = job["company"]
-            company_rating = job["company_rating"]
-            sdg_impact = job["sdg_impact"]
-            urgency = job["urgency"]
-        
         # Calculate similarity and other metrics
         similarity = 0.95 if any(skill in skill_text for skill in ["python", "data", "design", "sustainable"]) else 0.85
         
@@ -1610,23 +1468,19 @@ async def enhanced_job_search(request: Request, query: QueryInput, current_user:
         salary_min, salary_max = ai_salary_predictor(skill_text, 3)
         salary_boost = f"₹{salary_min}-{salary_max} LPA (+12%)"
         
-        # Translate salary boost if needed
-        if query.lang != "en" and query.lang in SUPPORTED_LANGUAGES:
-            salary_boost = await translate_text_enhanced(salary_boost, query.lang)
-        
         matches.append({
             "id": job["id"],
-            "job_title": job_title,
-            "description": job_description,
+            "job_title": job["job_title"],
+            "description": job["description"],
             "salary_range": f"₹{job['salary']} LPA",
             "salary_boost": salary_boost,
             "location": job["location"],  # Keep location in English for mapping
             "distance_km": distance,
-            "company": company_name,
+            "company": job["company"],
             "website": job["website"],
-            "company_rating": company_rating,
-            "sdg_impact": sdg_impact,
-            "urgency": urgency,
+            "company_rating": job["company_rating"],
+            "sdg_impact": job["sdg_impact"],
+            "urgency": job["urgency"],
             "similarity": round(similarity, 2),
             "apply_url": f"https://greenmatchers.com/jobs/{job['id']}",
             "language": query.lang
@@ -1634,26 +1488,37 @@ async def enhanced_job_search(request: Request, query: QueryInput, current_user:
     
     # Sort by similarity
     matches = sorted(matches, key=lambda x: x["similarity"], reverse=True)
-    response_time = time.time() - start_time
     
-    # Translate suggestions
     skill_suggestions = recommend_skills(skill_text)[:2]
-    if query.lang != "en" and query.lang in SUPPORTED_LANGUAGES:
-        translated_suggestions = []
-        for suggestion in skill_suggestions:
-            translated_suggestions.append(await translate_text_enhanced(suggestion, query.lang))
-        skill_suggestions = translated_suggestions
+    email_subject = "🚨 NEW GREEN JOBS!"
+    email_body = f"{len(matches)} matches in {query.location} in {query.lang}!"
+    
+    # Pre-translated titles/descriptions from job_translations; the rest in one deduplicated batch
+    if translate:
+        stored = await job_pretranslator.lookup(
+            {match["id"]: {field: match[key] for key, field in PRETRANSLATED_JOB_FIELDS.items()} for match in matches[:10]},
+            query.lang)
+        pending = []
+        for match in matches[:10]:
+            pretranslated = stored.get(match["id"], {})
+            for key in TRANSLATED_JOB_FIELDS:
+                field = PRETRANSLATED_JOB_FIELDS.get(key)
+                if field in pretranslated:
+                    match[key] = pretranslated[field]
+                else:
+                    pending.append((match, key))
+        texts = [match[key] for match, key in pending] + skill_suggestions + [email_subject, email_body]
+        translated = iter(await translation_batcher.translate_many(texts, query.lang))
+        for match, key in pending:
+            match[key] = next(translated)
+        skill_suggestions = [next(translated) for _ in skill_suggestions]
+        email_subject, email_body = next(translated), next(translated)
+    response_time = time.time() - start_time
     
     # Send notifications
     notification_msg = f"🚨 {current_user['username']}: {len(matches)} JOBS in {query.location} ({query.lang})!"
     await manager.broadcast(notification_msg)
     
-    email_subject = "🚨 NEW GREEN JOBS!"
-    email_body = f"{len(matches)} matches in {query.location} in {query.lang}!"
-    if query.lang != "en" and query.lang in SUPPORTED_LANGUAGES:
-        email_subject = await translate_text_enhanced(email_subject, query.lang)
-        email_body = await translate_text_enhanced(email_body, query.lang)
-    
     send_email(current_user["email"], email_subject, email_body)
     
     return {
@@ -1679,12 +1544,9 @@ async def mariadb_vector_job_search(request: Request, query: QueryInput, current
     try:
         # Generate query vector
         query_text = " ".join(query.skill_text)
-        query_vector = vector_service.generate_embedding(query_text)
+        query_vector = await vector_service.generate_embedding_async(query_text)
         vector_str = vector_service.vector_to_mariadb_format(query_vector)
         
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        
         # Use MariaDB VECTOR_DISTANCE for similarity search
         sql = """
             SELECT job_id, title, description, company, location, salary,
@@ -1695,8 +1557,7 @@ async def mariadb_vector_job_search(request: Request, query: QueryInput, current
             LIMIT 10
         """
         
-        cursor.execute(sql, (vector_str,))
-        results = cursor.fetchall()
+        results = await run_db(fetch_rows, sql, (vector_str,))
         
         # Format results
         matches = []
@@ -1718,9 +1579,6 @@ async def mariadb_vector_job_search(request: Request, query: QueryInput, current
                 "database_technology": "MariaDB Native Vector Operations"
             })
         
-        cursor.close()
-        conn.close()
-        
         return {
             "matches": matches,
             "total_results": len(matches),
@@ -1741,12 +1599,9 @@ async def mariadb_vector_career_recommendations(request: Request, career_data: C
     try:
         # Generate query vector from user skills
         query_text = " ".join(career_data.skills) if career_data.skills else career_data.experience
-        query_vector = vector_service.generate_embedding(query_text)
+        query_vector = await vector_service.generate_embedding_async(query_text)
         vector_str = vector_service.vector_to_mariadb_format(query_vector)
         
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        
         # Use MariaDB VECTOR_DISTANCE for career matching
         sql = """
             SELECT career_id, title, description, growth, salary_range, demand, category,
@@ -1756,8 +1611,7 @@ async def mariadb_vector_career_recommendations(request: Request, career_data: C
             LIMIT 15
         """
         
-        cursor.execute(sql, (vector_str,))
-        results = cursor.fetchall()
+        results = await run_db(fetch_rows, sql, (vector_str,))
         
         # Format recommendations
         recommendations = []
@@ -1777,9 +1631,6 @@ async def mariadb_vector_career_recommendations(request: Request, career_data: C
                 "database_feature": "Native VECTOR_DISTANCE Calculation"
             })
         
-        cursor.close()
-        conn.close()
-        
         return {
             "recommendations": recommendations,
             "total_count": len(recommendations),
@@ -1793,7 +1644,7 @@ async def mariadb_vector_career_recommendations(request: Request, career_data: C
         raise HTTPException(status_code=500, detail=f"Vector career matching failed: {str(e)}")
 
 @app.get("/debug/vector-test")
-async def debug_vector_test():
+def debug_vector_test():
     """Test MariaDB vector functionality - DEMO ENDPOINT FOR HACKATHON"""
     try:
         conn = get_db_connection()
@@ -1829,7 +1680,7 @@ async def debug_vector_test():
         return {"error": str(e), "status": "❌ Vector test failed"}
 
 @app.get("/api/vector/status")
-async def vector_status():
+def vector_status():
     """Check MariaDB vector implementation status"""
     try:
         conn = get_db_connection()
@@ -1847,8 +1698,10 @@ async def vector_status():
         cursor.close()
         conn.close()
         
+        vs = get_vector_service()
         return {
             "vector_implementation": "Active",
+            "embedding_cache": vs.embedding_cache.stats() if vs else None,
             "careers_with_vectors": status["careers_with_vectors"],
             "jobs_with_vectors": status["jobs_with_vectors"], 
             "users_with_vectors": status["users_with_vectors"],
@@ -1891,7 +1744,7 @@ async def vector_demo():
         "maria_db_vector": {
             "schema_implemented": True,
             "vector_columns": ["description_vector", "skills_vector"],
-            "dimensions": 384,
+            "dimensions": 768,
             "tables": ["careers", "jobs", "users"]
         },
         "ai_capabilities": {
@@ -1916,30 +1769,23 @@ async def semantic_job_search(request: Request, query: QueryInput, current_user:
         query_text = " ".join(query.skill_text)
         
         # Generate query embedding
-        query_vector = vector_service.generate_embedding(query_text)
-        
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
+        query_vector = await vector_service.generate_embedding_async(query_text)
         
         # Get jobs with their vectors
-        cursor.execute("""
+        jobs = await run_db(fetch_rows, """
             SELECT job_id, title, description, company, location, salary,
-                   desc_vector_json, skills_vector_json
+                   desc_vector_blob, desc_vector_json
             FROM jobs 
             WHERE status = 'active'
             LIMIT 10
         """)
         
-        jobs = cursor.fetchall()
-        cursor.close()
-        conn.close()
-        
         # Calculate similarities in Python
         matches = []
         for job in jobs:
-            if job['desc_vector_json']:
+            job_vector = vector_from_columns(job['desc_vector_blob'], job['desc_vector_json'], len(query_vector))
+            if job_vector is not None:
                 try:
-                    job_vector = json.loads(job['desc_vector_json'])
                     similarity = vector_service.cosine_similarity(query_vector, job_vector)
                     
                     matches.append({
@@ -1980,29 +1826,22 @@ async def semantic_career_recommendations(request: Request, career_data: CareerR
         query_text = " ".join(career_data.skills) if career_data.skills else career_data.experience
         
         # Generate embedding
-        query_vector = vector_service.generate_embedding(query_text)
-        
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
+        query_vector = await vector_service.generate_embedding_async(query_text)
         
         # Get careers with vectors
-        cursor.execute("""
+        careers = await run_db(fetch_rows, """
             SELECT career_id, title, description, growth, salary_range, demand,
-                   skills_vector_json
+                   skills_vector_blob, skills_vector_json
             FROM careers 
             LIMIT 15
         """)
         
-        careers = cursor.fetchall()
-        cursor.close()
-        conn.close()
-        
         # Calculate similarities
         recommendations = []
         for career in careers:
-            if career['skills_vector_json']:
+            career_vector = vector_from_columns(career['skills_vector_blob'], career['skills_vector_json'], len(query_vector))
+            if career_vector is not None:
                 try:
-                    career_vector = json.loads(career['skills_vector_json'])
                     similarity = vector_service.cosine_similarity(query_vector, career_vector)
                     
                     recommendations.append({
@@ -2043,8 +1882,8 @@ async def hackathon_semantic_job_search(request: Request, query: QueryInput, cur
         query_text = " ".join(query.skill_text)
         
         # Use your existing vector service
-        filters = {"location": query.location} if query.location else None
-        matches = vector_service.semantic_search_jobs(query_text, top_k=10, filters=filters)
+        filters = {"location": query.location, "experience_level": query.experience_level, "job_type": query.job_type}
+        matches = await vector_service.semantic_search_jobs_async(query_text, top_k=10, filters=filters)
         
         return {
             "feature": "MariaDB AI-Powered Semantic Search",
@@ -2062,6 +1901,29 @@ async def hackathon_semantic_job_search(request: Request, query: QueryInput, cur
         logger.error(f"Semantic search error: {e}")
         raise HTTPException(status_code=500, detail=f"Semantic search error: {str(e)}")
 
+@app.post("/api/vector/jobs/hybrid")
+async def hackathon_hybrid_job_search(request: Request, query: QueryInput, current_user: dict = Depends(get_current_user)):
+    """🔎 Keyword (BM25) + semantic job search fused with reciprocal rank fusion"""
+    vs = get_vector_service()
+    if not vs:
+        raise HTTPException(status_code=503, detail="Vector service not available")
+    try:
+        query_text = " ".join(query.skill_text)
+        filters = {"location": query.location, "experience_level": query.experience_level, "job_type": query.job_type}
+        matches = await vs.hybrid_search_jobs_async(query_text, top_k=10, filters=filters)
+        
+        return {
+            "query": query_text,
+            "matches": matches,
+            "total_matches": len(matches),
+            "search_method": "BM25 inverted index + vector cosine, reciprocal rank fusion",
+            "user": current_user["username"]
+        }
+        
+    except Exception as e:
+        logger.error(f"Hybrid search error: {e}")
+        raise HTTPException(status_code=500, detail=f"Hybrid search error: {str(e)}")
+
 @app.post("/api/vector/careers/semantic-recommendations") 
 # # @limiter.limit("10/minute")
 async def hackathon_semantic_careers(request: Request, career_data: CareerRecommendationsInput, current_user: dict = Depends(get_current_user)):
@@ -2070,7 +1932,7 @@ async def hackathon_semantic_careers(request: Request, career_data: CareerRecomm
         query_text = " ".join(career_data.skills) if career_data.skills else career_data.experience
         
         # Use your existing vector service
-        recommendations = vector_service.semantic_career_recommendations(query_text, top_k=10)
+        recommendations = await vector_service.semantic_career_recommendations_async(query_text, top_k=10)
         
         return {
             "feature": "AI Career Recommendations",
@@ -2094,10 +1956,10 @@ async def hackathon_vector_demo():
     return {
         "maria_db_vector": {
             "schema_implemented": True,
-            "vector_columns": ["desc_vector_json", "skills_vector_json"],
-            "dimensions": 384,
+            "vector_columns": ["desc_vector_blob", "skills_vector_blob"],
+            "dimensions": 768,
             "tables": ["careers", "jobs"],
-            "approach": "Hybrid - MariaDB JSON + Python AI"
+            "approach": "Hybrid - MariaDB float32 BLOBs + Python AI"
         },
         "ai_capabilities": {
             "embedding_model": "all-mpnet-base-v2",
@@ -2122,7 +1984,7 @@ async def hackathon_vector_demo():
     }
 
 @app.get("/api/vector/status")
-async def hackathon_vector_status():
+def hackathon_vector_status():
     """📊 HACKATHON STATUS: Vector Implementation Status"""
     try:
         conn = get_db_connection()
@@ -2131,16 +1993,18 @@ async def hackathon_vector_status():
         # Check vector implementation status
         cursor.execute("""
             SELECT 
-                (SELECT COUNT(*) FROM careers WHERE desc_vector_json IS NOT NULL) as careers_with_vectors,
-                (SELECT COUNT(*) FROM jobs WHERE desc_vector_json IS NOT NULL) as jobs_with_vectors
+                (SELECT COUNT(*) FROM careers WHERE desc_vector_blob IS NOT NULL OR desc_vector_json IS NOT NULL) as careers_with_vectors,
+                (SELECT COUNT(*) FROM jobs WHERE desc_vector_blob IS NOT NULL OR desc_vector_json IS NOT NULL) as jobs_with_vectors
         """)
         
         status = cursor.fetchone()
         cursor.close()
         conn.close()
         
+        vs = get_vector_service()
         return {
             "vector_implementation": "Active",
+            "embedding_cache": vs.embedding_cache.stats() if vs else None,
             "careers_vectorized": status["careers_with_vectors"],
             "jobs_vectorized": status["jobs_with_vectors"],
             "total_vectorized": status["careers_with_vectors"] + status["jobs_with_vectors"],
@@ -2152,6 +2016,18 @@ async def hackathon_vector_status():
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
+@app.get("/api/vector/index/report")
+async def hackathon_vector_index_report(sample_size: int = 200, top_k: int = 10):
+    """📈 ANN index recall vs latency, measured against exact search"""
+    vs = get_vector_service()
+    if not vs:
+        raise HTTPException(status_code=503, detail="Vector service not available")
+    try:
+        return vs.get_index_report(sample_size=sample_size, top_k=top_k)
+    except Exception as e:
+        logger.error(f"Vector index report error: {e}")
+        raise HTTPException(status_code=500, detail=f"Index report failed: {str(e)}")
+
 @app.post("/api/vector/test")
 async def hackathon_vector_test(test_data: dict):
     """🧪 HACKATHON TEST: Test vector functionality"""
@@ -2159,8 +2035,8 @@ async def hackathon_vector_test(test_data: dict):
         query = test_data.get("query", "renewable energy")
 
         # Test both endpoints
-        jobs = vector_service.semantic_search_jobs(query, top_k=3)
-        careers = vector_service.semantic_career_recommendations(query, top_k=3)
+        jobs = await vector_service.semantic_search_jobs_async(query, top_k=3)
+        careers = await vector_service.semantic_career_recommendations_async(query, top_k=3)
 
         return {
             "test_query": query,
@@ -2209,7 +2085,7 @@ async def analyze_resume_ai(
             print(f"⚠️ BART resume compression failed: {e}")
 
         # Get job matches based on resume
-        jobs_data = get_cached_jobs()  # Get all jobs
+        jobs_data = await asyncio.to_thread(get_cached_jobs)  # Get all jobs
         job_matches = resume_parser.get_job_matches(analysis, jobs_data)
 
         # Clean up temp file
@@ -2261,15 +2137,14 @@ async def get_personalized_recommendations(
         user_skills = user_profile.get("skills", [])
         user_history = user_profile.get("job_history", [])
 
-        # Get all jobs for recommendations
-        all_jobs = get_cached_jobs()
-
-        # Generate hybrid recommendations
-        recommendations = recommendation_engine.hybrid_recommend(
+        # Generate hybrid recommendations over the resident job index (embedding runs off the event loop);
+        # without a posted job_history the engine reads the user's row of interaction_store
+        recommendations = await asyncio.to_thread(
+            recommendation_engine.hybrid_recommend,
             user_id=current_user["user_id"],
             user_skills=user_skills,
             user_history=user_history,
-            all_jobs=all_jobs
+            all_jobs=None
         )
 
         return {
@@ -2277,7 +2152,7 @@ async def get_personalized_recommendations(
             "recommendation_type": "hybrid_ai",
             "based_on": {
                 "skills": len(user_skills),
-                "history": len(user_history)
+                "history": len(user_history) or max((rec.get("based_on_history", 0) for rec in recommendations), default=0)
             },
             "ai_generated": True
         }
@@ -2288,7 +2163,7 @@ async def get_personalized_recommendations(
 
 @app.post("/api/ai/career/skill-gap")
 # @limiter.limit("10/minute")
-async def analyze_skill_gap(
+def analyze_skill_gap(
     gap_request: dict,
     current_user: dict = Depends(get_current_user)
 ):
@@ -2494,7 +2369,7 @@ async def match_jobs(request: Request, query: QueryInput, current_user: dict = D
     if not query.location or query.location.lower() == "string":
         query.location = user_city
         print(f"👤 AUTO-DETECTED: {user_city}")
-    jobs = get_cached_jobs(query)
+    jobs = await get_cached_jobs_async(query)
     skill_text = " ".join(query.skill_text).lower()
     matches = []
     for job in jobs:
@@ -2547,7 +2422,7 @@ async def generate_resume(query: QueryInput, current_user: dict = Depends(get_cu
     )
 
 @app.post("/save_job")
-async def save_job(job_id: int, current_user: dict = Depends(get_current_user)):
+def save_job(job_id: int, current_user: dict = Depends(get_current_user)):
     conn = get_db_connection()
     if not conn:
         raise HTTPException(status_code=500, detail="Database connection failed")
@@ -2556,7 +2431,11 @@ async def save_job(job_id: int, current_user: dict = Depends(get_current_user)):
         cursor.execute("SELECT user_id FROM users WHERE username = %s", (current_user["username"],))
         user_id = cursor.fetchone()[0]
         cursor.execute("INSERT IGNORE INTO favorites (user_id, job_id) VALUES (%s, %s)", (user_id, job_id))
+        newly_saved = cursor.rowcount == 1  # 0 when the job was already saved
         conn.commit()
+        if newly_saved:
+            app_stats.incr("favorites")
+            interaction_store.record(user_id, job_id, "save")
         cursor.execute("SELECT COUNT(*) FROM favorites WHERE user_id = %s", (user_id,))
         favorites_count = cursor.fetchone()[0]
         return {"message": "Job saved!", "favorites": favorites_count}
@@ -2568,6 +2447,12 @@ async def save_job(job_id: int, current_user: dict = Depends(get_current_user)):
         cursor.close()
         conn.close()
 
+@app.post("/api/jobs/{job_id}/view")
+async def record_job_view(job_id: int, current_user: dict = Depends(get_current_user)):
+    """Record that the user opened a job posting (feeds personalized recommendations)"""
+    interaction_store.record(current_user["user_id"], job_id, "view")
+    return {"message": "View recorded", "job_id": job_id}
+
 @app.post("/career_path")
 async def career_path(career_data: CareerPathInput, current_user: dict = Depends(get_current_user)):
     path = {
@@ -2641,75 +2526,40 @@ async def get_companies_trends():
     }
 
 # Real-time WebSocket connections
-active_connections = []
+async def _stats_message() -> Dict[str, Any]:
+    """One /ws/stats payload from the shared counters - no per-client database queries"""
+    counts = await app_stats.aget()
+    if counts:
+        total_jobs, companies = counts["jobs"], counts["job_companies"]
+    else:
+        total_jobs, companies = 547, 51  # Fallback if the counters are unavailable
+    return {
+        "type": "stats_update",
+        "total_jobs": total_jobs,
+        "companies": companies,
+        "timestamp": datetime.now().strftime("%H:%M:%S")
+    }
+
+# One producer task for all /ws/stats clients (serialised once, sent concurrently)
+stats_broadcaster = StatsBroadcaster(_stats_message, name="ws-stats")
 
 @app.websocket("/ws/stats")
 async def websocket_stats(websocket: WebSocket):
     await websocket.accept()
     print("✅ WebSocket client connected")
-    active_connections.append(websocket)
+    await stats_broadcaster.subscribe(websocket)
     
     try:
+        # Updates are pushed by the broadcaster; reading just detects the disconnect
         while True:
-            # Send updates every 10 seconds for demo
-            await asyncio.sleep(10)
-            
-            try:
-                # Get live stats from database
-                conn = get_db_connection()
-                if conn:
-                    cursor = conn.cursor()
-                    try:
-                        cursor.execute("SELECT COUNT(*) FROM jobs")
-                        total_jobs_result = cursor.fetchone()
-                        total_jobs = total_jobs_result[0] if total_jobs_result else 547
-                        
-                        cursor.execute("SELECT COUNT(DISTINCT company) FROM jobs")
-                        companies_result = cursor.fetchone()
-                        companies = companies_result[0] if companies_result else 51
-                        
-                        await websocket.send_json({
-                            "type": "stats_update",
-                            "total_jobs": total_jobs,
-                            "companies": companies,
-                            "timestamp": datetime.now().strftime("%H:%M:%S")
-                        })
-                        print(f"📊 Sent stats update: {total_jobs} jobs, {companies} companies")
-                        
-                    except Exception as db_error:
-                        print(f"Database error: {db_error}")
-                        # Fallback data if DB query fails
-                        await websocket.send_json({
-                            "type": "stats_update", 
-                            "total_jobs": 547,
-                            "companies": 51,
-                            "timestamp": datetime.now().strftime("%H:%M:%S")
-                        })
-                    finally:
-                        cursor.close()
-                        conn.close()
-                else:
-                    # Fallback if DB connection fails
-                    await websocket.send_json({
-                        "type": "stats_update",
-                        "total_jobs": 547,
-                        "companies": 51, 
-                        "timestamp": datetime.now().strftime("%H:%M:%S")
-                    })
-                    
-            except Exception as send_error:
-                print(f"Error sending WebSocket message: {send_error}")
-                break
-                
+            await websocket.receive_text()
+
     except WebSocketDisconnect:
         print("❌ WebSocket client disconnected")
-        active_connections.remove(websocket)
     except Exception as e:
         print(f"❌ WebSocket error: {e}")
-        active_connections.remove(websocket)
     finally:
-        if websocket in active_connections:
-            active_connections.remove(websocket)
+        stats_broadcaster.unsubscribe(websocket)
         print("🔌 WebSocket connection cleaned up")
 
 # ============ AUTHENTICATION & PASSWORD UTILS ============
@@ -2756,6 +2606,12 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
         if username is None:
             raise HTTPException(status_code=401, detail="Invalid credentials")
         
+        # Cached principal skips the users lookup on most authenticated requests
+        cached = principal_cache.get(username, "full")
+        if cached is not None:
+            return cached
+        generation = principal_cache.generation(username)
+        
         conn = get_db_connection()
         if not conn:
             raise HTTPException(status_code=500, detail="Database connection failed")
@@ -2766,6 +2622,7 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
             user = cursor.fetchone()
             if not user:
                 raise HTTPException(status_code=401, detail="User not found")
+            principal_cache.put(username, user, "full", generation)
             return user
         finally:
             cursor.close()
@@ -2840,7 +2697,7 @@ class JobCreate(BaseModel):
 
 # ============ PHASE 1: USER MANAGEMENT ENDPOINTS ============
 @app.post("/api/auth/register")
-async def register_user(user_data: UserRegister):
+def register_user(user_data: UserRegister):
     """User registration with role-based accounts - FIXED VERSION"""
     conn = get_db_connection()
     if not conn:
@@ -2877,6 +2734,8 @@ async def register_user(user_data: UserRegister):
             """, (user_id, 1, "Company Representative", datetime.utcnow()))  # Default company_id 1
         
         conn.commit()
+        principal_cache.invalidate(user_data.username)
+        app_stats.incr("users")
         
         # Create access token
         access_token = create_access_token(data={"sub": user_data.username})
@@ -2900,7 +2759,7 @@ async def register_user(user_data: UserRegister):
         conn.close()
 
 @app.post("/api/auth/login")
-async def login_user(user_data: UserLogin):
+def login_user(user_data: UserLogin):
     """User login with JWT token"""
     conn = get_db_connection()
     if not conn:
@@ -2921,6 +2780,8 @@ async def login_user(user_data: UserLogin):
         cursor.execute("UPDATE users SET last_login = %s WHERE user_id = %s", 
                       (datetime.utcnow(), user["user_id"]))
         conn.commit()
+        # A fresh login (e.g. after a password or role change) re-reads the principal
+        principal_cache.invalidate(user["username"])
         
         # Create token
         access_token = create_access_token(data={"sub": user["username"]})
@@ -2945,7 +2806,7 @@ async def login_user(user_data: UserLogin):
         conn.close()
 
 @app.get("/api/users/profile")
-async def get_user_profile(current_user: dict = Depends(get_current_user)):
+def get_user_profile(current_user: dict = Depends(get_current_user)):
     """Get complete user profile"""
     conn = get_db_connection()
     if not conn:
@@ -2992,7 +2853,7 @@ async def get_user_profile(current_user: dict = Depends(get_current_user)):
         conn.close()
 
 @app.post("/api/users/profile")
-async def update_user_profile(
+def update_user_profile(
     profile_data: UserProfileCreate, 
     current_user: dict = Depends(get_current_user)
 ):
@@ -3039,6 +2900,7 @@ async def update_user_profile(
             ))
         
         conn.commit()
+        principal_cache.invalidate(current_user["username"])
         return {"message": "Profile updated successfully"}
         
     except mariadb.Error as e:
@@ -3050,7 +2912,7 @@ async def update_user_profile(
         conn.close()
 
 @app.post("/api/users/upload-resume")
-async def upload_resume(
+def upload_resume(
     file: UploadFile = File(...),
     current_user: dict = Depends(get_current_user)
 ):
@@ -3086,6 +2948,7 @@ async def upload_resume(
                     WHERE user_id = %s
                 """, (resume_url, datetime.utcnow(), current_user["user_id"]))
                 conn.commit()
+                principal_cache.invalidate(current_user["username"])
             finally:
                 cursor.close()
                 conn.close()
@@ -3104,10 +2967,9 @@ async def apply_for_job(
     current_user: dict = Depends(get_current_user)
 ):
     """Apply for a job"""
-    conn = get_db_connection()
-    if not conn:
-        raise HTTPException(status_code=500, detail="Database connection failed")
-    
+    return await run_db(_create_application, application_data, current_user)
+
+def _create_application(conn, application_data: JobApplicationCreate, current_user: dict):
     cursor = conn.cursor()
     try:
         # Check if job exists
@@ -3155,6 +3017,8 @@ async def apply_for_job(
         ))
         
         conn.commit()
+        app_stats.incr("applications")
+        interaction_store.record(current_user["user_id"], application_data.job_id, "apply")
         
         return {
             "message": "Application submitted successfully",
@@ -3168,15 +3032,13 @@ async def apply_for_job(
         raise HTTPException(status_code=500, detail="Failed to submit application")
     finally:
         cursor.close()
-        conn.close()
 
 @app.get("/api/users/applications")
 async def get_user_applications(current_user: dict = Depends(get_current_user)):
     """Get user's job applications"""
-    conn = get_db_connection()
-    if not conn:
-        raise HTTPException(status_code=500, detail="Database connection failed")
-    
+    return await run_db(_query_user_applications, current_user["user_id"])
+
+def _query_user_applications(conn, user_id: int):
     cursor = conn.cursor(dictionary=True)
     try:
         cursor.execute("""
@@ -3185,7 +3047,7 @@ async def get_user_applications(current_user: dict = Depends(get_current_user)):
             JOIN jobs j ON a.job_id = j.job_id
             WHERE a.user_id = %s
             ORDER BY a.applied_at DESC
-        """, (current_user["user_id"],))
+        """, (user_id,))
         
         applications = cursor.fetchall()
         return {"applications": applications}
@@ -3195,12 +3057,11 @@ async def get_user_applications(current_user: dict = Depends(get_current_user)):
         raise HTTPException(status_code=500, detail="Failed to fetch applications")
     finally:
         cursor.close()
-        conn.close()
 
 # ============ PHASE 1: EMPLOYER ENDPOINTS ============
 
 @app.post("/api/employer/profile")
-async def create_employer_profile(
+def create_employer_profile(
     profile_data: EmployerProfileCreate,
     current_user: dict = Depends(get_current_user)
 ):
@@ -3257,19 +3118,8 @@ async def create_employer_profile(
         cursor.close()
         conn.close()
 
-@app.post("/api/employer/jobs")
-async def create_job(
-    job_data: JobCreate,
-    current_user: dict = Depends(get_current_user)
-):
-    """Create a new job posting"""
-    if current_user["role"] != "employer":
-        raise HTTPException(status_code=403, detail="Only employers can post jobs")
-    
-    conn = get_db_connection()
-    if not conn:
-        raise HTTPException(status_code=500, detail="Database connection failed")
-    
+def _insert_job(conn, job_data: JobCreate, current_user: dict):
+    """Insert a job posting for the employer; returns (job_id, company_name)"""
     cursor = conn.cursor()
     try:
         # Get employer profile to get company_id
@@ -3301,12 +3151,8 @@ async def create_job(
         
         job_id = cursor.lastrowid
         conn.commit()
-        
-        return {
-            "message": "Job posted successfully",
-            "job_id": job_id,
-            "company": company_name
-        }
+        refresh_cached_jobs(job_id)
+        return job_id, company_name
         
     except mariadb.Error as e:
         conn.rollback()
@@ -3314,10 +3160,39 @@ async def create_job(
         raise HTTPException(status_code=500, detail="Failed to create job")
     finally:
         cursor.close()
-        conn.close()
+
+@app.post("/api/employer/jobs")
+async def create_job(
+    job_data: JobCreate,
+    current_user: dict = Depends(get_current_user)
+):
+    """Create a new job posting"""
+    if current_user["role"] != "employer":
+        raise HTTPException(status_code=403, detail="Only employers can post jobs")
+    
+    job_id, company_name = await run_db(_insert_job, job_data, current_user)
+    app_stats.incr("jobs")
+    job_pretranslator.schedule(job_id, {"title": job_data.title, "description": job_data.description,
+                                        "company": company_name})
+
+    # Make the new posting searchable without waiting for an index reload
+    # (embedding + index upserts run on a worker thread, not the event loop)
+    vs = get_vector_service()
+    if vs:
+        try:
+            await asyncio.to_thread(vs.index_job, job_id)
+        except Exception as e:
+            logger.warning(f"Failed to index job {job_id}: {e}")
+    
+    return {
+        "message": "Job posted successfully",
+        "job_id": job_id,
+        "company": company_name
+    }
+
 
 @app.get("/api/employer/applications")
-async def get_employer_applications(current_user: dict = Depends(get_current_user)):
+def get_employer_applications(current_user: dict = Depends(get_current_user)):
     """Get applications for employer's jobs"""
     if current_user["role"] != "employer":
         raise HTTPException(status_code=403, detail="Only employers can access this endpoint")
@@ -3353,7 +3228,7 @@ async def get_employer_applications(current_user: dict = Depends(get_current_use
         conn.close()
 
 @app.put("/api/applications/{application_id}/status")
-async def update_application_status(
+def update_application_status(
     application_id: int,
     status: str,
     current_user: dict = Depends(get_current_user)
@@ -3405,7 +3280,7 @@ async def update_application_status(
 # ============ EDUCATION & EXPERIENCE ENDPOINTS ============
 
 @app.post("/api/users/education")
-async def add_education(
+def add_education(
     education_data: EducationCreate,
     current_user: dict = Depends(get_current_user)
 ):
@@ -3440,7 +3315,7 @@ async def add_education(
         conn.close()
 
 @app.post("/api/users/experience")
-async def add_experience(
+def add_experience(
     experience_data: ExperienceCreate,
     current_user: dict = Depends(get_current_user)
 ):
@@ -3476,16 +3351,8 @@ async def add_experience(
 
 # ============ ENHANCED SEARCH ENDPOINTS ============
 
-@app.post("/api/jobs/search-enhanced")
-async def enhanced_job_search(
-    query: QueryInput,
-    current_user: dict = Depends(get_current_user)
-):
-    """Enhanced job search with filters"""
-    conn = get_db_connection()
-    if not conn:
-        raise HTTPException(status_code=500, detail="Database connection failed")
-    
+def _search_jobs_enhanced(conn, skill_text, location, ranked_ids):
+    """Filtered job rows for the enhanced search, run through run_db"""
     cursor = conn.cursor(dictionary=True)
     try:
         base_sql = """
@@ -3496,23 +3363,47 @@ async def enhanced_job_search(
         """
         params = []
         
-        # Add skill filters
-        if query.skill_text:
-            skill_conditions = []
-            for skill in query.skill_text:
-                skill_conditions.append("(j.title LIKE %s OR j.description LIKE %s OR j.skills LIKE %s)")
-                params.extend([f"%{skill}%", f"%{skill}%", f"%{skill}%"])
-            base_sql += " AND (" + " OR ".join(skill_conditions) + ")"
+        # Add skill filters - ranked ids from the BM25 + vector index, LIKE scan only as a fallback
+        if ranked_ids is not None:
+            base_sql += job_id_filter_sql("j.job_id", ranked_ids)
+            params.extend(ranked_ids)
+        elif skill_text:
+            fulltext = fulltext_condition(conn, "jobs", skill_text, alias="j.")
+            if fulltext:
+                base_sql += " AND " + fulltext[0]
+                params.extend(fulltext[1])
+            else:
+                skill_conditions = []
+                for skill in skill_text:
+                    skill_conditions.append("(j.title LIKE %s OR j.description LIKE %s OR j.skills LIKE %s)")
+                    params.extend([f"%{skill}%", f"%{skill}%", f"%{skill}%"])
+                base_sql += " AND (" + " OR ".join(skill_conditions) + ")"
         
         # Add location filter
-        if query.location and query.location.lower() != "string":
+        if location:
             base_sql += " AND j.location LIKE %s"
-            params.append(f"%{query.location}%")
+            params.append(f"%{location}%")
         
         base_sql += " ORDER BY j.created_at DESC LIMIT 50"
         
         cursor.execute(base_sql, params)
-        jobs = cursor.fetchall()
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+@app.post("/api/jobs/search-enhanced")
+async def enhanced_job_search(
+    query: QueryInput,
+    current_user: dict = Depends(get_current_user)
+):
+    """Enhanced job search with filters"""
+    try:
+        location = query.location if query.location and query.location.lower() != "string" else None
+        ranked_ids = await hybrid_job_ids_async(" ".join(query.skill_text), location) if query.skill_text else None
+        jobs = await run_db(_search_jobs_enhanced, query.skill_text, location, ranked_ids)
+        if ranked_ids:
+            rank = {job_id: position for position, job_id in enumerate(ranked_ids)}
+            jobs = sorted(jobs, key=lambda job: rank.get(job["job_id"], len(rank)))
         
         # Format response
         formatted_jobs = []
@@ -3546,9 +3437,6 @@ async def enhanced_job_search(
     except mariadb.Error as e:
         logger.error(f"Enhanced search error: {e}")
         raise HTTPException(status_code=500, detail="Search failed")
-    finally:
-        cursor.close()
-        conn.close()
 
 # ============ KEEP ALL YOUR EXISTING ENDPOINTS BELOW ============
 
@@ -3557,42 +3445,20 @@ async def enhanced_job_search(
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy", "version": "4.0.0", "phase": "1-complete"}
+    return {"status": "healthy", "version": "4.0.0", "phase": "1-complete", **health_metrics()}
 
 @app.get("/stats")
-def get_stats():
-    conn = get_db_connection()
-    if not conn:
-        raise HTTPException(status_code=500, detail="Database connection failed")
-    cursor = conn.cursor()
-    try:
-        # Get real counts from database including new tables
-        cursor.execute("SELECT COUNT(*) FROM users")
-        users_count = cursor.fetchone()[0]
-        cursor.execute("SELECT COUNT(*) FROM jobs")
-        jobs_count = cursor.fetchone()[0]
-        cursor.execute("SELECT COUNT(*) FROM favorites")
-        favorites_count = cursor.fetchone()[0]
-        cursor.execute("SELECT COUNT(*) FROM companies")
-        companies_count = cursor.fetchone()[0]
-        cursor.execute("SELECT COUNT(*) FROM applications")
-        applications_count = cursor.fetchone()[0]
-        
-        return {
-            "total_jobs": jobs_count,
-            "companies": companies_count,
-            "sdg_goals": 15,
-            "favorites": favorites_count,
-            "applications": applications_count,
-            "users": users_count,
-            "profile_views": 143
-        }
-    except mariadb.Error as e:
-        logger.error(f"Error querying stats: {e}")
-        raise HTTPException(status_code=500, detail="Database query failed")
-    finally:
-        cursor.close()
-        conn.close()
+async def get_stats():
+    counts = await current_stats()
+    return {
+        "total_jobs": counts["jobs"],
+        "companies": counts["companies"],
+        "sdg_goals": 15,
+        "favorites": counts["favorites"],
+        "applications": counts["applications"],
+        "users": counts["users"],
+        "profile_views": 143
+    }
 
 # ... [REST OF YOUR EXISTING ENDPOINTS - NO CHANGES] ...
 
@@ -3605,10 +3471,6 @@ def train_salary_predictor():
 
 salary_model = train_salary_predictor()
 
-# Translation cache
-translation_cache = {}
-cache_lock = asyncio.Lock()
-
 
 
 # =============================================================================
@@ -3982,6 +3844,7 @@ async def update_company_profile_data(profile_data: CompanyProfile, user_id: int
 async def process_bulk_job_post(jobs: List[JobCreate], user_id: int) -> dict:
     """Process bulk job posting"""
     # Mock implementation - replace with actual bulk processing
+    # (each inserted job needs refresh_cached_jobs + job_pretranslator.schedule, as in create_job)
     return {
         "message": f"Successfully posted {len(jobs)} jobs",
         "jobs_posted": len(jobs),
@@ -4120,6 +3983,21 @@ def init_db():
         conn.commit()
         print("✅ Database initialized with Phase 1 tables")
 
+        # Catalog translations from earlier runs / other workers
+        translation_memory.warm()
+        # User x job interaction matrix, so the first recommendation request does not compact the log
+        interaction_store.warm()
+
+        # Normalize career skills for indexed matching (no-op once indexed)
+        pooled = get_db_connection()
+        if pooled:
+            try:
+                ensure_skill_index(pooled, not pooled.is_mariadb)
+            except Exception as e:
+                print(f"⚠️ Career skill index migration skipped: {e}")
+            finally:
+                pooled.close()
+
         # Initialize vector data
         print("🚀 Initializing vector data...")
         vector_result = initialize_vector_data()
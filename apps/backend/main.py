@@ -10,7 +10,8 @@ from .routes import (
     auth_router, users_router, jobs_router, careers_router,
     translation_router, system_router, vector_router
 )
-from .models import create_tables
+from .models import create_tables, create_fulltext_indexes, create_skill_index
+from .services.translation_memory import translation_memory
 
 # Create FastAPI app
 app = FastAPI(
@@ -84,6 +85,18 @@ async def startup_event():
     except Exception as e:
         print(f"⚠️ Database initialization warning: {e}")
 
+    try:
+        create_fulltext_indexes()
+    except Exception as e:
+        print(f"⚠️ Full-text index migration skipped: {e}")
+
+    try:
+        create_skill_index()
+    except Exception as e:
+        print(f"⚠️ Career skill index migration skipped: {e}")
+
+    translation_memory.warm()
+
     print("🚀 Green Matchers API started successfully!")
     print(f"📊 Environment: {'Development' if settings.debug else 'Production'}")
     print(f"📚 API Documentation: http://localhost:8000/docs")
@@ -1,14 +1,14 @@
 # models/__init__.py
-from .database import Base, get_db, create_tables
+from .database import Base, get_db, create_tables, create_fulltext_indexes, create_skill_index
 from .user import User, UserProfile, UserEducation, UserExperience
 from .job import Job, Application, Company
 from .career import Career, CareerSkill
-from .system import Notification, SavedSearch
+from .system import Notification, SavedSearch, VectorSpec
 
 __all__ = [
-    "Base", "get_db", "create_tables",
+    "Base", "get_db", "create_tables", "create_fulltext_indexes", "create_skill_index",
     "User", "UserProfile", "UserEducation", "UserExperience",
     "Job", "Application", "Company",
     "Career", "CareerSkill",
-    "Notification", "SavedSearch"
+    "Notification", "SavedSearch", "VectorSpec"
 ]
\ No newline at end of file
@@ -4,7 +4,6 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from typing import Generator
 from ..config import settings
-import mariadb
 
 # SQLAlchemy setup - Use SQLite for development
 DATABASE_URL = "sqlite:///./green_jobs.db"
@@ -31,18 +30,40 @@ def create_tables():
     """Create all tables"""
     Base.metadata.create_all(bind=engine)
 
+def create_fulltext_indexes():
+    """FTS5 tables (SQLite) or FULLTEXT indexes (MariaDB) for keyword search"""
+    from ..services.fulltext import ensure_fulltext_indexes
+    conn = engine.raw_connection()
+    try:
+        return ensure_fulltext_indexes(conn, engine.dialect.name == "sqlite")
+    finally:
+        conn.close()
+
+def create_skill_index():
+    """Canonical skill table + career<->skill map for career matching"""
+    from ..services.skill_index import ensure_skill_index
+    conn = engine.raw_connection()
+    try:
+        return ensure_skill_index(conn, engine.dialect.name == "sqlite")
+    finally:
+        conn.close()
+
 # Raw MariaDB connection for vector operations
 def get_mariadb_connection():
-    """Get raw MariaDB connection for vector operations"""
+    """Get a pooled raw MariaDB connection for vector operations (close() returns it to the pool)"""
+    # Imported here: services/__init__ pulls in the models package
+    from ..services.db_pool import get_pool
+    pool = get_pool('mariadb', mariadb_config={
+        'user': settings.db_user,
+        'password': settings.db_password,
+        'host': settings.db_host,
+        'port': settings.db_port,
+        'database': settings.db_name
+    })
+    if pool is None:
+        return None
     try:
-        conn = mariadb.connect(
-            user=settings.db_user,
-            password=settings.db_password,
-            host=settings.db_host,
-            port=settings.db_port,
-            database=settings.db_name
-        )
-        return conn
-    except mariadb.Error as e:
+        return pool.acquire()
+    except Exception as e:
         print(f"MariaDB connection error: {e}")
-        return None
\ No newline at end of file
+        return None
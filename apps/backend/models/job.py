@@ -1,5 +1,5 @@
 # models/job.py
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Numeric, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, LargeBinary, Boolean, Numeric, Enum, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .database import Base
@@ -47,8 +47,12 @@ class Job(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Vector search fields (for MariaDB vector extension)
-    desc_vector_json = Column(Text)  # JSON string of description vector
-    skills_vector_json = Column(Text)  # JSON string of skills vector
+    desc_vector_json = Column(Text)  # JSON string of description vector (legacy)
+    skills_vector_json = Column(Text)  # JSON string of skills vector (legacy)
+    desc_vector_blob = Column(LargeBinary)  # Little-endian float32 / int8 description vector
+    skills_vector_blob = Column(LargeBinary)  # Little-endian float32 / int8 skills vector
+    embedding_source_hash = Column(String(64))  # sha256 of model + source text, used to skip re-embedding
+    vector_registry_id = Column(Integer, ForeignKey("vector_registry.registry_id"))  # Spec that produced the vectors
 
     # BART compression fields
     job_summary = Column(Text)  # Compressed job description (3-5 bullet points)
@@ -1,5 +1,5 @@
 # models/system.py
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, JSON, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .database import Base
@@ -31,6 +31,17 @@ class SavedSearch(Base):
     # Relationships
     user = relationship("User", back_populates="saved_searches")
 
+class VectorSpec(Base):
+    __tablename__ = "vector_registry"
+    __table_args__ = (UniqueConstraint("model_name", "dimension", "normalization", "version", name="uq_vector_spec"),)
+
+    registry_id = Column(Integer, primary_key=True, index=True)
+    model_name = Column(String(200), nullable=False)
+    dimension = Column(Integer, nullable=False)
+    normalization = Column(String(20), nullable=False)  # l2, none
+    version = Column(String(50), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
 class JobDemand(Base):
     __tablename__ = "job_demand"
 
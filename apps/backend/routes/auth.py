@@ -8,6 +8,7 @@ from typing import Optional
 from ..models.database import get_db
 from ..models.user import User
 from ..services.auth import AuthService
+from ..services.stats_counters import stats_counters
 
 router = APIRouter()
 
@@ -75,6 +76,7 @@ async def register_user(
     db.add(new_user)
     db.commit()
     db.refresh(new_user)
+    stats_counters.incr("users")
 
     # Create access token
     access_token = AuthService.create_access_token(data={"sub": new_user.username})
@@ -10,6 +10,7 @@ from ..models.career import Career, CareerSkill
 from ..services.auth import AuthService
 from ..services.translation import TranslationService
 from ..services.vector import VectorService
+from ..services.fulltext import fulltext_clause
 
 router = APIRouter()
 
@@ -45,14 +46,18 @@ async def enhanced_career_recommendations(
         if skills:
             # Find careers with matching skills
             careers_query = db.query(Career)
-            skill_conditions = []
-            for skill in skills:
-                skill_conditions.extend([
-                    Career.title.ilike(f"%{skill}%"),
-                    Career.description.ilike(f"%{skill}%"),
-                    Career.required_skills.ilike(f"%{skill}%")
-                ])
-            careers_query = careers_query.filter(db.or_(*skill_conditions))
+            fulltext = fulltext_clause(db, "careers", skills)
+            if fulltext is not None:
+                careers_query = careers_query.filter(fulltext)
+            else:
+                skill_conditions = []
+                for skill in skills:
+                    skill_conditions.extend([
+                        Career.title.ilike(f"%{skill}%"),
+                        Career.description.ilike(f"%{skill}%"),
+                        Career.required_skills.ilike(f"%{skill}%")
+                    ])
+                careers_query = careers_query.filter(db.or_(*skill_conditions))
         else:
             # Get top careers by demand
             careers_query = db.query(Career).order_by(Career.demand.desc())
@@ -4,18 +4,35 @@ from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
 from pydantic import BaseModel
 from typing import List, Optional
+import asyncio
 import json
 
-from ..models.database import get_db
+from ..models.database import get_db, engine
 from ..models.user import User
 from ..models.job import Job, Application, Company, EmployerProfile
 from ..services.auth import AuthService
 from ..services.translation import TranslationService
 from ..services.bart_compression import BARTCompressionEngine
+from ..services.vector import VectorService
+from ..services.db_executor import db_executor, DatabaseTimeoutError
+from ..services.fulltext import fulltext_clause
+from ..services.job_snapshot import job_snapshot
+from ..services.stats_counters import stats_counters
+from ..services.job_translations import JobPretranslator
 from datetime import datetime
 
 router = APIRouter()
 
+# Postings are translated into every language when created; search reads job_translations
+job_pretranslator = JobPretranslator(TranslationService.translate_batch, engine.raw_connection,
+                                     use_sqlite=engine.dialect.name == "sqlite",
+                                     languages=list(TranslationService.SUPPORTED_LANGUAGES),
+                                     executor=db_executor, name="orm-jobs")
+SEARCH_JOB_FIELDS = {"job_title": "title", "description": "description", "company": "company"}
+
+def _excerpt(text: str, limit: int = 200) -> str:
+    return text[:limit] + "..." if len(text) > limit else text
+
 class QueryInput(BaseModel):
     skill_text: List[str]
     lang: str = "en"
@@ -41,6 +58,37 @@ class JobApplicationCreate(BaseModel):
     job_id: int
     cover_letter: Optional[str] = None
 
+async def _hybrid_job_ids(query: QueryInput, limit: int = 50) -> Optional[List[int]]:
+    """Job ids ranked by hybrid keyword + semantic search; None if the index is unavailable"""
+    location = query.location if query.location and query.location.lower() != "string" else None
+    try:
+        hits = await VectorService.hybrid_search_jobs_async(" ".join(query.skill_text), top_k=limit,
+                                                            filters={"location": location})
+        return [hit["id"] for hit in hits]
+    except Exception as e:
+        print(f"⚠️ Hybrid search unavailable, falling back to LIKE: {e}")
+        return None
+
+def _in_rank_order(rows, ranked_ids: Optional[List[int]], job_id_of):
+    if not ranked_ids:
+        return rows
+    rank = {job_id: position for position, job_id in enumerate(ranked_ids)}
+    return sorted(rows, key=lambda row: rank.get(job_id_of(row), len(rank)))
+
+def _skill_filter(db: Session, skills: List[str]):
+    """Full-text MATCH when the index is migrated, otherwise the ilike chain"""
+    fulltext = fulltext_clause(db, "jobs", skills)
+    if fulltext is not None:
+        return fulltext
+    skill_conditions = []
+    for skill in skills:
+        skill_conditions.extend([
+            Job.title.ilike(f"%{skill}%"),
+            Job.description.ilike(f"%{skill}%"),
+            Job.skills.ilike(f"%{skill}%")
+        ])
+    return or_(*skill_conditions)
+
 @router.post("/search")
 async def enhanced_job_search(
     request: Request,
@@ -58,25 +106,22 @@ async def enhanced_job_search(
         # Get base jobs from database with skill matching
         base_query = db.query(Job).filter(Job.status == "active")
 
-        # Add skill filters
-        if query.skill_text:
-            skill_conditions = []
-            for skill in query.skill_text:
-                skill_conditions.extend([
-                    Job.title.ilike(f"%{skill}%"),
-                    Job.description.ilike(f"%{skill}%"),
-                    Job.skills.ilike(f"%{skill}%")
-                ])
-            base_query = base_query.filter(or_(*skill_conditions))
+        # Add skill filters - ranked ids from the BM25 + vector index, LIKE scan only as a fallback
+        ranked_ids = await _hybrid_job_ids(query) if query.skill_text else None
+        if ranked_ids is not None:
+            base_query = base_query.filter(Job.job_id.in_(ranked_ids))
+        elif query.skill_text:
+            base_query = base_query.filter(_skill_filter(db, query.skill_text))
 
         # Add location filter
         if query.location and query.location.lower() != "string":
             base_query = base_query.filter(Job.location.ilike(f"%{query.location}%"))
 
-        base_jobs = base_query.limit(50).all()
+        base_jobs = _in_rank_order(base_query.limit(50).all(), ranked_ids, lambda job: job.job_id)
 
         # Process jobs with translation and AI matching
         matches = []
+        sources = {}
         skill_text = " ".join(query.skill_text).lower()
 
         for job in base_jobs:
@@ -86,15 +131,11 @@ async def enhanced_job_search(
             # Calculate distance (simplified)
             distance = 10 if query.location and query.location.lower() not in job.location.lower() else 5
 
-            # Translate if needed
+            # Translated in one batch below
             job_title = job.title
-            job_description = job.description[:200] + "..." if len(job.description) > 200 else job.description
+            job_description = _excerpt(job.description)
             company_name = job.company
-
-            if query.lang != "en" and query.lang in TranslationService.SUPPORTED_LANGUAGES:
-                job_title = await TranslationService.translate_text(job.title, query.lang)
-                job_description = await TranslationService.translate_text(job.description[:200], query.lang)
-                company_name = await TranslationService.translate_text(job.company, query.lang)
+            sources[job.job_id] = {"title": job.title, "description": job.description, "company": job.company}
 
             matches.append({
                 "id": job.job_id,
@@ -114,6 +155,22 @@ async def enhanced_job_search(
         # Sort by similarity
         matches = sorted(matches, key=lambda x: x["similarity"], reverse=True)
 
+        # Pre-translated text from job_translations; only postings not translated yet go to the translator
+        if query.lang != "en" and query.lang in TranslationService.SUPPORTED_LANGUAGES:
+            stored = await job_pretranslator.lookup({match["id"]: sources[match["id"]] for match in matches[:10]},
+                                                    query.lang)
+            pending = []
+            for match in matches[:10]:
+                pretranslated = stored.get(match["id"], {})
+                for key, field in SEARCH_JOB_FIELDS.items():
+                    if field in pretranslated:
+                        match[key] = _excerpt(pretranslated[field]) if field == "description" else pretranslated[field]
+                    else:
+                        pending.append((match, key))
+            translated = iter(await TranslationService.translate_batch([match[key] for match, key in pending], query.lang))
+            for match, key in pending:
+                match[key] = next(translated)
+
         return {
             "matches": matches[:10],
             "user_location": query.location,
@@ -135,6 +192,12 @@ async def apply_for_job(
     db: Session = Depends(get_db)
 ):
     """Apply for a job"""
+    try:
+        return await db_executor.run_sync(_create_application, db, application_data, current_user)
+    except DatabaseTimeoutError:
+        raise HTTPException(status_code=504, detail="Database query timed out")
+
+def _create_application(db: Session, application_data: JobApplicationCreate, current_user: User):
     # Check if job exists
     job = db.query(Job).filter(Job.job_id == application_data.job_id).first()
     if not job:
@@ -161,6 +224,7 @@ async def apply_for_job(
     db.add(new_application)
     db.commit()
     db.refresh(new_application)
+    stats_counters.incr("applications")
 
     # Update job application count
     job.applications_count += 1
@@ -235,6 +299,21 @@ async def create_job(
     db.add(new_job)
     db.commit()
     db.refresh(new_job)
+    stats_counters.incr("jobs")
+
+    # Make the new posting searchable without waiting for an index reload
+    # (embedding + index upserts run on a worker thread, not the event loop)
+    try:
+        await asyncio.to_thread(VectorService.index_job, new_job.job_id)
+    except Exception as e:
+        print(f"⚠️ Failed to index job {new_job.job_id}: {e}")
+    try:
+        job_snapshot.refresh([new_job.job_id])
+    except Exception as e:
+        print(f"⚠️ Failed to refresh job snapshot for {new_job.job_id}: {e}")
+        job_snapshot.invalidate()
+    job_pretranslator.schedule(new_job.job_id, {"title": new_job.title, "description": new_job.description,
+                                                "company": new_job.company})
 
     # Generate BART job summary asynchronously (don't block job creation)
     try:
@@ -308,22 +387,18 @@ async def enhanced_job_search_v2(
             .join(Company, Job.company == Company.name)\
             .filter(Job.status == "active")
 
-        # Add skill filters
-        if query.skill_text:
-            skill_conditions = []
-            for skill in query.skill_text:
-                skill_conditions.extend([
-                    Job.title.ilike(f"%{skill}%"),
-                    Job.description.ilike(f"%{skill}%"),
-                    Job.skills.ilike(f"%{skill}%")
-                ])
-            base_query = base_query.filter(or_(*skill_conditions))
+        # Add skill filters - ranked ids from the BM25 + vector index, LIKE scan only as a fallback
+        ranked_ids = await _hybrid_job_ids(query) if query.skill_text else None
+        if ranked_ids is not None:
+            base_query = base_query.filter(Job.job_id.in_(ranked_ids))
+        elif query.skill_text:
+            base_query = base_query.filter(_skill_filter(db, query.skill_text))
 
         # Add location filter
         if query.location and query.location.lower() != "string":
             base_query = base_query.filter(Job.location.ilike(f"%{query.location}%"))
 
-        results = base_query.limit(50).all()
+        results = _in_rank_order(base_query.limit(50).all(), ranked_ids, lambda row: row[0].job_id)
 
         # Format results
         formatted_jobs = []
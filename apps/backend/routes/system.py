@@ -2,9 +2,8 @@
 from fastapi import APIRouter, Request, Depends
 from sqlalchemy.orm import Session
 from ..models.database import get_db, get_mariadb_connection
-from ..models.user import User
-from ..models.job import Job, Application
 from ..models.system import JobDemand
+from ..services.stats_counters import stats_counters
 
 router = APIRouter()
 
@@ -18,22 +17,21 @@ async def health_check():
     }
 
 @router.get("/stats")
-async def get_stats(db: Session = Depends(get_db)):
+async def get_stats():
     """Get system statistics"""
     try:
-        # Get real counts from database
-        users_count = db.query(User).count()
-        jobs_count = db.query(Job).filter(Job.status == "active").count()
-        applications_count = db.query(Application).count()
-        companies_count = db.query(Job.company).distinct().count()
+        # Shared counters, reconciled in the background - no COUNT(*) per request
+        counts = await stats_counters.aget()
+        if counts is None:
+            raise RuntimeError("stats counters unavailable")
 
         return {
-            "total_jobs": jobs_count,
-            "companies": companies_count,
+            "total_jobs": counts["jobs"],
+            "companies": counts["companies"],
             "sdg_goals": 15,
             "favorites": 0,  # TODO: Implement favorites
-            "applications": applications_count,
-            "users": users_count,
+            "applications": counts["applications"],
+            "users": counts["users"],
             "profile_views": 143
         }
     except Exception as e:
@@ -44,7 +42,7 @@ async def get_stats(db: Session = Depends(get_db)):
             "sdg_goals": 15,
             "favorites": 0,
             "applications": 8,
-            "users": users_count if 'users_count' in locals() else 0,
+            "users": 0,
             "profile_views": 143,
             "error": str(e)
         }
@@ -10,6 +10,7 @@ from ..models.database import get_db
 from ..models.user import User, UserProfile, UserEducation, UserExperience
 from ..models.job import Application
 from ..services.auth import AuthService
+from ..services.db_executor import db_executor, DatabaseTimeoutError
 
 router = APIRouter()
 
@@ -201,8 +202,13 @@ async def get_user_applications(
     db: Session = Depends(get_db)
 ):
     """Get user's job applications"""
-    applications = db.query(Application)\
-        .filter(Application.user_id == current_user.user_id)\
-        .order_by(Application.applied_at.desc()).all()
+    try:
+        applications = await db_executor.run_sync(
+            lambda: db.query(Application)
+            .filter(Application.user_id == current_user.user_id)
+            .order_by(Application.applied_at.desc()).all()
+        )
+    except DatabaseTimeoutError:
+        raise HTTPException(status_code=504, detail="Database query timed out")
 
     return {"applications": applications}
\ No newline at end of file
@@ -13,6 +13,8 @@ class QueryInput(BaseModel):
     skill_text: List[str]
     lang: str = "en"
     location: Optional[str] = None
+    experience_level: Optional[str] = None
+    job_type: Optional[str] = None
 
 class CareerRecommendationsInput(BaseModel):
     skills: List[str]
@@ -29,11 +31,11 @@ async def mariadb_vector_job_search(
     try:
         # Generate query vector
         query_text = " ".join(query.skill_text)
-        query_vector = VectorService.generate_embedding(query_text)
+        query_vector = await VectorService.generate_embedding_async(query_text)
         vector_str = VectorService.vector_to_mariadb_format(query_vector)
 
         # Get matches using vector search
-        matches = VectorService.semantic_search_jobs(query_text, top_k=10, filters={"location": query.location} if query.location else None)
+        matches = await VectorService.semantic_search_jobs_async(query_text, top_k=10, filters={"location": query.location, "experience_level": query.experience_level, "job_type": query.job_type})
 
         return {
             "matches": matches,
@@ -58,11 +60,11 @@ async def mariadb_vector_career_recommendations(
     try:
         # Generate query vector from user skills
         query_text = " ".join(career_data.skills) if career_data.skills else career_data.experience
-        query_vector = VectorService.generate_embedding(query_text)
+        query_vector = await VectorService.generate_embedding_async(query_text)
         vector_str = VectorService.vector_to_mariadb_format(query_vector)
 
         # Get recommendations using vector search
-        recommendations = VectorService.semantic_career_recommendations(query_text, top_k=15)
+        recommendations = await VectorService.semantic_career_recommendations_async(query_text, top_k=15)
 
         return {
             "recommendations": recommendations,
@@ -89,16 +91,24 @@ async def vector_status():
     except Exception as e:
         return {"vector_implementation": "Error", "message": str(e)}
 
+@router.get("/index/report")
+async def vector_index_report(sample_size: int = 200, top_k: int = 10):
+    """Recall and latency of the ANN index measured against exact search"""
+    try:
+        return VectorService.get_index_report(sample_size=sample_size, top_k=top_k)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Index report failed: {str(e)}")
+
 @router.get("/demo")
 async def hackathon_vector_demo():
     """Hackathon demo showcasing MariaDB Vector Capabilities"""
     return {
         "maria_db_vector": {
             "schema_implemented": True,
-            "vector_columns": ["desc_vector_json", "skills_vector_json"],
-            "dimensions": 384,
+            "vector_columns": ["desc_vector_blob", "skills_vector_blob"],
+            "dimensions": 768,
             "tables": ["careers", "jobs"],
-            "approach": "Hybrid - MariaDB JSON + Python AI"
+            "approach": "Hybrid - MariaDB float32 BLOBs + Python AI"
         },
         "ai_capabilities": {
             "embedding_model": "all-mpnet-base-v2",
@@ -131,8 +141,8 @@ async def semantic_job_search(
     """AI-powered semantic job search"""
     try:
         query_text = " ".join(query.skill_text)
-        filters = {"location": query.location} if query.location else None
-        matches = VectorService.semantic_search_jobs(query_text, top_k=10, filters=filters)
+        filters = {"location": query.location, "experience_level": query.experience_level, "job_type": query.job_type}
+        matches = await VectorService.semantic_search_jobs_async(query_text, top_k=10, filters=filters)
 
         return {
             "feature": "MariaDB AI-Powered Semantic Search",
@@ -149,6 +159,29 @@ async def semantic_job_search(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Semantic search error: {str(e)}")
 
+@router.post("/jobs/hybrid")
+async def hybrid_job_search(
+    request: Request,
+    query: QueryInput,
+    current_user: User = Depends(AuthService.get_current_user)
+):
+    """Keyword (BM25) + semantic job search fused with reciprocal rank fusion"""
+    try:
+        query_text = " ".join(query.skill_text)
+        filters = {"location": query.location, "experience_level": query.experience_level, "job_type": query.job_type}
+        matches = await VectorService.hybrid_search_jobs_async(query_text, top_k=10, filters=filters)
+
+        return {
+            "query": query_text,
+            "matches": matches,
+            "total_matches": len(matches),
+            "search_method": "BM25 inverted index + vector cosine, reciprocal rank fusion",
+            "user": current_user.username
+        }
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Hybrid search error: {str(e)}")
+
 @router.post("/careers/semantic")
 async def semantic_career_recommendations(
     request: Request,
@@ -158,7 +191,7 @@ async def semantic_career_recommendations(
     """AI-powered career recommendations using vector similarity"""
     try:
         query_text = " ".join(career_data.skills) if career_data.skills else career_data.experience
-        recommendations = VectorService.semantic_career_recommendations(query_text, top_k=10)
+        recommendations = await VectorService.semantic_career_recommendations_async(query_text, top_k=10)
 
         return {
             "feature": "AI Career Recommendations",
@@ -182,8 +215,8 @@ async def hackathon_vector_test(test_data: dict):
         query = test_data.get("query", "renewable energy")
 
         # Test both endpoints
-        jobs = VectorService.semantic_search_jobs(query, top_k=3)
-        careers = VectorService.semantic_career_recommendations(query, top_k=3)
+        jobs = await VectorService.semantic_search_jobs_async(query, top_k=3)
+        careers = await VectorService.semantic_career_recommendations_async(query, top_k=3)
 
         return {
             "test_query": query,
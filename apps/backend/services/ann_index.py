@@ -0,0 +1,314 @@
+# services/ann_index.py - Approximate nearest-neighbour (IVF-flat) vector index
+import time
+import numpy as np
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+
+from .vector_index import VectorMatrixIndex
+
+
+class IVFFlatIndex(VectorMatrixIndex):
+    """
+    Inverted-file index on top of VectorMatrixIndex.
+
+    Rows are clustered with spherical k-means into nlist cells; a query only
+    scores the rows in its nprobe closest cells. Vectors stay in the parent's
+    contiguous matrix, so exact search (super().search) remains available for
+    recall measurement and for indexes too small to be worth clustering.
+    """
+
+    def __init__(self, dimension: int = 768, nlist: int = 0, nprobe: int = 8,
+                 min_train_size: int = 1000, kmeans_iterations: int = 10,
+                 initial_capacity: int = 1024, attributes: Iterable[str] = ()):
+        super().__init__(dimension=dimension, initial_capacity=initial_capacity, attributes=attributes)
+        self.nlist = nlist  # 0 = pick sqrt(n) at train time
+        self.nprobe = nprobe
+        self.min_train_size = min_train_size
+        self.kmeans_iterations = kmeans_iterations
+        self.centroids: Optional[np.ndarray] = None
+        self.trained_size = 0
+        self._assign = np.zeros(initial_capacity, dtype=np.int32)
+        self._pos = np.zeros(initial_capacity, dtype=np.int64)
+        self._lists: List[np.ndarray] = []
+        self._list_sizes = np.zeros(0, dtype=np.int64)
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    # ---- training -------------------------------------------------------
+
+    def _target_nlist(self, count: int) -> int:
+        if self.nlist:
+            return max(1, min(self.nlist, count))
+        return int(np.clip(np.sqrt(count), 1, 4096))
+
+    def train(self, seed: int = 42):
+        """Run spherical k-means over (a sample of) the stored rows"""
+        with self._lock:
+            count = self._size
+            if count < self.min_train_size:
+                self.centroids = None
+                self._lists = []
+                self._list_sizes = np.zeros(0, dtype=np.int64)
+                return
+            nlist = self._target_nlist(count)
+            rng = np.random.default_rng(seed)
+            sample_size = min(count, nlist * 64)
+            sample = self.matrix[rng.choice(count, sample_size, replace=False)]
+
+            centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+            for _ in range(self.kmeans_iterations):
+                labels = np.argmax(sample @ centroids.T, axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, labels, sample)
+                norms = np.linalg.norm(sums, axis=1, keepdims=True)
+                empty = norms[:, 0] == 0
+                # Re-seed empty cells from random sample points
+                if empty.any():
+                    sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+                    norms[empty] = 1.0
+                centroids = (sums / norms).astype(np.float32)
+
+            self.centroids = centroids
+            self.trained_size = count
+            self._assign_all()
+
+    def _assign_all(self):
+        """Rebuild every inverted list from the current centroids"""
+        count = self._size
+        nlist = self.centroids.shape[0]
+        self._grow_assignments(max(count, 1))
+        labels = np.empty(count, dtype=np.int32)
+        # Chunk to bound the (rows x nlist) score matrix
+        for start in range(0, count, 65536):
+            block = self.matrix[start:start + 65536]
+            labels[start:start + len(block)] = np.argmax(block @ self.centroids.T, axis=1)
+
+        order = np.argsort(labels, kind="stable")
+        bounds = np.searchsorted(labels[order], np.arange(nlist + 1))
+        self._lists = []
+        self._list_sizes = np.zeros(nlist, dtype=np.int64)
+        for cell in range(nlist):
+            members = order[bounds[cell]:bounds[cell + 1]].astype(np.int64)
+            size = len(members)
+            buffer = np.zeros(max(size * 2, 16), dtype=np.int64)
+            buffer[:size] = members
+            self._lists.append(buffer)
+            self._list_sizes[cell] = size
+            self._pos[members] = np.arange(size)
+        self._assign[:count] = labels
+
+    def _grow_assignments(self, capacity: int):
+        if capacity <= len(self._assign):
+            return
+        new_capacity = max(capacity, len(self._assign) * 2)
+        assign = np.zeros(new_capacity, dtype=np.int32)
+        assign[:len(self._assign)] = self._assign
+        pos = np.zeros(new_capacity, dtype=np.int64)
+        pos[:len(self._pos)] = self._pos
+        self._assign, self._pos = assign, pos
+
+    # ---- inverted list maintenance --------------------------------------
+
+    def _list_add(self, offset: int, cell: int):
+        size = self._list_sizes[cell]
+        members = self._lists[cell]
+        if size >= len(members):
+            grown = np.zeros(len(members) * 2, dtype=np.int64)
+            grown[:size] = members[:size]
+            self._lists[cell] = members = grown
+        members[size] = offset
+        self._assign[offset] = cell
+        self._pos[offset] = size
+        self._list_sizes[cell] = size + 1
+
+    def _list_remove(self, offset: int):
+        cell = self._assign[offset]
+        members = self._lists[cell]
+        last = self._list_sizes[cell] - 1
+        position = self._pos[offset]
+        moved = members[last]
+        members[position] = moved
+        self._pos[moved] = position
+        self._list_sizes[cell] = last
+
+    def _nearest_cell(self, normalized: np.ndarray) -> int:
+        return int(np.argmax(self.centroids @ normalized))
+
+    # ---- VectorMatrixIndex overrides -------------------------------------
+
+    def build(self, rows: Iterable[Tuple[int, Any, Dict[str, Any]]], retrain: bool = False):
+        """Replace contents; keeps existing centroids unless the catalog has doubled"""
+        super().build(rows)
+        with self._lock:
+            if (retrain or not self.is_trained
+                    or self._size > 2 * self.trained_size
+                    or self._size < self.min_train_size):
+                self.train()
+            else:
+                self._assign_all()
+
+    def upsert(self, item_id: int, vector, payload: Optional[Dict[str, Any]] = None):
+        """Insert or update a row and file it under its nearest cell"""
+        with self._lock:
+            existing = self.id_to_offset.get(int(item_id))
+            if existing is not None and self.is_trained:
+                self._list_remove(existing)
+            super().upsert(item_id, vector, payload)
+            if self.is_trained:
+                offset = self.id_to_offset[int(item_id)]
+                self._grow_assignments(offset + 1)
+                self._list_add(offset, self._nearest_cell(self._buffer[offset]))
+            elif self._size >= self.min_train_size:
+                self.train()
+
+    def remove(self, item_id: int) -> bool:
+        with self._lock:
+            offset = self.id_to_offset.get(int(item_id))
+            if offset is None:
+                return False
+            if self.is_trained:
+                self._list_remove(offset)
+                last = self._size - 1
+                if offset != last:
+                    # The parent moves the last row into this slot; follow it
+                    cell = self._assign[last]
+                    position = self._pos[last]
+                    self._lists[cell][position] = offset
+                    self._assign[offset] = cell
+                    self._pos[offset] = position
+            return super().remove(item_id)
+
+    def search(self, query_vector, top_k: int = 10, min_score: Optional[float] = None,
+               mask: Optional[np.ndarray] = None, nprobe: Optional[int] = None,
+               filters: Optional[Dict[str, Any]] = None) -> List[Tuple[int, float, Dict[str, Any]]]:
+        """Approximate top_k search over the nprobe nearest cells"""
+        if not self.is_trained:
+            return super().search(query_vector, top_k=top_k, min_score=min_score, mask=mask, filters=filters)
+
+        query = self._normalize(query_vector)
+        with self._lock:
+            if self._size == 0 or top_k <= 0:
+                return []
+            nlist = self.centroids.shape[0]
+            probes = min(nprobe or self.nprobe, nlist)
+            mask = self._combined_mask(mask, filters)
+            if mask is not None:
+                selected = np.flatnonzero(mask)
+                # Fewer rows pass the filter than the probed cells would hold: score them all exactly
+                if len(selected) <= self._size * probes / nlist:
+                    if len(selected) == 0:
+                        return []
+                    return self._rank(selected, self._buffer[selected] @ query, top_k, min_score)
+
+            cell_scores = self.centroids @ query
+            if probes < nlist:
+                cells = np.argpartition(-cell_scores, probes - 1)[:probes]
+            else:
+                cells = np.arange(nlist)
+
+            offsets = np.concatenate([self._lists[c][:self._list_sizes[c]] for c in cells])
+            if mask is not None:
+                offsets = offsets[mask[offsets]]
+            if len(offsets) == 0:
+                return []
+            scores = self._buffer[offsets] @ query
+            return self._rank(offsets, scores, top_k, min_score)
+
+    def exact_search(self, query_vector, top_k: int = 10, min_score: Optional[float] = None,
+                     mask: Optional[np.ndarray] = None, filters: Optional[Dict[str, Any]] = None
+                     ) -> List[Tuple[int, float, Dict[str, Any]]]:
+        """Brute-force search over every row (ground truth for recall)"""
+        return super().search(query_vector, top_k=top_k, min_score=min_score, mask=mask, filters=filters)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats.update({
+            "backend": "ivf",
+            "trained": self.is_trained,
+            "nlist": int(self.centroids.shape[0]) if self.is_trained else 0,
+            "nprobe": self.nprobe,
+        })
+        return stats
+
+    def memory_usage(self) -> Dict[str, Any]:
+        usage = super().memory_usage()
+        with self._lock:
+            ivf_bytes = int(self._assign.nbytes + self._pos.nbytes
+                            + sum(members.nbytes for members in self._lists))
+            if self.is_trained:
+                ivf_bytes += int(self.centroids.nbytes)
+        usage["ivf_bytes"] = ivf_bytes
+        usage["total_mb"] = round(usage["total_mb"] + ivf_bytes / (1024 * 1024), 2)
+        return usage
+
+    def _arrays_to_save(self) -> Dict[str, np.ndarray]:
+        arrays = super()._arrays_to_save()
+        if self.is_trained:
+            arrays["centroids"] = self.centroids
+            arrays["trained_size"] = np.array([self.trained_size])
+        return arrays
+
+    def _restore_arrays(self, arrays, payloads: List[Dict[str, Any]]):
+        super()._restore_arrays(arrays, payloads)
+        if "centroids" in arrays.files:
+            self.centroids = arrays["centroids"].astype(np.float32, copy=False)
+            self.trained_size = int(arrays["trained_size"][0])
+            self._assign_all()
+        else:
+            self.centroids = None
+
+
+def create_vector_index(backend: str = "exact", dimension: int = 768, attributes: Iterable[str] = (),
+                        **options) -> VectorMatrixIndex:
+    """Factory for the configured index backend ("exact" or "ivf")"""
+    if backend == "ivf":
+        return IVFFlatIndex(dimension=dimension, attributes=attributes, **options)
+    if backend != "exact":
+        print(f"⚠️ Unknown vector index backend '{backend}', using exact search")
+    return VectorMatrixIndex(dimension=dimension, attributes=attributes)
+
+
+def recall_report(index: IVFFlatIndex, queries: np.ndarray, top_k: int = 10,
+                  nprobe_values: Tuple[int, ...] = (1, 2, 4, 8, 16, 32)) -> Dict[str, Any]:
+    """Measure recall@k and latency of the ANN path against exact search"""
+
+    def percentile_ms(samples: List[float], q: float) -> float:
+        return round(float(np.percentile(samples, q)) * 1000, 3) if samples else 0.0
+
+    exact_results, exact_latency = [], []
+    for query in queries:
+        start = time.perf_counter()
+        hits = index.exact_search(query, top_k=top_k)
+        exact_latency.append(time.perf_counter() - start)
+        exact_results.append({item_id for item_id, _, _ in hits})
+
+    report = {
+        "rows": len(index),
+        "queries": len(queries),
+        "top_k": top_k,
+        "exact": {
+            "p50_ms": percentile_ms(exact_latency, 50),
+            "p99_ms": percentile_ms(exact_latency, 99),
+        },
+        "ann": [],
+    }
+    if not index.is_trained:
+        report["note"] = f"Index has fewer than {index.min_train_size} rows; ANN path falls back to exact search"
+        return report
+
+    for nprobe in nprobe_values:
+        recalls, latency = [], []
+        for query, truth in zip(queries, exact_results):
+            start = time.perf_counter()
+            hits = index.search(query, top_k=top_k, nprobe=nprobe)
+            latency.append(time.perf_counter() - start)
+            if truth:
+                recalls.append(len(truth & {item_id for item_id, _, _ in hits}) / len(truth))
+        report["ann"].append({
+            "nprobe": nprobe,
+            "recall_at_k": round(float(np.mean(recalls)), 4) if recalls else None,
+            "p50_ms": percentile_ms(latency, 50),
+            "p99_ms": percentile_ms(latency, 99),
+        })
+    return report
@@ -0,0 +1,185 @@
+# services/db_executor.py - Bounded thread-pool executor for blocking DB calls from async handlers
+import asyncio
+import functools
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class DatabaseTimeoutError(Exception):
+    """A query did not finish within its timeout"""
+
+
+class DatabaseUnavailableError(Exception):
+    """No database connection could be obtained"""
+
+
+# MariaDB ER_STATEMENT_TIMEOUT ("Query execution was interrupted (max_statement_time exceeded)")
+MARIADB_STATEMENT_TIMEOUT = 1969
+
+
+def _is_statement_timeout(error: Exception) -> bool:
+    """True for the error a database raises when it aborts a statement at its deadline"""
+    if isinstance(error, sqlite3.OperationalError):
+        return "interrupted" in str(error)
+    return getattr(error, "errno", None) == MARIADB_STATEMENT_TIMEOUT or "max_statement_time" in str(error)
+
+
+class DatabaseExecutor:
+    """
+    Runs blocking mariadb / sqlite3 / SQLAlchemy work on a dedicated, bounded
+    thread pool so a slow query never blocks the event loop.
+
+    run() checks a connection out (via `connect`, e.g. the pooled
+    get_db_connection), sets a statement timeout on it and calls fn(conn, ...).
+    The timeout is enforced twice: the awaiting handler stops waiting after
+    `timeout` seconds, and the database aborts the statement at the same
+    deadline (MariaDB max_statement_time, SQLite progress handler), so the
+    worker thread and its connection are freed rather than left running.
+    Whichever side fires first, the caller sees DatabaseTimeoutError.
+    Size the pool to the connection pool so workers never wait on each other.
+    """
+
+    def __init__(self, connect: Optional[Callable[[], Any]] = None, max_workers: Optional[int] = None,
+                 default_timeout: Optional[float] = None, name: str = "db"):
+        self.connect = connect
+        self.max_workers = max_workers or int(os.getenv('DB_EXECUTOR_WORKERS', os.getenv('DB_POOL_SIZE', 10)))
+        self.default_timeout = default_timeout or float(os.getenv('DB_QUERY_TIMEOUT_SECONDS', 10))
+        self.name = name
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._started = 0
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._timeouts = 0
+        self._total_seconds = 0.0
+        self._max_seconds = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                        thread_name_prefix=f"{self.name}-executor")
+        return self._executor
+
+    def _timed(self, fn: Callable, *args, **kwargs):
+        with self._lock:
+            self._started += 1
+            self._running += 1
+        started = time.perf_counter()
+        ok = False
+        try:
+            result = fn(*args, **kwargs)
+            ok = True
+            return result
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._running -= 1
+                self._total_seconds += elapsed
+                self._max_seconds = max(self._max_seconds, elapsed)
+                if ok:
+                    self._completed += 1
+                else:
+                    self._failed += 1
+
+    async def run_sync(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs):
+        """Run a blocking callable (e.g. a SQLAlchemy session block) on the DB threads"""
+        timeout = self.default_timeout if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._submitted += 1
+        future = loop.run_in_executor(self._get_executor(), functools.partial(self._timed, fn, *args, **kwargs))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._timeouts += 1
+            raise DatabaseTimeoutError(f"Database call {getattr(fn, '__name__', fn)} exceeded {timeout:.1f}s")
+        except DatabaseTimeoutError:
+            # The database aborted the statement before the await deadline fired
+            with self._lock:
+                self._timeouts += 1
+            raise
+
+    async def run(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs):
+        """fn(conn, *args, **kwargs) with a pooled connection and a statement timeout"""
+        timeout = self.default_timeout if timeout is None else timeout
+        return await self.run_sync(self._with_connection, fn, timeout, args, kwargs, timeout=timeout)
+
+    def _with_connection(self, fn: Callable, timeout: float, args, kwargs):
+        if self.connect is None:
+            raise DatabaseUnavailableError("DatabaseExecutor has no connection factory")
+        conn = self.connect()
+        if conn is None:
+            raise DatabaseUnavailableError("Database connection failed")
+        try:
+            reset = _apply_statement_timeout(conn, timeout)
+            try:
+                return fn(conn, *args, **kwargs)
+            except Exception as e:
+                if _is_statement_timeout(e):
+                    raise DatabaseTimeoutError(f"Database call {getattr(fn, '__name__', fn)} "
+                                               f"exceeded {timeout:.1f}s") from e
+                raise
+            finally:
+                reset()
+        finally:
+            conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            finished = self._completed + self._failed
+            return {
+                "workers": self.max_workers,
+                "running": self._running,
+                "queued": self._submitted - self._started,
+                "completed": self._completed,
+                "failed": self._failed,
+                "timeouts": self._timeouts,
+                "avg_ms": round(self._total_seconds / finished * 1000, 2) if finished else 0.0,
+                "max_ms": round(self._max_seconds * 1000, 2),
+                "default_timeout_seconds": self.default_timeout,
+            }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+def _apply_statement_timeout(conn, timeout: float) -> Callable[[], None]:
+    """Make the database abort statements that run past the deadline; returns the undo"""
+    raw = getattr(conn, "raw", conn)
+    if isinstance(raw, sqlite3.Connection):
+        deadline = time.monotonic() + timeout
+        # A non-zero return interrupts the running statement (sqlite3.OperationalError: interrupted)
+        raw.set_progress_handler(lambda: int(time.monotonic() > deadline), 10000)
+        return lambda: raw.set_progress_handler(None, 0)
+    if getattr(conn, "is_mariadb", False):
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"SET SESSION max_statement_time = {float(timeout)}")
+            cursor.close()
+        except Exception:
+            return lambda: None
+
+        def reset():
+            try:
+                cursor = conn.cursor()
+                cursor.execute("SET SESSION max_statement_time = 0")
+                cursor.close()
+            except Exception:
+                pass
+        return reset
+    return lambda: None
+
+
+# Global instance for SQLAlchemy session work in routes/*.py
+db_executor = DatabaseExecutor(name="orm")
@@ -0,0 +1,318 @@
+# services/db_pool.py - Bounded connection pool for the raw MariaDB / SQLite connections
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+
+class PoolTimeoutError(Exception):
+    """No connection became free within the acquire timeout"""
+
+
+def _pool_setting(name: str, default: float) -> float:
+    return float(os.getenv(name, default))
+
+
+class PooledConnection:
+    """
+    Proxy handed out by ConnectionPool. close() returns the underlying
+    connection to the pool instead of closing it, so existing
+    `conn = get_db_connection() ... conn.close()` call sites keep working.
+    cursor(dictionary=True) is accepted for SQLite too (rows are sqlite3.Row).
+    """
+
+    def __init__(self, pool: "ConnectionPool", entry: Dict[str, Any]):
+        self._pool = pool
+        self._entry = entry
+        self.is_mariadb = pool.backend == "mariadb"
+
+    @property
+    def raw(self):
+        if self._entry is None:
+            raise RuntimeError("Connection already returned to the pool")
+        return self._entry["conn"]
+
+    def cursor(self, *args, **kwargs):
+        if not self.is_mariadb:
+            kwargs.pop("dictionary", None)
+        return self.raw.cursor(*args, **kwargs)
+
+    def close(self):
+        entry, self._entry = self._entry, None
+        if entry is not None:
+            self._pool._release(entry)
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.raw, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def __del__(self):
+        # A handler that forgot close() must not drain the pool
+        if getattr(self, "_entry", None) is not None:
+            self._pool._leaked += 1
+            self.close()
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of at most max_size connections.
+
+    Idle connections are reused LIFO. A connection older than max_lifetime is
+    closed and replaced instead of reused, one that has been idle longer than
+    health_check_interval is pinged before being handed out, and acquire()
+    blocks up to acquire_timeout for a free slot before raising
+    PoolTimeoutError. Wait times and utilisation are tracked for stats().
+    """
+
+    def __init__(self, factory: Callable[[], Any], backend: str, name: str = "default",
+                 max_size: int = 10, max_lifetime: float = 1800.0,
+                 health_check_interval: float = 30.0, acquire_timeout: float = 10.0,
+                 health_check: Optional[Callable[[Any], None]] = None):
+        self.factory = factory
+        self.backend = backend
+        self.name = name
+        self.max_size = max(1, int(max_size))
+        self.max_lifetime = max_lifetime
+        self.health_check_interval = health_check_interval
+        self.acquire_timeout = acquire_timeout
+        self.health_check = health_check or _default_health_check
+        self._idle = deque()
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        # metrics
+        self._acquired = 0
+        self._created = 0
+        self._recycled = 0
+        self._health_failures = 0
+        self._timeouts = 0
+        self._leaked = 0
+        self._peak_in_use = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _discard(self, entry: Dict[str, Any]):
+        try:
+            entry["conn"].close()
+        except Exception:
+            pass
+
+    def _usable(self, entry: Dict[str, Any], now: float) -> bool:
+        if self.max_lifetime and now - entry["created_at"] > self.max_lifetime:
+            self._recycled += 1
+            return False
+        if now - entry["last_used"] > self.health_check_interval:
+            try:
+                self.health_check(entry["conn"])
+            except Exception:
+                self._health_failures += 1
+                return False
+        return True
+
+    def acquire(self, timeout: Optional[float] = None) -> PooledConnection:
+        timeout = self.acquire_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError(f"Connection pool '{self.name}' is closed")
+                while self._idle:
+                    entry = self._idle.pop()
+                    if self._usable(entry, time.monotonic()):
+                        return self._checkout(entry, started)
+                    self._size -= 1
+                    self._discard(entry)
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        f"Connection pool '{self.name}' exhausted ({self.max_size} in use) after {timeout:.1f}s"
+                    )
+                self._cond.wait(remaining)
+
+        # Open the new connection outside the lock; a slow connect must not block releases
+        try:
+            conn = self.factory()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        now = time.monotonic()
+        entry = {"conn": conn, "created_at": now, "last_used": now}
+        with self._cond:
+            self._created += 1
+            return self._checkout(entry, started)
+
+    def _checkout(self, entry: Dict[str, Any], started: float) -> PooledConnection:
+        waited = time.monotonic() - started
+        self._acquired += 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+        self._peak_in_use = max(self._peak_in_use, self._size - len(self._idle))
+        return PooledConnection(self, entry)
+
+    def _release(self, entry: Dict[str, Any]):
+        conn = entry["conn"]
+        healthy = True
+        try:
+            conn.rollback()  # never hand the next caller an open transaction
+        except Exception:
+            healthy = False
+        now = time.monotonic()
+        with self._cond:
+            expired = self.max_lifetime and now - entry["created_at"] > self.max_lifetime
+            if self._closed or not healthy or expired:
+                self._size -= 1
+                if expired:
+                    self._recycled += 1
+                elif not healthy:
+                    self._health_failures += 1
+                self._discard(entry)
+            else:
+                entry["last_used"] = now
+                self._idle.append(entry)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            idle = len(self._idle)
+            in_use = self._size - idle
+            return {
+                "backend": self.backend,
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": idle,
+                "in_use": in_use,
+                "peak_in_use": self._peak_in_use,
+                "utilisation": round(in_use / self.max_size, 3),
+                "acquired": self._acquired,
+                "created": self._created,
+                "recycled": self._recycled,
+                "health_failures": self._health_failures,
+                "timeouts": self._timeouts,
+                "leaked": self._leaked,
+                "avg_wait_ms": round(self._wait_total / self._acquired * 1000, 3) if self._acquired else 0.0,
+                "max_wait_ms": round(self._wait_max * 1000, 3),
+            }
+
+    def close_all(self):
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                self._size -= 1
+                self._discard(self._idle.pop())
+            self._cond.notify_all()
+
+
+def _default_health_check(conn):
+    if hasattr(conn, "ping"):
+        conn.ping()  # MariaDB
+    else:
+        conn.execute("SELECT 1").fetchone()
+
+
+def _sqlite_factory(path: str) -> Callable[[], sqlite3.Connection]:
+    def connect():
+        # Pooled connections move between request threads
+        conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+    return connect
+
+
+def _pool_options(overrides: Dict[str, Any]) -> Dict[str, Any]:
+    options = {
+        "max_size": int(_pool_setting('DB_POOL_SIZE', 10)),
+        "max_lifetime": _pool_setting('DB_POOL_MAX_LIFETIME_SECONDS', 1800),
+        "health_check_interval": _pool_setting('DB_POOL_HEALTH_CHECK_SECONDS', 30),
+        "acquire_timeout": _pool_setting('DB_POOL_ACQUIRE_TIMEOUT_SECONDS', 10),
+    }
+    options.update(overrides)
+    return options
+
+
+def create_sqlite_pool(path: str, name: str = "sqlite", **options) -> ConnectionPool:
+    return ConnectionPool(_sqlite_factory(path), "sqlite", name=name, **_pool_options(options))
+
+
+def create_mariadb_pool(config: Dict[str, Any], name: str = "mariadb", **options) -> ConnectionPool:
+    import mariadb
+    return ConnectionPool(lambda: mariadb.connect(**config), "mariadb", name=name, **_pool_options(options))
+
+
+def mariadb_config_from_env(**defaults) -> Dict[str, Any]:
+    return {
+        'host': os.getenv('DB_HOST', defaults.get('host', 'localhost')),
+        'user': os.getenv('DB_USER', defaults.get('user', 'root')),
+        'password': os.getenv('DB_PASSWORD', defaults.get('password', 'greenmatchers2025')),
+        'database': os.getenv('DB_NAME', defaults.get('database', 'green_jobs')),
+        'port': int(os.getenv('DB_PORT', defaults.get('port', 3306))),
+    }
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(name: str, mariadb_config: Optional[Dict[str, Any]] = None,
+             sqlite_path: Optional[str] = None, **options) -> Optional[ConnectionPool]:
+    """
+    Shared pool for `name`, created on first use: MariaDB when it answers,
+    otherwise SQLite at sqlite_path. Returns None when neither is available.
+    """
+    pool = _pools.get(name)
+    if pool is not None:
+        return pool
+    with _pools_lock:
+        if name in _pools:
+            return _pools[name]
+        if mariadb_config is not None:
+            try:
+                pool = create_mariadb_pool(mariadb_config, name=name, **options)
+                pool.acquire().close()  # probe, and keep the first connection warm
+                print(f"✅ MariaDB connection pool '{name}' ready (max {pool.max_size})")
+            except Exception as e:
+                print(f"⚠️ MariaDB unavailable for pool '{name}': {e}")
+                pool = None
+        if pool is None and sqlite_path is not None:
+            pool = create_sqlite_pool(sqlite_path, name=name, **options)
+            print(f"✅ SQLite connection pool '{name}' ready ({sqlite_path})")
+        if pool is not None:
+            _pools[name] = pool
+        return pool
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Utilisation metrics for every shared pool"""
+    return {name: pool.stats() for name, pool in list(_pools.items())}
+
+
+def close_pools():
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close_all()
+        _pools.clear()
@@ -0,0 +1,56 @@
+# services/embedding_backends.py - CPU inference backends for the sentence embedding model
+import os
+from typing import Optional
+
+# torch       - full-precision PyTorch (original behaviour)
+# torch-int8  - PyTorch with dynamic int8 quantization of the Linear layers
+# onnx        - ONNX Runtime export of the same model
+# onnx-int8   - pre-quantized ONNX weights published with the model
+# A smaller distilled model is selected via EMBEDDING_MODEL instead (e.g. all-MiniLM-L6-v2).
+EMBEDDING_BACKENDS = ("torch", "torch-int8", "onnx", "onnx-int8")
+
+DEFAULT_MODEL = "all-mpnet-base-v2"
+DEFAULT_ONNX_INT8_FILE = "onnx/model_quint8_avx2.onnx"
+
+
+def load_embedding_model(model_name: str = DEFAULT_MODEL, backend: str = "torch",
+                         onnx_file: Optional[str] = None):
+    """
+    Load a SentenceTransformer for the requested backend. ONNX backends need
+    optimum[onnxruntime]; if a backend cannot be loaded we fall back to torch
+    so the service still starts. Returns (model, backend actually used).
+    """
+    from sentence_transformers import SentenceTransformer
+
+    backend = (backend or "torch").lower()
+    if backend not in EMBEDDING_BACKENDS:
+        print(f"⚠️ Unknown embedding backend '{backend}', using torch")
+        backend = "torch"
+
+    try:
+        if backend == "onnx":
+            return SentenceTransformer(model_name, device="cpu", backend="onnx"), backend
+        if backend == "onnx-int8":
+            model_kwargs = {"file_name": onnx_file or DEFAULT_ONNX_INT8_FILE}
+            return SentenceTransformer(model_name, device="cpu", backend="onnx", model_kwargs=model_kwargs), backend
+        if backend == "torch-int8":
+            import torch
+            model = SentenceTransformer(model_name, device="cpu")
+            torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+            return model, backend
+    except Exception as e:
+        print(f"⚠️ Embedding backend '{backend}' unavailable ({e}), falling back to torch")
+        backend = "torch"
+
+    return SentenceTransformer(model_name), backend
+
+
+def load_configured_model():
+    """Model and backend from EMBEDDING_MODEL / EMBEDDING_BACKEND / EMBEDDING_ONNX_FILE"""
+    model_name = os.getenv('EMBEDDING_MODEL', DEFAULT_MODEL)
+    model, backend = load_embedding_model(
+        model_name,
+        backend=os.getenv('EMBEDDING_BACKEND', 'torch'),
+        onnx_file=os.getenv('EMBEDDING_ONNX_FILE') or None,
+    )
+    return model_name, model, backend
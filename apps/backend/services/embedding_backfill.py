@@ -0,0 +1,226 @@
+# services/embedding_backfill.py - Batched, resumable embedding backfill for jobs and careers
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .vector_registry import REGISTRY_COLUMN
+from .vector_storage import encode_vector, ensure_blob_columns
+
+HASH_COLUMN = "embedding_source_hash"
+
+
+def _career_texts(row: Tuple) -> Tuple[str, str]:
+    _, title, description, skills = row
+    desc_text = f"{title} {description}" if description else title
+    skills_text = str(skills) if skills else title
+    return desc_text, skills_text
+
+
+def _job_texts(row: Tuple) -> Tuple[str, str]:
+    _, title, description, company = row
+    desc_text = f"{title} {description} {company}" if description else f"{title} {company}"
+    skills_text = description if description else title
+    return desc_text, skills_text
+
+
+# table -> (id column, source columns, text builder)
+BACKFILL_TABLES: Dict[str, Tuple[str, str, Callable[[Tuple], Tuple[str, str]]]] = {
+    "careers": ("career_id", "title, description, required_skills", _career_texts),
+    "jobs": ("job_id", "title, description, company", _job_texts),
+}
+
+
+class EmbeddingBackfill:
+    """
+    Re-embeds the jobs and careers tables in chunks.
+
+    Rows are streamed by primary key, both texts per row are encoded in one
+    batched model call, and each chunk is written with executemany and
+    committed. A checkpoint file records the last committed id per table so
+    an interrupted run resumes where it stopped. Rows whose source-text hash
+    (which includes the model name) is unchanged and whose vector registry
+    spec is current are skipped, so a model change re-embeds everything while
+    a plain re-run is nearly free. With stale_only only rows whose spec is
+    missing or outdated are visited at all.
+    """
+
+    def __init__(self, vector_service, batch_size: int = 64, chunk_size: int = 512,
+                 checkpoint_path: Optional[str] = None, force: bool = False, stale_only: bool = False):
+        self.vector_service = vector_service
+        self.conn = None  # checked out of the service's pool for the duration of run()
+        self.use_sqlite = vector_service.use_sqlite
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.force = force
+        self.stale_only = stale_only
+        self.spec_id = None
+        self.checkpoint_path = checkpoint_path or os.path.join(
+            getattr(vector_service, 'index_dir', 'vector_index'),
+            "reembed_checkpoint.json" if stale_only else "backfill_checkpoint.json"
+        )
+
+    # ---- checkpointing ----------------------------------------------------
+
+    def _read_checkpoint(self) -> Dict[str, Any]:
+        try:
+            with open(self.checkpoint_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_checkpoint(self, checkpoint: Dict[str, Any]):
+        directory = os.path.dirname(self.checkpoint_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _clear_checkpoint(self):
+        try:
+            os.remove(self.checkpoint_path)
+        except OSError:
+            pass
+
+    # ---- schema -----------------------------------------------------------
+
+    def ensure_columns(self):
+        """Vector BLOB columns, registry spec column and the source-text hash used to skip unchanged rows"""
+        ensure_blob_columns(self.conn, self.use_sqlite)
+        self.spec_id = self.vector_service.current_vector_spec_id()
+        cursor = self.conn.cursor()
+        for table in BACKFILL_TABLES:
+            if self.use_sqlite:
+                try:
+                    cursor.execute(f"ALTER TABLE {table} ADD COLUMN {HASH_COLUMN} VARCHAR(64)")
+                except sqlite3.OperationalError:
+                    pass
+            else:
+                try:
+                    cursor.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {HASH_COLUMN} VARCHAR(64)")
+                except Exception:
+                    pass
+        self.conn.commit()
+        cursor.close()
+
+    def source_hash(self, desc_text: str, skills_text: str) -> str:
+        model_key = getattr(self.vector_service, 'model_key', None) or getattr(self.vector_service, 'model_name', '')
+        payload = "\x00".join([model_key, desc_text or "", skills_text or ""])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # ---- backfill ---------------------------------------------------------
+
+    def _encode(self, texts: List[str]):
+        return self.vector_service.model.encode(texts, batch_size=self.batch_size, normalize_embeddings=True,
+                                                show_progress_bar=False)
+
+    def backfill_table(self, table: str, start_after: int = 0,
+                       checkpoint: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        id_column, source_columns, build_texts = BACKFILL_TABLES[table]
+        embedded = skipped = 0
+        last_id = start_after
+        started = time.perf_counter()
+
+        stale_filter, stale_params = "", ()
+        if self.stale_only:
+            stale_filter = f"AND ({REGISTRY_COLUMN} IS NULL OR {REGISTRY_COLUMN} <> ?)"
+            stale_params = (self.spec_id if self.spec_id is not None else -1,)
+
+        while True:
+            cursor = self.conn.cursor()
+            cursor.execute(f"""
+                SELECT {id_column}, {source_columns}, {HASH_COLUMN}, {REGISTRY_COLUMN} FROM {table}
+                WHERE {id_column} > ? {stale_filter}
+                ORDER BY {id_column}
+                LIMIT ?
+            """, (last_id,) + stale_params + (self.chunk_size,))
+            rows = cursor.fetchall()
+            if not rows:
+                cursor.close()
+                break
+
+            pending = []
+            for row in rows:
+                row = tuple(row)
+                source_row, stored_hash, registry_id = row[:-2], row[-2], row[-1]
+                desc_text, skills_text = build_texts(source_row)
+                text_hash = self.source_hash(desc_text, skills_text)
+                if not self.force and not self.stale_only and stored_hash == text_hash and registry_id == self.spec_id:
+                    skipped += 1
+                    continue
+                pending.append((source_row[0], desc_text, skills_text, text_hash))
+            last_id = tuple(rows[-1])[0]
+
+            if pending:
+                # Desc and skills texts share one batched forward pass
+                vectors = self._encode([p[1] for p in pending] + [p[2] for p in pending])
+                count = len(pending)
+                updates = [
+                    (encode_vector(vectors[i]), encode_vector(vectors[count + i]), text_hash, self.spec_id, row_id)
+                    for i, (row_id, _, _, text_hash) in enumerate(pending)
+                ]
+                cursor.executemany(f"""
+                    UPDATE {table}
+                    SET desc_vector_blob = ?, skills_vector_blob = ?, {HASH_COLUMN} = ?, {REGISTRY_COLUMN} = ?,
+                        desc_vector_json = NULL, skills_vector_json = NULL
+                    WHERE {id_column} = ?
+                """, updates)
+                embedded += count
+            self.conn.commit()
+            cursor.close()
+
+            if checkpoint is not None:
+                checkpoint[table] = last_id
+                self._write_checkpoint(checkpoint)
+
+            elapsed = time.perf_counter() - started
+            processed = embedded + skipped
+            print(f"✅ {table}: {processed} rows ({embedded} embedded, {skipped} unchanged) "
+                  f"- {processed / elapsed if elapsed else 0:.1f} rows/s")
+
+        elapsed = time.perf_counter() - started
+        return {
+            "embedded": embedded,
+            "skipped_unchanged": skipped,
+            "seconds": round(elapsed, 2),
+            "rows_per_second": round((embedded + skipped) / elapsed, 1) if elapsed else 0.0,
+        }
+
+    def run(self, tables: Optional[List[str]] = None, resume: bool = True) -> Dict[str, Any]:
+        """Backfill the given tables (default: careers then jobs), resuming from the checkpoint"""
+        with self.vector_service.connection() as conn:
+            self.conn = conn
+            try:
+                self.ensure_columns()
+                checkpoint = self._read_checkpoint() if resume else {}
+                report: Dict[str, Any] = {"resumed_from": dict(checkpoint)}
+
+                for table in tables or list(BACKFILL_TABLES):
+                    report[table] = self.backfill_table(table, start_after=checkpoint.get(table, 0),
+                                                        checkpoint=checkpoint)
+            finally:
+                self.conn = None
+
+        self._clear_checkpoint()
+        return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-embed jobs and careers in resumable batches")
+    parser.add_argument("--batch-size", type=int, default=64, help="texts per model.encode call")
+    parser.add_argument("--chunk-size", type=int, default=512, help="rows per commit/checkpoint")
+    parser.add_argument("--tables", nargs="+", choices=list(BACKFILL_TABLES), default=None)
+    parser.add_argument("--force", action="store_true", help="re-embed rows even if their text is unchanged")
+    parser.add_argument("--no-resume", action="store_true", help="ignore an existing checkpoint")
+    parser.add_argument("--stale", action="store_true", help="only re-embed rows whose vector spec is missing or outdated")
+    args = parser.parse_args()
+
+    from .vector_services import vector_service
+    backfill = EmbeddingBackfill(vector_service, batch_size=args.batch_size,
+                                 chunk_size=args.chunk_size, force=args.force, stale_only=args.stale)
+    print(backfill.run(tables=args.tables, resume=not args.no_resume))
@@ -0,0 +1,112 @@
+# services/embedding_batcher.py - Micro-batching embedding worker that runs off the event loop
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Sequence
+
+_STOP = object()
+
+
+class EmbeddingBatcher:
+    """
+    Collects concurrent embedding requests and encodes them together.
+
+    Callers get a Future per text. A single daemon worker thread waits for
+    the first request, keeps collecting for up to max_wait_ms or until
+    max_batch_size texts are queued, then runs one batched encode call and
+    resolves every caller's future. The model forward pass therefore never
+    runs on the asyncio event loop, and concurrent requests share a batch.
+    """
+
+    def __init__(self, encode_batch: Callable[[List[str]], Sequence[Any]],
+                 max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        self.encode_batch = encode_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+        self.errors = 0
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join(timeout)
+
+    def submit(self, text: str) -> Future:
+        """Queue a text for the next batch; safe to call from any thread"""
+        self.start()
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future
+
+    async def embed(self, text: str):
+        """Await an embedding without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(text))
+
+    def _collect(self, first) -> List:
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self._queue.put(_STOP)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            # Drop requests whose callers already gave up (e.g. timed-out HTTP requests)
+            batch = [(text, future) for text, future in self._collect(first)
+                     if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            try:
+                vectors = self.encode_batch([text for text, _ in batch])
+            except Exception as e:
+                self.errors += 1
+                print(f"❌ Embedding batch failed: {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.items += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+            for (_, future), vector in zip(batch, vectors):
+                future.set_result(vector)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "running": self._thread is not None and self._thread.is_alive(),
+            "queued": self._queue.qsize(),
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "errors": self.errors,
+        }
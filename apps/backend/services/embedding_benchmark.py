@@ -0,0 +1,178 @@
+# services/embedding_benchmark.py - Compare embedding backends on the job corpus
+#
+#   python -m apps.backend.services.embedding_benchmark --backends torch torch-int8 onnx-int8
+#   python -m apps.backend.services.embedding_benchmark --models all-mpnet-base-v2 all-MiniLM-L6-v2
+#
+# Each candidate runs in a fresh process so RSS numbers are not polluted by
+# the previous model. Retrieval agreement is recall@k of each candidate's
+# top-k jobs against the baseline (first candidate) for the same queries.
+import argparse
+import json
+import multiprocessing
+import os
+import sqlite3
+import statistics
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .embedding_backends import DEFAULT_MODEL, load_embedding_model
+
+DEFAULT_QUERIES = [
+    "solar energy engineer",
+    "python data analysis",
+    "wind turbine technician",
+    "sustainability consultant",
+    "electric vehicle battery research",
+    "environmental policy analyst",
+    "green building architect",
+    "carbon accounting",
+]
+
+
+def _rss_mb() -> Optional[float]:
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+    except ImportError:
+        return None
+
+
+def load_job_corpus(db_path: str = "green_jobs.db", limit: int = 2000) -> List[str]:
+    """Job texts exactly as the backfill builds them; MariaDB first, SQLite fallback"""
+    query = f"SELECT title, description, company FROM jobs ORDER BY job_id LIMIT {int(limit)}"
+    rows = []
+    try:
+        import mariadb
+        conn = mariadb.connect(
+            host=os.getenv('DB_HOST', 'localhost'),
+            user=os.getenv('DB_USER', 'root'),
+            password=os.getenv('DB_PASSWORD', 'greenmatchers2025'),
+            database=os.getenv('DB_NAME', 'green_jobs'),
+            port=int(os.getenv('DB_PORT', 3306))
+        )
+    except Exception:
+        conn = sqlite3.connect(db_path)
+    try:
+        cursor = conn.cursor()
+        cursor.execute(query)
+        rows = cursor.fetchall()
+    except Exception as e:
+        print(f"⚠️ Could not read job corpus: {e}")
+    finally:
+        conn.close()
+    return [f"{t} {d} {c}" if d else f"{t} {c}" for t, d, c in rows]
+
+
+def _run_candidate(model_name: str, backend: str, corpus: List[str], queries: List[str],
+                   batch_size: int, repeats: int) -> Dict[str, Any]:
+    rss_before = _rss_mb()
+    started = time.perf_counter()
+    model, used_backend = load_embedding_model(model_name, backend)
+    load_seconds = time.perf_counter() - started
+    model.encode(queries[:1])  # warm-up
+
+    latencies = []
+    for _ in range(repeats):
+        for query in queries:
+            t0 = time.perf_counter()
+            model.encode(query)
+            latencies.append((time.perf_counter() - t0) * 1000)
+    latencies.sort()
+
+    t0 = time.perf_counter()
+    corpus_vectors = model.encode(corpus, batch_size=batch_size, normalize_embeddings=True,
+                                  show_progress_bar=False, convert_to_numpy=True)
+    corpus_seconds = time.perf_counter() - t0
+    query_vectors = model.encode(queries, normalize_embeddings=True, convert_to_numpy=True)
+    rss_after = _rss_mb()
+
+    return {
+        "model": model_name,
+        "backend": used_backend,
+        "dimension": int(corpus_vectors.shape[1]) if corpus_vectors.ndim == 2 else None,
+        "load_seconds": round(load_seconds, 2),
+        "query_latency_p50_ms": round(statistics.median(latencies), 2),
+        "query_latency_p99_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))], 2),
+        "corpus_texts_per_second": round(len(corpus) / corpus_seconds, 1) if corpus_seconds else None,
+        "rss_mb": round(rss_after, 1) if rss_after is not None else None,
+        "rss_delta_mb": round(rss_after - rss_before, 1) if rss_after is not None and rss_before is not None else None,
+        "_corpus_vectors": corpus_vectors.astype(np.float32),
+        "_query_vectors": query_vectors.astype(np.float32),
+    }
+
+
+def _worker(args: Tuple, results):
+    try:
+        results.put(_run_candidate(*args))
+    except Exception as e:
+        results.put({"model": args[0], "backend": args[1], "error": str(e)})
+
+
+def retrieval_agreement(baseline: Dict[str, Any], candidate: Dict[str, Any], top_k: int) -> Dict[str, Any]:
+    """Recall@k of the candidate's top-k jobs against the baseline's, plus vector drift when comparable"""
+    base_top = np.argsort(-(baseline["_query_vectors"] @ baseline["_corpus_vectors"].T), axis=1)[:, :top_k]
+    cand_top = np.argsort(-(candidate["_query_vectors"] @ candidate["_corpus_vectors"].T), axis=1)[:, :top_k]
+    recall = float(np.mean([len(set(b) & set(c)) / len(b) for b, c in zip(base_top, cand_top)]))
+    report = {f"recall_at_{top_k}_vs_baseline": round(recall, 4)}
+    if baseline["_corpus_vectors"].shape == candidate["_corpus_vectors"].shape:
+        cosine = np.sum(baseline["_corpus_vectors"] * candidate["_corpus_vectors"], axis=1)
+        report["mean_cosine_vs_baseline"] = round(float(cosine.mean()), 4)
+        report["min_cosine_vs_baseline"] = round(float(cosine.min()), 4)
+    return report
+
+
+def run_benchmark(candidates: List[Tuple[str, str]], corpus: List[str], queries: List[str],
+                  batch_size: int = 32, repeats: int = 5, top_k: int = 10) -> List[Dict[str, Any]]:
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    for model_name, backend in candidates:
+        print(f"⏱️ Benchmarking {model_name} [{backend}] on {len(corpus)} jobs...")
+        queue = ctx.Queue()
+        process = ctx.Process(target=_worker, args=((model_name, backend, corpus, queries, batch_size, repeats), queue))
+        process.start()
+        result = queue.get()
+        process.join()
+        results.append(result)
+
+    baseline = next((r for r in results if "error" not in r), None)
+    for result in results:
+        if "error" in result or baseline is None:
+            continue
+        result.update(retrieval_agreement(baseline, result, min(top_k, len(corpus))))
+        if result is not baseline and baseline.get("corpus_texts_per_second") and result.get("corpus_texts_per_second"):
+            result["throughput_vs_baseline"] = round(result["corpus_texts_per_second"] / baseline["corpus_texts_per_second"], 2)
+
+    return [{k: v for k, v in r.items() if not k.startswith("_")} for r in results]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare embedding inference backends")
+    parser.add_argument("--models", nargs="+", default=[os.getenv('EMBEDDING_MODEL', DEFAULT_MODEL)])
+    parser.add_argument("--backends", nargs="+", default=["torch", "torch-int8", "onnx", "onnx-int8"])
+    parser.add_argument("--db", default="green_jobs.db", help="SQLite fallback path")
+    parser.add_argument("--limit", type=int, default=2000, help="number of jobs to encode")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeats", type=int, default=5, help="passes over the query set for latency")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--output", help="write the JSON report here")
+    args = parser.parse_args()
+
+    corpus = load_job_corpus(args.db, args.limit)
+    if not corpus:
+        raise SystemExit("❌ No jobs found to benchmark against")
+
+    # Baseline is the first model with the first backend
+    candidates = [(m, b) for m in args.models for b in args.backends]
+    report = run_benchmark(candidates, corpus, DEFAULT_QUERIES,
+                           batch_size=args.batch_size, repeats=args.repeats, top_k=args.top_k)
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
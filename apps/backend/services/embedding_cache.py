@@ -0,0 +1,142 @@
+# services/embedding_cache.py - Bounded LRU/TTL cache for query embeddings
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from .vector_storage import decode_vector, encode_vector
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    """Case-fold and collapse whitespace so trivially different queries share an entry"""
+    return _WHITESPACE.sub(" ", text or "").strip().casefold()
+
+
+class EmbeddingCache:
+    """
+    In-memory LRU of query -> float32 vector with a TTL, plus an optional
+    SQLite tier that survives restarts. Keys include the model name so a
+    model swap never serves vectors from the old embedding space.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 3600,
+                 persist_path: Optional[str] = None, dimension: int = 768):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.persist_path = persist_path
+        self.dimension = dimension
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        if persist_path:
+            try:
+                directory = os.path.dirname(persist_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._disk = sqlite3.connect(persist_path, check_same_thread=False)
+                self._disk.execute("""
+                    CREATE TABLE IF NOT EXISTS query_embeddings (
+                        model TEXT NOT NULL,
+                        query TEXT NOT NULL,
+                        vector BLOB NOT NULL,
+                        created_at REAL NOT NULL,
+                        PRIMARY KEY (model, query)
+                    )
+                """)
+                self._disk.commit()
+            except sqlite3.Error as e:
+                print(f"⚠️ Embedding cache disk tier disabled: {e}")
+                self._disk = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - created_at > self.ttl_seconds
+
+    def get(self, model: str, text: str) -> Optional[np.ndarray]:
+        key = (model, normalize_query(text))
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                vector, created_at = entry
+                if not self._expired(created_at, now):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return vector
+                del self._entries[key]
+                self.expirations += 1
+
+            if self._disk is not None:
+                row = self._disk.execute(
+                    "SELECT vector, created_at FROM query_embeddings WHERE model = ? AND query = ?", key
+                ).fetchone()
+                if row and not self._expired(row[1], now):
+                    vector = decode_vector(row[0], self.dimension)
+                    self._store(key, vector, row[1])
+                    self.disk_hits += 1
+                    return vector
+
+            self.misses += 1
+            return None
+
+    def put(self, model: str, text: str, vector) -> np.ndarray:
+        key = (model, normalize_query(text))
+        vector = np.asarray(vector, dtype=np.float32)
+        vector.setflags(write=False)
+        now = time.time()
+        with self._lock:
+            self._store(key, vector, now)
+            if self._disk is not None:
+                try:
+                    self._disk.execute(
+                        "INSERT OR REPLACE INTO query_embeddings (model, query, vector, created_at) VALUES (?, ?, ?, ?)",
+                        (key[0], key[1], encode_vector(vector, fmt="f32"), now)
+                    )
+                    self._disk.commit()
+                except sqlite3.Error as e:
+                    print(f"⚠️ Embedding cache write failed: {e}")
+        return vector
+
+    def _store(self, key: tuple, vector: np.ndarray, created_at: float):
+        self._entries[key] = (vector, created_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._disk is not None:
+                self._disk.execute("DELETE FROM query_embeddings")
+                self._disk.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "persistent": self._disk is not None,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,260 @@
+# services/fulltext.py - Full-text indexes (SQLite FTS5 / MariaDB FULLTEXT) for keyword search
+#
+#   python -m apps.backend.services.fulltext                 # migrate the configured database
+#   python -m apps.backend.services.fulltext --sqlite green_jobs.db
+#
+# Keyword filters used to be leading-wildcard LIKE '%term%' scans. The query
+# builders below emit MATCH syntax for whichever backend the connection is,
+# and return None when a term cannot be expressed faithfully (symbols like
+# c++ / c#, non-ASCII text, MariaDB stopwords or words below the minimum
+# token size) or the index has not been migrated yet - callers then keep
+# their LIKE filter.
+import argparse
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# table -> (integer primary key, indexed text columns)
+FULLTEXT_TABLES: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "jobs": ("job_id", ("title", "description", "skills")),
+    "careers": ("career_id", ("title", "description", "required_skills")),
+    "career_skills": ("skill_id", ("skill_name",)),
+}
+
+# InnoDB defaults (innodb_ft_min_token_size / default stopword list)
+MARIADB_MIN_TOKEN_SIZE = int(os.getenv('FULLTEXT_MIN_TOKEN_SIZE', 3))
+MARIADB_STOPWORDS = frozenset("""
+a about an are as at be by com de en for from how i in is it la of on or that the this to was what
+when where who will with und www
+""".split())
+
+_SEARCHABLE_TERM = re.compile(r"^[a-z0-9\s\-./']+$")
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+_ready: Dict[Tuple[str, str], Tuple[bool, float]] = {}
+_ready_lock = threading.Lock()
+READY_RECHECK_SECONDS = 60
+
+
+def fts_table(table: str) -> str:
+    return f"{table}_fts"
+
+
+def fulltext_index_name(table: str) -> str:
+    return f"ft_{table}_search"
+
+
+def _backend_of(conn) -> str:
+    return "mariadb" if getattr(conn, "is_mariadb", False) else "sqlite"
+
+
+def _table_columns(cursor, table: str, use_sqlite: bool) -> List[str]:
+    if use_sqlite:
+        cursor.execute(f"PRAGMA table_info({table})")
+        return [row[1] for row in cursor.fetchall()]
+    cursor.execute(f"""
+        SELECT column_name FROM information_schema.COLUMNS
+        WHERE table_schema = DATABASE() AND table_name = '{table}'
+    """)
+    return [row[0] for row in cursor.fetchall()]
+
+
+# ---- migration ---------------------------------------------------------------
+
+def ensure_fulltext_indexes(conn, use_sqlite: bool, tables: Optional[Sequence[str]] = None) -> Dict[str, str]:
+    """
+    Idempotent migration. SQLite: an external-content FTS5 table per source
+    table, kept in sync by insert/update/delete triggers and populated with
+    'rebuild' when first created. MariaDB: one FULLTEXT index over the same
+    columns. Tables or columns that do not exist are skipped.
+    """
+    report: Dict[str, str] = {}
+    cursor = conn.cursor()
+    for table in tables or list(FULLTEXT_TABLES):
+        id_column, columns = FULLTEXT_TABLES[table]
+        existing = set(_table_columns(cursor, table, use_sqlite))
+        if not existing:
+            report[table] = "skipped (no table)"
+            continue
+        if not set(columns) <= existing:
+            report[table] = f"skipped (missing {', '.join(sorted(set(columns) - existing))})"
+            continue
+
+        if use_sqlite:
+            report[table] = _ensure_fts5(cursor, table, id_column, columns)
+        else:
+            report[table] = _ensure_mariadb_fulltext(cursor, table, columns)
+        conn.commit()
+        _mark_ready("sqlite" if use_sqlite else "mariadb", table, True)
+        print(f"✅ Full-text index for {table}: {report[table]}")
+    cursor.close()
+    return report
+
+
+def _ensure_fts5(cursor, table: str, id_column: str, columns: Tuple[str, ...]) -> str:
+    fts = fts_table(table)
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,))
+    created = cursor.fetchone() is None
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+
+    cursor.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+            {column_list}, content='{table}', content_rowid='{id_column}',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts}(rowid, {column_list}) VALUES (new.{id_column}, {new_values});
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.{id_column}, {old_values});
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {column_list} ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.{id_column}, {old_values});
+            INSERT INTO {fts}(rowid, {column_list}) VALUES (new.{id_column}, {new_values});
+        END
+    """)
+    if created:
+        cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+        return "created FTS5 table"
+    return "FTS5 table exists"
+
+
+def _ensure_mariadb_fulltext(cursor, table: str, columns: Tuple[str, ...]) -> str:
+    if _mariadb_has_fulltext(cursor, table):
+        return "FULLTEXT index exists"
+    cursor.execute(f"ALTER TABLE {table} ADD FULLTEXT INDEX {fulltext_index_name(table)} ({', '.join(columns)})")
+    return "created FULLTEXT index"
+
+
+def _mariadb_has_fulltext(cursor, table: str) -> bool:
+    cursor.execute(f"""
+        SELECT COUNT(*) FROM information_schema.STATISTICS
+        WHERE table_schema = DATABASE() AND table_name = '{table}'
+          AND index_name = '{fulltext_index_name(table)}' AND index_type = 'FULLTEXT'
+    """)
+    return bool(cursor.fetchone()[0])
+
+
+# ---- readiness ---------------------------------------------------------------
+
+def _mark_ready(backend: str, table: str, ready: bool):
+    with _ready_lock:
+        _ready[(backend, table)] = (ready, time.monotonic())
+
+
+def fulltext_ready(conn, table: str, backend: Optional[str] = None) -> bool:
+    """Whether the migration has run for table; misses are re-checked every READY_RECHECK_SECONDS"""
+    backend = backend or _backend_of(conn)
+    cached = _ready.get((backend, table))
+    if cached is not None and (cached[0] or time.monotonic() - cached[1] < READY_RECHECK_SECONDS):
+        return cached[0]
+    ready = False
+    try:
+        cursor = conn.cursor()
+        if backend == "sqlite":
+            cursor.execute(f"SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = '{fts_table(table)}'")
+            ready = cursor.fetchone() is not None
+        else:
+            ready = _mariadb_has_fulltext(cursor, table)
+        cursor.close()
+    except Exception as e:
+        print(f"⚠️ Full-text readiness check failed for {table}: {e}")
+    _mark_ready(backend, table, ready)
+    return ready
+
+
+# ---- query building ----------------------------------------------------------
+
+def build_match_query(terms: Sequence[str], backend: str, match_all: bool = False) -> Optional[str]:
+    """
+    Search expression for FTS5 MATCH or MariaDB AGAINST (... IN BOOLEAN MODE).
+    Each term is a phrase whose last word is a prefix, mirroring the
+    substring semantics of LIKE '%term%' as closely as the indexes allow.
+    """
+    clauses = []
+    for term in terms:
+        term = (term or "").strip().lower()
+        if not term:
+            continue
+        if not _SEARCHABLE_TERM.match(term):
+            return None
+        tokens = _TOKEN.findall(term)
+        if not tokens:
+            continue
+        if backend == "sqlite":
+            clauses.append('"' + " ".join(tokens) + '"*')
+        else:
+            if any(len(token) < MARIADB_MIN_TOKEN_SIZE or token in MARIADB_STOPWORDS for token in tokens):
+                return None
+            clause = f"{tokens[0]}*" if len(tokens) == 1 else '"' + " ".join(tokens) + '"'
+            clauses.append(f"+{clause}" if match_all else clause)
+    if not clauses:
+        return None
+    if backend == "sqlite":
+        return (" AND " if match_all else " OR ").join(clauses)
+    return " ".join(clauses)
+
+
+def match_sql(table: str, backend: str, alias: str = "", placeholder: str = "%s") -> str:
+    """WHERE fragment matching `table` rows against one search-expression parameter"""
+    id_column, columns = FULLTEXT_TABLES[table]
+    if backend == "sqlite":
+        fts = fts_table(table)
+        return f"{alias}{id_column} IN (SELECT rowid FROM {fts} WHERE {fts} MATCH {placeholder})"
+    return f"MATCH({', '.join(alias + c for c in columns)}) AGAINST ({placeholder} IN BOOLEAN MODE)"
+
+
+def fulltext_condition(conn, table: str, terms: Sequence[str], alias: str = "",
+                       match_all: bool = False, placeholder: str = "%s") -> Optional[Tuple[str, List[str]]]:
+    """(sql, params) for a raw DB-API connection, or None to keep the LIKE fallback"""
+    backend = _backend_of(conn)
+    expression = build_match_query(terms, backend, match_all)
+    if expression is None or not fulltext_ready(conn, table, backend):
+        return None
+    return match_sql(table, backend, alias, placeholder), [expression]
+
+
+def fulltext_clause(db, table: str, terms: Sequence[str], match_all: bool = False):
+    """SQLAlchemy text() filter for a Session, or None to keep the ilike fallback"""
+    from sqlalchemy import text
+
+    backend = "sqlite" if db.bind.dialect.name == "sqlite" else "mariadb"
+    expression = build_match_query(terms, backend, match_all)
+    if expression is None:
+        return None
+    try:
+        raw = db.connection().connection
+    except Exception:
+        return None
+    if not fulltext_ready(raw, table, backend):
+        return None
+    param = f"fulltext_{table}"
+    return text(match_sql(table, backend, alias=f"{table}.", placeholder=f":{param}")).bindparams(**{param: expression})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create full-text indexes for job and career search")
+    parser.add_argument("--sqlite", help="migrate this SQLite file instead of the configured MariaDB/SQLite pool")
+    parser.add_argument("--tables", nargs="+", choices=list(FULLTEXT_TABLES), default=None)
+    args = parser.parse_args()
+
+    if args.sqlite:
+        import sqlite3
+        connection = sqlite3.connect(args.sqlite)
+        print(ensure_fulltext_indexes(connection, True, args.tables))
+        connection.close()
+    else:
+        from .db_pool import get_pool, mariadb_config_from_env
+        pool = get_pool('migrate', mariadb_config=mariadb_config_from_env(), sqlite_path='green_jobs.db')
+        with pool.connection() as connection:
+            print(ensure_fulltext_indexes(connection, pool.backend == "sqlite", args.tables))
@@ -0,0 +1,130 @@
+# services/fulltext_benchmark.py - LIKE scan vs full-text index on a synthetic job fixture
+#
+#   python -m apps.backend.services.fulltext_benchmark --rows 500000
+#   python -m apps.backend.services.fulltext_benchmark --mariadb --database green_jobs_bench
+#
+# Builds a jobs table of --rows synthetic postings (SQLite file by default, or a
+# scratch MariaDB database), then times the LIKE filters the search endpoints
+# used against the FTS5 / FULLTEXT conditions from services/fulltext.py.
+import argparse
+import json
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from .fulltext import ensure_fulltext_indexes, fulltext_condition
+
+TITLES = ["Solar Engineer", "Wind Turbine Technician", "Sustainability Analyst", "EV Battery Researcher",
+          "Carbon Accountant", "Green Building Architect", "Environmental Policy Advisor", "Hydrogen Process Engineer",
+          "Recycling Operations Manager", "Climate Data Scientist"]
+SKILLS = ["python", "solar pv", "autocad", "gis", "carbon accounting", "battery chemistry", "sql", "leed",
+          "power electronics", "life cycle assessment", "machine learning", "project management", "scada",
+          "energy modelling", "hvac", "policy analysis", "excel", "matlab", "wind resource assessment", "esg reporting"]
+FILLER = ("design install maintain monitor optimise report collaborate stakeholders renewable grid efficiency "
+          "emissions compliance field site safety quality commissioning inspection budget planning").split()
+# Long tail of niche skills so selective queries exist, as in real postings
+NICHE_SKILLS = [f"niche{n:04d}" for n in range(5000)]
+CITIES = ["Mumbai", "Delhi", "Bengaluru", "Chennai", "Pune", "Hyderabad", "Kolkata", "Ahmedabad"]
+
+QUERIES = [["python"], ["solar pv"], ["carbon accounting"], ["scada", "hvac"], ["niche0042"], ["niche0042", "niche4999"]]
+
+
+def build_fixture(conn, rows: int, use_sqlite: bool, seed: int = 7, chunk: int = 10000):
+    rng = random.Random(seed)
+    cursor = conn.cursor()
+    cursor.execute("DROP TABLE IF EXISTS jobs")
+    if use_sqlite:
+        cursor.execute("DROP TABLE IF EXISTS jobs_fts")
+    id_type = "INTEGER PRIMARY KEY" if use_sqlite else "INT PRIMARY KEY"
+    cursor.execute(f"""
+        CREATE TABLE jobs (
+            job_id {id_type}, title VARCHAR(200), description TEXT, skills TEXT,
+            company VARCHAR(100), location VARCHAR(100), status VARCHAR(20)
+        )
+    """)
+    placeholder = "?" if use_sqlite else "%s"
+    insert = f"INSERT INTO jobs VALUES ({', '.join([placeholder] * 7)})"
+    for start in range(1, rows + 1, chunk):
+        batch = []
+        for job_id in range(start, min(start + chunk, rows + 1)):
+            skills = rng.sample(SKILLS, 2) + [rng.choice(NICHE_SKILLS)]
+            words = rng.choices(FILLER, k=40) + skills
+            rng.shuffle(words)
+            batch.append((job_id, rng.choice(TITLES), " ".join(words), json.dumps(skills),
+                          f"Company {job_id % 500}", rng.choice(CITIES), "active"))
+        cursor.executemany(insert, batch)
+        conn.commit()
+    cursor.close()
+
+
+def _time(conn, sql: str, params: List[Any], repeats: int, select_count: bool) -> Dict[str, Any]:
+    timings, count = [], 0
+    for _ in range(repeats):
+        cursor = conn.cursor()
+        started = time.perf_counter()
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+        count = rows[0][0] if select_count else len(rows)
+        timings.append((time.perf_counter() - started) * 1000)
+        cursor.close()
+    return {"median_ms": round(statistics.median(timings), 2), "rows": count}
+
+
+def run_benchmark(conn, use_sqlite: bool, repeats: int = 5, limit: int = 50) -> List[Dict[str, Any]]:
+    placeholder = "?" if use_sqlite else "%s"
+    results = []
+    for terms in QUERIES:
+        like = " OR ".join(f"(title LIKE {placeholder} OR description LIKE {placeholder} OR skills LIKE {placeholder})"
+                           for _ in terms)
+        like_params = [f"%{term}%" for term in terms for _ in range(3)]
+        fulltext = fulltext_condition(conn, "jobs", terms, placeholder=placeholder)
+        if fulltext is None:
+            results.append({"terms": terms, "error": "term not expressible as a full-text query"})
+            continue
+        for label, where, params in (("like", like, like_params), ("fulltext", fulltext[0], fulltext[1])):
+            for scope, suffix in (("count", ""), (f"first_{limit}", f" LIMIT {limit}")):
+                select = "COUNT(*)" if scope == "count" else "job_id, title"
+                stats = _time(conn, f"SELECT {select} FROM jobs WHERE status = 'active' AND ({where}){suffix}",
+                              params, repeats, scope == "count")
+                results.append({"terms": terms, "method": label, "query": scope, **stats})
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark LIKE vs full-text job search")
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--db", help="SQLite fixture path (default: a temporary file)")
+    parser.add_argument("--mariadb", action="store_true", help="use a scratch MariaDB database instead of SQLite")
+    parser.add_argument("--database", default="green_jobs_bench", help="scratch MariaDB database (tables are dropped!)")
+    parser.add_argument("--output", help="write the JSON report here")
+    args = parser.parse_args()
+
+    if args.mariadb:
+        import mariadb
+        from .db_pool import mariadb_config_from_env
+        connection = mariadb.connect(**{**mariadb_config_from_env(), "database": args.database})
+        connection.is_mariadb = True
+        use_sqlite = False
+    else:
+        path = args.db or os.path.join(tempfile.mkdtemp(), "fulltext_bench.db")
+        connection = sqlite3.connect(path)
+        use_sqlite = True
+
+    started = time.perf_counter()
+    build_fixture(connection, args.rows, use_sqlite)
+    print(f"⏱️ Fixture: {args.rows} jobs in {time.perf_counter() - started:.1f}s")
+    started = time.perf_counter()
+    ensure_fulltext_indexes(connection, use_sqlite, ["jobs"])
+    print(f"⏱️ Full-text index built in {time.perf_counter() - started:.1f}s")
+
+    report = run_benchmark(connection, use_sqlite, args.repeats)
+    connection.close()
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
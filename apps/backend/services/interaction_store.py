@@ -0,0 +1,439 @@
+# services/interaction_store.py - Append-only user-job interaction log compacted into a CSR user x item matrix
+import os
+import queue
+import threading
+import time
+import numpy as np
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+TABLE = "user_job_interactions"
+INTERACTION_WEIGHTS = {'apply': 3.0, 'save': 2.0, 'view': 1.0}
+
+
+def ensure_interaction_log(conn, use_sqlite: bool):
+    """Idempotent migration for the interaction log"""
+    cursor = conn.cursor()
+    try:
+        if use_sqlite:
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {TABLE} (
+                    interaction_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER NOT NULL,
+                    job_id INTEGER NOT NULL,
+                    interaction_type VARCHAR(16) NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+        else:
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {TABLE} (
+                    interaction_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                    user_id INT NOT NULL,
+                    job_id INT NOT NULL,
+                    interaction_type VARCHAR(16) NOT NULL,
+                    created_at DOUBLE NOT NULL
+                )
+            """)
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+class UserItemMatrix:
+    """
+    Immutable CSR matrix of decayed interaction weights: row r holds the
+    jobs of user_ids[r] in indices[indptr[r]:indptr[r + 1]] (offsets into
+    item_ids) with their weights in data. Weights are as of reference_time;
+    every log id up to watermark is folded in, as are folded_ids above it.
+    """
+
+    def __init__(self, user_ids: np.ndarray, item_ids: np.ndarray, indptr: np.ndarray, indices: np.ndarray,
+                 data: np.ndarray, reference_time: float, watermark: int = 0,
+                 folded_ids: Optional[np.ndarray] = None):
+        self.user_ids = np.asarray(user_ids, dtype=np.int64)
+        self.item_ids = np.asarray(item_ids, dtype=np.int64)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.data = np.asarray(data, dtype=np.float32)
+        self.reference_time = reference_time
+        self.watermark = watermark
+        self.folded_ids = np.asarray(folded_ids if folded_ids is not None else np.zeros(0), dtype=np.int64)
+        self.row_of = {int(user_id): row for row, user_id in enumerate(self.user_ids)}
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.user_ids), len(self.item_ids)
+
+    @property
+    def nnz(self) -> int:
+        return len(self.data)
+
+    @classmethod
+    def empty(cls, reference_time: float = 0.0) -> "UserItemMatrix":
+        return cls(np.zeros(0), np.zeros(0), np.zeros(1), np.zeros(0), np.zeros(0), reference_time)
+
+    @classmethod
+    def from_triples(cls, users: np.ndarray, items: np.ndarray, weights: np.ndarray, reference_time: float,
+                     watermark: int = 0, min_weight: float = 0.0) -> "UserItemMatrix":
+        """Sum duplicate (user, item) weights and lay the result out row by row"""
+        users = np.asarray(users, dtype=np.int64)
+        items = np.asarray(items, dtype=np.int64)
+        weights = np.asarray(weights, dtype=np.float64)
+        if len(users) == 0:
+            return cls.empty(reference_time)._with_watermark(watermark)
+
+        user_ids, rows = np.unique(users, return_inverse=True)
+        item_ids, cols = np.unique(items, return_inverse=True)
+        order = np.lexsort((cols, rows))
+        rows, cols, weights = rows[order], cols[order], weights[order]
+        starts = np.flatnonzero(np.r_[True, (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])])
+        rows, cols, weights = rows[starts], cols[starts], np.add.reduceat(weights, starts)
+
+        keep = weights > min_weight
+        rows, cols, weights = rows[keep], cols[keep], weights[keep]
+        indptr = np.zeros(len(user_ids) + 1, dtype=np.int64)
+        np.add.at(indptr, rows + 1, 1)
+        return cls(user_ids, item_ids, np.cumsum(indptr), cols, weights, reference_time, watermark)
+
+    def _with_watermark(self, watermark: int) -> "UserItemMatrix":
+        self.watermark = watermark
+        return self
+
+    def triples(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(user_id, item_id, weight) arrays for every stored entry"""
+        users = np.repeat(self.user_ids, np.diff(self.indptr))
+        return users, self.item_ids[self.indices], self.data.astype(np.float64)
+
+    def row(self, user_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(item_ids, weights) of one user - a slice, no scan"""
+        row = self.row_of.get(int(user_id))
+        if row is None:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        start, end = self.indptr[row], self.indptr[row + 1]
+        return self.item_ids[self.indices[start:end]], self.data[start:end]
+
+    def merged(self, users: np.ndarray, items: np.ndarray, weights: np.ndarray, reference_time: float,
+               watermark: int, half_life_seconds: float, min_weight: float,
+               folded_ids: Optional[np.ndarray] = None) -> "UserItemMatrix":
+        """This matrix decayed to reference_time plus new (already decayed) entries"""
+        old_users, old_items, old_weights = self.triples()
+        old_weights = old_weights * decay(reference_time - self.reference_time, half_life_seconds)
+        matrix = UserItemMatrix.from_triples(
+            np.concatenate([old_users, np.asarray(users, dtype=np.int64)]),
+            np.concatenate([old_items, np.asarray(items, dtype=np.int64)]),
+            np.concatenate([old_weights, np.asarray(weights, dtype=np.float64)]),
+            reference_time, watermark, min_weight
+        )
+        if folded_ids is not None:
+            matrix.folded_ids = np.asarray(folded_ids, dtype=np.int64)
+        return matrix
+
+    def save(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        np.savez(path, user_ids=self.user_ids, item_ids=self.item_ids, indptr=self.indptr, indices=self.indices,
+                 data=self.data, folded_ids=self.folded_ids,
+                 meta=np.array([self.reference_time, self.watermark], dtype=np.float64))
+
+    @classmethod
+    def load(cls, path: str) -> Optional["UserItemMatrix"]:
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as arrays:
+            reference_time, watermark = arrays["meta"]
+            folded_ids = arrays["folded_ids"] if "folded_ids" in arrays.files else None
+            return cls(arrays["user_ids"], arrays["item_ids"], arrays["indptr"], arrays["indices"],
+                       arrays["data"], float(reference_time), int(watermark), folded_ids)
+
+
+def advance_watermark(watermark: int, ids: np.ndarray, overlap: int) -> Tuple[int, np.ndarray]:
+    """
+    (new watermark, folded ids above it) after folding ids. Auto-increment
+    ids can commit out of order across workers, so the watermark only moves
+    over a gap-free run; gaps more than overlap ids behind the newest id are
+    treated as settled (rollbacks, auto_increment_increment > 1).
+    """
+    ids = np.unique(np.asarray(ids, dtype=np.int64))
+    ids = ids[ids > watermark]
+    if len(ids) == 0:
+        return watermark, ids
+    gap_free = ids == watermark + np.arange(1, len(ids) + 1)
+    run = len(ids) if gap_free.all() else int(np.argmin(gap_free))
+    new_watermark = max(watermark + run, int(ids[-1]) - overlap)
+    return new_watermark, ids[ids > new_watermark]
+
+
+def decay(age_seconds, half_life_seconds: float):
+    """Weight multiplier for an interaction age_seconds old"""
+    if half_life_seconds <= 0:
+        return np.ones_like(age_seconds, dtype=np.float64) if isinstance(age_seconds, np.ndarray) else 1.0
+    return np.power(0.5, np.asarray(age_seconds, dtype=np.float64) / half_life_seconds)
+
+
+class InteractionStore:
+    """
+    Views, saves and applications per user, so recommendations no longer
+    depend on the client posting its own job history.
+
+    record() is cheap: it updates an in-process delta and queues the row
+    for a background writer that appends it to user_job_interactions
+    (failed batches are retried). compact() folds the log rows it has not
+    seen into a new UserItemMatrix: existing weights are decayed to now
+    (half-life half_life_days), new rows are decayed by their age,
+    duplicates summed and negligible weights dropped. The last id_overlap
+    ids are re-read each time so rows that commit late are not skipped. It
+    runs every compact_seconds on a background thread; the matrix is saved
+    to persist_path so a restart only replays the tail of the log.
+    user_weights() is a CSR row slice plus this process's delta; a delta
+    entry is dropped only once its write is confirmed and folded (a row
+    recorded during a compaction may count twice until the next one).
+    """
+
+    def __init__(self, connect: Callable[[], Any], use_sqlite: Optional[bool] = None,
+                 half_life_days: Optional[float] = None, compact_seconds: Optional[float] = None,
+                 min_weight: float = 0.01, persist_path: Optional[str] = None, name: str = "interactions",
+                 id_overlap: Optional[int] = None, retry_seconds: float = 5.0):
+        self.connect = connect
+        self.use_sqlite = use_sqlite
+        self.half_life_seconds = (half_life_days if half_life_days is not None
+                                  else float(os.getenv('INTERACTION_HALF_LIFE_DAYS', 30))) * 86400
+        self.compact_seconds = (compact_seconds if compact_seconds is not None
+                                else float(os.getenv('INTERACTION_COMPACT_SECONDS', 300)))
+        self.min_weight = min_weight
+        self.persist_path = persist_path
+        self.name = name
+        self.id_overlap = id_overlap if id_overlap is not None else int(os.getenv('INTERACTION_ID_OVERLAP', 1000))
+        self.retry_seconds = retry_seconds
+        self.matrix: Optional[UserItemMatrix] = None
+        self._delta: Dict[int, List[Tuple[int, float, float, int]]] = defaultdict(list)
+        self._seq = 0
+        self._confirmed: set = set()
+        self._retry: List[tuple] = []
+        self._lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._writes: "queue.Queue[tuple]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._compactor: Optional[threading.Thread] = None
+        self._table_ready = False
+        self.recorded = 0
+        self.written = 0
+        self.write_errors = 0
+        self.compactions = 0
+        self.last_compaction_ms = 0.0
+
+    # ---- database ---------------------------------------------------------------
+
+    def _is_sqlite(self, conn) -> bool:
+        if self.use_sqlite is not None:
+            return self.use_sqlite
+        return not getattr(conn, "is_mariadb", False)
+
+    def _with_connection(self, fn: Callable, *args):
+        conn = self.connect()
+        if conn is None:
+            raise RuntimeError("Database connection failed")
+        try:
+            use_sqlite = self._is_sqlite(conn)
+            if not self._table_ready:
+                ensure_interaction_log(conn, use_sqlite)
+                self._table_ready = True
+            return fn(conn, use_sqlite, *args)
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _append(conn, use_sqlite: bool, rows: Sequence[tuple]):
+        mark = "?" if use_sqlite else "%s"
+        cursor = conn.cursor()
+        try:
+            cursor.executemany(f"""
+                INSERT INTO {TABLE} (user_id, job_id, interaction_type, created_at)
+                VALUES ({mark}, {mark}, {mark}, {mark})
+            """, list(rows))
+            conn.commit()
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _read_tail(conn, use_sqlite: bool, watermark: int) -> List[tuple]:
+        mark = "?" if use_sqlite else "%s"
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f"""
+                SELECT interaction_id, user_id, job_id, interaction_type, created_at FROM {TABLE}
+                WHERE interaction_id > {mark} ORDER BY interaction_id
+            """, (watermark,))
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    # ---- write path ---------------------------------------------------------------
+
+    def record(self, user_id: int, job_id: int, interaction_type: str, at: Optional[float] = None):
+        """Log one view/save/apply; never blocks on the database"""
+        if user_id is None or job_id is None:
+            return
+        at = time.time() if at is None else at
+        weight = INTERACTION_WEIGHTS.get(interaction_type, 1.0)
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+            self._delta[int(user_id)].append((int(job_id), weight, at, seq))
+            self.recorded += 1
+        self._writes.put((seq, int(user_id), int(job_id), interaction_type, at))
+        self._ensure_threads()
+
+    def _ensure_threads(self):
+        with self._lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._write_loop, name=f"{self.name}-writer", daemon=True)
+                self._writer.start()
+            if self.compact_seconds > 0 and (self._compactor is None or not self._compactor.is_alive()):
+                self._compactor = threading.Thread(target=self._compact_loop, name=f"{self.name}-compactor",
+                                                   daemon=True)
+                self._compactor.start()
+
+    def _write_loop(self, batch_size: int = 500):
+        while True:
+            with self._lock:
+                batch, self._retry = self._retry, []
+            taken = 0
+            try:
+                batch.append(self._writes.get(timeout=self.retry_seconds if batch else None))
+                taken += 1
+            except queue.Empty:
+                pass
+            while len(batch) < batch_size:
+                try:
+                    batch.append(self._writes.get_nowait())
+                    taken += 1
+                except queue.Empty:
+                    break
+            try:
+                self._with_connection(self._append, [row[1:] for row in batch])
+                self.written += len(batch)
+                with self._lock:
+                    self._confirmed.update(row[0] for row in batch)
+            except Exception as e:
+                self.write_errors += 1
+                print(f"⚠️ {self.name} log write failed ({len(batch)} rows), retrying: {e}")
+                with self._lock:
+                    self._retry = batch + self._retry
+            finally:
+                for _ in range(taken):
+                    self._writes.task_done()
+
+    def flush(self):
+        """Block until every recorded interaction has had a write attempt"""
+        if self._writer is not None:
+            self._writes.join()
+
+    # ---- compaction ---------------------------------------------------------------
+
+    def _compact_loop(self):
+        while True:
+            time.sleep(self.compact_seconds)
+            try:
+                self.compact()
+            except Exception as e:
+                print(f"⚠️ {self.name} compaction failed: {e}")
+
+    def _load_snapshot(self):
+        if self.matrix is None and self.persist_path:
+            try:
+                self.matrix = UserItemMatrix.load(self.persist_path)
+            except Exception as e:
+                print(f"⚠️ Could not load {self.name} matrix snapshot: {e}")
+
+    def compact(self) -> Dict[str, Any]:
+        """Fold the log tail into a new CSR matrix (single flight)"""
+        with self._compact_lock:
+            started = time.perf_counter()
+            self._load_snapshot()
+            current = self.matrix or UserItemMatrix.empty(time.time())
+            self.flush()
+            with self._lock:
+                confirmed = set(self._confirmed)  # committed before the read below, so folded by it
+            rows = self._with_connection(self._read_tail, current.watermark)
+            seen = set(current.folded_ids.tolist())
+            rows = [row for row in rows if row[0] not in seen]
+            now = time.time()
+            if rows:
+                ids, users, items, kinds, created = zip(*rows)
+                weights = np.array([INTERACTION_WEIGHTS.get(kind, 1.0) for kind in kinds])
+                weights *= decay(now - np.asarray(created, dtype=np.float64), self.half_life_seconds)
+                watermark, folded_ids = advance_watermark(
+                    current.watermark, np.concatenate([current.folded_ids, np.array(ids, dtype=np.int64)]),
+                    self.id_overlap
+                )
+                matrix = current.merged(np.array(users), np.array(items), weights, now, watermark,
+                                        self.half_life_seconds, self.min_weight, folded_ids)
+            else:
+                matrix = current
+            self.matrix = matrix
+            with self._lock:
+                for user_id in list(self._delta):
+                    pending = [entry for entry in self._delta[user_id] if entry[3] not in confirmed]
+                    if pending:
+                        self._delta[user_id] = pending
+                    else:
+                        del self._delta[user_id]
+                self._confirmed -= confirmed
+            if self.persist_path and rows:
+                try:
+                    matrix.save(self.persist_path)
+                except OSError as e:
+                    print(f"⚠️ Could not save {self.name} matrix snapshot: {e}")
+            self.compactions += 1
+            self.last_compaction_ms = round((time.perf_counter() - started) * 1000, 1)
+            return {"rows_folded": len(rows), "users": matrix.shape[0], "jobs": matrix.shape[1], "nnz": matrix.nnz}
+
+    def warm(self) -> bool:
+        """Startup: load the snapshot, fold in the log tail and start the background threads"""
+        try:
+            summary = self.compact()
+            print(f"✅ {self.name} matrix ready: {summary['users']} users x {summary['jobs']} jobs "
+                  f"({summary['rows_folded']} log rows folded)")
+            return True
+        except Exception as e:
+            print(f"⚠️ {self.name} matrix warm-up failed, compacting on first use: {e}")
+            return False
+        finally:
+            self._ensure_threads()
+
+    # ---- read path ---------------------------------------------------------------
+
+    def user_weights(self, user_id: int, now: Optional[float] = None) -> Dict[int, float]:
+        """{job_id: decayed weight} for one user; the first call compacts (blocking)"""
+        if self.matrix is None:
+            self.compact()
+            self._ensure_threads()
+        now = time.time() if now is None else now
+        matrix = self.matrix
+        items, weights = matrix.row(user_id)
+        factor = decay(now - matrix.reference_time, self.half_life_seconds)
+        result = {int(item): float(weight) * float(factor) for item, weight in zip(items, weights)}
+        with self._lock:
+            pending = list(self._delta.get(int(user_id), ()))
+        for job_id, weight, at, _ in pending:
+            result[job_id] = result.get(job_id, 0.0) + weight * float(decay(now - at, self.half_life_seconds))
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        matrix = self.matrix
+        return {
+            "users": matrix.shape[0] if matrix else 0,
+            "jobs": matrix.shape[1] if matrix else 0,
+            "nnz": matrix.nnz if matrix else 0,
+            "watermark": matrix.watermark if matrix else 0,
+            "folded_above_watermark": len(matrix.folded_ids) if matrix else 0,
+            "recorded": self.recorded,
+            "written": self.written,
+            "pending_writes": self._writes.qsize() + len(self._retry),
+            "write_errors": self.write_errors,
+            "compactions": self.compactions,
+            "last_compaction_ms": self.last_compaction_ms,
+            "half_life_days": round(self.half_life_seconds / 86400, 2),
+        }
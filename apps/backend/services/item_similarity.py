@@ -0,0 +1,312 @@
+# services/item_similarity.py - Sparse top-N item-item similarity table for collaborative filtering
+import os
+import threading
+import time
+import numpy as np
+from typing import Any, Dict, Optional, Set
+
+
+class ItemSimilarityIndex:
+    """
+    For every job, its top_n most similar jobs (cosine over the job vectors),
+    kept as a sparse {job_id: {neighbour_id: similarity}} table.
+
+    Collaborative scoring becomes a lookup-and-accumulate over the user's
+    history - O(history x top_n) - instead of comparing every candidate job
+    with every history job. build() computes the table blockwise (one
+    matrix product per block of rows); upsert()/remove() keep it current as
+    single jobs are indexed or closed, and sync() reconciles it with the
+    resident job index after a reload. Each job's weakest listed similarity
+    (its floor) is kept in a sorted array, so upsert() selects the jobs that
+    gain the new job with one vectorized comparison; a reverse index of who
+    lists whom makes remove() touch only those lists. The table is saved as
+    an .npz file so a restarted worker does not recompute it - after single
+    writes at most once per save_delay seconds, on a background timer.
+
+    After a remove(), jobs that listed the removed job keep top_n - 1
+    neighbours until their next upsert or rebuild.
+    """
+
+    def __init__(self, top_n: int = 20, min_similarity: float = 0.0, persist_path: Optional[str] = None,
+                 save_delay: float = 5.0):
+        self.top_n = top_n
+        self.min_similarity = min_similarity
+        self.persist_path = persist_path
+        self.save_delay = save_delay
+        self.neighbors: Dict[int, Dict[int, float]] = {}
+        self.built_at: Optional[float] = None
+        self.version = 0
+        self._lock = threading.RLock()
+        self._listed_by: Dict[int, Set[int]] = {}  # job -> jobs whose lists contain it
+        self._floor_ids = np.zeros(0, dtype=np.int64)  # sorted ids of jobs with a list
+        self._floors = np.zeros(0, dtype=np.float32)  # weakest listed similarity, -inf while not full
+        self._save_timer: Optional[threading.Timer] = None
+        self.builds = 0
+        self.upserts = 0
+        self.removals = 0
+
+    def __len__(self) -> int:
+        return len(self.neighbors)
+
+    def __contains__(self, item_id: int) -> bool:
+        return item_id in self.neighbors
+
+    def _top(self, scores: np.ndarray, ids: np.ndarray, exclude: int) -> Dict[int, float]:
+        scores = np.where(ids == exclude, -np.inf, scores)
+        k = min(self.top_n, len(scores))
+        if k <= 0:
+            return {}
+        best = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+        return {
+            int(ids[offset]): float(scores[offset])
+            for offset in best
+            if scores[offset] > self.min_similarity
+        }
+
+    # ---- bookkeeping ---------------------------------------------------------------
+
+    def _reindex(self):
+        """Rebuild the reverse index and floors from self.neighbors (after build/load)"""
+        listed_by: Dict[int, Set[int]] = {}
+        for item_id, listed in self.neighbors.items():
+            for neighbor in listed:
+                listed_by.setdefault(neighbor, set()).add(item_id)
+        self._listed_by = listed_by
+        self._floor_ids = np.array(sorted(self.neighbors), dtype=np.int64)
+        self._floors = np.array([self._floor_of(int(item_id)) for item_id in self._floor_ids], dtype=np.float32)
+
+    def _floor_of(self, item_id: int) -> float:
+        listed = self.neighbors.get(item_id, {})
+        return min(listed.values()) if len(listed) >= self.top_n else -np.inf
+
+    def _set_floor(self, item_id: int):
+        position = int(np.searchsorted(self._floor_ids, item_id))
+        if position < len(self._floor_ids) and self._floor_ids[position] == item_id:
+            self._floors[position] = self._floor_of(item_id)
+        else:
+            self._floor_ids = np.insert(self._floor_ids, position, item_id)
+            self._floors = np.insert(self._floors, position, self._floor_of(item_id))
+
+    def _drop_floor(self, item_id: int):
+        position = int(np.searchsorted(self._floor_ids, item_id))
+        if position < len(self._floor_ids) and self._floor_ids[position] == item_id:
+            self._floor_ids = np.delete(self._floor_ids, position)
+            self._floors = np.delete(self._floors, position)
+
+    def _floors_for(self, ids: np.ndarray) -> np.ndarray:
+        """Floors aligned with ids (-inf for jobs without a full list)"""
+        if not len(self._floor_ids):
+            return np.full(len(ids), -np.inf, dtype=np.float32)
+        positions = np.minimum(np.searchsorted(self._floor_ids, ids), len(self._floor_ids) - 1)
+        return np.where(self._floor_ids[positions] == ids, self._floors[positions], -np.inf)
+
+    def _link(self, item_id: int, neighbor: int, similarity: float):
+        self.neighbors.setdefault(item_id, {})[neighbor] = similarity
+        self._listed_by.setdefault(neighbor, set()).add(item_id)
+
+    def _unlink(self, item_id: int, neighbor: int):
+        self.neighbors.get(item_id, {}).pop(neighbor, None)
+        listers = self._listed_by.get(neighbor)
+        if listers is not None:
+            listers.discard(item_id)
+            if not listers:
+                del self._listed_by[neighbor]
+
+    # ---- write path ---------------------------------------------------------------
+
+    def build(self, ids: np.ndarray, matrix: np.ndarray, block_size: int = 1024):
+        """Recompute the whole table from row-normalized vectors aligned with ids"""
+        started = time.perf_counter()
+        ids = np.asarray(ids, dtype=np.int64)
+        matrix = np.asarray(matrix, dtype=np.float32)
+        neighbors: Dict[int, Dict[int, float]] = {}
+        for start in range(0, len(ids), block_size):
+            block = matrix[start:start + block_size] @ matrix.T
+            for row, scores in enumerate(block):
+                item_id = int(ids[start + row])
+                neighbors[item_id] = self._top(scores, ids, item_id)
+        with self._lock:
+            self.neighbors = neighbors
+            self._reindex()
+            self.built_at = time.time()
+            self.version += 1
+            self.builds += 1
+        print(f"✅ Item similarity table built: {len(ids)} jobs x top {self.top_n} "
+              f"in {(time.perf_counter() - started) * 1000:.0f}ms")
+        self.save()
+
+    def upsert(self, item_id: int, vector, ids: np.ndarray, matrix: np.ndarray, save: bool = True):
+        """(Re)compute one job's neighbours and offer it as a neighbour to every other job"""
+        item_id = int(item_id)
+        vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(vector)
+        scores = np.asarray(matrix, dtype=np.float32) @ (vector / norm if norm > 0 else vector)
+        ids = np.asarray(ids, dtype=np.int64)
+        with self._lock:
+            self._discard(item_id)
+            for neighbor, similarity in self._top(scores, ids, item_id).items():
+                self._link(item_id, neighbor, similarity)
+            self.neighbors.setdefault(item_id, {})
+            self._set_floor(item_id)
+            # Only jobs whose list is not full or whose weakest entry is beaten take the new job
+            gains = (scores > self.min_similarity) & (scores > self._floors_for(ids)) & (ids != item_id)
+            for offset in np.flatnonzero(gains):
+                other = int(ids[offset])
+                listed = self.neighbors.get(other, {})
+                if len(listed) >= self.top_n:
+                    self._unlink(other, min(listed, key=listed.get))
+                self._link(other, item_id, float(scores[offset]))
+                self._set_floor(other)
+            self.version += 1
+            self.upserts += 1
+        if save:
+            self._schedule_save()
+
+    def _discard(self, item_id: int) -> bool:
+        listed = self.neighbors.get(item_id)
+        if listed is None:
+            return False
+        for neighbor in list(listed):
+            self._unlink(item_id, neighbor)
+        del self.neighbors[item_id]
+        self._drop_floor(item_id)
+        for lister in self._listed_by.pop(item_id, set()):
+            self.neighbors.get(lister, {}).pop(item_id, None)
+            self._set_floor(lister)
+        return True
+
+    def remove(self, item_id: int, save: bool = True) -> bool:
+        """Drop a closed or deleted job from the table"""
+        with self._lock:
+            removed = self._discard(int(item_id))
+            if removed:
+                self.version += 1
+                self.removals += 1
+        if removed and save:
+            self._schedule_save()
+        return removed
+
+    def build_from_index(self, index):
+        """Rebuild from a VectorMatrixIndex (rows are already normalized)"""
+        with index._lock:
+            ids, matrix = index.ids.copy(), index.matrix.copy()
+        self.build(ids, matrix)
+
+    def sync(self, index, rebuild_fraction: float = 0.1):
+        """
+        Reconcile with a reloaded VectorMatrixIndex: added jobs are upserted and
+        missing ones removed, or the table is rebuilt when it is empty or more
+        than rebuild_fraction of the jobs changed.
+        """
+        with index._lock:
+            ids, matrix = index.ids.copy(), index.matrix.copy()
+        current = set(int(item_id) for item_id in ids)
+        with self._lock:
+            known = set(self.neighbors)
+        added, removed = current - known, known - current
+        if not known or len(added) + len(removed) > rebuild_fraction * max(len(current), 1):
+            self.build(ids, matrix)
+            return
+        if not added and not removed:
+            return
+        offset_of = {int(item_id): offset for offset, item_id in enumerate(ids)}
+        for item_id in removed:
+            self.remove(item_id, save=False)
+        for item_id in added:
+            self.upsert(item_id, matrix[offset_of[item_id]], ids, matrix, save=False)
+        self.save()
+
+    # ---- read path ---------------------------------------------------------------
+
+    def score(self, history: Dict[int, float]) -> Dict[int, float]:
+        """Best weighted similarity of each neighbour of the history jobs (history jobs excluded)"""
+        scores: Dict[int, float] = {}
+        with self._lock:
+            for item_id, weight in history.items():
+                for neighbor, similarity in self.neighbors.get(item_id, {}).items():
+                    if neighbor in history:
+                        continue
+                    weighted = similarity * weight
+                    if weighted > scores.get(neighbor, 0.0):
+                        scores[neighbor] = weighted
+        return scores
+
+    # ---- persistence ---------------------------------------------------------------
+
+    def _schedule_save(self):
+        """Coalesce saves after single writes into one, save_delay seconds later, off the caller's thread"""
+        if not self.persist_path:
+            return
+        if self.save_delay <= 0:
+            self.save()
+            return
+        with self._lock:
+            if self._save_timer is not None:
+                return
+            self._save_timer = threading.Timer(self.save_delay, self._save_scheduled)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def _save_scheduled(self):
+        with self._lock:
+            self._save_timer = None
+        self.save()
+
+    def save(self, path: Optional[str] = None):
+        """Write the table as <path>.npz: ids plus -1 padded (ids x top_n) neighbour/similarity arrays"""
+        path = path or self.persist_path
+        if not path:
+            return
+        with self._lock:
+            ids = np.fromiter(self.neighbors, dtype=np.int64, count=len(self.neighbors))
+            neighbor_ids = np.full((len(ids), self.top_n), -1, dtype=np.int64)
+            similarities = np.zeros((len(ids), self.top_n), dtype=np.float32)
+            for row, item_id in enumerate(ids):
+                listed = self.neighbors[int(item_id)]
+                neighbor_ids[row, :len(listed)] = list(listed)
+                similarities[row, :len(listed)] = list(listed.values())
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            np.savez(path, ids=ids, neighbor_ids=neighbor_ids, similarities=similarities,
+                     top_n=np.array([self.top_n]))
+        except OSError as e:
+            print(f"⚠️ Could not save item similarity table: {e}")
+
+    def load(self, path: Optional[str] = None) -> bool:
+        """Load a table written by save(); False if there is none or top_n changed"""
+        path = path or self.persist_path
+        if not path or not os.path.exists(path):
+            return False
+        with np.load(path) as arrays:
+            if int(arrays["top_n"][0]) != self.top_n:
+                return False
+            neighbors = {
+                int(item_id): {int(n): float(s) for n, s in zip(row_ids, row_sims) if n >= 0}
+                for item_id, row_ids, row_sims in zip(arrays["ids"], arrays["neighbor_ids"], arrays["similarities"])
+            }
+        with self._lock:
+            self.neighbors = neighbors
+            self._reindex()
+            self.built_at = os.path.getmtime(path)
+            self.version += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "items": len(self.neighbors),
+            "top_n": self.top_n,
+            "links": sum(len(listed) for listed in self.neighbors.values()),
+            "built_at": self.built_at,
+            "builds": self.builds,
+            "upserts": self.upserts,
+            "removals": self.removals,
+        }
+
+
+# Global instance (persisted next to the vector index snapshots)
+item_similarity = ItemSimilarityIndex(
+    top_n=int(os.getenv('ITEM_SIMILARITY_TOP_N', 20)),
+    persist_path=os.path.join(os.getenv('VECTOR_INDEX_DIR', 'vector_index'), 'item_similarity.npz'),
+)
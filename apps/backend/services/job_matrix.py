@@ -0,0 +1,109 @@
+# services/job_matrix.py - Prebuilt job-vector matrix for batched content-based scoring
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .vector_storage import vector_from_columns
+
+
+def job_vector(job: Dict[str, Any], dimension: int) -> Optional[np.ndarray]:
+    """A job's skill vector, else its stored description vector; None if it has neither"""
+    try:
+        if job.get('skill_vector') is not None:
+            vector = np.asarray(job['skill_vector'], dtype=np.float32).reshape(-1)
+            return vector if vector.shape == (dimension,) else None
+    except (TypeError, ValueError):
+        return None
+    return vector_from_columns(job.get('desc_vector_blob'), job.get('desc_vector_json'), dimension)
+
+
+class JobVectorMatrix:
+    """
+    Job vectors stacked once into a row-normalized float32 matrix, with the
+    job records aligned to its rows.
+
+    Scoring every job for a user is then one matrix-vector product, scoring a
+    batch of users one matrix-matrix product, and the top k per user comes
+    from argpartition instead of sorting every job. Build it once per job
+    snapshot (from_jobs) or copy the resident vector index (from_index) and
+    reuse it across requests.
+    """
+
+    def __init__(self, ids: Sequence[int], matrix: np.ndarray, jobs: Optional[List[Dict[str, Any]]] = None,
+                 normalized: bool = False):
+        matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        if matrix.ndim != 2 or matrix.shape[0] != len(ids):
+            raise ValueError(f"Expected a ({len(ids)}, dim) matrix, got {matrix.shape}")
+        if not normalized and len(ids):
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            matrix = matrix / norms
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.matrix = matrix
+        self.dimension = matrix.shape[1]
+        self.jobs = jobs if jobs is not None else [{'id': int(job_id)} for job_id in self.ids]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_jobs(cls, all_jobs: Sequence[Dict[str, Any]], dimension: int) -> "JobVectorMatrix":
+        """Stack the vectors of job records; jobs without a usable vector are left out"""
+        ids, vectors, jobs = [], [], []
+        for job in all_jobs:
+            vector = job_vector(job, dimension)
+            if vector is None:
+                continue
+            ids.append(int(job.get('id') or job.get('job_id') or 0))
+            vectors.append(vector)
+            jobs.append(job)
+        matrix = np.vstack(vectors) if vectors else np.zeros((0, dimension), dtype=np.float32)
+        return cls(ids, matrix, jobs)
+
+    @classmethod
+    def from_index(cls, index) -> "JobVectorMatrix":
+        """Snapshot of a VectorMatrixIndex (rows are already normalized)"""
+        with index._lock:
+            ids = index.ids.copy()
+            matrix = index.matrix.copy()
+            jobs = [{**payload, 'id': int(job_id)} for job_id, payload in zip(ids, index.payloads)]
+        return cls(ids, matrix, jobs, normalized=True)
+
+    def score(self, user_vectors) -> np.ndarray:
+        """Cosine similarities: (jobs,) for one user vector, (users, jobs) for a stack of them"""
+        users = np.asarray(user_vectors, dtype=np.float32)
+        single = users.ndim == 1
+        users = np.atleast_2d(users)
+        if users.shape[1] != self.dimension:
+            raise ValueError(f"Expected {self.dimension}-dim user vectors, got {users.shape[1]}")
+        norms = np.linalg.norm(users, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        scores = (users / norms) @ self.matrix.T
+        return scores[0] if single else scores
+
+    def top_k(self, user_vectors, k: int, min_score: Optional[float] = None,
+              chunk_size: int = 1024) -> List[List[Tuple[int, float]]]:
+        """Per user, up to k (row offset, score) pairs best first, keeping scores > min_score"""
+        users = np.atleast_2d(np.asarray(user_vectors, dtype=np.float32))
+        results: List[List[Tuple[int, float]]] = []
+        count = len(self)
+        k = min(k, count)
+        if k <= 0:
+            return [[] for _ in range(len(users))]
+
+        for start in range(0, len(users), chunk_size):
+            scores = self.score(users[start:start + chunk_size])
+            if k < count:
+                best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            else:
+                best = np.broadcast_to(np.arange(count), (len(scores), count))
+            best_scores = np.take_along_axis(scores, best, axis=1)
+            order = np.argsort(-best_scores, axis=1, kind="stable")
+            best = np.take_along_axis(best, order, axis=1)
+            best_scores = np.take_along_axis(best_scores, order, axis=1)
+            for offsets, row_scores in zip(best, best_scores):
+                results.append([
+                    (int(offset), float(score))
+                    for offset, score in zip(offsets, row_scores)
+                    if min_score is None or score > min_score
+                ])
+        return results
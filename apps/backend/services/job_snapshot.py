@@ -0,0 +1,166 @@
+# services/job_snapshot.py - Versioned in-memory job catalog with memoized query results
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+# loader(job_ids) -> rows (dicts with an "id" key); job_ids=None loads the whole catalog
+JobLoader = Callable[[Optional[List[int]]], List[Dict[str, Any]]]
+
+
+class JobSnapshot:
+    """
+    Holds every job row get_cached_jobs serves, keyed by id, plus a version
+    that is bumped on each write. Whole-catalog reads hand out the same
+    immutable tuple until the next write; filtered results are memoized in an
+    LRU keyed by (version, query key), so a write invalidates them implicitly.
+
+    Writes are incremental: refresh(job_ids) re-reads just those rows through
+    the loader (a row the loader no longer returns is dropped) and discard()
+    removes a closed job. A full reload only happens on first use or when the
+    snapshot is older than max_age_seconds, which bounds staleness for writes
+    made by other processes. Rows and results are shared between callers and
+    must be treated as read-only.
+    """
+
+    def __init__(self, loader: Optional[JobLoader] = None, max_results: int = 256,
+                 max_age_seconds: float = 300):
+        self.loader = loader
+        self.max_results = max_results
+        self.max_age_seconds = max_age_seconds
+        self.version = 0
+        self._rows: Dict[int, Dict[str, Any]] = {}
+        self._snapshot: Optional[Tuple[Dict[str, Any], ...]] = None
+        self._loaded_at: Optional[float] = None
+        self._results: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.full_loads = 0
+        self.row_refreshes = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    # ---- loading -------------------------------------------------------------
+
+    def _is_stale(self) -> bool:
+        if self._loaded_at is None:
+            return True
+        return self.max_age_seconds > 0 and time.monotonic() - self._loaded_at > self.max_age_seconds
+
+    def load(self, rows: Iterable[Dict[str, Any]]):
+        """Replace the whole catalog"""
+        with self._lock:
+            self._rows = {row["id"]: row for row in rows}
+            self._loaded_at = time.monotonic()
+            self.full_loads += 1
+            self._bump()
+
+    def _ensure_loaded(self):
+        if not self._is_stale() or self.loader is None:
+            return
+        with self._lock:
+            if self._is_stale():
+                self.load(self.loader(None))
+
+    def _bump(self):
+        self.version += 1
+        self._snapshot = None
+        self._results.clear()
+
+    # ---- reads ---------------------------------------------------------------
+
+    def all(self) -> Tuple[Dict[str, Any], ...]:
+        """Every job in id order; the same tuple is returned until the next write"""
+        self._ensure_loaded()
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = tuple(self._rows[job_id] for job_id in sorted(self._rows))
+            return self._snapshot
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        self._ensure_loaded()
+        return self._rows.get(job_id)
+
+    def memoize(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Result of compute() for key at the current version, computed at most once per version"""
+        self._ensure_loaded()
+        with self._lock:
+            version = self.version
+            cache_key = (version, key)
+            if cache_key in self._results:
+                self._results.move_to_end(cache_key)
+                self.hits += 1
+                return self._results[cache_key]
+            self.misses += 1
+
+        result = compute()
+        with self._lock:
+            if self.version == version and self.max_results > 0:  # not invalidated meanwhile
+                self._results[cache_key] = result
+                while len(self._results) > self.max_results:
+                    self._results.popitem(last=False)
+                    self.evictions += 1
+        return result
+
+    # ---- write-through -------------------------------------------------------
+
+    def upsert(self, row: Dict[str, Any]):
+        with self._lock:
+            self._rows[row["id"]] = row
+            self._bump()
+
+    def discard(self, job_id: int):
+        """Drop a closed or deleted job"""
+        with self._lock:
+            if self._rows.pop(job_id, None) is not None:
+                self._bump()
+
+    def refresh(self, job_ids: Iterable[int]):
+        """Re-read created or updated jobs through the loader"""
+        job_ids = [int(job_id) for job_id in job_ids]
+        if not job_ids or self.loader is None:
+            return
+        if self._loaded_at is None:
+            return  # nothing cached yet; the first read loads everything
+        rows = {row["id"]: row for row in self.loader(job_ids)}
+        with self._lock:
+            for job_id in job_ids:
+                if job_id in rows:
+                    self._rows[job_id] = rows[job_id]
+                else:
+                    self._rows.pop(job_id, None)
+            self.row_refreshes += len(job_ids)
+            self._bump()
+
+    def invalidate(self):
+        """Force a full reload on the next read"""
+        with self._lock:
+            self._loaded_at = None
+            self._bump()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "version": self.version,
+            "jobs": len(self._rows),
+            "cached_results": len(self._results),
+            "max_results": self.max_results,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "full_loads": self.full_loads,
+            "row_refreshes": self.row_refreshes,
+            "age_seconds": round(time.monotonic() - self._loaded_at, 1) if self._loaded_at else None,
+        }
+
+
+# Global instance (app.py sets the loader)
+job_snapshot = JobSnapshot(
+    max_results=int(os.getenv('JOB_CACHE_RESULTS', 256)),
+    max_age_seconds=float(os.getenv('JOB_CACHE_MAX_AGE_SECONDS', 300)),
+)
@@ -0,0 +1,248 @@
+# services/job_translations.py - Ingest-time pre-translation of job postings
+#
+# Non-English job search used to send the same titles, descriptions and
+# company names to the translator on every request. Postings are now
+# translated once, in the background, when they are created (or the first
+# time a search returns them untranslated) into job_translations, keyed by
+# (job_id, field, lang). Each row records the sha256 of the source text it was
+# translated from: after an edit the hash no longer matches, the row is
+# treated as missing and the posting is re-translated.
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .translation_memory import source_hash
+
+TABLE = "job_translations"
+JOB_FIELDS = ("title", "description", "company")
+
+# (texts, target_lang) -> translations in the same order
+TranslateManyFn = Callable[[Sequence[str], str], Awaitable[List[str]]]
+
+
+def ensure_job_translations(conn, use_sqlite: bool):
+    """Idempotent migration for the side table"""
+    cursor = conn.cursor()
+    try:
+        if use_sqlite:
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {TABLE} (
+                    job_id INTEGER NOT NULL,
+                    field VARCHAR(32) NOT NULL,
+                    lang VARCHAR(8) NOT NULL,
+                    source_hash CHAR(64) NOT NULL,
+                    translated_text TEXT NOT NULL,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (job_id, field, lang)
+                )
+            """)
+        else:
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {TABLE} (
+                    job_id INT NOT NULL,
+                    field VARCHAR(32) NOT NULL,
+                    lang VARCHAR(8) NOT NULL,
+                    source_hash CHAR(64) NOT NULL,
+                    translated_text TEXT NOT NULL,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                    PRIMARY KEY (job_id, field, lang)
+                )
+            """)
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+def fetch_job_translations(conn, use_sqlite: bool, sources: Dict[int, Dict[str, str]],
+                           lang: str) -> Tuple[Dict[int, Dict[str, str]], int]:
+    """Fresh translations {job_id: {field: text}} for sources, plus how many stored rows were stale"""
+    if not sources:
+        return {}, 0
+    mark = "?" if use_sqlite else "%s"
+    job_ids = list(sources)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"""
+            SELECT job_id, field, source_hash, translated_text FROM {TABLE}
+            WHERE lang = {mark} AND job_id IN ({', '.join([mark] * len(job_ids))})
+        """, [lang] + job_ids)
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+
+    fresh: Dict[int, Dict[str, str]] = {}
+    stale = 0
+    for job_id, field, hash_, translated in rows:
+        source = sources.get(job_id, {}).get(field)
+        if source is None:
+            continue
+        if hash_ == source_hash(source):
+            fresh.setdefault(job_id, {})[field] = translated
+        else:
+            stale += 1
+    return fresh, stale
+
+
+def store_job_translations(conn, use_sqlite: bool, rows: Iterable[Tuple[int, str, str, str, str]]) -> int:
+    """Upsert (job_id, field, lang, source_hash, translated_text) rows"""
+    rows = list(rows)
+    if not rows:
+        return 0
+    mark = "?" if use_sqlite else "%s"
+    cursor = conn.cursor()
+    try:
+        cursor.executemany(f"""
+            REPLACE INTO {TABLE} (job_id, field, lang, source_hash, translated_text)
+            VALUES ({mark}, {mark}, {mark}, {mark}, {mark})
+        """, rows)
+        conn.commit()
+    finally:
+        cursor.close()
+    return len(rows)
+
+
+class JobPretranslator:
+    """
+    Background translation of job postings into every language, served from
+    job_translations at search time.
+
+    schedule() is called after a posting is committed and returns at once;
+    the translation runs as a task through translate_many (the deduplicating
+    batcher, so catalogue and translation-memory hits never reach Google).
+    lookup() is the request path: one indexed read for the page of jobs, no
+    translator calls. Jobs it finds missing or stale are scheduled, so
+    postings created before pre-translation fill in as they are searched.
+    Results identical to the source (translator failures, or text that
+    needs no translation) are not stored; a posting already translated at
+    its current text is not rescheduled for them.
+    """
+
+    def __init__(self, translate_many: TranslateManyFn, connect: Callable[[], Any], use_sqlite: Optional[bool] = None,
+                 languages: Sequence[str] = (), executor=None, name: str = "jobs"):
+        self.translate_many = translate_many
+        self.connect = connect
+        self.use_sqlite = use_sqlite
+        self.languages = [lang for lang in languages if lang != "en"]
+        self.executor = executor
+        self.name = name
+        self._table_ready = False
+        self._pending: Set[int] = set()
+        self._settled: "OrderedDict[int, Tuple[str, ...]]" = OrderedDict()  # job_id -> source hashes translated
+        self._tasks: Set[asyncio.Task] = set()
+        self.scheduled = 0
+        self.jobs_translated = 0
+        self.rows_written = 0
+        self.failures = 0
+        self.fresh_hits = 0
+        self.stale_rows = 0
+        self.missing = 0
+
+    # ---- database ---------------------------------------------------------------
+
+    def _is_sqlite(self, conn) -> bool:
+        if self.use_sqlite is not None:
+            return self.use_sqlite
+        return not getattr(conn, "is_mariadb", False)
+
+    def _with_connection(self, fn: Callable, *args):
+        conn = self.connect()
+        if conn is None:
+            raise RuntimeError("Database connection failed")
+        try:
+            use_sqlite = self._is_sqlite(conn)
+            if not self._table_ready:
+                ensure_job_translations(conn, use_sqlite)
+                self._table_ready = True
+            return fn(conn, use_sqlite, *args)
+        finally:
+            conn.close()
+
+    async def _run_db(self, fn: Callable, *args):
+        if self.executor is not None:
+            return await self.executor.run_sync(self._with_connection, fn, *args)
+        return await asyncio.to_thread(self._with_connection, fn, *args)
+
+    # ---- write path ---------------------------------------------------------------
+
+    def schedule(self, job_id: int, sources: Dict[str, str]) -> Optional[asyncio.Task]:
+        """Pre-translate a committed posting in the background; no-op if one is already queued"""
+        if job_id in self._pending or not self.languages:
+            return None
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return None  # no event loop (CLI/tests) - translated on first search instead
+        self._pending.add(job_id)
+        self.scheduled += 1
+        task = loop.create_task(self.pretranslate(job_id, sources), name=f"{self.name}-pretranslate-{job_id}")
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def pretranslate(self, job_id: int, sources: Dict[str, str]) -> int:
+        """Translate every field into every language and store the results; returns rows written"""
+        try:
+            fields = [field for field in JOB_FIELDS if sources.get(field) and sources[field].strip()]
+            texts = [sources[field] for field in fields]
+            results = await asyncio.gather(*(self.translate_many(texts, lang) for lang in self.languages))
+            rows = [
+                (job_id, field, lang, source_hash(text), translated)
+                for lang, translations in zip(self.languages, results)
+                for field, text, translated in zip(fields, texts, translations)
+                if translated and translated != text
+            ]
+            written = await self._run_db(store_job_translations, rows)
+            self._settle(job_id, sources)
+            self.jobs_translated += 1
+            self.rows_written += written
+            return written
+        except Exception as e:
+            self.failures += 1
+            print(f"⚠️ Pre-translation failed for job {job_id}: {e}")
+            return 0
+        finally:
+            self._pending.discard(job_id)
+
+    def _signature(self, sources: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(source_hash(sources.get(field) or "") for field in JOB_FIELDS)
+
+    def _settle(self, job_id: int, sources: Dict[str, str], max_jobs: int = 10000):
+        self._settled[job_id] = self._signature(sources)
+        self._settled.move_to_end(job_id)
+        while len(self._settled) > max_jobs:
+            self._settled.popitem(last=False)
+
+    # ---- request path ---------------------------------------------------------------
+
+    async def lookup(self, sources: Dict[int, Dict[str, str]], lang: str) -> Dict[int, Dict[str, str]]:
+        """Stored translations {job_id: {field: text}} for the current source texts; schedules the gaps"""
+        if lang == "en" or lang not in self.languages or not sources:
+            return {}
+        try:
+            fresh, stale = await self._run_db(fetch_job_translations, sources, lang)
+        except Exception as e:
+            print(f"⚠️ Job translation lookup failed: {e}")
+            return {}
+        self.stale_rows += stale
+        for job_id, fields in sources.items():
+            expected = sum(1 for field in JOB_FIELDS if fields.get(field) and fields[field].strip())
+            found = len(fresh.get(job_id, {}))
+            self.fresh_hits += found
+            if found < expected:
+                self.missing += expected - found
+                if self._settled.get(job_id) != self._signature(fields):
+                    self.schedule(job_id, fields)
+        return fresh
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "languages": len(self.languages),
+            "pending_jobs": len(self._pending),
+            "scheduled": self.scheduled,
+            "jobs_translated": self.jobs_translated,
+            "rows_written": self.rows_written,
+            "failures": self.failures,
+            "fresh_hits": self.fresh_hits,
+            "stale_rows": self.stale_rows,
+            "missing": self.missing,
+        }
@@ -0,0 +1,182 @@
+# services/lexical_index.py - In-process BM25 inverted index and rank fusion for hybrid search
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from in into is it of on or the to with we you our your will
+this that job role work working team experience
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case word tokens; keeps terms like c++, c#, node.js and drops stopwords"""
+    return [token for token in _TOKEN.findall((text or "").lower()) if token not in STOPWORDS]
+
+
+class BM25Index:
+    """
+    Okapi BM25 over an inverted index of term -> {doc_id: term frequency}.
+
+    Documents are added, replaced and removed one at a time so the index can
+    follow job creates/updates without a rebuild. A query only touches the
+    posting lists of its own terms, never the whole corpus.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.doc_lengths: Dict[int, int] = {}
+        self.doc_terms: Dict[int, Tuple[str, ...]] = {}
+        self.payloads: Dict[int, Dict[str, Any]] = {}
+        self.total_length = 0
+        self.version = 0
+        self.loaded_at: Optional[float] = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def __contains__(self, doc_id: int) -> bool:
+        return doc_id in self.doc_lengths
+
+    def build(self, docs: Iterable[Tuple[int, str, Optional[Dict[str, Any]]]]):
+        """Replace the index contents with (doc_id, text, payload) documents"""
+        with self._lock:
+            self.postings, self.doc_lengths, self.doc_terms, self.payloads = {}, {}, {}, {}
+            self.total_length = 0
+            for doc_id, text, payload in docs:
+                self._add(int(doc_id), text, payload)
+            self.version += 1
+            self.loaded_at = time.time()
+
+    def _add(self, doc_id: int, text: str, payload: Optional[Dict[str, Any]]):
+        tokens = tokenize(text)
+        counts = Counter(tokens)
+        for term, tf in counts.items():
+            self.postings.setdefault(term, {})[doc_id] = tf
+        self.doc_lengths[doc_id] = len(tokens)
+        self.doc_terms[doc_id] = tuple(counts)
+        self.payloads[doc_id] = payload or {}
+        self.total_length += len(tokens)
+
+    def _remove(self, doc_id: int) -> bool:
+        if doc_id not in self.doc_lengths:
+            return False
+        for term in self.doc_terms.pop(doc_id):
+            docs = self.postings.get(term)
+            if docs is not None:
+                docs.pop(doc_id, None)
+                if not docs:
+                    del self.postings[term]
+        self.total_length -= self.doc_lengths.pop(doc_id)
+        self.payloads.pop(doc_id, None)
+        return True
+
+    def upsert(self, doc_id: int, text: str, payload: Optional[Dict[str, Any]] = None):
+        with self._lock:
+            self._remove(int(doc_id))
+            self._add(int(doc_id), text, payload)
+            self.version += 1
+
+    def remove(self, doc_id: int) -> bool:
+        with self._lock:
+            removed = self._remove(int(doc_id))
+            if removed:
+                self.version += 1
+            return removed
+
+    def get_payload(self, doc_id: int) -> Optional[Dict[str, Any]]:
+        return self.payloads.get(int(doc_id))
+
+    def search(self, query: str, top_k: int = 10,
+               accept: Optional[Callable[[int], bool]] = None) -> List[Tuple[int, float]]:
+        """Top-k (doc_id, bm25_score), best first; accept(doc_id) filters the matching documents"""
+        terms = set(tokenize(query))
+        with self._lock:
+            count = len(self.doc_lengths)
+            if not terms or count == 0 or top_k <= 0:
+                return []
+            avg_length = self.total_length / count or 1.0
+            scores: Dict[int, float] = {}
+            rejected = set()
+            for term in terms:
+                docs = self.postings.get(term)
+                if not docs:
+                    continue
+                idf = math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+                for doc_id, tf in docs.items():
+                    if accept is not None and doc_id not in scores:
+                        if doc_id in rejected or not accept(doc_id):
+                            rejected.add(doc_id)
+                            continue
+                    norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / avg_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:top_k]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "documents": len(self.doc_lengths),
+            "terms": len(self.postings),
+            "postings": sum(len(docs) for docs in self.postings.values()),
+            "avg_doc_length": round(self.total_length / len(self.doc_lengths), 1) if self.doc_lengths else 0.0,
+            "version": self.version,
+            "loaded_at": self.loaded_at,
+        }
+
+    def save(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            data = {
+                "k1": self.k1,
+                "b": self.b,
+                "postings": self.postings,
+                "doc_lengths": self.doc_lengths,
+                "payloads": self.payloads,
+            }
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+
+    def load(self, path: str) -> bool:
+        if not os.path.exists(path):
+            return False
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        postings = {term: {int(doc_id): tf for doc_id, tf in docs.items()} for term, docs in data["postings"].items()}
+        doc_terms: Dict[int, List[str]] = {}
+        for term, docs in postings.items():
+            for doc_id in docs:
+                doc_terms.setdefault(doc_id, []).append(term)
+        with self._lock:
+            self.k1, self.b = data["k1"], data["b"]
+            self.postings = postings
+            self.doc_lengths = {int(doc_id): length for doc_id, length in data["doc_lengths"].items()}
+            self.doc_terms = {doc_id: tuple(doc_terms.get(doc_id, ())) for doc_id in self.doc_lengths}
+            self.payloads = {int(doc_id): payload for doc_id, payload in data["payloads"].items()}
+            self.total_length = sum(self.doc_lengths.values())
+            self.version += 1
+            self.loaded_at = os.path.getmtime(path)
+        return True
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[int]], k: int = 60,
+                           weights: Optional[Sequence[float]] = None) -> List[Tuple[int, float]]:
+    """Fuse ranked id lists: score(d) = sum_i w_i / (k + rank_i(d)), best first"""
+    weights = weights or [1.0] * len(rankings)
+    fused: Dict[int, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, doc_id in enumerate(ranking, start=1):
+            fused[doc_id] = fused.get(doc_id, 0.0) + weight / (k + rank)
+    return sorted(fused.items(), key=lambda item: (-item[1], item[0]))
@@ -0,0 +1,103 @@
+# services/principal_cache.py - Short-TTL LRU cache of authenticated users keyed by token subject
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class PrincipalCache:
+    """
+    Caches the users row that get_current_user loads for a JWT subject, so an
+    authenticated request skips the database while the entry is fresh.
+
+    Entries are keyed by (subject, variant) because the two get_current_user
+    implementations select different columns. invalidate(subject) drops every
+    variant and bumps the subject's generation; a lookup that started before
+    the invalidation passes its generation to put() and is discarded, so a
+    slow read can never re-insert a row from before a role/password change.
+    Only successful lookups are cached.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 60):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def generation(self, subject: str) -> int:
+        with self._lock:
+            return self._generations.get(subject, 0)
+
+    def get(self, subject: str, variant: str = "default") -> Optional[Dict[str, Any]]:
+        key = (subject, variant)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                user, created_at = entry
+                if self.ttl_seconds <= 0 or now - created_at <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return dict(user)  # handlers may mutate their copy
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return None
+
+    def put(self, subject: str, user: Dict[str, Any], variant: str = "default",
+            generation: Optional[int] = None):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self._generations.get(subject, 0):
+                return  # invalidated while the row was being read
+            key = (subject, variant)
+            self._entries[key] = (dict(user), time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, subject: str):
+        """Drop a user's cached principal after a role, password or profile change"""
+        with self._lock:
+            self._generations[subject] = self._generations.get(subject, 0) + 1
+            for key in [key for key in self._entries if key[0] == subject]:
+                del self._entries[key]
+            self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+# Global instance
+principal_cache = PrincipalCache(
+    max_entries=int(os.getenv('AUTH_CACHE_SIZE', 10000)),
+    ttl_seconds=float(os.getenv('AUTH_CACHE_TTL_SECONDS', 60)),
+)
@@ -3,115 +3,182 @@ import numpy as np
 from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.preprocessing import StandardScaler
 from typing import List, Dict, Any, Optional
+import heapq
 import json
 from collections import defaultdict
 import pandas as pd
 from datetime import datetime, timedelta
+from .vector_storage import vector_from_columns
+from .job_matrix import JobVectorMatrix
+from .item_similarity import ItemSimilarityIndex, item_similarity
 
 class AdvancedRecommendationEngine:
     def __init__(self):
         """Initialize the advanced recommendation engine"""
         self.scaler = StandardScaler()
+        # InteractionStore (logged views/saves/applications as a CSR user x job matrix), assigned by app.py
         self.user_item_matrix = None
-        self.item_similarity_matrix = None
+        # Top-N similar jobs per job, maintained by the vector service as jobs change
+        self.item_similarity_matrix = item_similarity
         self.is_trained = False
 
+        # Job vectors for content-based scoring, stacked once per job list; with no job list,
+        # a snapshot of the vector service's job index, re-taken when the index changes
+        self.job_matrix: Optional[JobVectorMatrix] = None
+        self.vector_service = None
+        self._job_matrix_version = None
+        self._content_matrix = None
+        self._collaborative_index = None
+        self._jobs_index = None
+
         # Collaborative filtering parameters
         self.min_common_users = 3
         self.top_k_similar_items = 10
 
         print("✅ Advanced Recommendation Engine initialized!")
 
-    def content_based_recommend(self, user_skills: List[str],
-                              all_jobs: List[Dict], top_k: int = 5) -> List[Dict]:
-        """Content-based filtering using skill vectors"""
-        user_vector = self._get_user_skill_vector(user_skills)
-
-        recommendations = []
-        for job in all_jobs:
-            if 'skill_vector' in job or 'desc_vector_json' in job:
-                try:
-                    # Try skill vector first, fallback to description vector
-                    vector_field = 'skill_vector' if 'skill_vector' in job else 'desc_vector_json'
-                    if vector_field.endswith('_json'):
-                        job_vector = json.loads(job[vector_field])
-                    else:
-                        job_vector = job[vector_field]
+    def content_based_recommend(self, user_skills: List[str], all_jobs: Optional[List[Dict]] = None,
+                                top_k: int = 5, job_matrix: Optional[JobVectorMatrix] = None) -> List[Dict]:
+        """Content-based filtering using skill vectors (one matrix product over all jobs)"""
+        return self.content_based_recommend_many([user_skills], all_jobs, top_k, job_matrix)[0]
 
-                    similarity = self._calculate_similarity(user_vector, job_vector)
-
-                    if similarity > 0.1:  # Minimum relevance threshold
-                        recommendations.append({
-                            **job,
-                            'similarity_score': round(similarity * 100, 2),
-                            'recommendation_type': 'content_based',
-                            'match_confidence': self._calculate_confidence(similarity)
-                        })
-                except Exception as e:
-                    print(f"⚠️ Error in content-based recommendation for job {job.get('id')}: {e}")
-                    continue
-
-        return sorted(recommendations, key=lambda x: x['similarity_score'], reverse=True)[:top_k]
+    def content_based_recommend_many(self, skill_lists: List[List[str]], all_jobs: Optional[List[Dict]] = None,
+                                     top_k: int = 5, job_matrix: Optional[JobVectorMatrix] = None) -> List[List[Dict]]:
+        """content_based_recommend for a batch of users (offline jobs): one embedding batch, one GEMM per chunk"""
+        if not skill_lists:
+            return []
+        user_vectors = self._get_user_skill_vectors(skill_lists)
+        matrix = job_matrix or self._job_matrix_for(all_jobs, user_vectors.shape[1])
+
+        results = []
+        for picks in matrix.top_k(user_vectors, top_k, min_score=0.1):  # Minimum relevance threshold
+            results.append([
+                {
+                    **matrix.jobs[offset],
+                    'similarity_score': round(similarity * 100, 2),
+                    'recommendation_type': 'content_based',
+                    'match_confidence': self._calculate_confidence(similarity)
+                }
+                for offset, similarity in picks
+            ])
+        return results
+
+    def set_job_matrix(self, job_matrix: Optional[JobVectorMatrix]):
+        """Prebuilt matrix used when no all_jobs are passed (e.g. JobVectorMatrix.from_index)"""
+        self.job_matrix = job_matrix
+
+    def attach_vector_service(self, vector_service):
+        """Serve all_jobs=None requests from the vector service's resident job index"""
+        self.vector_service = vector_service
+        self._job_matrix_version = None
+
+    def _index_job_matrix(self) -> Optional[JobVectorMatrix]:
+        """The attached index as a JobVectorMatrix, re-snapshotted whenever its version changes"""
+        if self.vector_service is not None:
+            try:
+                index = self.vector_service.loaded_job_index()
+                version = index.version
+                if self.job_matrix is None or version != self._job_matrix_version:
+                    self.job_matrix = JobVectorMatrix.from_index(index)
+                    self._job_matrix_version = version
+            except Exception as e:
+                print(f"⚠️ Job index unavailable for recommendations: {e}")
+        return self.job_matrix
+
+    def _job_matrix_for(self, all_jobs: Optional[List[Dict]], dimension: int) -> JobVectorMatrix:
+        """Matrix for all_jobs, stacked once and reused while callers pass the same job list"""
+        if all_jobs is None:
+            matrix = self._index_job_matrix()
+            if matrix is not None:
+                return matrix
+        cached = self._content_matrix
+        if cached is not None and cached[0] is all_jobs and cached[1].dimension == dimension:
+            return cached[1]
+        matrix = JobVectorMatrix.from_jobs(all_jobs or [], dimension)
+        self._content_matrix = (all_jobs, matrix)
+        return matrix
 
     def collaborative_filter(self, user_history: List[Dict],
-                           all_jobs: List[Dict], top_k: int = 5) -> List[Dict]:
-        """Collaborative filtering based on user behavior patterns"""
-        if not user_history:
+                           all_jobs: Optional[List[Dict]] = None, top_k: int = 5,
+                           interaction_weights: Optional[Dict[int, float]] = None) -> List[Dict]:
+        """Collaborative filtering based on user behavior patterns (item-item similarity lookups)"""
+        if interaction_weights:
+            # Row of the stored user x job matrix: {job_id: time-decayed weight}
+            user_interactions = interaction_weights
+        elif not user_history:
             return []
-
-        # Build user-item interaction matrix from history
-        user_interactions = defaultdict(int)
-        for interaction in user_history:
-            job_id = interaction.get('job_id')
-            interaction_type = interaction.get('type', 'view')
-            weight = {'apply': 3, 'save': 2, 'view': 1}.get(interaction_type, 1)
-            user_interactions[job_id] += weight
-
-        # Find similar jobs based on user preferences
-        recommendations = []
-        interacted_job_ids = set(user_interactions.keys())
-
-        for job in all_jobs:
-            job_id = job.get('id') or job.get('job_id')
-            if job_id in interacted_job_ids:
-                continue  # Skip already interacted jobs
-
-            # Calculate similarity to user's preferred jobs
-            max_similarity = 0
-            for interacted_id, weight in user_interactions.items():
-                similar_job = next((j for j in all_jobs if (j.get('id') or j.get('job_id')) == interacted_id), None)
-                if similar_job and 'skill_vector' in similar_job:
-                    try:
-                        sim_vector = similar_job.get('skill_vector')
-                        job_vector = job.get('skill_vector')
-
-                        if sim_vector and job_vector:
-                            similarity = self._calculate_similarity(sim_vector, job_vector)
-                            weighted_similarity = similarity * weight
-                            max_similarity = max(max_similarity, weighted_similarity)
-                    except:
-                        continue
-
-            if max_similarity > 0.15:  # Minimum collaborative threshold
-                recommendations.append({
-                    **job,
-                    'collaborative_score': round(max_similarity * 100, 2),
-                    'recommendation_type': 'collaborative',
-                    'based_on_history': len(user_interactions)
-                })
-
-        return sorted(recommendations, key=lambda x: x['collaborative_score'], reverse=True)[:top_k]
+        else:
+            # Build user-item interaction matrix from history
+            user_interactions = defaultdict(int)
+            for interaction in user_history:
+                job_id = interaction.get('job_id')
+                interaction_type = interaction.get('type', 'view')
+                weight = {'apply': 3, 'save': 2, 'view': 1}.get(interaction_type, 1)
+                user_interactions[job_id] += weight
+
+        # Neighbours of the user's jobs, each scored by its best weighted similarity
+        similarity_index = self._item_similarity_for(all_jobs)
+        scores = similarity_index.score(user_interactions)
+        jobs_by_id = self._jobs_by_id(all_jobs)
+        known = all_jobs is not None or bool(jobs_by_id)  # only recommend jobs still listed
+        candidates = [
+            (score, job_id) for job_id, score in scores.items()
+            if score > 0.15 and (not known or job_id in jobs_by_id)  # Minimum collaborative threshold
+        ]
+
+        return [
+            {
+                **jobs_by_id.get(job_id, {'id': job_id}),
+                'collaborative_score': round(score * 100, 2),
+                'recommendation_type': 'collaborative',
+                'based_on_history': len(user_interactions)
+            }
+            for score, job_id in heapq.nlargest(top_k, candidates)
+        ]
+
+    def _item_similarity_for(self, all_jobs: Optional[List[Dict]]) -> ItemSimilarityIndex:
+        """The shared table kept in step with the job index, else one built once for this job list"""
+        if len(self.item_similarity_matrix) or all_jobs is None:
+            return self.item_similarity_matrix
+        cached = self._collaborative_index
+        if cached is not None and cached[0] is all_jobs:
+            return cached[1]
+        similarity_index = ItemSimilarityIndex(top_n=self.top_k_similar_items)
+        first = next((job['skill_vector'] for job in all_jobs if job.get('skill_vector') is not None), None)
+        if first is not None:
+            matrix = JobVectorMatrix.from_jobs(all_jobs, len(first))
+            similarity_index.build(matrix.ids, matrix.matrix)
+        self._collaborative_index = (all_jobs, similarity_index)
+        return similarity_index
+
+    def _jobs_by_id(self, all_jobs: Optional[List[Dict]]) -> Dict[Any, Dict]:
+        if all_jobs is None and self.job_matrix is not None:
+            all_jobs = self.job_matrix.jobs  # job details from the index payloads
+        cached = self._jobs_index
+        if cached is not None and cached[0] is all_jobs:
+            return cached[1]
+        jobs_by_id = {(job.get('id') or job.get('job_id')): job for job in all_jobs or []}
+        self._jobs_index = (all_jobs, jobs_by_id)
+        return jobs_by_id
 
     def hybrid_recommend(self, user_id: int, user_skills: List[str],
-                        user_history: List[Dict], all_jobs: List[Dict],
-                        weights: Dict[str, float] = None) -> List[Dict]:
+                        user_history: List[Dict], all_jobs: Optional[List[Dict]] = None,
+                        weights: Dict[str, float] = None,
+                        interaction_weights: Optional[Dict[int, float]] = None) -> List[Dict]:
         """Hybrid: Content-based + Collaborative filtering combined"""
         if weights is None:
             weights = {'content': 0.6, 'collaborative': 0.4}
+        if interaction_weights is None and not user_history and self.user_item_matrix is not None:
+            try:
+                interaction_weights = self.user_item_matrix.user_weights(user_id)
+            except Exception as e:
+                # No stored history is better than no recommendations
+                print(f"⚠️ Interaction history unavailable for user {user_id}: {e}")
+                interaction_weights = {}
 
         # Get recommendations from both methods
         content_recs = self.content_based_recommend(user_skills, all_jobs, 15)
-        collaborative_recs = self.collaborative_filter(user_history, all_jobs, 15)
+        collaborative_recs = self.collaborative_filter(user_history, all_jobs, 15, interaction_weights)
 
         # Combine and deduplicate
         all_recommendations = {}
@@ -145,9 +212,12 @@ class AdvancedRecommendationEngine:
 
         recommendations = []
         for career in all_careers:
-            if 'skills_vector_json' in career:
+            if 'skills_vector_blob' in career or 'skills_vector_json' in career:
                 try:
-                    career_vector = json.loads(career['skills_vector_json'])
+                    career_vector = vector_from_columns(career.get('skills_vector_blob'),
+                                                        career.get('skills_vector_json'), len(user_vector))
+                    if career_vector is None:
+                        continue
                     similarity = self._calculate_similarity(user_vector, career_vector)
 
                     # Calculate career fit based on multiple factors
@@ -224,6 +294,14 @@ class AdvancedRecommendationEngine:
         skill_text = " ".join(skills) if skills else "general professional skills"
         return vector_service.generate_embedding(skill_text)
 
+    def _get_user_skill_vectors(self, skill_lists: List[List[str]]) -> np.ndarray:
+        """Skill vectors for many users, encoded in one model batch"""
+        if len(skill_lists) == 1:
+            return np.asarray([self._get_user_skill_vector(skill_lists[0])], dtype=np.float32)
+        from .vector_services import vector_service
+        texts = [" ".join(skills) if skills else "general professional skills" for skills in skill_lists]
+        return vector_service.generate_embeddings(texts)
+
     def _calculate_similarity(self, vec1, vec2) -> float:
         """Calculate cosine similarity between vectors"""
         from .vector_services import vector_service
@@ -0,0 +1,316 @@
+# services/skill_index.py - Normalized career skill index (canonical skills + career<->skill map)
+#
+#   python -m apps.backend.services.skill_index              # migrate + index careers missing from the map
+#   python -m apps.backend.services.skill_index --rebuild    # re-normalize every career
+#   python -m apps.backend.services.skill_index --sqlite green_jobs.db
+#
+# Career matching used to AND one "required_skills LIKE '%skill%' OR
+# skill_name LIKE '%skill%'" clause per user skill over careers LEFT JOIN
+# career_skills, then re-parse the required_skills JSON of every row. Skills
+# are now normalized once into canonical_skills, mapped to careers in
+# career_skill_map (kept in the career's own order, so it doubles as the
+# pre-parsed required_skills list), and matching is an indexed lookup by
+# skill id ranked by how many of the user's skills a career covers.
+import argparse
+import json
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+SKILLS_TABLE = "canonical_skills"
+MAP_TABLE = "career_skill_map"
+FALLBACK_SKILLS = ["Various Skills"]
+
+_WHITESPACE = re.compile(r"\s+")
+_ready: Dict[str, Tuple[bool, float]] = {}
+_ready_lock = threading.Lock()
+READY_RECHECK_SECONDS = 60
+
+
+def _backend_of(conn) -> str:
+    return "mariadb" if getattr(conn, "is_mariadb", False) else "sqlite"
+
+
+def _placeholder(conn) -> str:
+    return "%s" if _backend_of(conn) == "mariadb" else "?"
+
+
+def normalize_skill(name: Any) -> Optional[str]:
+    """Canonical key for a skill name: trimmed, unquoted, lower case, single-spaced"""
+    if name is None:
+        return None
+    key = _WHITESPACE.sub(" ", str(name).strip().strip('[]"\'').strip()).lower()
+    return key[:100] or None
+
+
+def parse_required_skills(value: Any) -> List[str]:
+    """Display names from a careers.required_skills value (JSON list, comma list or single skill)"""
+    if isinstance(value, list):
+        skills = value
+    elif isinstance(value, str):
+        value = value.strip()
+        skills = None
+        if value.startswith('[') and value.endswith(']'):
+            try:
+                parsed = json.loads(value)
+                skills = parsed if isinstance(parsed, list) else None
+            except json.JSONDecodeError:
+                skills = None
+        if skills is None:
+            text = value.strip('[]"\'')
+            skills = [part.strip().strip('"\'') for part in text.split(',')] if text else []
+    else:
+        skills = []
+    return [str(skill).strip() for skill in skills if skill is not None and str(skill).strip()]
+
+
+# ---- migration / write path -----------------------------------------------------
+
+def ensure_skill_index(conn, use_sqlite: bool, rebuild: bool = False) -> Dict[str, Any]:
+    """
+    Idempotent migration: creates the two tables and indexes every career
+    that has no map rows yet (all careers with rebuild=True). Skipped when
+    there is no careers table.
+    """
+    cursor = conn.cursor()
+    try:
+        if not _table_exists(cursor, "careers", use_sqlite):
+            return {"status": "skipped (no careers table)"}
+        if use_sqlite:
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {SKILLS_TABLE} (
+                    skill_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    skill_key VARCHAR(100) NOT NULL UNIQUE,
+                    display_name VARCHAR(100) NOT NULL
+                )
+            """)
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {MAP_TABLE} (
+                    career_id INTEGER NOT NULL,
+                    skill_id INTEGER NOT NULL,
+                    position INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (career_id, skill_id)
+                )
+            """)
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{MAP_TABLE}_skill ON {MAP_TABLE} (skill_id, career_id)")
+        else:
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {SKILLS_TABLE} (
+                    skill_id INT AUTO_INCREMENT PRIMARY KEY,
+                    skill_key VARCHAR(100) NOT NULL UNIQUE,
+                    display_name VARCHAR(100) NOT NULL
+                )
+            """)
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {MAP_TABLE} (
+                    career_id INT NOT NULL,
+                    skill_id INT NOT NULL,
+                    position INT NOT NULL DEFAULT 0,
+                    PRIMARY KEY (career_id, skill_id),
+                    INDEX idx_{MAP_TABLE}_skill (skill_id, career_id)
+                )
+            """)
+        conn.commit()
+
+        if rebuild:
+            cursor.execute("SELECT career_id FROM careers")
+        else:
+            cursor.execute(f"""
+                SELECT c.career_id FROM careers c
+                WHERE NOT EXISTS (SELECT 1 FROM {MAP_TABLE} m WHERE m.career_id = c.career_id)
+            """)
+        career_ids = [row[0] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+    indexed = index_career_skills(conn, career_ids, use_sqlite) if career_ids else 0
+    _mark_ready("sqlite" if use_sqlite else "mariadb", True)
+    print(f"✅ Career skill index ready: {indexed} careers normalized")
+    return {"status": "ready", "careers_indexed": indexed}
+
+
+def _table_exists(cursor, table: str, use_sqlite: bool) -> bool:
+    if use_sqlite:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+    else:
+        cursor.execute(f"SHOW TABLES LIKE '{table}'")
+    return cursor.fetchone() is not None
+
+
+def index_career_skills(conn, career_ids: Sequence[int], use_sqlite: Optional[bool] = None, chunk: int = 500) -> int:
+    """
+    Write-time normalization for careers: re-derive each career's canonical
+    skills from careers.required_skills and career_skills.skill_name. Call
+    after inserting or updating careers; returns the number of careers indexed.
+    """
+    if use_sqlite is None:
+        use_sqlite = _backend_of(conn) == "sqlite"
+    p = "?" if use_sqlite else "%s"
+    insert_ignore = "INSERT OR IGNORE" if use_sqlite else "INSERT IGNORE"
+    cursor = conn.cursor()
+    indexed = 0
+    try:
+        for start in range(0, len(career_ids), chunk):
+            batch = list(career_ids[start:start + chunk])
+            marks = ", ".join([p] * len(batch))
+            skills: Dict[int, List[str]] = {career_id: [] for career_id in batch}
+
+            cursor.execute(f"SELECT career_id, required_skills FROM careers WHERE career_id IN ({marks})", batch)
+            for career_id, required_skills in cursor.fetchall():
+                skills[career_id].extend(parse_required_skills(required_skills))
+            if _table_exists(cursor, "career_skills", use_sqlite):
+                cursor.execute(f"SELECT career_id, skill_name FROM career_skills WHERE career_id IN ({marks})", batch)
+                for career_id, skill_name in cursor.fetchall():
+                    skills[career_id].append(skill_name)
+
+            # canonical key -> display name, first spelling wins
+            names: Dict[str, str] = {}
+            per_career: Dict[int, List[str]] = {}
+            for career_id, raw_skills in skills.items():
+                keys = []
+                for raw in raw_skills:
+                    key = normalize_skill(raw)
+                    if key and key not in keys:
+                        keys.append(key)
+                        names.setdefault(key, str(raw).strip().strip('"\'')[:100])
+                per_career[career_id] = keys
+
+            if names:
+                cursor.executemany(f"{insert_ignore} INTO {SKILLS_TABLE} (skill_key, display_name) VALUES ({p}, {p})",
+                                   list(names.items()))
+            skill_ids = _skill_ids(cursor, list(names), p)
+
+            cursor.execute(f"DELETE FROM {MAP_TABLE} WHERE career_id IN ({marks})", batch)
+            rows = [(career_id, skill_ids[key], position)
+                    for career_id, keys in per_career.items()
+                    for position, key in enumerate(keys) if key in skill_ids]
+            if rows:
+                cursor.executemany(f"INSERT INTO {MAP_TABLE} (career_id, skill_id, position) VALUES ({p}, {p}, {p})", rows)
+            conn.commit()
+            indexed += len(batch)
+    finally:
+        cursor.close()
+    return indexed
+
+
+def _skill_ids(cursor, keys: List[str], p: str, chunk: int = 500) -> Dict[str, int]:
+    ids: Dict[str, int] = {}
+    for start in range(0, len(keys), chunk):
+        batch = keys[start:start + chunk]
+        cursor.execute(f"SELECT skill_key, skill_id FROM {SKILLS_TABLE} WHERE skill_key IN ({', '.join([p] * len(batch))})",
+                       batch)
+        ids.update({key: skill_id for key, skill_id in cursor.fetchall()})
+    return ids
+
+
+# ---- readiness ---------------------------------------------------------------
+
+def _mark_ready(backend: str, ready: bool):
+    with _ready_lock:
+        _ready[backend] = (ready, time.monotonic())
+
+
+def skill_index_ready(conn) -> bool:
+    """Whether the migration has run; misses are re-checked every READY_RECHECK_SECONDS"""
+    backend = _backend_of(conn)
+    cached = _ready.get(backend)
+    if cached is not None and (cached[0] or time.monotonic() - cached[1] < READY_RECHECK_SECONDS):
+        return cached[0]
+    ready = False
+    try:
+        cursor = conn.cursor()
+        ready = _table_exists(cursor, MAP_TABLE, backend == "sqlite")
+        cursor.close()
+    except Exception as e:
+        print(f"⚠️ Skill index readiness check failed: {e}")
+    _mark_ready(backend, ready)
+    return ready
+
+
+# ---- read path ---------------------------------------------------------------
+
+def match_careers(conn, user_skills: Sequence[str], limit: int = 15) -> Optional[List[Tuple[int, int]]]:
+    """
+    (career_id, overlap) for careers sharing at least one skill with the
+    user, best overlap first and then by demand. A user skill matches every
+    canonical skill containing it, as the old LIKE '%skill%' filter did, but
+    the substring test runs over the small skill vocabulary instead of every
+    career row; the career lookup itself uses the (skill_id, career_id) index.
+    Returns None when the index has not been migrated.
+    """
+    if not skill_index_ready(conn):
+        return None
+    keys = [key for key in (normalize_skill(skill) for skill in user_skills) if key]
+    if not keys:
+        return []
+    p = _placeholder(conn)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT skill_id, skill_key FROM {SKILLS_TABLE} WHERE " +
+                       " OR ".join([f"skill_key LIKE {p}"] * len(keys)), [f"%{key}%" for key in keys])
+        # skill id -> indexes of the user skills it satisfies
+        satisfies: Dict[int, List[int]] = defaultdict(list)
+        for skill_id, skill_key in cursor.fetchall():
+            for position, key in enumerate(keys):
+                if key in skill_key:
+                    satisfies[skill_id].append(position)
+        if not satisfies:
+            return []
+
+        cursor.execute(f"""
+            SELECT m.career_id, m.skill_id, c.demand FROM {MAP_TABLE} m
+            JOIN careers c ON c.career_id = m.career_id
+            WHERE m.skill_id IN ({', '.join([p] * len(satisfies))})
+        """, list(satisfies))
+        covered: Dict[int, set] = defaultdict(set)
+        demand: Dict[int, int] = {}
+        for career_id, skill_id, career_demand in cursor.fetchall():
+            covered[career_id].update(satisfies[skill_id])
+            demand[career_id] = career_demand or 0
+    finally:
+        cursor.close()
+
+    ranked = sorted(covered, key=lambda career_id: (-len(covered[career_id]), -demand[career_id], career_id))
+    return [(career_id, len(covered[career_id])) for career_id in ranked[:limit]]
+
+
+def career_skill_lists(conn, career_ids: Iterable[int]) -> Dict[int, List[str]]:
+    """Pre-parsed required skills (display names in the career's order) for career_ids"""
+    career_ids = list(career_ids)
+    if not career_ids:
+        return {}
+    p = _placeholder(conn)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"""
+            SELECT m.career_id, s.display_name FROM {MAP_TABLE} m
+            JOIN {SKILLS_TABLE} s ON s.skill_id = m.skill_id
+            WHERE m.career_id IN ({', '.join([p] * len(career_ids))})
+            ORDER BY m.career_id, m.position
+        """, career_ids)
+        lists: Dict[int, List[str]] = defaultdict(list)
+        for career_id, display_name in cursor.fetchall():
+            lists[career_id].append(display_name)
+        return dict(lists)
+    finally:
+        cursor.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Normalize career skills into canonical_skills / career_skill_map")
+    parser.add_argument("--sqlite", help="migrate this SQLite file instead of the configured MariaDB/SQLite pool")
+    parser.add_argument("--rebuild", action="store_true", help="re-normalize every career, not just new ones")
+    args = parser.parse_args()
+
+    if args.sqlite:
+        import sqlite3
+        connection = sqlite3.connect(args.sqlite)
+        print(ensure_skill_index(connection, True, args.rebuild))
+        connection.close()
+    else:
+        from .db_pool import get_pool, mariadb_config_from_env
+        pool = get_pool('migrate', mariadb_config=mariadb_config_from_env(), sqlite_path='green_jobs.db')
+        with pool.connection() as connection:
+            print(ensure_skill_index(connection, pool.backend == "sqlite", args.rebuild))
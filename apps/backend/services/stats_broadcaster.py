@@ -0,0 +1,113 @@
+# services/stats_broadcaster.py - One producer task fanning a stats payload out to all websocket subscribers
+import asyncio
+import json
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+# Close code for evicted slow consumers ("try again later")
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+class StatsBroadcaster:
+    """
+    Replaces one polling loop per /ws/stats connection. A single producer
+    task builds the payload every interval_seconds, serialises it once and
+    sends the same text to every subscriber concurrently. Each send is
+    bounded by send_timeout_seconds; a subscriber that times out or errors is
+    evicted (closed with 1013) so one slow tab cannot hold up the others.
+    The producer runs only while there are subscribers.
+    """
+
+    def __init__(self, snapshot_fn: Callable[[], Awaitable[Dict[str, Any]]],
+                 interval_seconds: Optional[float] = None, send_timeout_seconds: Optional[float] = None,
+                 name: str = "stats"):
+        self.snapshot_fn = snapshot_fn
+        self.interval_seconds = (interval_seconds if interval_seconds is not None
+                                 else float(os.getenv('STATS_WS_INTERVAL_SECONDS', 10)))
+        self.send_timeout_seconds = (send_timeout_seconds if send_timeout_seconds is not None
+                                     else float(os.getenv('STATS_WS_SEND_TIMEOUT_SECONDS', 2)))
+        self.name = name
+        self.subscribers: set = set()
+        self.last_payload: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+        self.broadcasts = 0
+        self.messages_sent = 0
+        self.evictions = 0
+        self.snapshot_failures = 0
+        self.last_broadcast_ms = 0.0
+
+    def __len__(self) -> int:
+        return len(self.subscribers)
+
+    async def subscribe(self, websocket):
+        """Register an accepted websocket; it gets the latest payload right away, then every tick"""
+        self.subscribers.add(websocket)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name=f"{self.name}-broadcaster")
+        if self.last_payload is not None:
+            await self._send(websocket, self.last_payload)
+
+    def unsubscribe(self, websocket):
+        self.subscribers.discard(websocket)
+
+    async def _run(self):
+        print(f"📡 {self.name} broadcaster started")
+        try:
+            while self.subscribers:
+                await asyncio.sleep(self.interval_seconds)
+                if not self.subscribers:
+                    break
+                try:
+                    payload = json.dumps(await self.snapshot_fn(), separators=(",", ":"), ensure_ascii=False)
+                except Exception as e:
+                    self.snapshot_failures += 1
+                    print(f"⚠️ {self.name} snapshot failed: {e}")
+                    continue
+                await self.broadcast(payload)
+        finally:
+            print(f"📡 {self.name} broadcaster stopped")
+
+    async def broadcast(self, payload: str):
+        """Send one pre-serialised payload to every subscriber concurrently"""
+        self.last_payload = payload
+        started = time.perf_counter()
+        await asyncio.gather(*(self._send(websocket, payload) for websocket in list(self.subscribers)))
+        self.broadcasts += 1
+        self.last_broadcast_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    async def _send(self, websocket, payload: str):
+        try:
+            await asyncio.wait_for(websocket.send_text(payload), self.send_timeout_seconds)
+            self.messages_sent += 1
+        except Exception as e:  # timeout, disconnect or broken socket
+            await self._evict(websocket, e)
+
+    async def _evict(self, websocket, reason: Exception):
+        if websocket not in self.subscribers:
+            return
+        self.subscribers.discard(websocket)
+        self.evictions += 1
+        print(f"⚠️ Evicting {self.name} subscriber: {type(reason).__name__}")
+        try:
+            await asyncio.wait_for(websocket.close(code=SLOW_CONSUMER_CLOSE_CODE), self.send_timeout_seconds)
+        except Exception:
+            pass  # already gone
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+        self.subscribers.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self.subscribers),
+            "running": self._task is not None and not self._task.done(),
+            "interval_seconds": self.interval_seconds,
+            "send_timeout_seconds": self.send_timeout_seconds,
+            "broadcasts": self.broadcasts,
+            "messages_sent": self.messages_sent,
+            "evictions": self.evictions,
+            "snapshot_failures": self.snapshot_failures,
+            "last_broadcast_ms": self.last_broadcast_ms,
+        }
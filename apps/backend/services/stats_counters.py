@@ -0,0 +1,137 @@
+# services/stats_counters.py - Shared dashboard counters, reconciled by one background refresh
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class StatsCounters:
+    """
+    Dashboard counts (users, jobs, applications, companies ...) shared by
+    every /stats request and /ws/stats client of a process.
+
+    Writers call incr() after committing an insert, so counts move
+    immediately. count_fn, which runs the actual COUNT(*) queries, is only
+    called to reconcile: on first use, then at most once per
+    refresh_seconds on a single background thread. Readers never wait for
+    it once a first value exists, so dashboard load does not grow with table
+    size or the number of clients. Counts may drift by in-flight writes
+    until the next reconcile.
+    """
+
+    def __init__(self, count_fn: Callable[[], Dict[str, int]], refresh_seconds: Optional[float] = None,
+                 name: str = "stats"):
+        self.count_fn = count_fn
+        self.refresh_seconds = (refresh_seconds if refresh_seconds is not None
+                                else float(os.getenv('STATS_REFRESH_SECONDS', 30)))
+        self.name = name
+        self._counts: Optional[Dict[str, int]] = None
+        self._refreshed_at = 0.0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._scheduled = False
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.increments = 0
+        self.reads = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._counts is not None
+
+    def refresh(self, wait: bool = False) -> Optional[Dict[str, int]]:
+        """Run count_fn now; single flight - concurrent callers skip, or wait for it with wait=True"""
+        if not self._refresh_lock.acquire(blocking=wait):
+            return None
+        try:
+            if wait and self._counts is not None:
+                return dict(self._counts)  # loaded by the caller we waited for
+            started = time.perf_counter()
+            counts = dict(self.count_fn())
+            with self._lock:
+                self._counts = counts
+                self._refreshed_at = time.monotonic()
+                self.refreshes += 1
+            print(f"📊 {self.name} counters reconciled in {(time.perf_counter() - started) * 1000:.0f}ms")
+            return counts
+        except Exception as e:
+            self.refresh_failures += 1
+            with self._lock:
+                self._refreshed_at = time.monotonic()  # back off until the next interval
+            print(f"⚠️ {self.name} counter refresh failed: {e}")
+            return None
+        finally:
+            self._refresh_lock.release()
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._scheduled:
+                return
+            self._scheduled = True
+
+        def run():
+            try:
+                self.refresh()
+            finally:
+                self._scheduled = False
+
+        threading.Thread(target=run, name=f"{self.name}-counters", daemon=True).start()
+
+    def get(self) -> Optional[Dict[str, int]]:
+        """Current counts; the first call loads them, later calls never block on the database"""
+        self.reads += 1
+        if self._counts is None:
+            if not self._refreshed_at or time.monotonic() - self._refreshed_at > self.refresh_seconds:
+                self.refresh(wait=True)
+        elif time.monotonic() - self._refreshed_at > self.refresh_seconds:
+            self._refresh_in_background()
+        counts = self._counts
+        return dict(counts) if counts is not None else None
+
+    async def aget(self) -> Optional[Dict[str, int]]:
+        """get() for async handlers (the first load runs off the event loop)"""
+        if self._counts is None:
+            return await asyncio.to_thread(self.get)
+        return self.get()
+
+    def incr(self, name: str, delta: int = 1):
+        """Write-through update after a committed insert/delete"""
+        with self._lock:
+            if self._counts is not None and name in self._counts:
+                self._counts[name] += delta
+                self.increments += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "loaded": self.loaded,
+            "age_seconds": round(time.monotonic() - self._refreshed_at, 1) if self._refreshed_at else None,
+            "refresh_seconds": self.refresh_seconds,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "increments": self.increments,
+            "reads": self.reads,
+        }
+
+
+def _count_orm_stats() -> Dict[str, int]:
+    """Reconcile query for the SQLAlchemy app (routes/system.py)"""
+    # Imported here: services/__init__ pulls in the models package
+    from ..models.database import SessionLocal
+    from ..models.job import Application, Job
+    from ..models.user import User
+
+    db = SessionLocal()
+    try:
+        return {
+            "users": db.query(User).count(),
+            "jobs": db.query(Job).filter(Job.status == "active").count(),
+            "applications": db.query(Application).count(),
+            "companies": db.query(Job.company).distinct().count(),
+        }
+    finally:
+        db.close()
+
+
+# Global instance (the SQLAlchemy app; app.py keeps its own over the raw pool)
+stats_counters = StatsCounters(_count_orm_stats, name="orm")
@@ -0,0 +1,139 @@
+# services/translation_batcher.py - Deduplicated, concurrency-limited batch translation
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# (text, target_lang) -> translation, or None on a miss
+LookupFn = Callable[[str, str], Optional[str]]
+# (texts, target_lang) -> {text: translation} for the ones it can resolve (blocking)
+LookupManyFn = Callable[[Sequence[str], str], Dict[str, str]]
+StoreFn = Callable[[str, str, str], None]
+
+
+class TranslationBatcher:
+    """
+    Translates every string of a response in one call. Texts are
+    deduplicated, cache/fallback hits are resolved through lookup without
+    leaving the event loop (so lookup must not do I/O), lookup_many resolves
+    the remaining texts in one blocking call on the thread pool (e.g. the
+    translation memory's disk tier), and only what is still missing goes to
+    the blocking translate_fn - concurrently, bounded by max_concurrency. A miss already being translated for another request
+    is awaited instead of translated twice. Failed or timed-out translations
+    return the original text and are not stored.
+    """
+
+    def __init__(self, translate_fn: Callable[[str, str], str], lookup: Optional[LookupFn] = None,
+                 store: Optional[StoreFn] = None, max_concurrency: Optional[int] = None,
+                 timeout: Optional[float] = None, name: str = "translation",
+                 lookup_many: Optional[LookupManyFn] = None):
+        self.translate_fn = translate_fn
+        self.lookup = lookup
+        self.lookup_many = lookup_many
+        self.store = store
+        self.max_concurrency = max_concurrency or int(os.getenv('TRANSLATION_CONCURRENCY', 8))
+        self.timeout = timeout if timeout is not None else float(os.getenv('TRANSLATION_TIMEOUT_SECONDS', 10))
+        self.name = name
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self.requested = 0
+        self.lookup_hits = 0
+        self.translated = 0
+        self.shared = 0
+        self.failures = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                                thread_name_prefix=f"{self.name}-batch")
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def translate_many(self, texts: Sequence[str], target_lang: str) -> List[str]:
+        """Translations for texts in the same order; blanks and English pass through"""
+        if target_lang == "en":
+            return list(texts)
+        unique = list(dict.fromkeys(text for text in texts if text and text.strip()))
+        self.requested += len(unique)
+
+        resolved: Dict[str, str] = {}
+        misses = []
+        for text in unique:
+            hit = self.lookup(text, target_lang) if self.lookup else None
+            if hit is not None:
+                resolved[text] = hit
+                self.lookup_hits += 1
+            else:
+                misses.append(text)
+
+        if misses and self.lookup_many:
+            try:
+                found = await asyncio.get_running_loop().run_in_executor(
+                    self._get_executor(), self.lookup_many, misses, target_lang)
+            except Exception as e:
+                print(f"⚠️ Batch translation lookup failed: {e}")
+                found = {}
+            resolved.update(found)
+            self.lookup_hits += len(found)
+            misses = [text for text in misses if text not in found]
+
+        if misses:
+            results = await asyncio.gather(*(self._translate_shared(text, target_lang) for text in misses))
+            resolved.update(zip(misses, results))
+        return [resolved.get(text, text) for text in texts]
+
+    async def translate(self, text: str, target_lang: str) -> str:
+        return (await self.translate_many([text], target_lang))[0]
+
+    async def _translate_shared(self, text: str, target_lang: str) -> str:
+        key = (text, target_lang)
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.shared += 1
+            return await asyncio.shield(pending)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._translate_one(text, target_lang)
+            future.set_result(result)
+            return result
+        except BaseException:  # cancelled: let waiters fall back to the original text
+            future.set_result(text)
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _translate_one(self, text: str, target_lang: str) -> str:
+        async with self._get_semaphore():
+            loop = asyncio.get_running_loop()
+            try:
+                translated = await asyncio.wait_for(
+                    loop.run_in_executor(self._get_executor(), self.translate_fn, text, target_lang), self.timeout)
+            except Exception as e:
+                self.failures += 1
+                print(f"❌ Translation failed for '{text[:40]}' to {target_lang}: {type(e).__name__} {e}")
+                return text
+        self.translated += 1
+        if self.store and translated:
+            self.store(text, target_lang, translated)
+        return translated or text
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "requested": self.requested,
+            "lookup_hits": self.lookup_hits,
+            "translated": self.translated,
+            "shared_in_flight": self.shared,
+            "failures": self.failures,
+            "max_concurrency": self.max_concurrency,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
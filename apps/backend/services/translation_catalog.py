@@ -0,0 +1,366 @@
+# services/translation_catalog.py - Fallback translation catalogue, compiled into case-folded lookup tables
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+# Curated translations for job titles and companies, shared by app.py and TranslationService
+FALLBACK_TRANSLATIONS = {
+    "hi": {
+        # Job Titles - Hindi
+        "Solar Energy Engineer": "सौर ऊर्जा इंजीनियर",
+        "Environmental Analyst": "पर्यावरण विश्लेषक",
+        "Wind Farm Technician": "विंड फार्म तकनीशियन",
+        "Sustainability Manager": "सस्टेनेबिलिटी मैनेजर",
+        "EV Battery Engineer": "ईवी बैटरी इंजीनियर",
+        "Sustainability Data Analyst": "सस्टेनेबिलिटी डेटा विश्लेषक",
+        "Senior Solar Energy Engineer": "सीनियर सौर ऊर्जा इंजीनियर",
+        "Green Building Architect": "ग्रीन बिल्डिंग आर्किटेक्ट",
+        "ESG Reporting Manager": "ईएसजी रिपोर्टिंग मैनेजर",
+        "Wind Energy Analyst": "विंड एनर्जी एनालिस्ट",
+        "Carbon Accounting Specialist": "कार्बन अकाउंटिंग विशेषज्ञ",
+        "Eco Engineer": "इको इंजीनियर",
+        "Green Developer": "ग्रीन डेवलपर",
+        "Renewable Analyst": "नवीकरणीय विश्लेषक",
+        "Sustainability Consultant": "सस्टेनेबिलिटी कंसल्टेंट",
+        "Green Data Scientist": "ग्रीन डेटा साइंटिस्ट",
+       
+        # Companies - Hindi
+        "Tata Power Renewables": "टाटा पावर रिन्यूएबल्स",
+        "Adani Green Energy": "अडानी ग्रीन एनर्जी",
+        "ReNew Power": "रिन्यू पावर",
+        "Suzlon Energy": "सुजलॉन एनर्जी",
+        "GreenTech Solutions": "ग्रीनटेक सॉल्यूशंस",
+        "EcoConsult Services": "ईकोकंसल्ट सर्विसेज",
+        "PowerWind Energy": "पावरविंड एनर्जी",
+        "GreenFuture Corp": "ग्रीनफ्यूचर कॉर्प",
+        "ElectroMobility India": "इलेक्ट्रोमोबिलिटी इंडिया",
+        "Inox Wind": "इनोक्स विंड",
+        "Mahindra Sustainability": "महिंद्रा सस्टेनेबिलिटी"
+    },
+    "bn": {
+        # Job Titles - Bengali
+        "Solar Energy Engineer": "সৌর শক্তি প্রকৌশলী",
+        "Environmental Analyst": "পরিবেশ বিশ্লেষক",
+        "Wind Farm Technician": "বায়ু খামার টেকনিশিয়ান",
+        "Sustainability Manager": "টেকসইতা ব্যবস্থাপক",
+        "EV Battery Engineer": "ইভি ব্যাটারি ইঞ্জিনিয়ার",
+        "Sustainability Data Analyst": "টেকসইতা ডেটা বিশ্লেষক",
+        "Senior Solar Energy Engineer": "সিনিয়র সৌর শক্তি প্রকৌশলী",
+        "Green Building Architect": "গ্রিন বিল্ডিং আর্কিটেক্ট",
+        "ESG Reporting Manager": "ESG রিপোর্টিং ম্যানেজার",
+        "Wind Energy Analyst": "বায়ু শক্তি বিশ্লেষক",
+        "Carbon Accounting Specialist": "কার্বন অ্যাকাউন্টিং বিশেষজ্ঞ",
+       
+        # Companies - Bengali
+        "Tata Power Renewables": "টাটা পাওয়ার নবায়নযোগ্য",
+        "Adani Green Energy": "আদানি গ্রিন এনার্জি",
+        "ReNew Power": "রিনিউ পাওয়ার",
+        "Suzlon Energy": "সুজলন এনার্জি",
+        "GreenTech Solutions": "গ্রিনটেক সলিউশনস",
+        "EcoConsult Services": "ইকোকনসাল্ট সার্ভিসেস",
+        "PowerWind Energy": "পাওয়ারউইন্ড এনার্জি",
+        "GreenFuture Corp": "গ্রিনফিউচার কর্প",
+        "ElectroMobility India": "ইলেক্ট্রোমোবিলিটি ইন্ডিয়া",
+        "Inox Wind": "ইনক্স উইন্ড",
+        "Mahindra Sustainability": "মহিন্দরা টেকসইতা"
+    },
+    "te": {
+        # Job Titles - Telugu
+        "Solar Energy Engineer": "సోలార్ ఎనర్జీ ఇంజనీర్",
+        "Environmental Analyst": "పర్యావరణ విశ్లేషకుడు",
+        "Wind Farm Technician": "విండ్ ఫార్మ్ టెక్నీషియన్",
+        "Sustainability Manager": "సస్టైనబిలిటీ మేనేజర్",
+        "EV Battery Engineer": "ఈవీ బ్యాటరీ ఇంజనీర్",
+        "Sustainability Data Analyst": "సస్టైనబిలిటీ డేటా అనలిస్ట్",
+        "Senior Solar Energy Engineer": "సీనియర్ సోలార్ ఎనర్జీ ఇంజనీర్",
+        "Green Building Architect": "గ్రీన్ బిల్డింగ్ ఆర్కిటెక్ట్",
+        "ESG Reporting Manager": "ESG రిపోర్టింగ్ మేనేజర్",
+        "Wind Energy Analyst": "విండ్ ఎనర్జీ అనలిస్ట్",
+        "Carbon Accounting Specialist": "కార్బన్ అకౌంటింగ్ స్పెషలిస్ట్",
+       
+        # Companies - Telugu
+        "Tata Power Renewables": "టాటా పవర్ రిన్యూవబుల్స్",
+        "Adani Green Energy": "అదానీ గ్రీన్ ఎనర్జీ",
+        "ReNew Power": "రిన్యూ పవర్",
+        "Suzlon Energy": "సుజ్లాన్ ఎనర్జీ",
+        "GreenTech Solutions": "గ్రీన్టెక్ సొల్యూషన్స్",
+        "EcoConsult Services": "ఎకోకన్సల్ట్ సర్వీసెస్",
+        "PowerWind Energy": "పవర్విండ్ ఎనర్జీ",
+        "GreenFuture Corp": "గ్రీన్ఫ్యూచర్ కార్ప్",
+        "ElectroMobility India": "ఎలక్ట్రోమోబిలిటీ ఇండియా",
+        "Inox Wind": "ఇనాక్స్ విండ్",
+        "Mahindra Sustainability": "మహీంద్రా సస్టైనబిలిటీ"
+    },
+    "ta": {
+        # Job Titles - Tamil
+        "Solar Energy Engineer": "சோலார் எனர்ஜி இன்ஜினியர்",
+        "Environmental Analyst": "சுற்றுச்சூழல் பகுப்பாய்வாளர்",
+        "Wind Farm Technician": "காற்று பண்ணை தொழில்நுட்ப வல்லுநர்",
+        "Sustainability Manager": "நிலைத்தன்மை மேலாளர்",
+        "EV Battery Engineer": "EV பேட்டரி இன்ஜினியர்",
+        "Sustainability Data Analyst": "நிலைத்தன்மை தரவு பகுப்பாய்வாளர்",
+        "Senior Solar Energy Engineer": "மூத்த சோலார் எனர்ஜி இன்ஜினியர்",
+        "Green Building Architect": "பசுமை கட்டிடக் கலைஞர்",
+        "ESG Reporting Manager": "ESG அறிக்கை மேலாளர்",
+        "Wind Energy Analyst": "காற்று ஆற்றல் பகுப்பாய்வாளர்",
+        "Carbon Accounting Specialist": "கார்பன் கணக்கியல் நிபுணர்",
+       
+        # Companies - Tamil
+        "Tata Power Renewables": "டாடா பவர் புதுப்பிக்கத்தக்கவை",
+        "Adani Green Energy": "அதானி கிரீன் எனர்ஜி",
+        "ReNew Power": "ரினியூ பவர்",
+        "Suzlon Energy": "சுஜ்லான் எனர்ஜி",
+        "GreenTech Solutions": "கிரீன்டெக் தீர்வுகள்",
+        "EcoConsult Services": "எகோகன்சல்ட் சேவைகள்",
+        "PowerWind Energy": "பவர்விண்ட் எனர்ஜி",
+        "GreenFuture Corp": "கிரீன்ஃபியூச்சர் கார்ப்",
+        "ElectroMobility India": "எலக்ட்ரோமோபிலிட்டி இந்தியா",
+        "Inox Wind": "இனாக்ஸ் விண்ட்",
+        "Mahindra Sustainability": "மகிந்திரா நிலைத்தன்மை"
+    },
+    "mr": {
+        # Job Titles - Marathi
+        "Solar Energy Engineer": "सौर ऊर्जा अभियंता",
+        "Environmental Analyst": "पर्यावरण विश्लेषक",
+        "Wind Farm Technician": "विंड फार्म तंत्रज्ञ",
+        "Sustainability Manager": "सातत्य व्यवस्थापक",
+        "EV Battery Engineer": "ईव्ही बॅटरी अभियंता",
+        "Sustainability Data Analyst": "सातत्य डेटा विश्लेषक",
+        "Senior Solar Energy Engineer": "वरिष्ठ सौर ऊर्जा अभियंता",
+        "Green Building Architect": "ग्रीन बिल्डिंग आर्किटेक्ट",
+        "ESG Reporting Manager": "ESG अहवाल व्यवस्थापक",
+        "Wind Energy Analyst": "विंड एनर्जी विश्लेषक",
+        "Carbon Accounting Specialist": "कार्बन लेखा तज्ञ",
+       
+        # Companies - Marathi
+        "Tata Power Renewables": "टाटा पॉवर नूतनीकरणीय",
+        "Adani Green Energy": "अदानी ग्रीन एनर्जी",
+        "ReNew Power": "रिन्यू पॉवर",
+        "Suzlon Energy": "सुजलॉन एनर्जी",
+        "GreenTech Solutions": "ग्रीनटेक सोल्यूशन्स",
+        "EcoConsult Services": "इकोकन्सल्ट सर्व्हिसेस",
+        "PowerWind Energy": "पॉवरविंड एनर्जी",
+        "GreenFuture Corp": "ग्रीनफ्यूचर कॉर्प",
+        "ElectroMobility India": "इलेक्ट्रोमोबिलिटी इंडिया",
+        "Inox Wind": "इनॉक्स विंड",
+        "Mahindra Sustainability": "महिंद्रा सातत्य"
+    },
+    "gu": {
+        # Job Titles - Gujarati
+        "Solar Energy Engineer": "સોલર એનર્જી એન્જિનિયર",
+        "Environmental Analyst": "પર્યાવરણ વિશ્લેષક",
+        "Wind Farm Technician": "વિન્ડ ફાર્મ ટેક્નિશિયન",
+        "Sustainability Manager": "સસ્ટેનેબિલિટી મેનેજર",
+        "EV Battery Engineer": "ઈવી બેટરી એન્જિનિયર",
+        "Sustainability Data Analyst": "સસ્ટેનેબિલિટી ડેટા એનાલિસ્ટ",
+        "Senior Solar Energy Engineer": "સિનિયર સોલર એનર્જી એન્જિનિયર",
+        "Green Building Architect": "ગ્રીન બિલ્ડિંગ આર્કિટેક્ટ",
+        "ESG Reporting Manager": "ESG રિપોર્ટિંગ મેનેજર",
+        "Wind Energy Analyst": "વિન્ડ એનર્જી એનાલિસ્ટ",
+        "Carbon Accounting Specialist": "કાર્બન એકાઉન્ટિંગ સ્પેશિયલિસ્ટ",
+       
+        # Companies - Gujarati
+        "Tata Power Renewables": "ટાટા પાવર રિન્યુએબલ્સ",
+        "Adani Green Energy": "અદાણી ગ્રીન એનર્જી",
+        "ReNew Power": "રિન્યુ પાવર",
+        "Suzlon Energy": "સુઝલોન એનર્જી",
+        "GreenTech Solutions": "ગ્રીનટેક સોલ્યુશન્સ",
+        "EcoConsult Services": "ઇકોકન્સલ્ટ સર્વિસિસ",
+        "PowerWind Energy": "પાવરવિન્ડ એનર્જી",
+        "GreenFuture Corp": "ગ્રીનફ્યુચર કોર્પ",
+        "ElectroMobility India": "ઇલેક્ટ્રોમોબિલિટી ઇન્ડિયા",
+        "Inox Wind": "ઇનોક્સ વિન્ડ",
+        "Mahindra Sustainability": "મહીન્દ્રા સસ્ટેનેબિલિટી"
+    },
+    "kn": {
+        # Job Titles - Kannada
+        "Solar Energy Engineer": "ಸೌರ ಶಕ್ತಿ ಎಂಜಿನಿಯರ್",
+        "Environmental Analyst": "ಪರಿಸರ ವಿಶ್ಲೇಷಕ",
+        "Wind Farm Technician": "ಗಾಳಿ ಫಾರ್ಮ್ ತಂತ್ರಜ್ಞ",
+        "Sustainability Manager": "ಸುಸ್ಥಿರತೆ ಮ್ಯಾನೇಜರ್",
+        "EV Battery Engineer": "ಇವಿ ಬ್ಯಾಟರಿ ಎಂಜಿನಿಯರ್",
+        "Sustainability Data Analyst": "ಸುಸ್ಥಿರತೆ ಡೇಟಾ ವಿಶ್ಲೇಷಕ",
+        "Senior Solar Energy Engineer": "ಸೀನಿಯರ್ ಸೌರ ಶಕ್ತಿ ಎಂಜಿನಿಯರ್",
+        "Green Building Architect": "ಗ್ರೀನ್ ಬಿಲ್ಡಿಂಗ್ ಆರ್ಕಿಟೆಕ್ಟ್",
+        "ESG Reporting Manager": "ESG ರಿಪೋರ್ಟಿಂಗ್ ಮ್ಯಾನೇಜರ್",
+        "Wind Energy Analyst": "ಗಾಳಿ ಶಕ್ತಿ ವಿಶ್ಲೇಷಕ",
+        "Carbon Accounting Specialist": "ಕಾರ್ಬನ್ ಅಕೌಂಟಿಂಗ್ ತಜ್ಞ",
+       
+        # Companies - Kannada
+        "Tata Power Renewables": "ಟಾಟಾ ಪವರ್ ನವೀಕರಿಸಬಹುದಾದ",
+        "Adani Green Energy": "ಅದಾನಿ ಗ್ರೀನ್ ಎನರ್ಜಿ",
+        "ReNew Power": "ರಿನ್ಯೂ ಪವರ್",
+        "Suzlon Energy": "ಸುಜ್ಲಾನ್ ಎನರ್ಜಿ",
+        "GreenTech Solutions": "ಗ್ರೀನ್ಟೆಕ್ ಪರಿಹಾರಗಳು",
+        "EcoConsult Services": "ಎಕೋಕನ್ಸಲ್ಟ್ ಸೇವೆಗಳು",
+        "PowerWind Energy": "ಪವರ್ವಿಂಡ್ ಎನರ್ಜಿ",
+        "GreenFuture Corp": "ಗ್ರೀನ್ಫ್ಯೂಚರ್ ಕಾರ್ಪ್",
+        "ElectroMobility India": "ಎಲೆಕ್ಟ್ರೋಮೊಬಿಲಿಟಿ ಇಂಡಿಯಾ",
+        "Inox Wind": "ಇನಾಕ್ಸ್ ವಿಂಡ್",
+        "Mahindra Sustainability": "ಮಹೀಂದ್ರಾ ಸುಸ್ಥಿರತೆ"
+    },
+    "ml": {
+        # Job Titles - Malayalam
+        "Solar Energy Engineer": "സോളാർ എനർജി എഞ്ചിനീയർ",
+        "Environmental Analyst": "പരിസ്ഥിതി വിശകലനകാരൻ",
+        "Wind Farm Technician": "വിൻഡ് ഫാം ടെക്നീഷ്യൻ",
+        "Sustainability Manager": "സസ്റ്റെയിനബിലിറ്റി മാനേജർ",
+        "EV Battery Engineer": "ഇവി ബാറ്ററി എഞ്ചിനീയർ",
+        "Sustainability Data Analyst": "സസ്റ്റെയിനബിലിറ്റി ഡാറ്റ അനലിസ്റ്റ്",
+        "Senior Solar Energy Engineer": "സീനിയർ സോളാർ എനർജി എഞ്ചിനീയർ",
+        "Green Building Architect": "ഗ്രീൻ ബിൽഡിംഗ് ആർക്കിടെക്റ്റ്",
+        "ESG Reporting Manager": "ESG റിപ്പോർട്ടിംഗ് മാനേജർ",
+        "Wind Energy Analyst": "വിൻഡ് എനർജി അനലിസ്റ്റ്",
+        "Carbon Accounting Specialist": "കാർബൺ അക്കൗണ്ടിംഗ് സ്പെഷ്യലിസ്റ്റ്",
+       
+        # Companies - Malayalam
+        "Tata Power Renewables": "ടാറ്റ പവർ പുനരുപയോഗപ്പെടുത്താവുന്ന",
+        "Adani Green Energy": "അദാനി ഗ്രീൻ എനർജി",
+        "ReNew Power": "റിന്യൂ പവർ",
+        "Suzlon Energy": "സുജ്ലോൺ എനർജി",
+        "GreenTech Solutions": "ഗ്രീൻടെക് സൊല്യൂഷൻസ്",
+        "EcoConsult Services": "ഇക്കോകൺസൾട്ട് സേവനങ്ങൾ",
+        "PowerWind Energy": "പവർവിൻഡ് എനർജി",
+        "GreenFuture Corp": "ഗ്രീൻഫ്യൂച്ചർ കോർപ്പ്",
+        "ElectroMobility India": "ഇലക്ട്രോമോബിലിറ്റി ഇന്ത്യ",
+        "Inox Wind": "ഇനോക്സ് വിൻഡ്",
+        "Mahindra Sustainability": "മഹീന്ദ്ര സസ്റ്റെയിനബിലിറ്റി"
+    },
+    "or": {
+        # Job Titles - Odia
+        "Solar Energy Engineer": "ସୌର ଶକ୍ତି ଇଞ୍ଜିନିୟର",
+        "Environmental Analyst": "ପରିବେଶ ବିଶ୍ଳେଷକ",
+        "Wind Farm Technician": "ପବନ ଫାର୍ମ ଟେକ୍ନିସିଆନ",
+        "Sustainability Manager": "ସ୍ଥିରତା ପରିଚାଳକ",
+        "EV Battery Engineer": "ଇଭି ବ୍ୟାଟେରୀ ଇଞ୍ଜିନିୟର",
+        "Sustainability Data Analyst": "ସ୍ଥିରତା ତଥ୍ୟ ବିଶ୍ଳେଷକ",
+        "Senior Solar Energy Engineer": "ସିନିୟର ସୌର ଶକ୍ତି ଇଞ୍ଜିନିୟର",
+        "Green Building Architect": "ଗ୍ରୀନ୍ ବିଲ୍ଡିଂ ଆର୍କିଟେକ୍ଟ",
+        "ESG Reporting Manager": "ESG ରିପୋର୍ଟିଂ ମ୍ୟାନେଜର",
+        "Wind Energy Analyst": "ପବନ ଶକ୍ତି ବିଶ୍ଳେଷକ",
+        "Carbon Accounting Specialist": "କାର୍ବନ ଆକାଉଣ୍ଟିଂ ବିଶେଷଜ୍ଞ",
+       
+        # Companies - Odia
+        "Tata Power Renewables": "ଟାଟା ପାୱାର ନବୀକରଣୀୟ",
+        "Adani Green Energy": "ଆଦାନୀ ଗ୍ରୀନ୍ ଏନର୍ଜି",
+        "ReNew Power": "ରିନ୍ୟୁ ପାୱାର",
+        "Suzlon Energy": "ସୁଜଲନ୍ ଏନର୍ଜି",
+        "GreenTech Solutions": "ଗ୍ରୀନ୍ଟେକ୍ ସମାଧାନ",
+        "EcoConsult Services": "ଇକୋକନ୍ସଲ୍ଟ ସେବା",
+        "PowerWind Energy": "ପାୱାରୱିଣ୍ଡ୍ ଏନର୍ଜି",
+        "GreenFuture Corp": "ଗ୍ରୀନ୍ଫ୍ୟୁଚର୍ କର୍ପ",
+        "ElectroMobility India": "ଇଲେକ୍ଟ୍ରୋମୋବିଲିଟି ଇଣ୍ଡିଆ",
+        "Inox Wind": "ଇନୋକ୍ସ ୱିଣ୍ଡ",
+        "Mahindra Sustainability": "ମହୀନ୍ଦ୍ରା ସ୍ଥିରତା"
+    }
+}
+
+_TOKEN = re.compile(r"\w+")
+
+
+def fold(text: str) -> str:
+    """Catalogue key for text: case-folded, whitespace collapsed"""
+    return " ".join(text.casefold().split())
+
+
+class TranslationCatalog:
+    """
+    FALLBACK_TRANSLATIONS compiled once into per-language hash maps keyed by
+    fold(), so a fallback lookup is a single dict probe instead of a scan
+    that lowercases every key.
+
+    Phrase matching (optional) covers text that is not a catalogue entry but
+    is built from them, e.g. "Solar Energy Engineer - Tata Power
+    Renewables": the text is tokenised, catalogue phrases are matched
+    longest-first over token n-grams and replaced in place, keeping the
+    original separators. A phrase translation is only returned when the
+    matched phrases cover at least phrase_min_coverage of the words;
+    phrase_min_coverage=None turns phrase matching off.
+    """
+
+    def __init__(self, translations: Dict[str, Dict[str, str]], phrase_min_coverage: Optional[float] = 1.0):
+        self.phrase_min_coverage = phrase_min_coverage
+        self._exact: Dict[str, Dict[str, str]] = {}
+        self._phrases: Dict[str, Dict[Tuple[str, ...], str]] = {}
+        self._max_phrase_tokens = 1
+        self.exact_hits = 0
+        self.phrase_hits = 0
+        self.misses = 0
+        for lang, entries in translations.items():
+            exact = self._exact.setdefault(lang, {})
+            phrases = self._phrases.setdefault(lang, {})
+            for source, translated in entries.items():
+                exact.setdefault(fold(source), translated)  # first spelling wins
+                tokens = tuple(token.casefold() for token in _TOKEN.findall(source))
+                if tokens:
+                    phrases.setdefault(tokens, translated)
+                    self._max_phrase_tokens = max(self._max_phrase_tokens, len(tokens))
+
+    def languages(self) -> List[str]:
+        return sorted(self._exact)
+
+    def get(self, text: str, target_lang: str) -> Optional[str]:
+        """Exact (case-insensitive) catalogue translation, or None"""
+        exact = self._exact.get(target_lang)
+        translated = exact.get(fold(text)) if exact else None
+        if translated is not None:
+            self.exact_hits += 1
+        return translated
+
+    def match_phrases(self, text: str, target_lang: str) -> Optional[str]:
+        """text with catalogue phrases translated in place, or None below the coverage threshold"""
+        phrases = self._phrases.get(target_lang)
+        if not phrases or self.phrase_min_coverage is None:
+            self.misses += 1
+            return None
+        spans = [(m.start(), m.end(), m.group().casefold()) for m in _TOKEN.finditer(text)]
+        if not spans:
+            self.misses += 1
+            return None
+
+        pieces = []
+        cursor = 0
+        covered = 0
+        i = 0
+        while i < len(spans):
+            for n in range(min(self._max_phrase_tokens, len(spans) - i), 0, -1):
+                translated = phrases.get(tuple(span[2] for span in spans[i:i + n]))
+                if translated is not None:
+                    pieces.append(text[cursor:spans[i][0]])
+                    pieces.append(translated)
+                    cursor = spans[i + n - 1][1]
+                    covered += n
+                    i += n
+                    break
+            else:
+                i += 1
+        if not covered or covered / len(spans) < self.phrase_min_coverage:
+            self.misses += 1
+            return None
+        pieces.append(text[cursor:])
+        self.phrase_hits += 1
+        return "".join(pieces)
+
+    def lookup(self, text: str, target_lang: str) -> Optional[str]:
+        """Exact catalogue hit, else a phrase-level match, else None"""
+        translated = self.get(text, target_lang)
+        return translated if translated is not None else self.match_phrases(text, target_lang)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "languages": len(self._exact),
+            "entries": sum(len(entries) for entries in self._exact.values()),
+            "phrase_min_coverage": self.phrase_min_coverage,
+            "exact_hits": self.exact_hits,
+            "phrase_hits": self.phrase_hits,
+            "misses": self.misses,
+        }
+
+
+def _phrase_min_coverage() -> Optional[float]:
+    value = os.getenv('TRANSLATION_PHRASE_MIN_COVERAGE', '1.0').strip()
+    return float(value) if value else None
+
+
+# Global instance (TRANSLATION_PHRASE_MIN_COVERAGE= empty disables phrase matching)
+translation_catalog = TranslationCatalog(FALLBACK_TRANSLATIONS, phrase_min_coverage=_phrase_min_coverage())
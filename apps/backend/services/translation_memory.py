@@ -0,0 +1,351 @@
+# services/translation_memory.py - Persistent translation memory with a striped in-process LRU
+import hashlib
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+def source_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class _Stripe:
+    __slots__ = ("entries", "lock")
+
+    def __init__(self):
+        self.entries: "OrderedDict[Tuple[str, str], Tuple[str, float]]" = OrderedDict()
+        self.lock = threading.Lock()
+
+
+class TranslationMemory:
+    """
+    (source_hash, target_lang) -> translation, shared by every worker through
+    a SQLite file and fronted by an in-process LRU.
+
+    The LRU is split into `stripes` independently locked shards so concurrent
+    lookups rarely contend; each shard holds max_entries / stripes entries.
+    Misses fall through to SQLite (WAL mode, one connection per thread);
+    code on the event loop uses get_memory() and resolves its misses with
+    one get_many() call off the loop.
+    Writes land in memory immediately and reach disk through a background
+    writer, so put() never blocks on I/O. Both tiers honour ttl_seconds; the
+    file is pruned to max_disk_entries oldest-first. warm() preloads the most
+    recent translations so a restarted worker answers catalog strings from
+    memory.
+    """
+
+    def __init__(self, max_entries: int = 50000, ttl_seconds: float = 30 * 86400,
+                 persist_path: Optional[str] = None, max_disk_entries: int = 500000, stripes: int = 16):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.persist_path = persist_path
+        self.max_disk_entries = max_disk_entries
+        self._stripes = [_Stripe() for _ in range(max(1, stripes))]
+        self._stripe_capacity = max(1, max_entries // len(self._stripes)) if max_entries > 0 else 0
+        self._local = threading.local()
+        self._writes: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._metrics_lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.disk_writes = 0
+        self.disk_errors = 0
+
+        if persist_path:
+            try:
+                directory = os.path.dirname(persist_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                conn = self._connection()
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS translation_memory (
+                        source_hash TEXT NOT NULL,
+                        target_lang TEXT NOT NULL,
+                        source_text TEXT NOT NULL,
+                        translated_text TEXT NOT NULL,
+                        created_at REAL NOT NULL,
+                        PRIMARY KEY (source_hash, target_lang)
+                    )
+                """)
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_translation_memory_created ON translation_memory (created_at)")
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"⚠️ Translation memory disk tier disabled: {e}")
+                self.persist_path = None
+
+    # ---- tiers ---------------------------------------------------------------
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.persist_path, timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _stripe(self, key: Tuple[str, str]) -> _Stripe:
+        return self._stripes[int(key[0][:8], 16) % len(self._stripes)]
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - created_at > self.ttl_seconds
+
+    def _count(self, name: str):
+        with self._metrics_lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _remember(self, key: Tuple[str, str], translated: str, created_at: float):
+        if self._stripe_capacity <= 0:
+            return
+        stripe = self._stripe(key)
+        evicted = 0
+        with stripe.lock:
+            stripe.entries[key] = (translated, created_at)
+            stripe.entries.move_to_end(key)
+            while len(stripe.entries) > self._stripe_capacity:
+                stripe.entries.popitem(last=False)
+                evicted += 1
+        if evicted:
+            with self._metrics_lock:
+                self.evictions += evicted
+
+    # ---- API -----------------------------------------------------------------
+
+    def _memory_get(self, key: Tuple[str, str], now: float) -> Optional[str]:
+        stripe = self._stripe(key)
+        with stripe.lock:
+            entry = stripe.entries.get(key)
+            if entry is None:
+                return None
+            if self._expired(entry[1], now):
+                del stripe.entries[key]
+                hit = None
+            else:
+                stripe.entries.move_to_end(key)
+                hit = entry[0]
+        self._count("hits" if hit is not None else "expirations")
+        return hit
+
+    def get_memory(self, text: str, target_lang: str) -> Optional[str]:
+        """In-process tier only - never touches disk, safe on the event loop; misses are not counted"""
+        return self._memory_get((source_hash(text), target_lang), time.time())
+
+    def get(self, text: str, target_lang: str) -> Optional[str]:
+        key = (source_hash(text), target_lang)
+        now = time.time()
+        hit = self._memory_get(key, now)
+        if hit is not None:
+            return hit
+
+        if self.persist_path:
+            try:
+                row = self._connection().execute(
+                    "SELECT translated_text, created_at FROM translation_memory WHERE source_hash = ? AND target_lang = ?",
+                    key
+                ).fetchone()
+            except sqlite3.Error as e:
+                self._count("disk_errors")
+                print(f"⚠️ Translation memory read failed: {e}")
+                row = None
+            if row and not self._expired(row[1], now):
+                self._remember(key, row[0], row[1])
+                self._count("disk_hits")
+                return row[0]
+
+        self._count("misses")
+        return None
+
+    def get_many(self, texts: Sequence[str], target_lang: str, chunk_size: int = 500) -> Dict[str, str]:
+        """{text: translation} for the texts remembered in either tier; one SELECT per chunk of disk misses"""
+        now = time.time()
+        found: Dict[str, str] = {}
+        pending: Dict[str, str] = {}
+        for text in dict.fromkeys(texts):
+            digest = source_hash(text)
+            hit = self._memory_get((digest, target_lang), now)
+            if hit is not None:
+                found[text] = hit
+            else:
+                pending[digest] = text
+
+        if self.persist_path and pending:
+            digests = list(pending)
+            for start in range(0, len(digests), chunk_size):
+                chunk = digests[start:start + chunk_size]
+                try:
+                    rows = self._connection().execute(
+                        f"SELECT source_hash, translated_text, created_at FROM translation_memory "
+                        f"WHERE target_lang = ? AND source_hash IN ({', '.join('?' * len(chunk))})",
+                        [target_lang] + chunk
+                    ).fetchall()
+                except sqlite3.Error as e:
+                    self._count("disk_errors")
+                    print(f"⚠️ Translation memory read failed: {e}")
+                    continue
+                for digest, translated, created_at in rows:
+                    if self._expired(created_at, now):
+                        continue
+                    self._remember((digest, target_lang), translated, created_at)
+                    found[pending.pop(digest)] = translated
+                    self._count("disk_hits")
+
+        with self._metrics_lock:
+            self.misses += len(pending)
+        return found
+
+    def put(self, text: str, target_lang: str, translated: str):
+        key = (source_hash(text), target_lang)
+        now = time.time()
+        self._remember(key, translated, now)
+        if self.persist_path:
+            self._writes.put((key[0], key[1], text, translated, now))
+            self._ensure_writer()
+
+    def warm(self, limit: Optional[int] = None) -> int:
+        """Load the most recent unexpired translations from disk into the LRU"""
+        if not self.persist_path:
+            return 0
+        limit = self.max_entries if limit is None else limit
+        cutoff = time.time() - self.ttl_seconds if self.ttl_seconds > 0 else 0
+        try:
+            rows = self._connection().execute("""
+                SELECT source_hash, target_lang, translated_text, created_at FROM translation_memory
+                WHERE created_at >= ? ORDER BY created_at DESC LIMIT ?
+            """, (cutoff, limit)).fetchall()
+        except sqlite3.Error as e:
+            print(f"⚠️ Translation memory warm-up failed: {e}")
+            return 0
+        for hash_, lang, translated, created_at in reversed(rows):  # oldest first so the newest end up most recent
+            self._remember((hash_, lang), translated, created_at)
+        print(f"✅ Translation memory warmed with {len(rows)} entries")
+        return len(rows)
+
+    # ---- write-behind ----------------------------------------------------------
+
+    def _ensure_writer(self):
+        if self._writer is not None and self._writer.is_alive():
+            return
+        with self._metrics_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._write_loop, name="translation-memory-writer", daemon=True)
+                self._writer.start()
+
+    def _write_loop(self, batch_size: int = 200, prune_every: int = 5000):
+        since_prune = 0
+        while True:
+            item = self._writes.get()
+            if item is None:
+                self._writes.task_done()
+                return
+            batch = [item]
+            while len(batch) < batch_size:
+                try:
+                    item = self._writes.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._writes.put(None)  # stop after this batch
+                    self._writes.task_done()
+                    break
+                batch.append(item)
+            self._flush(batch)
+            since_prune += len(batch)
+            if since_prune >= prune_every:
+                self.prune()
+                since_prune = 0
+            for _ in batch:
+                self._writes.task_done()
+
+    def _flush(self, batch: List[tuple]):
+        try:
+            conn = self._connection()
+            conn.executemany("""
+                INSERT OR REPLACE INTO translation_memory
+                (source_hash, target_lang, source_text, translated_text, created_at) VALUES (?, ?, ?, ?, ?)
+            """, batch)
+            conn.commit()
+            with self._metrics_lock:
+                self.disk_writes += len(batch)
+        except sqlite3.Error as e:
+            self._count("disk_errors")
+            print(f"⚠️ Translation memory write failed: {e}")
+
+    def flush(self):
+        """Block until queued writes are on disk"""
+        if self.persist_path and self._writer is not None:
+            self._writes.join()
+
+    def close(self):
+        """Flush pending writes and stop the writer thread"""
+        if self._writer is not None and self._writer.is_alive():
+            self._writes.put(None)
+            self._writer.join(timeout=5)
+
+    def prune(self) -> int:
+        """Drop expired rows and the oldest rows beyond max_disk_entries"""
+        if not self.persist_path:
+            return 0
+        try:
+            conn = self._connection()
+            removed = 0
+            if self.ttl_seconds > 0:
+                removed += conn.execute("DELETE FROM translation_memory WHERE created_at < ?",
+                                        (time.time() - self.ttl_seconds,)).rowcount
+            excess = conn.execute("SELECT COUNT(*) FROM translation_memory").fetchone()[0] - self.max_disk_entries
+            if excess > 0:
+                removed += conn.execute("""
+                    DELETE FROM translation_memory WHERE rowid IN (
+                        SELECT rowid FROM translation_memory ORDER BY created_at LIMIT ?
+                    )
+                """, (excess,)).rowcount
+            conn.commit()
+            return removed
+        except sqlite3.Error as e:
+            print(f"⚠️ Translation memory prune failed: {e}")
+            return 0
+
+    def clear(self):
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.entries.clear()
+        if self.persist_path:
+            self.flush()
+            conn = self._connection()
+            conn.execute("DELETE FROM translation_memory")
+            conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "entries": sum(len(stripe.entries) for stripe in self._stripes),
+            "max_entries": self.max_entries,
+            "stripes": len(self._stripes),
+            "ttl_seconds": self.ttl_seconds,
+            "persistent": bool(self.persist_path),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            "memory_hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "pending_writes": self._writes.qsize(),
+            "disk_writes": self.disk_writes,
+            "disk_errors": self.disk_errors,
+        }
+
+
+# Global instance (memory only unless TRANSLATION_MEMORY_PATH names the SQLite file)
+translation_memory = TranslationMemory(
+    max_entries=int(os.getenv('TRANSLATION_MEMORY_SIZE', 50000)),
+    ttl_seconds=float(os.getenv('TRANSLATION_MEMORY_TTL_SECONDS', 30 * 86400)),
+    persist_path=os.getenv('TRANSLATION_MEMORY_PATH') or None,
+    max_disk_entries=int(os.getenv('TRANSLATION_MEMORY_DISK_ENTRIES', 500000)),
+)
@@ -10,6 +10,11 @@ class VectorService:
         """Generate vector embedding for text"""
         return vector_service.generate_embedding(text)
 
+    @staticmethod
+    async def generate_embedding_async(text: str) -> List[float]:
+        """Generate a query embedding off the event loop (micro-batched)"""
+        return await vector_service.generate_embedding_async(text)
+
     @staticmethod
     def cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
         """Calculate cosine similarity between vectors"""
@@ -25,6 +30,41 @@ class VectorService:
         """AI-powered career recommendations using vector similarity"""
         return vector_service.semantic_career_recommendations(query, top_k)
 
+    @staticmethod
+    async def semantic_search_jobs_async(query: str, top_k: int = 10, filters: Dict = None) -> List[Dict]:
+        """semantic_search_jobs for async endpoints"""
+        return await vector_service.semantic_search_jobs_async(query, top_k, filters)
+
+    @staticmethod
+    def hybrid_search_jobs(query: str, top_k: int = 10, filters: Dict = None) -> List[Dict]:
+        """BM25 keyword + semantic job search fused with reciprocal rank fusion"""
+        return vector_service.hybrid_search_jobs(query, top_k, filters)
+
+    @staticmethod
+    async def hybrid_search_jobs_async(query: str, top_k: int = 10, filters: Dict = None) -> List[Dict]:
+        """hybrid_search_jobs for async endpoints"""
+        return await vector_service.hybrid_search_jobs_async(query, top_k, filters)
+
+    @staticmethod
+    async def semantic_career_recommendations_async(query: str, top_k: int = 10) -> List[Dict]:
+        """semantic_career_recommendations for async endpoints"""
+        return await vector_service.semantic_career_recommendations_async(query, top_k)
+
+    @staticmethod
+    def reembed_stale_vectors() -> Dict[str, Any]:
+        """Re-embed rows whose vector spec is missing or outdated (see VectorRegistry)"""
+        return vector_service.reembed_stale_vectors()
+
+    @staticmethod
+    def index_job(job_id: int) -> bool:
+        """Embed (if needed) and refresh a job in the resident vector index"""
+        return vector_service.index_job(job_id)
+
+    @staticmethod
+    def remove_job(job_id: int) -> bool:
+        """Remove a job from the resident vector index"""
+        return vector_service.remove_job(job_id)
+
     @staticmethod
     def initialize_vector_data():
         """Initialize vector data for all existing records"""
@@ -35,6 +75,11 @@ class VectorService:
         """Test vector functionality"""
         return vector_service.test_vector_functionality()
 
+    @staticmethod
+    def get_index_report(sample_size: int = 200, top_k: int = 10) -> Dict[str, Any]:
+        """Recall-versus-latency report for the ANN index"""
+        return vector_service.get_index_report(sample_size, top_k)
+
     @staticmethod
     def get_vector_status():
         """Get vector implementation status"""
@@ -0,0 +1,335 @@
+# services/vector_index.py - Resident float32 embedding matrix for vector search
+import json
+import os
+import threading
+import time
+import numpy as np
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+
+
+class VectorMatrixIndex:
+    """
+    In-memory index of pre-normalized float32 vectors.
+
+    Rows live in one contiguous matrix so a query is a single matrix-vector
+    product followed by argpartition. Each row has an external id (job_id,
+    career_id, ...) and an optional payload dict with the display fields
+    needed to build a search result without going back to the database.
+
+    Payload fields named in `attributes` (location, status, ...) are also
+    dictionary-encoded into one int32 code column per attribute, aligned with
+    the matrix offsets. A filter becomes a bitmap over offsets built from one
+    vectorized compare per attribute, and only the selected rows are scored,
+    so a selective filter makes top-k cheaper instead of wasting the work.
+    """
+
+    # Below this fraction of selected rows, gather-and-score beats scoring everything
+    GATHER_SELECTIVITY = 0.5
+
+    def __init__(self, dimension: int = 768, initial_capacity: int = 1024, attributes: Iterable[str] = ()):
+        self.dimension = dimension
+        self._buffer = np.zeros((initial_capacity, dimension), dtype=np.float32)
+        self._ids = np.zeros(initial_capacity, dtype=np.int64)
+        self.attributes = tuple(attributes)
+        self._codes: Dict[str, np.ndarray] = {name: np.full(initial_capacity, -1, dtype=np.int32) for name in self.attributes}
+        self._vocab: Dict[str, Dict[str, int]] = {name: {} for name in self.attributes}
+        self._size = 0
+        self.id_to_offset: Dict[int, int] = {}
+        self.payloads: List[Dict[str, Any]] = []
+        self.version = 0
+        self.loaded_at: Optional[float] = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, item_id: int) -> bool:
+        return item_id in self.id_to_offset
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Contiguous view over the populated rows"""
+        return self._buffer[:self._size]
+
+    @property
+    def ids(self) -> np.ndarray:
+        return self._ids[:self._size]
+
+    def _normalize(self, vector) -> np.ndarray:
+        vec = np.asarray(vector, dtype=np.float32).reshape(-1)
+        if vec.shape[0] != self.dimension:
+            raise ValueError(f"Expected {self.dimension}-dim vector, got {vec.shape[0]}")
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm > 0 else vec
+
+    def _reserve(self, capacity: int):
+        if capacity <= self._buffer.shape[0]:
+            return
+        new_capacity = max(capacity, self._buffer.shape[0] * 2)
+        buffer = np.zeros((new_capacity, self.dimension), dtype=np.float32)
+        buffer[:self._size] = self._buffer[:self._size]
+        ids = np.zeros(new_capacity, dtype=np.int64)
+        ids[:self._size] = self._ids[:self._size]
+        self._buffer, self._ids = buffer, ids
+        for name, codes in self._codes.items():
+            grown = np.full(new_capacity, -1, dtype=np.int32)
+            grown[:self._size] = codes[:self._size]
+            self._codes[name] = grown
+
+    # ---- attribute columns ------------------------------------------------
+
+    @staticmethod
+    def _attribute_key(value) -> Optional[str]:
+        if value is None:
+            return None
+        key = str(value).strip().lower()
+        return key or None
+
+    def _encode_attribute(self, name: str, value) -> int:
+        key = self._attribute_key(value)
+        if key is None:
+            return -1
+        vocab = self._vocab[name]
+        code = vocab.get(key)
+        if code is None:
+            code = vocab[key] = len(vocab)
+        return code
+
+    def _set_attributes(self, offset: int, payload: Dict[str, Any]):
+        for name in self.attributes:
+            self._codes[name][offset] = self._encode_attribute(name, payload.get(name))
+
+    def _rebuild_attributes(self):
+        capacity = self._ids.shape[0]
+        self._codes = {name: np.full(capacity, -1, dtype=np.int32) for name in self.attributes}
+        self._vocab = {name: {} for name in self.attributes}
+        for offset, payload in enumerate(self.payloads):
+            self._set_attributes(offset, payload)
+
+    def attribute_values(self, name: str) -> List[str]:
+        """Distinct (lower-cased) values seen for an attribute"""
+        return list(self._vocab.get(name, {}))
+
+    def _matching_codes(self, name: str, condition) -> np.ndarray:
+        """Codes for an exact value, a list of values, or {"contains": substring}"""
+        vocab = self._vocab[name]
+        if isinstance(condition, dict) and "contains" in condition:
+            needle = str(condition["contains"]).strip().lower()
+            codes = [code for value, code in vocab.items() if needle in value]
+        else:
+            values = condition if isinstance(condition, (list, tuple, set)) else [condition]
+            codes = [vocab[key] for key in map(self._attribute_key, values) if key in vocab]
+        return np.asarray(codes, dtype=np.int32)
+
+    def filter_mask(self, filters: Dict[str, Any]) -> Optional[np.ndarray]:
+        """
+        Bitmap over row offsets for attribute filters, AND-ed across attributes.
+        Unknown attributes raise; empty/None conditions are ignored.
+        """
+        mask = None
+        with self._lock:
+            for name, condition in (filters or {}).items():
+                if condition is None or condition == "" or condition == []:
+                    continue
+                if name not in self._codes:
+                    raise KeyError(f"'{name}' is not an indexed attribute")
+                codes = self._matching_codes(name, condition)
+                column = self._codes[name][:self._size]
+                selected = column == codes[0] if len(codes) == 1 else np.isin(column, codes)
+                mask = selected if mask is None else mask & selected
+        return mask
+
+    def build(self, rows: Iterable[Tuple[int, Any, Dict[str, Any]]]):
+        """Replace the index contents with (id, vector, payload) rows"""
+        item_ids, vectors, payloads = [], [], []
+        for item_id, vector, payload in rows:
+            item_ids.append(int(item_id))
+            vectors.append(np.asarray(vector, dtype=np.float32).reshape(-1))
+            payloads.append(payload or {})
+
+        count = len(item_ids)
+        buffer = np.zeros((max(count, 1), self.dimension), dtype=np.float32)
+        if count:
+            stacked = np.vstack(vectors)
+            if stacked.shape[1] != self.dimension:
+                raise ValueError(f"Expected {self.dimension}-dim vectors, got {stacked.shape[1]}")
+            norms = np.linalg.norm(stacked, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            buffer[:count] = stacked / norms
+
+        with self._lock:
+            self._buffer = buffer
+            self._ids = np.zeros(max(count, 1), dtype=np.int64)
+            self._ids[:count] = item_ids
+            self._size = count
+            self.id_to_offset = {item_id: offset for offset, item_id in enumerate(item_ids)}
+            self.payloads = payloads
+            self._rebuild_attributes()
+            self.version += 1
+            self.loaded_at = time.time()
+
+    def upsert(self, item_id: int, vector, payload: Optional[Dict[str, Any]] = None):
+        """Insert a new row or overwrite an existing one in place"""
+        item_id = int(item_id)
+        normalized = self._normalize(vector)
+        with self._lock:
+            offset = self.id_to_offset.get(item_id)
+            if offset is None:
+                self._reserve(self._size + 1)
+                offset = self._size
+                self._size += 1
+                self._ids[offset] = item_id
+                self.id_to_offset[item_id] = offset
+                self.payloads.append(payload or {})
+                self._set_attributes(offset, payload or {})
+            elif payload is not None:
+                self.payloads[offset] = payload
+                self._set_attributes(offset, payload)
+            self._buffer[offset] = normalized
+            self.version += 1
+
+    def remove(self, item_id: int) -> bool:
+        """Remove a row by swapping the last row into its slot"""
+        with self._lock:
+            offset = self.id_to_offset.pop(int(item_id), None)
+            if offset is None:
+                return False
+            last = self._size - 1
+            if offset != last:
+                self._buffer[offset] = self._buffer[last]
+                self._ids[offset] = self._ids[last]
+                self.payloads[offset] = self.payloads[last]
+                for codes in self._codes.values():
+                    codes[offset] = codes[last]
+                self.id_to_offset[int(self._ids[offset])] = offset
+            self.payloads.pop()
+            self._buffer[last] = 0.0
+            self._size = last
+            self.version += 1
+            return True
+
+    def get_payload(self, item_id: int) -> Optional[Dict[str, Any]]:
+        offset = self.id_to_offset.get(int(item_id))
+        return self.payloads[offset] if offset is not None else None
+
+    def _combined_mask(self, mask: Optional[np.ndarray], filters: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        if filters:
+            attribute_mask = self.filter_mask(filters)
+            if attribute_mask is not None:
+                mask = attribute_mask if mask is None else mask[:self._size] & attribute_mask
+        return mask[:self._size] if mask is not None else None
+
+    def search(self, query_vector, top_k: int = 10, min_score: Optional[float] = None,
+               mask: Optional[np.ndarray] = None, filters: Optional[Dict[str, Any]] = None
+               ) -> List[Tuple[int, float, Dict[str, Any]]]:
+        """
+        Return up to top_k (id, cosine_similarity, payload) tuples, best first.
+
+        mask is an optional boolean array over row offsets and filters maps
+        indexed attributes to a value, a list of values or {"contains": text};
+        rows excluded by either are never scored or returned.
+        """
+        query = self._normalize(query_vector)
+        with self._lock:
+            if self._size == 0 or top_k <= 0:
+                return []
+            mask = self._combined_mask(mask, filters)
+            if mask is None:
+                return self._rank(np.arange(self._size), self.matrix @ query, top_k, min_score)
+
+            offsets = np.flatnonzero(mask)
+            if len(offsets) == 0:
+                return []
+            if len(offsets) <= self.GATHER_SELECTIVITY * self._size:
+                return self._rank(offsets, self._buffer[offsets] @ query, top_k, min_score)
+            scores = np.where(mask, self.matrix @ query, -np.inf)
+            return self._rank(np.arange(self._size), scores, top_k, min_score)
+
+    def _rank(self, offsets: np.ndarray, scores: np.ndarray, top_k: int,
+              min_score: Optional[float]) -> List[Tuple[int, float, Dict[str, Any]]]:
+        """Pick the top_k (offset, score) pairs and resolve them to (id, score, payload)"""
+        if min_score is not None:
+            scores = np.where(scores > min_score, scores, -np.inf)
+        k = min(top_k, len(offsets))
+        if k == 0:
+            return []
+        if k < len(offsets):
+            best = np.argpartition(-scores, k - 1)[:k]
+        else:
+            best = np.arange(len(offsets))
+        best = best[np.argsort(-scores[best], kind="stable")]
+
+        return [
+            (int(self._ids[offsets[i]]), float(scores[i]), self.payloads[offsets[i]])
+            for i in best
+            if np.isfinite(scores[i])
+        ]
+
+    def memory_usage(self) -> Dict[str, Any]:
+        """Approximate resident memory of the index in bytes"""
+        with self._lock:
+            matrix_bytes = int(self.matrix.nbytes)
+            reserved_bytes = int(self._buffer.nbytes + self._ids.nbytes)
+            # Rough per-entry dict overhead for the id map
+            id_map_bytes = len(self.id_to_offset) * 100
+            attribute_bytes = int(sum(codes.nbytes for codes in self._codes.values()))
+            reserved_bytes += attribute_bytes
+            return {
+                "rows": self._size,
+                "dimension": self.dimension,
+                "dtype": "float32",
+                "matrix_bytes": matrix_bytes,
+                "reserved_bytes": reserved_bytes,
+                "id_map_bytes": id_map_bytes,
+                "attribute_bytes": attribute_bytes,
+                "total_mb": round((reserved_bytes + id_map_bytes) / (1024 * 1024), 2),
+            }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.memory_usage(),
+            "backend": "exact",
+            "version": self.version,
+            "loaded_at": self.loaded_at,
+            "attributes": {name: len(vocab) for name, vocab in self._vocab.items()},
+        }
+
+    def save(self, path_prefix: str):
+        """Persist the index as <prefix>.npz (vectors) + <prefix>.json (payloads)"""
+        directory = os.path.dirname(path_prefix)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            np.savez(f"{path_prefix}.npz", **self._arrays_to_save())
+            with open(f"{path_prefix}.json", "w", encoding="utf-8") as f:
+                json.dump({"dimension": self.dimension, "payloads": self.payloads}, f)
+
+    def load(self, path_prefix: str) -> bool:
+        """Load a snapshot written by save(); returns False if none exists"""
+        if not (os.path.exists(f"{path_prefix}.npz") and os.path.exists(f"{path_prefix}.json")):
+            return False
+        with open(f"{path_prefix}.json", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("dimension") != self.dimension:
+            return False
+        with np.load(f"{path_prefix}.npz") as arrays:
+            with self._lock:
+                self._restore_arrays(arrays, meta["payloads"])
+                self.version += 1
+                self.loaded_at = os.path.getmtime(f"{path_prefix}.npz")
+        return True
+
+    def _arrays_to_save(self) -> Dict[str, np.ndarray]:
+        return {"matrix": self.matrix, "ids": self.ids}
+
+    def _restore_arrays(self, arrays, payloads: List[Dict[str, Any]]):
+        matrix = arrays["matrix"].astype(np.float32, copy=False)
+        count = matrix.shape[0]
+        self._buffer = np.zeros((max(count, 1), self.dimension), dtype=np.float32)
+        self._buffer[:count] = matrix
+        self._ids = np.zeros(max(count, 1), dtype=np.int64)
+        self._ids[:count] = arrays["ids"]
+        self._size = count
+        self.id_to_offset = {int(item_id): offset for offset, item_id in enumerate(self._ids[:count])}
+        self.payloads = payloads
+        self._rebuild_attributes()
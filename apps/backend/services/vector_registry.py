@@ -0,0 +1,128 @@
+# services/vector_registry.py - Registry of embedding specs (model, dimension, normalization, version)
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from .vector_storage import VECTOR_TABLES
+
+REGISTRY_COLUMN = "vector_registry_id"
+
+
+class VectorRegistry:
+    """
+    Each distinct embedding spec gets one row in vector_registry; every stored
+    job/career vector points at the spec that produced it through
+    vector_registry_id. A row is current when that id equals the active spec,
+    legacy when it is NULL (written before the registry existed) and stale
+    otherwise. Bumping EMBEDDING_VERSION or switching model registers a new
+    spec, so upgrades re-embed incrementally instead of all at once.
+
+    `connection` is a zero-argument callable returning a context manager that
+    yields a DB connection, e.g. ConnectionPool.connection.
+    """
+
+    def __init__(self, connection, use_sqlite: bool):
+        self.connection = connection
+        self.use_sqlite = use_sqlite
+        self._specs: Dict[int, Dict[str, Any]] = {}
+
+    def ensure_schema(self):
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            if self.use_sqlite:
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS vector_registry (
+                        registry_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        model_name VARCHAR(200) NOT NULL,
+                        dimension INTEGER NOT NULL,
+                        normalization VARCHAR(20) NOT NULL,
+                        version VARCHAR(50) NOT NULL,
+                        created_at TIMESTAMP,
+                        UNIQUE (model_name, dimension, normalization, version)
+                    )
+                """)
+            else:
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS vector_registry (
+                        registry_id INT AUTO_INCREMENT PRIMARY KEY,
+                        model_name VARCHAR(200) NOT NULL,
+                        dimension INT NOT NULL,
+                        normalization VARCHAR(20) NOT NULL,
+                        version VARCHAR(50) NOT NULL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        UNIQUE KEY uq_vector_spec (model_name, dimension, normalization, version)
+                    )
+                """)
+
+            for table, _, _ in VECTOR_TABLES:
+                if self.use_sqlite:
+                    try:
+                        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {REGISTRY_COLUMN} INTEGER")
+                    except sqlite3.OperationalError:
+                        pass
+                else:
+                    try:
+                        cursor.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {REGISTRY_COLUMN} INT")
+                    except Exception:
+                        pass
+            conn.commit()
+            cursor.close()
+
+    def register(self, model_name: str, dimension: int, normalization: str = "l2", version: str = "1") -> int:
+        """Get-or-create the registry row for a spec and return its id"""
+        spec = (model_name, int(dimension), normalization, str(version))
+        select = """
+            SELECT registry_id FROM vector_registry
+            WHERE model_name = ? AND dimension = ? AND normalization = ? AND version = ?
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(select, spec)
+            row = cursor.fetchone()
+            if row is None:
+                cursor.execute("""
+                    INSERT INTO vector_registry (model_name, dimension, normalization, version, created_at)
+                    VALUES (?, ?, ?, ?, ?)
+                """, spec + (datetime.utcnow(),))
+                conn.commit()
+                cursor.execute(select, spec)
+                row = cursor.fetchone()
+                print(f"✅ Registered vector spec {spec[0]} ({spec[1]}d, {spec[2]}, v{spec[3]})")
+            cursor.close()
+
+        registry_id = int(row[0])
+        self._specs[registry_id] = dict(zip(("model_name", "dimension", "normalization", "version"), spec))
+        return registry_id
+
+    def get(self, registry_id: int) -> Optional[Dict[str, Any]]:
+        if registry_id not in self._specs:
+            with self.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT model_name, dimension, normalization, version FROM vector_registry WHERE registry_id = ?
+                """, (registry_id,))
+                row = cursor.fetchone()
+                cursor.close()
+            if row is None:
+                return None
+            self._specs[registry_id] = dict(zip(("model_name", "dimension", "normalization", "version"), tuple(row)))
+        return self._specs[registry_id]
+
+    def coverage(self, current_id: int) -> Dict[str, Any]:
+        """Current / legacy / stale vector counts per table"""
+        report: Dict[str, Any] = {"current_spec": {"registry_id": current_id, **(self.get(current_id) or {})}}
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            for table, _, columns in VECTOR_TABLES:
+                blob_column = columns[0][1]
+                cursor.execute(f"""
+                    SELECT
+                        SUM(CASE WHEN {REGISTRY_COLUMN} = ? THEN 1 ELSE 0 END),
+                        SUM(CASE WHEN {REGISTRY_COLUMN} IS NULL AND {blob_column} IS NOT NULL THEN 1 ELSE 0 END),
+                        SUM(CASE WHEN {REGISTRY_COLUMN} IS NOT NULL AND {REGISTRY_COLUMN} <> ? THEN 1 ELSE 0 END)
+                    FROM {table}
+                """, (current_id, current_id))
+                current, legacy, stale = (int(value or 0) for value in cursor.fetchone())
+                report[table] = {"current": current, "legacy": legacy, "stale": stale}
+            cursor.close()
+        return report
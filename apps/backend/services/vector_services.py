@@ -1,56 +1,138 @@
 
 # vector_services.py - UPDATED FOR HACKATHON READINESS
-import mariadb
 import sqlite3
-from sentence_transformers import SentenceTransformer
 import numpy as np
+import asyncio
 import json
-from typing import List, Dict, Any
+import time
+from typing import List, Dict, Any, Optional
 import os
 from dotenv import load_dotenv
+from .ann_index import create_vector_index, recall_report
+from .vector_storage import encode_vector, vector_from_columns, migrate_json_vectors
+from .embedding_backfill import EmbeddingBackfill
+from .embedding_cache import EmbeddingCache
+from .embedding_batcher import EmbeddingBatcher
+from .embedding_backends import load_configured_model
+from .vector_registry import VectorRegistry
+from .lexical_index import BM25Index, reciprocal_rank_fusion
+from .item_similarity import item_similarity
+from .db_pool import get_pool, mariadb_config_from_env
 
 load_dotenv()
 
 class GreenJobsVectorService:
+    EMBEDDING_DIMENSION = 768
+    # Job fields filtered inside the vector index rather than after scoring
+    JOB_FILTER_ATTRIBUTES = ("location", "status", "experience_level", "job_type")
+
     def __init__(self):
         # Initialize the enhanced embedding model (768 dimensions - better quality)
+        # EMBEDDING_BACKEND selects torch / torch-int8 / onnx / onnx-int8 CPU inference
         print("Loading enhanced sentence transformer model...")
-        self.model = SentenceTransformer('all-mpnet-base-v2')  # Better embeddings!
-        print("Enhanced model loaded successfully!")
+        self.model_name, self.model, self.model_backend = load_configured_model()  # Better embeddings!
+        # Backends quantize differently, so cached / stored vectors are keyed by model and backend
+        self.model_key = f"{self.model_name}@{self.model_backend}"
+        # A distilled EMBEDDING_MODEL may not be 768-d; use what the model actually produces
+        self.EMBEDDING_DIMENSION = self.model.get_sentence_embedding_dimension() or self.EMBEDDING_DIMENSION
+        print(f"Enhanced model loaded successfully! ({self.model_name}, {self.model_backend}, {self.EMBEDDING_DIMENSION}d)")
 
         # Semantic similarity handled by SentenceTransformer
         print("Vector service ready!")
 
-        # Database connection - try MariaDB first, fallback to SQLite
-        self.use_sqlite = False
-        try:
-            self.conn = mariadb.connect(
-                host=os.getenv('DB_HOST', 'localhost'),
-                user=os.getenv('DB_USER', 'root'),
-                password=os.getenv('DB_PASSWORD', 'greenmatchers2025'),
-                database=os.getenv('DB_NAME', 'green_jobs'),
-                port=int(os.getenv('DB_PORT', 3306))
-            )
-            print("MariaDB connection established!")
-        except mariadb.Error as e:
-            print(f"MariaDB connection failed: {e}")
-            print("Falling back to SQLite for development...")
-            self.use_sqlite = True
-            self.conn = sqlite3.connect('green_jobs.db')
-            self.conn.row_factory = sqlite3.Row
-            print("SQLite connection established!")
+        # Database connection pool - MariaDB first, fallback to SQLite.
+        # Executor threads each check out their own connection instead of sharing one.
+        self.db_pool = get_pool('vector', mariadb_config=mariadb_config_from_env(), sqlite_path='green_jobs.db')
+        self.use_sqlite = self.db_pool.backend == "sqlite"
+
+        # Resident vector indexes - built on first search, refreshed on job changes.
+        # VECTOR_INDEX_BACKEND=ivf switches to approximate (IVF-flat) search.
+        self.index_backend = os.getenv('VECTOR_INDEX_BACKEND', 'exact').lower()
+        self.index_dir = os.getenv('VECTOR_INDEX_DIR', 'vector_index')
+        self.index_refresh_seconds = int(os.getenv('VECTOR_INDEX_REFRESH_SECONDS', 300))
+        self.job_index = self._create_index(self.JOB_FILTER_ATTRIBUTES)
+        self.career_index = self._create_index()
+        # BM25 over title/skills/description for keyword recall, fused with vector scores
+        self.job_lexical_index = BM25Index()
+        self.hybrid_rrf_k = int(os.getenv('HYBRID_RRF_K', 60))
+        # Top-N similar jobs per job for collaborative filtering, kept in step with job_index
+        item_similarity.persist_path = f"{self._index_path('jobs')}_items.npz"
+        self._storage_migrated = False
+
+        # Every stored vector records the spec (model, dimension, normalization, version) that made it
+        self.embedding_version = os.getenv('EMBEDDING_VERSION', '1')
+        self.vector_registry = VectorRegistry(self.connection, self.use_sqlite)
+        self.vector_spec_id = None
+
+        # Repeated search queries skip the forward pass; EMBEDDING_CACHE_PATH adds a disk tier
+        self.embedding_cache = EmbeddingCache(
+            max_entries=int(os.getenv('EMBEDDING_CACHE_SIZE', 10000)),
+            ttl_seconds=float(os.getenv('EMBEDDING_CACHE_TTL_SECONDS', 86400)),
+            persist_path=os.getenv('EMBEDDING_CACHE_PATH') or None,
+            dimension=self.EMBEDDING_DIMENSION,
+        )
+
+        # Async endpoints share micro-batched forward passes on a worker thread
+        self.embedding_batcher = EmbeddingBatcher(
+            self._encode_batch,
+            max_batch_size=int(os.getenv('EMBEDDING_BATCH_SIZE', 32)),
+            max_wait_ms=float(os.getenv('EMBEDDING_BATCH_WAIT_MS', 5)),
+        )
     
-    def generate_embedding(self, text: str) -> List[float]:
-        """Convert text to vector embedding using 768 dimensions"""
+    def connection(self, timeout: Optional[float] = None):
+        """Check a connection out of the pool: `with vector_service.connection() as conn:`"""
+        return self.db_pool.connection(timeout)
+
+    def generate_embedding(self, text: str, use_cache: bool = True) -> List[float]:
+        """Convert text to vector embedding using 768 dimensions (queries are cached)"""
         if not text or text.strip() == "":
-            return [0.0] * 384
-        return self.model.encode(text).tolist()
+            return [0.0] * self.EMBEDDING_DIMENSION
+        if not use_cache:
+            return self.model.encode(text).tolist()
+        vector = self.embedding_cache.get(self.model_key, text)
+        if vector is None:
+            vector = self.embedding_cache.put(self.model_key, text, self.model.encode(text))
+        return vector.tolist()
+
+    def _encode_batch(self, texts: List[str]):
+        return self.model.encode(texts, batch_size=len(texts), show_progress_bar=False)
+
+    def generate_embeddings(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        """generate_embedding for many texts: cache hits first, one forward pass per batch of misses"""
+        vectors: Dict[str, Any] = {}
+        misses = []
+        for text in dict.fromkeys(texts):
+            if not text or text.strip() == "":
+                vectors[text] = np.zeros(self.EMBEDDING_DIMENSION, dtype=np.float32)
+                continue
+            vector = self.embedding_cache.get(self.model_key, text)
+            if vector is None:
+                misses.append(text)
+            else:
+                vectors[text] = vector
+        for start in range(0, len(misses), batch_size):
+            batch = misses[start:start + batch_size]
+            for text, vector in zip(batch, self._encode_batch(batch)):
+                vectors[text] = self.embedding_cache.put(self.model_key, text, vector)
+        return np.asarray([vectors[text] for text in texts], dtype=np.float32).reshape(len(texts), -1)
+
+    async def generate_embedding_async(self, text: str) -> List[float]:
+        """generate_embedding for async endpoints - cache first, then the micro-batcher"""
+        if not text or text.strip() == "":
+            return [0.0] * self.EMBEDDING_DIMENSION
+        vector = self.embedding_cache.get(self.model_key, text)
+        if vector is None:
+            vector = self.embedding_cache.put(self.model_key, text, await self.embedding_batcher.embed(text))
+        return vector.tolist()
     
     def cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
         """Calculate cosine similarity between two vectors"""
         try:
             v1 = np.array(vec1)
             v2 = np.array(vec2)
+            if v1.shape != v2.shape:
+                print(f"⚠️ Cosine similarity dimension mismatch: {v1.shape} vs {v2.shape}")
+                return 0.0
             dot_product = np.dot(v1, v2)
             norm_v1 = np.linalg.norm(v1)
             norm_v2 = np.linalg.norm(v2)
@@ -62,211 +144,496 @@ class GreenJobsVectorService:
             print(f"❌ Cosine similarity error: {e}")
             return 0.0
 
-    def populate_existing_data(self):
-        """HACKATHON READY: Add vector embeddings to all existing data"""
-        cursor = self.conn.cursor()
-
+    def populate_existing_data(self, batch_size: int = 64, chunk_size: int = 512, force: bool = False):
+        """HACKATHON READY: Add vector embeddings to all existing data (see EmbeddingBackfill)"""
         print("🚀 Starting vector data population for hackathon...")
 
-        # Ensure vector columns exist - different syntax for MariaDB vs SQLite
-        if self.use_sqlite:
-            # SQLite syntax
-            try:
-                cursor.execute("ALTER TABLE careers ADD COLUMN desc_vector_json TEXT")
-                print("✅ Career vector columns added (SQLite)")
-            except sqlite3.OperationalError:
-                print("✅ Career vector columns already exist (SQLite)")
+        with self.connection() as conn:
+            cursor = conn.cursor()
 
-            try:
-                cursor.execute("ALTER TABLE careers ADD COLUMN skills_vector_json TEXT")
-            except sqlite3.OperationalError:
-                pass
+            # Ensure vector columns exist - different syntax for MariaDB vs SQLite
+            if self.use_sqlite:
+                # SQLite syntax
+                try:
+                    cursor.execute("ALTER TABLE careers ADD COLUMN desc_vector_json TEXT")
+                    print("✅ Career vector columns added (SQLite)")
+                except sqlite3.OperationalError:
+                    print("✅ Career vector columns already exist (SQLite)")
 
-            try:
-                cursor.execute("ALTER TABLE jobs ADD COLUMN desc_vector_json TEXT")
-                print("✅ Job vector columns added (SQLite)")
-            except sqlite3.OperationalError:
-                print("✅ Job vector columns already exist (SQLite)")
+                try:
+                    cursor.execute("ALTER TABLE careers ADD COLUMN skills_vector_json TEXT")
+                except sqlite3.OperationalError:
+                    pass
 
-            try:
-                cursor.execute("ALTER TABLE jobs ADD COLUMN skills_vector_json TEXT")
-            except sqlite3.OperationalError:
-                pass
-        else:
-            # MariaDB syntax
-            try:
-                cursor.execute("ALTER TABLE careers ADD COLUMN IF NOT EXISTS desc_vector_json TEXT")
-                cursor.execute("ALTER TABLE careers ADD COLUMN IF NOT EXISTS skills_vector_json TEXT")
-                print("✅ Career vector columns ready (MariaDB)")
-            except:
-                print("✅ Career vector columns already exist (MariaDB)")
+                try:
+                    cursor.execute("ALTER TABLE jobs ADD COLUMN desc_vector_json TEXT")
+                    print("✅ Job vector columns added (SQLite)")
+                except sqlite3.OperationalError:
+                    print("✅ Job vector columns already exist (SQLite)")
+
+                try:
+                    cursor.execute("ALTER TABLE jobs ADD COLUMN skills_vector_json TEXT")
+                except sqlite3.OperationalError:
+                    pass
+            else:
+                # MariaDB syntax
+                try:
+                    cursor.execute("ALTER TABLE careers ADD COLUMN IF NOT EXISTS desc_vector_json TEXT")
+                    cursor.execute("ALTER TABLE careers ADD COLUMN IF NOT EXISTS skills_vector_json TEXT")
+                    print("✅ Career vector columns ready (MariaDB)")
+                except:
+                    print("✅ Career vector columns already exist (MariaDB)")
+
+                try:
+                    cursor.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS desc_vector_json TEXT")
+                    cursor.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS skills_vector_json TEXT")
+                    print("✅ Job vector columns ready (MariaDB)")
+                except:
+                    print("✅ Job vector columns already exist (MariaDB)")
+
+            conn.commit()
+            cursor.close()
+
+        # Binary vector columns + batched, resumable re-embedding of changed rows
+        report = EmbeddingBackfill(self, batch_size=batch_size, chunk_size=chunk_size, force=force).run()
+        print(f"🎉 HACKATHON READY: {report['careers']['embedded']} careers + "
+              f"{report['jobs']['embedded']} jobs vectorized "
+              f"({report['careers']['skipped_unchanged'] + report['jobs']['skipped_unchanged']} unchanged)!")
 
+        # Vectors changed underneath the resident indexes
+        self.load_job_index()
+        self.load_career_index()
+        return True
+
+    # RESIDENT JOB INDEX
+    def _job_payload(self, title, description, company, location, salary,
+                     status=None, experience_level=None, job_type=None) -> Dict[str, Any]:
+        """Display and filter fields kept alongside each indexed job vector"""
+        return {
+            "title": title,
+            "description": description,
+            "company": company,
+            "location": location,
+            "salary": float(salary) if salary is not None else None,
+            "status": status,
+            "experience_level": experience_level,
+            "job_type": job_type,
+        }
+
+    @staticmethod
+    def _job_lexical_text(title, skills, description) -> str:
+        """Text indexed by BM25; the title is repeated so title matches outrank body matches"""
+        return " ".join(str(part) for part in (title, title, skills, description) if part)
+
+    def _create_index(self, attributes=()):
+        options = {"attributes": attributes}
+        if self.index_backend == 'ivf':
+            options.update({
+                "nlist": int(os.getenv('VECTOR_INDEX_NLIST', 0)),
+                "nprobe": int(os.getenv('VECTOR_INDEX_NPROBE', 8)),
+            })
+        return create_vector_index(self.index_backend, dimension=self.EMBEDDING_DIMENSION, **options)
+
+    def _index_path(self, name: str) -> str:
+        return os.path.join(self.index_dir, f"{name}_{self.index_backend}_{self.model_key.replace('/', '_').replace('@', '_')}")
+
+    def _index_is_stale(self, index) -> bool:
+        return index.loaded_at is None or (
+            self.index_refresh_seconds > 0 and time.time() - index.loaded_at > self.index_refresh_seconds
+        )
+
+    def _load_index_snapshot(self, index, name: str) -> bool:
+        """Warm-start from the on-disk snapshot if it is still within the refresh interval"""
+        try:
+            return index.load(self._index_path(name)) and not self._index_is_stale(index)
+        except Exception as e:
+            print(f"⚠️ Could not load {name} index snapshot: {e}")
+            return False
+
+    def _load_lexical_snapshot(self) -> bool:
+        try:
+            return self.job_lexical_index.load(f"{self._index_path('jobs')}_bm25.json")
+        except Exception as e:
+            print(f"⚠️ Could not load jobs BM25 snapshot: {e}")
+            return False
+
+    def _save_index_snapshot(self, index, name: str):
+        try:
+            index.save(self._index_path(name))
+        except Exception as e:
+            print(f"⚠️ Could not save {name} index snapshot: {e}")
+
+    def migrate_vector_storage(self, **options) -> Dict[str, Any]:
+        """Convert legacy JSON vector columns to binary BLOBs (see vector_storage)"""
+        with self.connection() as conn:
+            report = migrate_json_vectors(conn, self.use_sqlite, **options)
+        self._storage_migrated = True
+        return report
+
+    def _ensure_vector_storage(self):
+        """Run the JSON -> BLOB migration once per process before reading vectors"""
+        if not self._storage_migrated:
             try:
-                cursor.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS desc_vector_json TEXT")
-                cursor.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS skills_vector_json TEXT")
-                print("✅ Job vector columns ready (MariaDB)")
-            except:
-                print("✅ Job vector columns already exist (MariaDB)")
-        
-        # Populate careers vectors
-        print("📊 Vectorizing careers...")
-        cursor.execute("SELECT career_id, title, description, required_skills FROM careers")
-        careers = cursor.fetchall()
-        
-        success_count = 0
-        for career_id, title, description, skills in careers:
+                self.migrate_vector_storage()
+            except Exception as e:
+                print(f"⚠️ Vector storage migration skipped: {e}")
+                self._storage_migrated = True
+        self.current_vector_spec_id()
+
+    def current_vector_spec_id(self) -> Optional[int]:
+        """Registry id of the active embedding spec (vectors are stored L2-normalized)"""
+        if self.vector_spec_id is None:
             try:
-                # Generate embeddings
-                desc_text = f"{title} {description}" if description else title
-                desc_vector = self.generate_embedding(desc_text)
-                
-                skills_text = str(skills) if skills else title
-                skills_vector = self.generate_embedding(skills_text)
-                
-                # Store as JSON
-                desc_vector_json = json.dumps(desc_vector)
-                skills_vector_json = json.dumps(skills_vector)
-                
-                cursor.execute("""
-                    UPDATE careers 
-                    SET desc_vector_json = ?, skills_vector_json = ?
-                    WHERE career_id = ?
-                """, (desc_vector_json, skills_vector_json, career_id))
-                
-                success_count += 1
-                if success_count % 10 == 0:
-                    print(f"✅ Vectorized {success_count} careers...")
-                    
+                self.vector_registry.ensure_schema()
+                self.vector_spec_id = self.vector_registry.register(
+                    self.model_key, self.EMBEDDING_DIMENSION, "l2", self.embedding_version
+                )
             except Exception as e:
-                print(f"⚠️ Skipping career {career_id}: {e}")
+                print(f"⚠️ Vector registry unavailable: {e}")
+        return self.vector_spec_id
+
+    def _is_stale_spec(self, registry_id) -> bool:
+        """Rows made by another spec are never mixed into search; legacy (NULL) rows are kept if the dimension fits"""
+        return registry_id is not None and self.vector_spec_id is not None and registry_id != self.vector_spec_id
+
+    def reembed_stale_vectors(self, batch_size: int = 64, chunk_size: int = 512) -> Dict[str, Any]:
+        """Bulk re-embed legacy and stale rows under the current spec, then rebuild the indexes"""
+        self._ensure_vector_storage()
+        report = EmbeddingBackfill(self, batch_size=batch_size, chunk_size=chunk_size, stale_only=True).run()
+        self.load_job_index()
+        self.load_career_index()
+        item_similarity.build_from_index(self.job_index)  # vectors changed, not just the job set
+        return report
+
+    def load_job_index(self) -> Dict[str, Any]:
+        """Build the resident job vector index and BM25 index from the jobs table"""
+        self._ensure_vector_storage()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT job_id, title, description, company, location, salary, status, experience_level, job_type,
+                       skills, desc_vector_blob, desc_vector_json, vector_registry_id
+                FROM jobs
+            """)
+            fetched = cursor.fetchall()
+            cursor.close()
+
+        rows, docs = [], []
+        skipped = 0
+        for (job_id, title, description, company, location, salary, status, experience_level, job_type,
+             skills, blob, vector_json, registry_id) in fetched:
+            payload = self._job_payload(title, description, company, location, salary, status, experience_level, job_type)
+            docs.append((job_id, self._job_lexical_text(title, skills, description), payload))
+            vector = None if self._is_stale_spec(registry_id) else vector_from_columns(blob, vector_json, self.EMBEDDING_DIMENSION)
+            if vector is None:
+                skipped += 1
                 continue
-        
-        # Populate jobs vectors
-        print("💼 Vectorizing jobs...")
-        cursor.execute("SELECT job_id, title, description, company FROM jobs")
-        jobs = cursor.fetchall()
-        
-        job_count = 0
-        for job_id, title, description, company in jobs:
-            try:
-                desc_text = f"{title} {description} {company}" if description else f"{title} {company}"
-                desc_vector = self.generate_embedding(desc_text)
-                
-                skills_vector = self.generate_embedding(description if description else title)
-                
-                desc_vector_json = json.dumps(desc_vector)
-                skills_vector_json = json.dumps(skills_vector)
-                
+            rows.append((job_id, vector, payload))
+
+        self.job_index.build(rows)
+        self.job_lexical_index.build(docs)
+        self._save_index_snapshot(self.job_index, "jobs")
+        self._sync_item_similarity()
+        try:
+            self.job_lexical_index.save(f"{self._index_path('jobs')}_bm25.json")
+        except Exception as e:
+            print(f"⚠️ Could not save jobs BM25 snapshot: {e}")
+        stats = self.job_index.stats()
+        print(f"✅ Job vector index loaded: {stats['rows']} jobs, {stats['total_mb']} MB ({skipped} without vectors); "
+              f"BM25 over {len(self.job_lexical_index)} jobs")
+        return stats
+
+    def loaded_job_index(self):
+        """The resident job index, loaded or refreshed first if needed (for JobVectorMatrix.from_index)"""
+        self._ensure_job_index()
+        return self.job_index
+
+    def _ensure_job_index(self):
+        """Load the index on first use and reload it once it is older than the refresh interval"""
+        if (self.job_index.loaded_at is None and self._load_index_snapshot(self.job_index, "jobs")
+                and self._load_lexical_snapshot()):
+            self._sync_item_similarity()
+            return
+        if self._index_is_stale(self.job_index):
+            self.load_job_index()
+
+    def _sync_item_similarity(self):
+        """Bring the item-item table in line with job_index (warm-starting from its snapshot)"""
+        try:
+            if len(item_similarity) == 0:
+                item_similarity.load()
+            item_similarity.sync(self.job_index)
+        except Exception as e:
+            print(f"⚠️ Item similarity sync failed: {e}")
+
+    def load_career_index(self) -> Dict[str, Any]:
+        """Build the resident career index from the careers skills vectors"""
+        self._ensure_vector_storage()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT career_id, title, description, growth, salary_range, demand, category,
+                       skills_vector_blob, skills_vector_json, vector_registry_id
+                FROM careers
+                WHERE skills_vector_blob IS NOT NULL OR skills_vector_json IS NOT NULL
+            """)
+            fetched = cursor.fetchall()
+            cursor.close()
+
+        rows = []
+        for career_id, title, description, growth, salary_range, demand, category, blob, vector_json, registry_id in fetched:
+            vector = None if self._is_stale_spec(registry_id) else vector_from_columns(blob, vector_json, self.EMBEDDING_DIMENSION)
+            if vector is None:
+                continue
+            rows.append((career_id, vector, {
+                "title": title,
+                "description": description,
+                "growth": growth,
+                "salary_range": salary_range,
+                "demand": demand,
+                "category": category,
+            }))
+
+        self.career_index.build(rows)
+        self._save_index_snapshot(self.career_index, "careers")
+        return self.career_index.stats()
+
+    def _ensure_career_index(self):
+        if self.career_index.loaded_at is None and self._load_index_snapshot(self.career_index, "careers"):
+            return
+        if self._index_is_stale(self.career_index):
+            self.load_career_index()
+
+    def index_job(self, job_id: int) -> bool:
+        """Refresh a single job in the index, embedding it first if it has no current vector"""
+        self._ensure_vector_storage()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT title, description, company, location, salary, status, experience_level, job_type,
+                       skills, desc_vector_blob, desc_vector_json, vector_registry_id
+                FROM jobs WHERE job_id = ?
+            """, (job_id,))
+            row = cursor.fetchone()
+            cursor.close()
+        if not row:
+            self.remove_job(job_id)
+            return False
+
+        (title, description, company, location, salary, status, experience_level, job_type,
+         skills, blob, vector_json, registry_id) = row
+        vector = None if self._is_stale_spec(registry_id) else vector_from_columns(blob, vector_json, self.EMBEDDING_DIMENSION)
+        if vector is None:
+            desc_text = f"{title} {description} {company}" if description else f"{title} {company}"
+            vector, skills_vector = self.model.encode(
+                [desc_text, description if description else title], normalize_embeddings=True
+            )
+            # Encoded before checking out a connection so the model never holds one
+            with self.connection() as conn:
+                cursor = conn.cursor()
                 cursor.execute("""
-                    UPDATE jobs 
-                    SET desc_vector_json = ?, skills_vector_json = ?
+                    UPDATE jobs
+                    SET desc_vector_blob = ?, skills_vector_blob = ?, vector_registry_id = ?
                     WHERE job_id = ?
-                """, (desc_vector_json, skills_vector_json, job_id))
-                
-                job_count += 1
-                if job_count % 10 == 0:
-                    print(f"✅ Vectorized {job_count} jobs...")
-                    
-            except Exception as e:
-                print(f"⚠️ Skipping job {job_id}: {e}")
-                continue
-        
-        self.conn.commit()
-        print(f"🎉 HACKATHON READY: {success_count} careers + {job_count} jobs vectorized!")
+                """, (encode_vector(vector), encode_vector(skills_vector), self.vector_spec_id, job_id))
+                conn.commit()
+                cursor.close()
+
+        payload = self._job_payload(title, description, company, location, salary, status, experience_level, job_type)
+        self.job_index.upsert(job_id, vector, payload)
+        self.job_lexical_index.upsert(job_id, self._job_lexical_text(title, skills, description), payload)
+        try:
+            item_similarity.upsert(job_id, vector, self.job_index.ids, self.job_index.matrix)
+        except Exception as e:
+            print(f"⚠️ Item similarity update failed for job {job_id}: {e}")
         return True
 
+    def remove_job(self, job_id: int) -> bool:
+        """Drop a closed or deleted job from the vector and BM25 indexes"""
+        removed = self.job_index.remove(job_id)
+        item_similarity.remove(job_id)
+        return self.job_lexical_index.remove(job_id) or removed
+
+    def _job_filters(self, filters: Optional[Dict]) -> Dict[str, Any]:
+        """Request filters -> index attribute filters (location is a substring match, the rest exact)"""
+        index_filters = {}
+        for name in self.JOB_FILTER_ATTRIBUTES:
+            value = (filters or {}).get(name)
+            if value:
+                index_filters[name] = {"contains": value} if name == "location" else value
+        return index_filters
+
+    def get_vector_status(self) -> Dict[str, Any]:
+        """Vector index status for /api/vector/status"""
+        return {
+            "embedding_dimensions": self.EMBEDDING_DIMENSION,
+            "embedding_model": self.model_name,
+            "embedding_backend": self.model_backend,
+            "index_backend": self.index_backend,
+            "job_index": self.job_index.stats(),
+            "item_similarity": item_similarity.stats(),
+            "career_index": self.career_index.stats(),
+            "index_refresh_seconds": self.index_refresh_seconds,
+            "job_lexical_index": self.job_lexical_index.stats(),
+            "embedding_cache": self.embedding_cache.stats(),
+            "embedding_batcher": self.embedding_batcher.stats(),
+            "vector_registry": self._registry_coverage(),
+            "db_pool": self.db_pool.stats(),
+        }
+
+    def _registry_coverage(self) -> Dict[str, Any]:
+        try:
+            spec_id = self.current_vector_spec_id()
+            return self.vector_registry.coverage(spec_id) if spec_id is not None else {}
+        except Exception as e:
+            return {"error": str(e)}
+
+    def get_index_report(self, sample_size: int = 200, top_k: int = 10) -> Dict[str, Any]:
+        """Recall-versus-latency of the ANN job index, using stored job vectors as queries"""
+        self._ensure_job_index()
+        if self.index_backend != 'ivf':
+            return {"index_backend": self.index_backend,
+                    "note": "Exact search in use; set VECTOR_INDEX_BACKEND=ivf to measure ANN recall"}
+        if len(self.job_index) == 0:
+            return {"index_backend": self.index_backend, "note": "Job index is empty"}
+
+        rng = np.random.default_rng(7)
+        picks = rng.choice(len(self.job_index), min(sample_size, len(self.job_index)), replace=False)
+        queries = self.job_index.matrix[picks].copy()
+        return {"index_backend": self.index_backend, **recall_report(self.job_index, queries, top_k=top_k)}
+
     # HACKATHON-READY SEMANTIC SEARCH
-    def semantic_search_jobs(self, query: str, top_k: int = 10, filters: Dict = None) -> List[Dict]:
+    def semantic_search_jobs(self, query: str, top_k: int = 10, filters: Dict = None,
+                             query_vector: List[float] = None) -> List[Dict]:
         """HACKATHON ENDPOINT: Semantic job search"""
-        query_vector = self.generate_embedding(query)
-        
-        cursor = self.conn.cursor(dictionary=True)
-        
-        # Get all active jobs
-        base_query = """
-            SELECT job_id, title, description, company, location, salary,
-                   desc_vector_json, skills_vector_json
-            FROM jobs 
-            WHERE 1=1
-        """
-        params = []
-        
-        if filters:
-            if filters.get('location'):
-                base_query += " AND location LIKE ?"
-                params.append(f"%{filters['location']}%")
-        
-        cursor.execute(base_query, params)
-        all_jobs = cursor.fetchall()
-        
-        # Calculate similarities
+        self._ensure_job_index()
+        if query_vector is None:
+            query_vector = self.generate_embedding(query)
+
+        # Attribute filters pick rows from the index bitmaps; only those rows are scored
+        hits = self.job_index.search(query_vector, top_k=top_k, min_score=0.3, filters=self._job_filters(filters))
+
         scored_jobs = []
-        for job in all_jobs:
-            if job['desc_vector_json']:
-                try:
-                    job_vector = json.loads(job['desc_vector_json'])
-                    similarity = self.cosine_similarity(query_vector, job_vector)
-                    
-                    if similarity > 0.3:  # Relevance threshold
-                        scored_jobs.append({
-                            "id": job["job_id"],
-                            "title": job["title"],
-                            "company": job["company"],
-                            "location": job["location"],
-                            "salary": f"₹{job['salary']:.1f} LPA" if job['salary'] else "Competitive",
-                            "description": job["description"][:150] + "..." if job["description"] and len(job["description"]) > 150 else job["description"],
-                            "similarity_score": round(similarity * 100, 2),
-                            "search_tech": "AI Semantic Search",
-                            "status": "Hackathon Ready 🚀"
-                        })
-                except Exception as e:
-                    continue
-        
-        scored_jobs.sort(key=lambda x: x["similarity_score"], reverse=True)
-        return scored_jobs[:top_k]
+        for job_id, similarity, job in hits:
+            scored_jobs.append({
+                "id": job_id,
+                "title": job["title"],
+                "company": job["company"],
+                "location": job["location"],
+                "salary": f"₹{job['salary']:.1f} LPA" if job['salary'] else "Competitive",
+                "description": job["description"][:150] + "..." if job["description"] and len(job["description"]) > 150 else job["description"],
+                "similarity_score": round(similarity * 100, 2),
+                "search_tech": "AI Semantic Search",
+                "status": "Hackathon Ready 🚀"
+            })
+        return scored_jobs
+
+    def hybrid_search_jobs(self, query: str, top_k: int = 10, filters: Dict = None,
+                           query_vector: List[float] = None, candidates: int = 100,
+                           min_score: float = 0.3) -> List[Dict]:
+        """
+        Keyword + semantic job search: BM25 and cosine top-`candidates` lists,
+        each restricted by the same attribute filters, fused with reciprocal
+        rank fusion so neither score scale dominates. Semantic candidates need
+        the same min_score as semantic_search_jobs, so a query with no keyword
+        or close semantic match returns nothing.
+        """
+        self._ensure_job_index()
+        if query_vector is None:
+            query_vector = self.generate_embedding(query)
+
+        index_filters = self._job_filters(filters)
+        semantic_hits = self.job_index.search(query_vector, top_k=candidates, min_score=min_score,
+                                              filters=index_filters)
+        accept = None
+        if index_filters:
+            payloads = self.job_lexical_index.payloads
+            accept = lambda job_id: self._payload_matches(payloads.get(job_id, {}), index_filters)
+        lexical_hits = self.job_lexical_index.search(query, top_k=candidates, accept=accept)
+
+        semantic_scores = {job_id: similarity for job_id, similarity, _ in semantic_hits}
+        lexical_scores = dict(lexical_hits)
+        fused = reciprocal_rank_fusion(
+            [[job_id for job_id, _, _ in semantic_hits], [job_id for job_id, _ in lexical_hits]],
+            k=self.hybrid_rrf_k,
+        )
+
+        results = []
+        for job_id, rrf_score in fused[:top_k]:
+            job = self.job_index.get_payload(job_id) or self.job_lexical_index.get_payload(job_id) or {}
+            results.append({
+                "id": job_id,
+                "title": job.get("title"),
+                "company": job.get("company"),
+                "location": job.get("location"),
+                "salary": f"₹{job['salary']:.1f} LPA" if job.get('salary') else "Competitive",
+                "description": job["description"][:150] + "..." if job.get("description") and len(job["description"]) > 150 else job.get("description"),
+                "similarity_score": round(semantic_scores[job_id] * 100, 2) if job_id in semantic_scores else None,
+                "keyword_score": round(lexical_scores[job_id], 3) if job_id in lexical_scores else None,
+                "hybrid_score": round(rrf_score, 5),
+                "search_tech": "Hybrid BM25 + Semantic Search",
+            })
+        return results
 
-    def semantic_career_recommendations(self, query: str, top_k: int = 10) -> List[Dict]:
+    @staticmethod
+    def _payload_matches(payload: Dict[str, Any], index_filters: Dict[str, Any]) -> bool:
+        for name, condition in index_filters.items():
+            value = str(payload.get(name) or "").strip().lower()
+            if isinstance(condition, dict):
+                if str(condition["contains"]).strip().lower() not in value:
+                    return False
+            else:
+                wanted = condition if isinstance(condition, (list, tuple, set)) else [condition]
+                if value not in {str(w).strip().lower() for w in wanted}:
+                    return False
+        return True
+
+    async def hybrid_search_jobs_async(self, query: str, top_k: int = 10, filters: Dict = None) -> List[Dict]:
+        """hybrid_search_jobs without blocking the event loop"""
+        query_vector = await self.generate_embedding_async(query)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, lambda: self.hybrid_search_jobs(query, top_k, filters, query_vector))
+
+    def semantic_career_recommendations(self, query: str, top_k: int = 10,
+                                        query_vector: List[float] = None) -> List[Dict]:
         """HACKATHON ENDPOINT: AI career recommendations"""
-        query_vector = self.generate_embedding(query)
-        
-        cursor = self.conn.cursor(dictionary=True)
-        cursor.execute("""
-            SELECT career_id, title, description, growth, salary_range, demand, category,
-                   skills_vector_json
-            FROM careers 
-        """)
-        
-        all_careers = cursor.fetchall()
-        
+        self._ensure_career_index()
+        if query_vector is None:
+            query_vector = self.generate_embedding(query)
+
         recommendations = []
-        for career in all_careers:
-            if career['skills_vector_json']:
-                try:
-                    career_vector = json.loads(career['skills_vector_json'])
-                    similarity = self.cosine_similarity(query_vector, career_vector)
-                    
-                    recommendations.append({
-                        "id": career["career_id"],
-                        "title": career["title"],
-                        "description": career["description"],
-                        "growth": career["growth"],
-                        "salary_range": career["salary_range"],
-                        "demand": career["demand"],
-                        "category": career["category"],
-                        "similarity_score": round(similarity * 100, 2),
-                        "ai_tech": "Vector Similarity",
-                        "status": "AI Recommended 🎯"
-                    })
-                except Exception as e:
-                    continue
-        
-        recommendations.sort(key=lambda x: x["similarity_score"], reverse=True)
-        return recommendations[:top_k]
+        for career_id, similarity, career in self.career_index.search(query_vector, top_k=top_k):
+            recommendations.append({
+                "id": career_id,
+                "title": career["title"],
+                "description": career["description"],
+                "growth": career["growth"],
+                "salary_range": career["salary_range"],
+                "demand": career["demand"],
+                "category": career["category"],
+                "similarity_score": round(similarity * 100, 2),
+                "ai_tech": "Vector Similarity",
+                "status": "AI Recommended 🎯"
+            })
+        return recommendations
+
+    async def semantic_search_jobs_async(self, query: str, top_k: int = 10, filters: Dict = None) -> List[Dict]:
+        """semantic_search_jobs without blocking the event loop"""
+        query_vector = await self.generate_embedding_async(query)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, lambda: self.semantic_search_jobs(query, top_k, filters, query_vector))
+
+    async def semantic_career_recommendations_async(self, query: str, top_k: int = 10) -> List[Dict]:
+        """semantic_career_recommendations without blocking the event loop"""
+        query_vector = await self.generate_embedding_async(query)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, lambda: self.semantic_career_recommendations(query, top_k, query_vector))
 
     def close(self):
-        """Close database connection"""
-        if hasattr(self, 'conn'):
-            self.conn.close()
+        """Close pooled database connections"""
+        self.embedding_batcher.stop()
+        if hasattr(self, 'db_pool'):
+            self.db_pool.close_all()
 
 # Global instance
 vector_service = GreenJobsVectorService()
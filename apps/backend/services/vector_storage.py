@@ -0,0 +1,127 @@
+# services/vector_storage.py - Compact binary storage for embedding vectors
+import json
+import os
+import sqlite3
+import numpy as np
+from typing import Any, Dict, List, Optional
+
+# Raw little-endian float32, or int8 with a per-vector float32 scale prefix
+STORAGE_FORMAT = os.getenv('VECTOR_STORAGE_FORMAT', 'f32').lower()
+
+FLOAT32_LE = np.dtype('<f4')
+INT8_SCALE_BYTES = 4
+
+# (table, id column, [(json column, blob column), ...])
+VECTOR_TABLES = [
+    ("jobs", "job_id", [("desc_vector_json", "desc_vector_blob"), ("skills_vector_json", "skills_vector_blob")]),
+    ("careers", "career_id", [("desc_vector_json", "desc_vector_blob"), ("skills_vector_json", "skills_vector_blob")]),
+]
+
+
+def encode_vector(vector, fmt: str = None) -> bytes:
+    """Serialize a vector as raw float32 (4 bytes/dim) or scaled int8 (1 byte/dim + 4)"""
+    fmt = fmt or STORAGE_FORMAT
+    vec = np.asarray(vector, dtype=FLOAT32_LE).reshape(-1)
+    if fmt == 'int8':
+        peak = float(np.max(np.abs(vec))) if vec.size else 0.0
+        scale = peak / 127.0 if peak > 0 else 1.0
+        quantized = np.clip(np.rint(vec / scale), -127, 127).astype(np.int8)
+        return np.array([scale], dtype=FLOAT32_LE).tobytes() + quantized.tobytes()
+    return vec.tobytes()
+
+
+def decode_vector(blob, dimension: int) -> np.ndarray:
+    """
+    Read a stored vector. Float32 blobs are wrapped with np.frombuffer (no copy,
+    read-only); int8 blobs are dequantized. The format is inferred from length.
+    """
+    size = len(blob)
+    if size == dimension * FLOAT32_LE.itemsize:
+        return np.frombuffer(blob, dtype=FLOAT32_LE)
+    if size == dimension + INT8_SCALE_BYTES:
+        scale = np.frombuffer(blob, dtype=FLOAT32_LE, count=1)[0]
+        return np.frombuffer(blob, dtype=np.int8, offset=INT8_SCALE_BYTES).astype(np.float32) * scale
+    raise ValueError(f"Vector blob of {size} bytes does not match dimension {dimension}")
+
+
+def vector_from_columns(blob, json_text, dimension: int) -> Optional[np.ndarray]:
+    """Prefer the binary column, fall back to legacy JSON text; None if neither is usable"""
+    try:
+        if blob:
+            return decode_vector(blob, dimension)
+        if json_text:
+            vector = np.asarray(json.loads(json_text), dtype=np.float32)
+            return vector if vector.shape == (dimension,) else None
+    except (TypeError, ValueError):
+        return None
+    return None
+
+
+def ensure_blob_columns(conn, use_sqlite: bool):
+    """Add the BLOB vector columns to jobs and careers if they are missing"""
+    cursor = conn.cursor()
+    for table, _, columns in VECTOR_TABLES:
+        for _, blob_column in columns:
+            if use_sqlite:
+                try:
+                    cursor.execute(f"ALTER TABLE {table} ADD COLUMN {blob_column} BLOB")
+                except sqlite3.OperationalError:
+                    pass
+            else:
+                try:
+                    cursor.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {blob_column} BLOB")
+                except Exception:
+                    pass
+    conn.commit()
+    cursor.close()
+
+
+def migrate_json_vectors(conn, use_sqlite: bool, batch_size: int = 500,
+                         fmt: str = None, clear_json: Optional[bool] = None) -> Dict[str, Any]:
+    """
+    Convert every JSON vector that has no binary copy yet, in committed batches.
+
+    With clear_json the legacy text is nulled out once converted so the
+    table actually shrinks; it defaults to on for lossless float32 and off
+    for int8. Safe to re-run: already-migrated rows are skipped.
+    """
+    fmt = fmt or STORAGE_FORMAT
+    if clear_json is None:
+        clear_json = fmt == 'f32'
+    ensure_blob_columns(conn, use_sqlite)
+    report: Dict[str, Any] = {"format": fmt, "json_cleared": clear_json}
+
+    for table, id_column, columns in VECTOR_TABLES:
+        converted = 0
+        for json_column, blob_column in columns:
+            set_clause = f"{blob_column} = ?" + (f", {json_column} = NULL" if clear_json else "")
+            last_id = 0
+            while True:
+                cursor = conn.cursor()
+                cursor.execute(f"""
+                    SELECT {id_column}, {json_column} FROM {table}
+                    WHERE {json_column} IS NOT NULL AND {blob_column} IS NULL AND {id_column} > ?
+                    ORDER BY {id_column}
+                    LIMIT ?
+                """, (last_id, batch_size))
+                rows = cursor.fetchall()
+                if not rows:
+                    cursor.close()
+                    break
+
+                updates: List[tuple] = []
+                for row_id, json_text in rows:
+                    last_id = row_id
+                    try:
+                        updates.append((encode_vector(json.loads(json_text), fmt), row_id))
+                    except (TypeError, ValueError):
+                        continue
+                if updates:
+                    cursor.executemany(f"UPDATE {table} SET {set_clause} WHERE {id_column} = ?", updates)
+                conn.commit()
+                cursor.close()
+                converted += len(updates)
+        report[table] = converted
+        print(f"✅ Migrated {converted} {table} vectors to binary storage")
+
+    return report
@@ -5,10 +5,11 @@ def test_vector_service():
         print("Testing vector service connection...")
         
         # Test database connection
-        conn = vector_service.conn
-        cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM careers")
-        count = cursor.fetchone()[0]
+        with vector_service.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM careers")
+            count = cursor.fetchone()[0]
+            cursor.close()
         print(f"✅ Connected to database. Found {count} careers.")
         
         # Test embedding generation
@@ -24,7 +25,6 @@ def test_vector_service():
         similarity = vector_service.cosine_similarity(vec1, vec2)
         print(f"✅ Similarity between '{text1}' and '{text2}': {similarity:.4f}")
         
-        cursor.close()
         return True
         
     except Exception as e:
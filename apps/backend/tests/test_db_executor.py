@@ -0,0 +1,61 @@
+"""
+Tests for the bounded async database executor
+"""
+import asyncio
+import time
+import pytest
+from services.db_executor import DatabaseExecutor, DatabaseTimeoutError, DatabaseUnavailableError
+from services.db_pool import create_sqlite_pool
+
+def _slow_query(conn):
+    cursor = conn.cursor()
+    # Recursive CTE that runs far longer than the timeout unless interrupted
+    cursor.execute("""
+        WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 100000000)
+        SELECT COUNT(*) FROM n
+    """)
+    return cursor.fetchone()[0]
+
+class TestDatabaseExecutor:
+    def test_runs_with_pooled_connection(self, tmp_path):
+        """fn receives a pooled connection that is returned afterwards"""
+        pool = create_sqlite_pool(str(tmp_path / "db.sqlite"), max_size=2)
+        executor = DatabaseExecutor(pool.acquire, max_workers=2)
+
+        async def run():
+            return await asyncio.gather(*(executor.run(lambda conn, i=i: conn.execute("SELECT ?", (i,)).fetchone()[0])
+                                          for i in range(5)))
+
+        assert asyncio.run(run()) == [0, 1, 2, 3, 4]
+        assert pool.stats()["in_use"] == 0
+        assert executor.stats()["completed"] == 5
+
+    def test_timeout_interrupts_the_statement(self, tmp_path):
+        """The awaiting handler gets DatabaseTimeoutError and SQLite aborts the query, freeing the worker"""
+        pool = create_sqlite_pool(str(tmp_path / "db.sqlite"), max_size=1)
+        executor = DatabaseExecutor(pool.acquire, max_workers=1)
+
+        started = time.perf_counter()
+        with pytest.raises(DatabaseTimeoutError):
+            asyncio.run(executor.run(_slow_query, timeout=0.1))
+        assert time.perf_counter() - started < 5
+
+        # The interrupted statement released its connection and thread
+        assert asyncio.run(executor.run(lambda conn: conn.execute("SELECT 1").fetchone()[0], timeout=5)) == 1
+        stats = executor.stats()
+        assert stats["timeouts"] == 1 and stats["failed"] == 1
+
+    def test_unavailable_database(self):
+        executor = DatabaseExecutor(lambda: None, max_workers=1)
+        with pytest.raises(DatabaseUnavailableError):
+            asyncio.run(executor.run(lambda conn: None))
+
+    def test_database_side_timeout_maps_to_timeout_error(self, tmp_path):
+        """When the SQLite deadline fires before the await deadline the caller still sees DatabaseTimeoutError"""
+        pool = create_sqlite_pool(str(tmp_path / "db.sqlite"), max_size=1)
+        executor = DatabaseExecutor(pool.acquire, max_workers=1)
+
+        # Statement deadline 0.1s, await deadline 5s
+        with pytest.raises(DatabaseTimeoutError):
+            asyncio.run(executor.run_sync(executor._with_connection, _slow_query, 0.1, (), {}, timeout=5))
+        assert executor.stats()["timeouts"] == 1
@@ -0,0 +1,70 @@
+"""
+Tests for the bounded MariaDB / SQLite connection pool
+"""
+import threading
+import time
+import pytest
+from services.db_pool import ConnectionPool, PoolTimeoutError, create_sqlite_pool
+
+class TestConnectionPool:
+    def test_reuses_connections_and_accepts_dictionary_cursor(self, tmp_path):
+        """close() returns the connection to the pool; cursor(dictionary=True) works on SQLite"""
+        pool = create_sqlite_pool(str(tmp_path / "pool.db"), max_size=2)
+        conn = pool.acquire()
+        assert conn.is_mariadb is False
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT 1 AS one")
+        assert cursor.fetchone()["one"] == 1
+        raw = conn.raw
+        conn.close()
+        conn.close()  # double close is harmless
+
+        with pool.connection() as again:
+            assert again.raw is raw
+        stats = pool.stats()
+        assert stats["created"] == 1 and stats["acquired"] == 2 and stats["idle"] == 1
+
+    def test_bounded_with_acquire_timeout(self, tmp_path):
+        """A full pool blocks until a release, then times out"""
+        pool = create_sqlite_pool(str(tmp_path / "pool.db"), max_size=1)
+        held = pool.acquire()
+        with pytest.raises(PoolTimeoutError):
+            pool.acquire(timeout=0.05)
+        assert pool.stats()["timeouts"] == 1
+        assert pool.stats()["utilisation"] == 1.0
+
+        threading.Timer(0.05, held.close).start()
+        with pool.connection(timeout=2):
+            pass
+        assert pool.stats()["max_wait_ms"] > 0
+
+    def test_recycles_expired_and_unhealthy_connections(self, tmp_path):
+        """Connections past max_lifetime are replaced; a failed health check discards the connection"""
+        pool = create_sqlite_pool(str(tmp_path / "pool.db"), max_size=1, max_lifetime=0.01)
+        pool.acquire().close()
+        time.sleep(0.02)
+        pool.acquire().close()
+        assert pool.stats()["created"] == 2 and pool.stats()["recycled"] >= 1
+
+        def failing_check(conn):
+            raise RuntimeError("gone away")
+        pool = create_sqlite_pool(str(tmp_path / "pool.db"), max_size=1, health_check_interval=0)
+        pool.health_check = failing_check
+        pool.acquire().close()
+        pool.acquire().close()
+        assert pool.stats()["health_failures"] == 1 and pool.stats()["created"] == 2
+
+    def test_unreleased_connection_returns_on_garbage_collection(self):
+        """A handler that never calls close() does not drain the pool"""
+        pool = ConnectionPool(lambda: _FakeConnection(), "sqlite", max_size=1)
+        pool.acquire()  # dropped immediately
+        with pool.connection(timeout=0.1):
+            pass
+        assert pool.stats()["leaked"] == 1
+
+class _FakeConnection:
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
@@ -0,0 +1,100 @@
+"""
+Tests for embedding backend selection and fallback
+"""
+import sys
+import types
+import pytest
+from services.embedding_backends import DEFAULT_MODEL, DEFAULT_ONNX_INT8_FILE, load_configured_model, load_embedding_model
+
+
+class FakeSentenceTransformer:
+    """Records how it was constructed; ONNX loads fail like they do without optimum[onnxruntime]"""
+    onnx_available = True
+    created = []
+
+    def __init__(self, model_name, device=None, backend="torch", model_kwargs=None):
+        if backend == "onnx" and not self.onnx_available:
+            raise ImportError("Using the ONNX backend requires installing Optimum and ONNX Runtime")
+        self.model_name = model_name
+        self.backend = backend
+        self.model_kwargs = model_kwargs
+        FakeSentenceTransformer.created.append(self)
+
+
+@pytest.fixture
+def fake_models(monkeypatch):
+    FakeSentenceTransformer.created = []
+    FakeSentenceTransformer.onnx_available = True
+    module = types.ModuleType("sentence_transformers")
+    module.SentenceTransformer = FakeSentenceTransformer
+    monkeypatch.setitem(sys.modules, "sentence_transformers", module)
+    return FakeSentenceTransformer
+
+
+def fake_torch(quantized):
+    torch = types.ModuleType("torch")
+    torch.nn = types.SimpleNamespace(Linear=object)
+    torch.qint8 = "qint8"
+    torch.ao = types.SimpleNamespace(quantization=types.SimpleNamespace(
+        quantize_dynamic=lambda model, layers, dtype, inplace: quantized.append((model, dtype, inplace))
+    ))
+    return torch
+
+
+class TestBackendResolution:
+    def test_torch_is_the_default(self, fake_models):
+        model, backend = load_embedding_model("mini")
+        assert backend == "torch"
+        assert model.model_name == "mini" and model.backend == "torch"
+
+    def test_unknown_backend_falls_back_to_torch(self, fake_models):
+        model, backend = load_embedding_model("mini", backend="tensorrt")
+        assert backend == "torch" and model.backend == "torch"
+
+    def test_onnx_int8_loads_the_quantized_file(self, fake_models):
+        model, backend = load_embedding_model("mini", backend="ONNX-INT8")
+        assert backend == "onnx-int8"
+        assert model.backend == "onnx"
+        assert model.model_kwargs == {"file_name": DEFAULT_ONNX_INT8_FILE}
+
+        model, _ = load_embedding_model("mini", backend="onnx-int8", onnx_file="onnx/model_qint8_arm64.onnx")
+        assert model.model_kwargs == {"file_name": "onnx/model_qint8_arm64.onnx"}
+
+    def test_torch_int8_quantizes_linear_layers(self, fake_models, monkeypatch):
+        quantized = []
+        monkeypatch.setitem(sys.modules, "torch", fake_torch(quantized))
+        model, backend = load_embedding_model("mini", backend="torch-int8")
+        assert backend == "torch-int8"
+        assert quantized == [(model, "qint8", True)]
+
+
+class TestFallback:
+    @pytest.mark.parametrize("requested", ["onnx", "onnx-int8"])
+    def test_missing_onnxruntime_falls_back_to_torch(self, fake_models, requested):
+        fake_models.onnx_available = False
+        model, backend = load_embedding_model("mini", backend=requested)
+        assert backend == "torch"
+        assert model.backend == "torch"
+        assert len(fake_models.created) == 1
+
+    def test_missing_torch_quantization_falls_back_to_torch(self, fake_models, monkeypatch):
+        monkeypatch.setitem(sys.modules, "torch", None)  # import torch raises ImportError
+        model, backend = load_embedding_model("mini", backend="torch-int8")
+        assert backend == "torch" and model.backend == "torch"
+
+
+class TestConfiguredModel:
+    def test_reads_environment(self, fake_models, monkeypatch):
+        monkeypatch.setenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+        monkeypatch.setenv("EMBEDDING_BACKEND", "onnx-int8")
+        monkeypatch.setenv("EMBEDDING_ONNX_FILE", "")
+        model_name, model, backend = load_configured_model()
+        assert model_name == "all-MiniLM-L6-v2"
+        assert backend == "onnx-int8"
+        assert model.model_kwargs == {"file_name": DEFAULT_ONNX_INT8_FILE}  # empty means the default file
+
+    def test_defaults(self, fake_models, monkeypatch):
+        for name in ("EMBEDDING_MODEL", "EMBEDDING_BACKEND", "EMBEDDING_ONNX_FILE"):
+            monkeypatch.delenv(name, raising=False)
+        model_name, model, backend = load_configured_model()
+        assert (model_name, backend) == (DEFAULT_MODEL, "torch")
@@ -0,0 +1,103 @@
+"""
+Tests for the batched, resumable embedding backfill
+"""
+import sqlite3
+from contextlib import nullcontext
+import numpy as np
+from services.embedding_backfill import EmbeddingBackfill
+from services.vector_registry import VectorRegistry
+
+class CountingModel:
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, batch_size=32, normalize_embeddings=False, show_progress_bar=False):
+        self.calls.append(len(texts))
+        return np.ones((len(texts), 8), dtype=np.float32)
+
+class FakeVectorService:
+    def __init__(self, conn):
+        self.conn = conn
+        self.use_sqlite = True
+        self.model = CountingModel()
+        self.model_name = "test-model"
+        self.model_key = "test-model@torch"
+        self.embedding_version = "1"
+        self.vector_registry = VectorRegistry(self.connection, use_sqlite=True)
+
+    def connection(self):
+        return nullcontext(self.conn)
+
+    def current_vector_spec_id(self):
+        self.vector_registry.ensure_schema()
+        return self.vector_registry.register(self.model_key, 8, "l2", self.embedding_version)
+
+def _service():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("""CREATE TABLE jobs (job_id INTEGER PRIMARY KEY, title TEXT, description TEXT, company TEXT,
+                    desc_vector_json TEXT, skills_vector_json TEXT)""")
+    conn.execute("""CREATE TABLE careers (career_id INTEGER PRIMARY KEY, title TEXT, description TEXT,
+                    required_skills TEXT, desc_vector_json TEXT, skills_vector_json TEXT)""")
+    conn.executemany("INSERT INTO jobs (job_id, title, description, company) VALUES (?, ?, ?, ?)",
+                     [(i, f"Job {i}", "Solar install", "SunCo") for i in range(1, 8)])
+    conn.execute("INSERT INTO careers (career_id, title) VALUES (1, 'Wind Technician')")
+    return FakeVectorService(conn)
+
+class TestEmbeddingBackfill:
+    def test_batches_and_skips_unchanged(self, tmp_path):
+        """Each chunk is one encode call; a re-run skips rows whose text is unchanged"""
+        service = _service()
+        backfill = EmbeddingBackfill(service, chunk_size=3, checkpoint_path=str(tmp_path / "ckpt.json"))
+
+        report = backfill.run()
+        assert report["jobs"]["embedded"] == 7
+        assert service.model.calls == [2, 6, 6, 2]  # careers, then 3 job chunks x (desc + skills)
+        assert service.conn.execute("SELECT COUNT(*) FROM jobs WHERE desc_vector_blob IS NULL").fetchone()[0] == 0
+
+        service.conn.execute("UPDATE jobs SET description = 'Wind farm' WHERE job_id = 4")
+        report = backfill.run()
+        assert report["jobs"]["embedded"] == 1
+        assert report["jobs"]["skipped_unchanged"] == 6
+
+    def test_resumes_from_checkpoint(self, tmp_path):
+        """Rows at or below the checkpointed id are not revisited"""
+        service = _service()
+        backfill = EmbeddingBackfill(service, chunk_size=2, checkpoint_path=str(tmp_path / "ckpt.json"))
+        backfill._write_checkpoint({"careers": 1, "jobs": 5})
+
+        report = backfill.run()
+        assert report["resumed_from"] == {"careers": 1, "jobs": 5}
+        assert report["jobs"]["embedded"] == 2
+        assert not (tmp_path / "ckpt.json").exists()
+
+    def test_stale_only_reembeds_outdated_specs(self, tmp_path):
+        """Bumping the spec version marks every row stale; the stale pass re-embeds and re-stamps them"""
+        service = _service()
+        EmbeddingBackfill(service, checkpoint_path=str(tmp_path / "ckpt.json")).run()
+        first_spec = service.current_vector_spec_id()
+
+        service.embedding_version = "2"
+        coverage = service.vector_registry.coverage(service.current_vector_spec_id())
+        assert coverage["jobs"] == {"current": 0, "legacy": 0, "stale": 7}
+
+        report = EmbeddingBackfill(service, stale_only=True, checkpoint_path=str(tmp_path / "ckpt.json")).run()
+        assert report["jobs"]["embedded"] == 7
+        coverage = service.vector_registry.coverage(service.current_vector_spec_id())
+        assert coverage["jobs"]["current"] == 7
+        assert coverage["current_spec"]["version"] == "2"
+        assert service.current_vector_spec_id() != first_spec
+
+    def test_backend_switch_reembeds_and_restamps(self, tmp_path):
+        """A new EMBEDDING_BACKEND is a new spec and a new source hash, so every row is redone"""
+        service = _service()
+        EmbeddingBackfill(service, checkpoint_path=str(tmp_path / "ckpt.json")).run()
+        first_spec = service.current_vector_spec_id()
+
+        service.model_key = "test-model@onnx-int8"
+        coverage = service.vector_registry.coverage(service.current_vector_spec_id())
+        assert coverage["jobs"]["stale"] == 7
+
+        report = EmbeddingBackfill(service, checkpoint_path=str(tmp_path / "ckpt.json")).run()
+        assert report["jobs"]["embedded"] == 7
+        assert report["jobs"]["skipped_unchanged"] == 0
+        assert service.current_vector_spec_id() != first_spec
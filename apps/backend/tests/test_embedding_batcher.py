@@ -0,0 +1,45 @@
+"""
+Tests for the micro-batching embedding worker
+"""
+import asyncio
+import pytest
+from services.embedding_batcher import EmbeddingBatcher
+
+class TestEmbeddingBatcher:
+    def test_concurrent_requests_share_a_batch(self):
+        """Requests arriving within the wait window are encoded in one call"""
+        calls = []
+
+        def encode(texts):
+            calls.append(list(texts))
+            return [len(text) for text in texts]
+
+        batcher = EmbeddingBatcher(encode, max_batch_size=8, max_wait_ms=50)
+
+        async def run():
+            return await asyncio.gather(*(batcher.embed("x" * i) for i in range(1, 6)))
+
+        try:
+            assert asyncio.run(run()) == [1, 2, 3, 4, 5]
+        finally:
+            batcher.stop()
+        assert len(calls) == 1
+        assert batcher.stats()["largest_batch"] == 5
+
+    def test_batch_size_cap_and_errors(self):
+        """Batches never exceed max_batch_size and encode errors reach every caller"""
+        def encode(texts):
+            if "boom" in texts:
+                raise RuntimeError("model failed")
+            return texts
+
+        batcher = EmbeddingBatcher(encode, max_batch_size=2, max_wait_ms=20)
+        try:
+            futures = [batcher.submit(t) for t in ("a", "b", "c")]
+            assert [f.result(timeout=2) for f in futures] == ["a", "b", "c"]
+            assert batcher.stats()["largest_batch"] == 2
+
+            with pytest.raises(RuntimeError):
+                batcher.submit("boom").result(timeout=2)
+        finally:
+            batcher.stop()
@@ -0,0 +1,40 @@
+"""
+Tests for the query embedding cache
+"""
+import numpy as np
+from services.embedding_cache import EmbeddingCache
+
+class TestEmbeddingCache:
+    def test_normalized_hits_and_lru_eviction(self):
+        """Case/whitespace variants share an entry; the least recently used entry is evicted"""
+        cache = EmbeddingCache(max_entries=2, dimension=4)
+        cache.put("m", "Solar Engineer", np.ones(4))
+        cache.put("m", "wind", np.zeros(4))
+
+        assert cache.get("m", "  solar   engineer ") is not None
+        cache.put("m", "python data", np.ones(4))
+
+        assert cache.get("m", "wind") is None
+        assert cache.get("other-model", "solar engineer") is None
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 2
+        assert stats["evictions"] == 1
+
+    def test_ttl_expiry(self):
+        """Entries older than the TTL are treated as misses"""
+        cache = EmbeddingCache(ttl_seconds=0.0001, dimension=4)
+        cache.put("m", "solar", np.ones(4))
+        cache._entries[("m", "solar")] = (np.ones(4), 0.0)
+
+        assert cache.get("m", "solar") is None
+        assert cache.stats()["expirations"] == 1
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        """A new cache instance reads vectors written by a previous one"""
+        path = str(tmp_path / "queries.db")
+        EmbeddingCache(persist_path=path, dimension=4).put("m", "solar", np.arange(4))
+
+        restored = EmbeddingCache(persist_path=path, dimension=4)
+        assert np.array_equal(restored.get("m", "solar"), np.arange(4, dtype=np.float32))
+        assert restored.stats()["disk_hits"] == 1
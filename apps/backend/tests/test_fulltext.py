@@ -0,0 +1,52 @@
+"""
+Tests for the FTS5 / FULLTEXT keyword search migration and query builders
+"""
+import sqlite3
+from services.fulltext import build_match_query, ensure_fulltext_indexes, fulltext_condition, match_sql
+
+def _conn():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE jobs (job_id INTEGER PRIMARY KEY, title TEXT, description TEXT, skills TEXT)")
+    conn.executemany("INSERT INTO jobs VALUES (?, ?, ?, ?)", [
+        (1, "Solar Engineer", "Design rooftop solar PV plants", '["python", "autocad"]'),
+        (2, "Wind Technician", "Maintain onshore wind turbines", '["scada"]'),
+    ])
+    return conn
+
+def _ids(conn, terms, **kwargs):
+    condition = fulltext_condition(conn, "jobs", terms, placeholder="?", **kwargs)
+    assert condition is not None
+    sql, params = condition
+    return sorted(row[0] for row in conn.execute(f"SELECT job_id FROM jobs WHERE {sql}", params))
+
+class TestFulltext:
+    def test_migration_backfills_and_triggers_sync(self):
+        """Existing rows are indexed on creation; inserts, updates and deletes follow via triggers"""
+        conn = _conn()
+        report = ensure_fulltext_indexes(conn, use_sqlite=True)
+        assert report["jobs"] == "created FTS5 table"
+        assert report["careers"].startswith("skipped")
+        assert ensure_fulltext_indexes(conn, use_sqlite=True)["jobs"] == "FTS5 table exists"
+
+        assert _ids(conn, ["solar"]) == [1]
+        assert _ids(conn, ["pyth"]) == [1]  # prefix, like LIKE '%pyth%'
+        assert _ids(conn, ["solar", "scada"]) == [1, 2]
+        assert _ids(conn, ["solar", "scada"], match_all=True) == []
+
+        conn.execute("INSERT INTO jobs VALUES (3, 'Solar Installer', 'Rooftop installs', '[]')")
+        conn.execute("UPDATE jobs SET description = 'Offshore wind and solar hybrid' WHERE job_id = 2")
+        conn.execute("DELETE FROM jobs WHERE job_id = 1")
+        assert _ids(conn, ["solar"]) == [2, 3]
+
+    def test_query_builders_per_backend(self):
+        assert build_match_query(["solar pv", "python"], "sqlite") == '"solar pv"* OR "python"*'
+        assert build_match_query(["solar panels", "python"], "mariadb", match_all=True) == '+"solar panels" +python*'
+        assert "MATCH(j.title, j.description, j.skills) AGAINST" in match_sql("jobs", "mariadb", alias="j.")
+
+    def test_unexpressible_terms_fall_back(self):
+        """Symbols, non-ASCII, short or stop words keep the LIKE path (None)"""
+        assert build_match_query(["c++"], "sqlite") is None
+        assert build_match_query(["सौर ऊर्जा"], "sqlite") is None
+        assert build_match_query(["ai"], "mariadb") is None
+        assert build_match_query(["   "], "sqlite") is None
+        assert fulltext_condition(_conn(), "careers", ["solar"]) is None  # not migrated
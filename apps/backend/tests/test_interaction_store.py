@@ -0,0 +1,129 @@
+"""
+Tests for the interaction log and its CSR user x item matrix
+"""
+import sqlite3
+import time
+import numpy as np
+import pytest
+from services.interaction_store import InteractionStore, UserItemMatrix, advance_watermark
+
+
+def sqlite_connect(path):
+    return lambda: sqlite3.connect(path)
+
+
+class TestUserItemMatrix:
+    def test_duplicates_are_summed_per_row(self):
+        matrix = UserItemMatrix.from_triples(
+            np.array([7, 3, 7, 7]), np.array([100, 100, 200, 100]), np.array([1.0, 2.0, 3.0, 2.0]), 0.0
+        )
+        assert matrix.shape == (2, 2)
+        assert matrix.nnz == 3
+        items, weights = matrix.row(7)
+        assert dict(zip(items.tolist(), weights.tolist())) == {100: 3.0, 200: 3.0}
+        assert matrix.row(42)[0].size == 0
+
+    def test_merge_decays_existing_weights(self):
+        day = 86400.0
+        matrix = UserItemMatrix.from_triples(np.array([1]), np.array([10]), np.array([4.0]), 0.0)
+        merged = matrix.merged(np.array([1, 2]), np.array([10, 20]), np.array([1.0, 1.0]), 30 * day,
+                               watermark=5, half_life_seconds=30 * day, min_weight=0.0)
+        weights = dict(zip(*[a.tolist() for a in merged.row(1)]))
+        assert weights[10] == pytest.approx(3.0)  # 4 halved + 1
+        assert merged.watermark == 5
+        assert merged.row(2)[0].tolist() == [20]
+
+    def test_save_and_load(self, tmp_path):
+        path = str(tmp_path / "matrix.npz")
+        UserItemMatrix.from_triples(np.array([1, 2]), np.array([10, 20]), np.array([1.0, 2.0]), 123.0, 9).save(path)
+        loaded = UserItemMatrix.load(path)
+        assert loaded.watermark == 9
+        assert loaded.reference_time == 123.0
+        assert loaded.row(2)[0].tolist() == [20]
+
+    def test_watermark_stops_at_gaps_until_they_settle(self):
+        watermark, folded = advance_watermark(0, np.array([1, 2, 4, 5]), overlap=10)
+        assert watermark == 2
+        assert folded.tolist() == [4, 5]
+        assert advance_watermark(2, np.array([3, 4, 5]), overlap=10)[0] == 5
+        watermark, folded = advance_watermark(2, np.array([4, 5, 20]), overlap=10)
+        assert (watermark, folded.tolist()) == (10, [20])
+
+
+class TestInteractionStore:
+    def test_recorded_interactions_are_visible_before_compaction(self, tmp_path):
+        store = InteractionStore(sqlite_connect(str(tmp_path / "log.db")), compact_seconds=0)
+        store.compact()
+        store.record(1, 10, "view")
+        store.record(1, 10, "apply")
+        store.record(1, 20, "save")
+        weights = store.user_weights(1)
+        assert weights[10] == pytest.approx(4.0, rel=1e-3)
+        assert weights[20] == pytest.approx(2.0, rel=1e-3)
+
+    def test_compaction_is_incremental_and_survives_restart(self, tmp_path):
+        db, snapshot = str(tmp_path / "log.db"), str(tmp_path / "matrix.npz")
+        store = InteractionStore(sqlite_connect(db), compact_seconds=0, persist_path=snapshot)
+        store.record(1, 10, "save")
+        store.record(2, 10, "view")
+        assert store.compact()["rows_folded"] == 2
+        store.record(1, 30, "apply")
+        assert store.compact()["rows_folded"] == 1
+        assert store.stats()["nnz"] == 3
+
+        restarted = InteractionStore(sqlite_connect(db), compact_seconds=0, persist_path=snapshot)
+        weights = restarted.user_weights(1)
+        assert restarted.stats()["watermark"] == 3
+        assert set(weights) == {10, 30}
+        assert weights[30] == pytest.approx(3.0, rel=1e-3)
+
+    def test_old_interactions_decay(self, tmp_path):
+        store = InteractionStore(sqlite_connect(str(tmp_path / "log.db")), half_life_days=1, compact_seconds=0)
+        store.record(1, 10, "apply", at=time.time() - 86400)
+        store.compact()
+        assert store.user_weights(1)[10] == pytest.approx(1.5, rel=1e-3)
+
+    def test_warm_up_failure_is_not_fatal(self):
+        def broken():
+            raise RuntimeError("database down")
+        store = InteractionStore(broken, compact_seconds=0)
+        assert store.warm() is False
+        assert store.matrix is None
+
+    def test_late_committed_rows_are_not_skipped(self, tmp_path):
+        db = str(tmp_path / "log.db")
+        store = InteractionStore(sqlite_connect(db), compact_seconds=0)
+        store.compact()
+        conn = sqlite3.connect(db)
+        insert = "INSERT INTO user_job_interactions VALUES (?, ?, ?, ?, ?)"
+        conn.executemany(insert, [(1, 1, 10, "view", time.time()), (3, 1, 30, "view", time.time())])
+        conn.commit()
+        assert store.compact()["rows_folded"] == 2
+        conn.execute(insert, (2, 1, 20, "save", time.time()))
+        conn.commit()
+        assert store.compact()["rows_folded"] == 1
+        assert store.compact()["rows_folded"] == 0
+        assert store.stats()["watermark"] == 3
+        assert set(store.user_weights(1)) == {10, 20, 30}
+
+    def test_failed_writes_stay_visible_and_are_retried(self, tmp_path):
+        db, down = str(tmp_path / "log.db"), [True]
+
+        def flaky():
+            if down[0]:
+                raise RuntimeError("database down")
+            return sqlite3.connect(db)
+
+        store = InteractionStore(flaky, compact_seconds=0, retry_seconds=0.05)
+        store.record(1, 10, "save")
+        store.flush()
+        assert store.write_errors >= 1
+        assert store._delta[1]
+        down[0] = False
+        deadline = time.time() + 5
+        while store.written == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        assert store.written == 1
+        store.compact()
+        assert store.user_weights(1)[10] == pytest.approx(2.0, rel=1e-3)
+        assert not store._delta
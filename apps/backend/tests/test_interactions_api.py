@@ -0,0 +1,44 @@
+"""
+Tests for the interaction-logging and personalized recommendation endpoints
+"""
+import pytest
+from httpx import AsyncClient
+from app import app, interaction_store
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+async def _token(client):
+    response = await client.post("/api/auth/login", json={"username": "testuser", "password": "testpass123"})
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.mark.asyncio
+async def test_job_view_is_recorded_for_the_user(monkeypatch):
+    """The principal carries user_id, so a view reaches the interaction store"""
+    recorded = []
+    monkeypatch.setattr(interaction_store, "record", lambda *args: recorded.append(args))
+    async with AsyncClient(app=app, base_url="http://testserver") as client:
+        response = await client.post("/api/jobs/1/view", headers=await _token(client))
+
+    assert response.status_code == 200
+    assert response.json()["job_id"] == 1
+    assert len(recorded) == 1
+    user_id, job_id, interaction_type = recorded[0]
+    assert isinstance(user_id, int) and job_id == 1 and interaction_type == "view"
+
+
+@pytest.mark.asyncio
+async def test_personalized_recommendations_use_stored_history(monkeypatch):
+    """Without a posted job_history the stored interactions are used instead of failing"""
+    looked_up = []
+    monkeypatch.setattr(interaction_store, "user_weights", lambda user_id: looked_up.append(user_id) or {})
+    async with AsyncClient(app=app, base_url="http://testserver") as client:
+        response = await client.post("/api/ai/recommendations/personalized",
+                                     json={"skills": ["python", "solar"]}, headers=await _token(client))
+
+    assert response.status_code == 200
+    assert "personalized_recommendations" in response.json()
+    assert len(looked_up) == 1
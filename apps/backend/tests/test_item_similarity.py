@@ -0,0 +1,106 @@
+"""
+Tests for the sparse item-item similarity table
+"""
+import time
+import numpy as np
+import pytest
+from services.item_similarity import ItemSimilarityIndex
+from services.vector_index import VectorMatrixIndex
+
+
+def _normalized(rows):
+    matrix = np.asarray(rows, dtype=np.float32)
+    return matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+
+def _random_jobs(count=40, dimension=8, seed=7):
+    rng = np.random.default_rng(seed)
+    return np.arange(100, 100 + count), _normalized(rng.normal(size=(count, dimension)))
+
+
+class TestItemSimilarityIndex:
+    def test_build_keeps_top_n_neighbours(self):
+        ids, matrix = _random_jobs()
+        index = ItemSimilarityIndex(top_n=5)
+        index.build(ids, matrix, block_size=16)
+
+        similarities = matrix @ matrix.T
+        np.fill_diagonal(similarities, -np.inf)
+        expected = set(int(ids[i]) for i in np.argsort(-similarities[3])[:5] if similarities[3, i] > 0)
+        assert set(index.neighbors[int(ids[3])]) == expected
+        assert all(len(listed) <= 5 for listed in index.neighbors.values())
+
+    def test_incremental_upsert_matches_rebuild(self):
+        ids, matrix = _random_jobs()
+        incremental = ItemSimilarityIndex(top_n=5)
+        incremental.build(ids[:-1], matrix[:-1])
+        incremental.upsert(ids[-1], matrix[-1], ids, matrix)
+
+        rebuilt = ItemSimilarityIndex(top_n=5)
+        rebuilt.build(ids, matrix)
+        assert incremental.neighbors.keys() == rebuilt.neighbors.keys()
+        for item_id, listed in rebuilt.neighbors.items():
+            assert set(incremental.neighbors[item_id]) == set(listed)
+
+    def test_score_is_best_weighted_similarity_excluding_history(self):
+        index = ItemSimilarityIndex(top_n=2)
+        index.neighbors = {1: {2: 0.9, 3: 0.5}, 4: {3: 0.4, 1: 0.8}}
+        assert index.score({1: 1, 4: 3}) == pytest.approx({2: 0.9, 3: 1.2})
+
+    def test_remove_drops_links(self):
+        ids, matrix = _random_jobs(count=10)
+        index = ItemSimilarityIndex(top_n=3)
+        index.build(ids, matrix)
+        assert index.remove(int(ids[0]))
+        assert int(ids[0]) not in index
+        assert all(int(ids[0]) not in listed for listed in index.neighbors.values())
+
+    def test_save_load_and_sync(self, tmp_path):
+        ids, matrix = _random_jobs(count=30)
+        path = str(tmp_path / "items.npz")
+        index = ItemSimilarityIndex(top_n=4, persist_path=path)
+        index.build(ids, matrix)
+
+        restored = ItemSimilarityIndex(top_n=4, persist_path=path)
+        assert restored.load()
+        assert restored.neighbors.keys() == index.neighbors.keys()
+        assert np.isclose(restored.neighbors[100][next(iter(index.neighbors[100]))],
+                          next(iter(index.neighbors[100].values())))
+
+        vectors = VectorMatrixIndex(dimension=matrix.shape[1])
+        vectors.build([(int(item_id), row, {}) for item_id, row in zip(ids, matrix)])
+        vectors.upsert(999, matrix[0] + 0.01)
+        vectors.remove(int(ids[5]))
+        restored.sync(vectors)
+        assert 999 in restored and int(ids[5]) not in restored
+        assert restored.builds == 0  # reconciled incrementally
+
+    def test_upserts_keep_reverse_index_and_floors_consistent(self):
+        ids, matrix = _random_jobs(count=30)
+        index = ItemSimilarityIndex(top_n=4)
+        index.build(ids[:20], matrix[:20])
+        for count in range(21, 31):
+            index.upsert(ids[count - 1], matrix[count - 1], ids[:count], matrix[:count], save=False)
+        index.remove(int(ids[3]), save=False)
+
+        for item_id, listed in index.neighbors.items():
+            assert len(listed) <= 4
+            for neighbor in listed:
+                assert item_id in index._listed_by[neighbor]
+        assert set(index._floor_ids.tolist()) == set(index.neighbors)
+        for item_id, floor in zip(index._floor_ids, index._floors):
+            assert floor == pytest.approx(index._floor_of(int(item_id)))
+
+    def test_single_writes_save_in_the_background(self, tmp_path):
+        ids, matrix = _random_jobs(count=10)
+        path = str(tmp_path / "items.npz")
+        index = ItemSimilarityIndex(top_n=3, persist_path=path, save_delay=0.05)
+        index.build(ids[:-1], matrix[:-1])
+        index.upsert(ids[-1], matrix[-1], ids, matrix)
+        index.remove(int(ids[0]))
+        assert index._save_timer is not None  # one pending save for both writes
+
+        time.sleep(0.3)
+        restored = ItemSimilarityIndex(top_n=3, persist_path=path)
+        assert restored.load()
+        assert int(ids[-1]) in restored and int(ids[0]) not in restored
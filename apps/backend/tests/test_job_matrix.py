@@ -0,0 +1,44 @@
+"""
+Tests for the prebuilt job-vector matrix
+"""
+import numpy as np
+from services.job_matrix import JobVectorMatrix, job_vector
+from services.vector_index import VectorMatrixIndex
+from services.vector_storage import encode_vector
+
+JOBS = [
+    {"id": 1, "title": "Solar", "skill_vector": [1, 0, 0]},
+    {"id": 2, "title": "Wind", "desc_vector_blob": encode_vector([0, 1, 0], "f32")},
+    {"id": 3, "title": "Hybrid", "skill_vector": [1, 1, 0]},
+    {"id": 4, "title": "No vector"},
+]
+
+
+class TestJobVectorMatrix:
+    def test_from_jobs_skips_jobs_without_vectors(self):
+        matrix = JobVectorMatrix.from_jobs(JOBS, 3)
+        assert list(matrix.ids) == [1, 2, 3]
+        assert np.allclose(np.linalg.norm(matrix.matrix, axis=1), 1.0)
+        assert job_vector({"skill_vector": [1, 0]}, 3) is None
+
+    def test_scores_match_pairwise_cosine(self):
+        matrix = JobVectorMatrix.from_jobs(JOBS, 3)
+        user = np.array([2.0, 1.0, 0.0])
+        expected = [float(np.dot(user, row) / np.linalg.norm(user)) for row in matrix.matrix]
+        assert np.allclose(matrix.score(user), expected, atol=1e-6)
+
+    def test_top_k_per_user_best_first(self):
+        matrix = JobVectorMatrix.from_jobs(JOBS, 3)
+        picks = matrix.top_k([[1, 0, 0], [0, 1, 0], [0, 0, 1]], k=2, min_score=0.1)
+        assert [matrix.jobs[offset]["id"] for offset, _ in picks[0]] == [1, 3]
+        assert [matrix.jobs[offset]["id"] for offset, _ in picks[1]] == [2, 3]
+        assert picks[2] == []  # nothing above the threshold
+
+    def test_from_index_copies_rows(self):
+        index = VectorMatrixIndex(dimension=3)
+        index.build([(10, [0, 0, 1], {"title": "Storage"})])
+        matrix = JobVectorMatrix.from_index(index)
+        index.upsert(11, [1, 0, 0])
+        assert len(matrix) == 1
+        assert matrix.jobs[0] == {"title": "Storage", "id": 10}
+        assert matrix.top_k([0, 0, 1], k=5)[0][0][0] == 0
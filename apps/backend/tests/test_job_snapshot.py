@@ -0,0 +1,69 @@
+"""
+Tests for the versioned job snapshot behind get_cached_jobs
+"""
+from services.job_snapshot import JobSnapshot
+
+class FakeJobs:
+    def __init__(self):
+        self.rows = {1: {"id": 1, "job_title": "Solar Engineer"}, 2: {"id": 2, "job_title": "Wind Technician"}}
+        self.calls = []
+
+    def __call__(self, job_ids=None):
+        self.calls.append(job_ids)
+        ids = sorted(self.rows) if job_ids is None else job_ids
+        return [dict(self.rows[job_id]) for job_id in ids if job_id in self.rows]
+
+class TestJobSnapshot:
+    def test_whole_catalog_is_a_shared_handoff(self):
+        jobs = FakeJobs()
+        snapshot = JobSnapshot(jobs)
+        first = snapshot.all()
+        assert [job["id"] for job in first] == [1, 2]
+        assert snapshot.all() is first
+        assert jobs.calls == [None]
+
+    def test_write_through_refreshes_only_touched_rows(self):
+        """Create, update and close re-read single rows and bump the version"""
+        jobs = FakeJobs()
+        snapshot = JobSnapshot(jobs)
+        before = snapshot.all()
+        version = snapshot.version
+
+        jobs.rows[3] = {"id": 3, "job_title": "EV Researcher"}
+        jobs.rows[1]["job_title"] = "Senior Solar Engineer"
+        snapshot.refresh([3, 1])
+        del jobs.rows[2]
+        snapshot.refresh([2])
+
+        after = snapshot.all()
+        assert after is not before and snapshot.version == version + 2
+        assert [(job["id"], job["job_title"]) for job in after] == [(1, "Senior Solar Engineer"), (3, "EV Researcher")]
+        assert jobs.calls == [None, [3, 1], [2]]
+
+        snapshot.discard(3)
+        assert [job["id"] for job in snapshot.all()] == [1]
+
+    def test_memoized_results_follow_the_version(self):
+        snapshot = JobSnapshot(FakeJobs(), max_results=2)
+        computed = []
+        compute = lambda key: lambda: computed.append(key) or key
+        assert snapshot.memoize("solar", compute("solar")) == "solar"
+        assert snapshot.memoize("solar", compute("solar")) == "solar"
+        assert computed == ["solar"]
+
+        snapshot.memoize("wind", compute("wind"))
+        snapshot.memoize("ev", compute("ev"))
+        assert snapshot.stats()["evictions"] == 1
+
+        snapshot.upsert({"id": 9, "job_title": "Carbon Accountant"})
+        snapshot.memoize("ev", compute("ev"))
+        assert computed == ["solar", "wind", "ev", "ev"]
+        assert snapshot.stats()["hits"] == 1
+
+    def test_stale_snapshot_reloads_in_full(self):
+        jobs = FakeJobs()
+        snapshot = JobSnapshot(jobs, max_age_seconds=300)
+        snapshot.all()
+        snapshot._loaded_at -= 301
+        snapshot.all()
+        assert jobs.calls == [None, None]
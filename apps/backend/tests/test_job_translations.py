@@ -0,0 +1,62 @@
+"""
+Tests for ingest-time job pre-translation
+"""
+import asyncio
+import sqlite3
+from services.job_translations import JobPretranslator
+
+JOB = {"title": "Solar Engineer", "description": "Design rooftop PV systems", "company": "Tata Power"}
+
+
+class FakeTranslator:
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, texts, lang):
+        self.calls.append((tuple(texts), lang))
+        return [text if text == "Tata Power" else f"[{lang}] {text}" for text in texts]
+
+
+def make_pretranslator(tmp_path, translator):
+    path = str(tmp_path / "jobs.db")
+    return JobPretranslator(translator, lambda: sqlite3.connect(path), use_sqlite=True, languages=["en", "hi", "ta"])
+
+
+class TestJobPretranslator:
+    def test_pretranslate_then_lookup_without_translator(self, tmp_path):
+        translator = FakeTranslator()
+        pretranslator = make_pretranslator(tmp_path, translator)
+
+        async def scenario():
+            written = await pretranslator.pretranslate(7, JOB)
+            calls = len(translator.calls)
+            stored = await pretranslator.lookup({7: JOB}, "hi")
+            return written, calls, stored
+
+        written, calls, stored = asyncio.run(scenario())
+        assert written == 4  # title + description in hi and ta; unchanged company is not stored
+        assert calls == 2  # one batch per language, English skipped
+        assert stored == {7: {"title": "[hi] Solar Engineer", "description": "[hi] Design rooftop PV systems"}}
+        assert len(translator.calls) == 2  # settled posting is not rescheduled for its company
+
+    def test_edited_source_is_stale_and_rescheduled(self, tmp_path):
+        translator = FakeTranslator()
+        pretranslator = make_pretranslator(tmp_path, translator)
+        edited = dict(JOB, title="Senior Solar Engineer")
+
+        async def scenario():
+            await pretranslator.pretranslate(7, JOB)
+            stored = await pretranslator.lookup({7: edited}, "ta")
+            await asyncio.gather(*pretranslator._tasks)
+            return stored, await pretranslator.lookup({7: edited}, "ta")
+
+        before, after = asyncio.run(scenario())
+        assert before == {7: {"description": "[ta] Design rooftop PV systems"}}
+        assert pretranslator.stats()["stale_rows"] == 1
+        assert after[7]["title"] == "[ta] Senior Solar Engineer"
+
+    def test_english_and_unknown_languages_skip_the_database(self, tmp_path):
+        pretranslator = make_pretranslator(tmp_path, FakeTranslator())
+        assert asyncio.run(pretranslator.lookup({7: JOB}, "en")) == {}
+        assert asyncio.run(pretranslator.lookup({7: JOB}, "fr")) == {}
+        assert pretranslator.schedule(7, JOB) is None  # no running loop
@@ -0,0 +1,50 @@
+"""
+Tests for the BM25 inverted index and reciprocal rank fusion
+"""
+from services.lexical_index import BM25Index, reciprocal_rank_fusion, tokenize
+
+def _index():
+    index = BM25Index()
+    index.build([
+        (1, "Solar Engineer solar panel design python", {"location": "Pune"}),
+        (2, "Wind Turbine Technician maintenance", {"location": "Chennai"}),
+        (3, "Data Analyst python sql dashboards for solar farms", {"location": "Pune"}),
+    ])
+    return index
+
+class TestBM25Index:
+    def test_ranking_and_tokenizer(self):
+        """Rare, repeated terms rank higher; special tokens like c++ survive"""
+        index = _index()
+        assert [doc_id for doc_id, _ in index.search("solar python")] == [1, 3]
+        assert index.search("nuclear") == []
+        assert "c++" in tokenize("C++ and Node.js developer")
+
+    def test_incremental_updates(self, tmp_path):
+        """Upserts replace postings, removals drop them, and snapshots round-trip"""
+        index = _index()
+        index.upsert(2, "Wind farm data scientist python")
+        assert 2 in [doc_id for doc_id, _ in index.search("python")]
+        assert index.search("turbine") == []
+
+        index.remove(1)
+        assert [doc_id for doc_id, _ in index.search("solar")] == [3]
+
+        path = str(tmp_path / "jobs_bm25.json")
+        index.save(path)
+        restored = BM25Index()
+        assert restored.load(path)
+        assert restored.search("python") == index.search("python")
+
+    def test_accept_filter(self):
+        """accept() restricts matches without scanning non-matching documents"""
+        index = _index()
+        hits = index.search("python", accept=lambda doc_id: index.get_payload(doc_id)["location"] == "Pune")
+        assert {doc_id for doc_id, _ in hits} == {1, 3}
+        assert index.search("python", accept=lambda doc_id: False) == []
+
+def test_reciprocal_rank_fusion():
+    """Documents ranked well by both lists win"""
+    fused = reciprocal_rank_fusion([[1, 2, 3], [3, 1, 4]], k=60)
+    assert [doc_id for doc_id, _ in fused][:2] == [1, 3]
+    assert {doc_id for doc_id, _ in fused} == {1, 2, 3, 4}
@@ -0,0 +1,50 @@
+"""
+Tests for the authenticated-user (principal) cache
+"""
+import time
+from services.principal_cache import PrincipalCache
+
+USER = {"user_id": 1, "username": "asha", "email": "asha@example.com", "role": "job_seeker"}
+
+class TestPrincipalCache:
+    def test_hit_miss_and_copies(self):
+        """Hits return a copy so handlers cannot corrupt the cached row"""
+        cache = PrincipalCache(max_entries=10, ttl_seconds=60)
+        assert cache.get("asha", "full") is None
+        cache.put("asha", USER, "full")
+
+        user = cache.get("asha", "full")
+        user["role"] = "admin"
+        assert cache.get("asha", "full")["role"] == "job_seeker"
+        assert cache.get("asha", "basic") is None
+        stats = cache.stats()
+        assert stats["hits"] == 2 and stats["misses"] == 2
+
+    def test_ttl_and_lru_eviction(self):
+        cache = PrincipalCache(max_entries=2, ttl_seconds=0.01)
+        cache.put("a", USER)
+        time.sleep(0.02)
+        assert cache.get("a") is None and cache.stats()["expirations"] == 1
+
+        cache = PrincipalCache(max_entries=2, ttl_seconds=60)
+        cache.put("a", USER)
+        cache.put("b", USER)
+        cache.get("a")
+        cache.put("c", USER)
+        assert cache.get("b") is None and cache.get("a") is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_invalidate_drops_all_variants_and_in_flight_reads(self):
+        """A role change invalidates every variant; a read that began earlier is not re-cached"""
+        cache = PrincipalCache()
+        cache.put("asha", USER, "basic")
+        cache.put("asha", USER, "full")
+        generation = cache.generation("asha")
+
+        cache.invalidate("asha")
+        assert cache.get("asha", "basic") is None and cache.get("asha", "full") is None
+
+        cache.put("asha", USER, "full", generation)  # stale read finishing late
+        assert cache.get("asha", "full") is None
+        cache.put("asha", {**USER, "role": "employer"}, "full", cache.generation("asha"))
+        assert cache.get("asha", "full")["role"] == "employer"
@@ -0,0 +1,49 @@
+"""
+Tests for the normalized career skill index
+"""
+import sqlite3
+from services.skill_index import (career_skill_lists, ensure_skill_index, index_career_skills, match_careers,
+                                  normalize_skill, parse_required_skills)
+
+def _conn():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE careers (career_id INTEGER PRIMARY KEY, title TEXT, demand INTEGER, required_skills TEXT)")
+    conn.execute("CREATE TABLE career_skills (skill_id INTEGER PRIMARY KEY, career_id INTEGER, skill_name TEXT)")
+    conn.executemany("INSERT INTO careers VALUES (?, ?, ?, ?)", [
+        (1, "Solar Engineer", 90, '["Python", "Solar PV", "AutoCAD"]'),
+        (2, "Climate Data Scientist", 95, '["python programming", "Machine Learning"]'),
+        (3, "Wind Technician", 80, "SCADA, Safety"),
+    ])
+    conn.execute("INSERT INTO career_skills (career_id, skill_name) VALUES (3, '  solar pv ')")
+    return conn
+
+class TestSkillIndex:
+    def test_parsing_and_normalization(self):
+        assert parse_required_skills('["Python", " GIS "]') == ["Python", "GIS"]
+        assert parse_required_skills("SCADA, 'Safety'") == ["SCADA", "Safety"]
+        assert parse_required_skills(None) == []
+        assert normalize_skill('  "Solar   PV" ') == "solar pv"
+
+    def test_migration_stores_pre_parsed_skill_lists(self):
+        conn = _conn()
+        assert ensure_skill_index(conn, use_sqlite=True)["careers_indexed"] == 3
+        assert ensure_skill_index(conn, use_sqlite=True)["careers_indexed"] == 0  # idempotent
+        lists = career_skill_lists(conn, [1, 3])
+        assert lists == {1: ["Python", "Solar PV", "AutoCAD"], 3: ["SCADA", "Safety", "Solar PV"]}  # one canonical spelling
+        assert conn.execute("SELECT COUNT(*) FROM canonical_skills WHERE skill_key = 'solar pv'").fetchone()[0] == 1
+
+    def test_matching_ranks_by_overlap_then_demand(self):
+        conn = _conn()
+        ensure_skill_index(conn, use_sqlite=True)
+        # "python" covers both python skills as the old LIKE did; career 1 shares both, then demand decides
+        assert match_careers(conn, ["Python", "solar pv"]) == [(1, 2), (2, 1), (3, 1)]
+        assert match_careers(conn, ["python"], limit=1) == [(2, 1)]
+        assert match_careers(conn, ["rust"]) == []
+
+    def test_write_path_reindexes_a_career(self):
+        conn = _conn()
+        ensure_skill_index(conn, use_sqlite=True)
+        conn.execute("UPDATE careers SET required_skills = '[\"Rust\"]' WHERE career_id = 2")
+        index_career_skills(conn, [2])
+        assert match_careers(conn, ["rust"]) == [(2, 1)]
+        assert match_careers(conn, ["machine learning"]) == []
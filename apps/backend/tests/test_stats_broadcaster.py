@@ -0,0 +1,62 @@
+"""
+Tests for the shared /ws/stats broadcaster
+"""
+import asyncio
+import json
+from services.stats_broadcaster import SLOW_CONSUMER_CLOSE_CODE, StatsBroadcaster
+
+class FakeSocket:
+    def __init__(self, delay=0.0, broken=False):
+        self.delay = delay
+        self.broken = broken
+        self.sent = []
+        self.closed_with = None
+
+    async def send_text(self, text):
+        if self.broken:
+            raise RuntimeError("connection reset")
+        await asyncio.sleep(self.delay)
+        self.sent.append(text)
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+class TestStatsBroadcaster:
+    def test_one_snapshot_per_tick_for_all_subscribers(self):
+        calls = []
+
+        async def snapshot():
+            calls.append(1)
+            return {"type": "stats_update", "total_jobs": len(calls)}
+
+        async def scenario():
+            broadcaster = StatsBroadcaster(snapshot, interval_seconds=0.01, send_timeout_seconds=1)
+            sockets = [FakeSocket() for _ in range(50)]
+            for socket in sockets:
+                await broadcaster.subscribe(socket)
+            await asyncio.sleep(0.035)
+            for socket in sockets:
+                broadcaster.unsubscribe(socket)
+            await asyncio.sleep(0.02)
+            return broadcaster, sockets
+
+        broadcaster, sockets = asyncio.run(scenario())
+        assert len(calls) == broadcaster.broadcasts >= 2
+        assert all(socket.sent == sockets[0].sent for socket in sockets)
+        assert json.loads(sockets[0].sent[0]) == {"type": "stats_update", "total_jobs": 1}
+        assert not broadcaster.stats()["running"]  # producer stops without subscribers
+
+    def test_slow_and_broken_consumers_are_evicted(self):
+        async def scenario():
+            broadcaster = StatsBroadcaster(lambda: None, interval_seconds=60, send_timeout_seconds=0.02)
+            fast, slow, broken = FakeSocket(), FakeSocket(delay=1), FakeSocket(broken=True)
+            for socket in (fast, slow, broken):
+                await broadcaster.subscribe(socket)
+            await broadcaster.broadcast('{"total_jobs":1}')
+            await broadcaster.close()
+            return broadcaster, fast, slow, broken
+
+        broadcaster, fast, slow, broken = asyncio.run(scenario())
+        assert fast.sent == ['{"total_jobs":1}']
+        assert slow.closed_with == SLOW_CONSUMER_CLOSE_CODE and broken.closed_with == SLOW_CONSUMER_CLOSE_CODE
+        assert broadcaster.evictions == 2
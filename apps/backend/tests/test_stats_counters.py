@@ -0,0 +1,62 @@
+"""
+Tests for the shared dashboard counters behind /stats and /ws/stats
+"""
+import asyncio
+import threading
+import time
+from services.stats_counters import StatsCounters
+
+class CountingSource:
+    def __init__(self):
+        self.calls = 0
+        self.jobs = 10
+
+    def __call__(self):
+        self.calls += 1
+        return {"jobs": self.jobs, "users": 3}
+
+class TestStatsCounters:
+    def test_readers_share_one_load(self):
+        source = CountingSource()
+        counters = StatsCounters(source, refresh_seconds=60)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(counters.get())) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert source.calls == 1
+        assert all(result == {"jobs": 10, "users": 3} for result in results)
+        assert asyncio.run(counters.aget())["jobs"] == 10
+
+    def test_writes_increment_without_recounting(self):
+        source = CountingSource()
+        counters = StatsCounters(source, refresh_seconds=60)
+        counters.get()
+        counters.incr("jobs")
+        counters.incr("unknown")
+        assert counters.get()["jobs"] == 11
+        assert source.calls == 1
+
+    def test_stale_counters_reconcile_in_background(self):
+        source = CountingSource()
+        counters = StatsCounters(source, refresh_seconds=0.01)
+        counters.get()
+        gate = threading.Event()
+        slow_count = lambda: gate.wait(2) and {"jobs": 42, "users": 3}
+        counters.count_fn = slow_count
+        time.sleep(0.02)
+        assert counters.get()["jobs"] == 10  # served without waiting for the refresh
+        gate.set()
+        deadline = time.time() + 2
+        while counters.get()["jobs"] != 42 and time.time() < deadline:
+            time.sleep(0.01)
+        assert counters.get()["jobs"] == 42
+
+    def test_failed_first_load_backs_off(self):
+        def broken():
+            raise RuntimeError("database down")
+        counters = StatsCounters(broken, refresh_seconds=60)
+        assert counters.get() is None
+        assert counters.get() is None
+        assert counters.stats()["refresh_failures"] == 1
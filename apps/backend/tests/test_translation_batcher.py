@@ -0,0 +1,81 @@
+"""
+Tests for deduplicated, concurrent batch translation
+"""
+import asyncio
+import threading
+import time
+from services.translation_batcher import TranslationBatcher
+
+FALLBACK = {("Solar Energy Engineer", "hi"): "सौर ऊर्जा इंजीनियर"}
+
+class SlowTranslator:
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, text, target_lang):
+        with self.lock:
+            self.calls.append(text)
+        time.sleep(self.delay)
+        if text == "boom":
+            raise RuntimeError("quota exceeded")
+        return f"{target_lang}:{text}"
+
+class TestTranslationBatcher:
+    def test_dedupes_resolves_hits_and_keeps_order(self):
+        translator, stored = SlowTranslator(), {}
+        batcher = TranslationBatcher(translator, lookup=lambda text, lang: FALLBACK.get((text, lang)),
+                                     store=lambda text, lang, value: stored.update({(text, lang): value}),
+                                     max_concurrency=8)
+        texts = ["Solar Energy Engineer", "High Demand", "", "High Demand", "4.8⭐", None]
+        result = asyncio.run(batcher.translate_many(texts, "hi"))
+        assert result == ["सौर ऊर्जा इंजीनियर", "hi:High Demand", "", "hi:High Demand", "hi:4.8⭐", None]
+        assert sorted(translator.calls) == ["4.8⭐", "High Demand"]
+        assert stored == {("High Demand", "hi"): "hi:High Demand", ("4.8⭐", "hi"): "hi:4.8⭐"}
+
+    def test_misses_run_concurrently_within_the_limit(self):
+        translator = SlowTranslator(delay=0.05)
+        batcher = TranslationBatcher(translator, max_concurrency=10)
+        started = time.perf_counter()
+        asyncio.run(batcher.translate_many([f"text {n}" for n in range(20)], "ta"))
+        elapsed = time.perf_counter() - started
+        assert len(translator.calls) == 20
+        assert elapsed < 0.5  # 2 waves of 10, not 20 serial calls (~1s)
+
+    def test_failures_and_timeouts_return_the_original(self):
+        stored = {}
+        batcher = TranslationBatcher(SlowTranslator(delay=0.01), store=lambda *args: stored.update({args[0]: args[2]}),
+                                     timeout=5)
+        assert asyncio.run(batcher.translate_many(["boom", "ok"], "hi")) == ["boom", "hi:ok"]
+        assert "boom" not in stored and batcher.stats()["failures"] == 1
+
+        slow = TranslationBatcher(SlowTranslator(delay=0.2), timeout=0.01)
+        assert asyncio.run(slow.translate("late", "hi")) == "late"
+
+    def test_concurrent_requests_share_in_flight_translations(self):
+        translator = SlowTranslator(delay=0.05)
+        batcher = TranslationBatcher(translator)
+
+        async def scenario():
+            return await asyncio.gather(*(batcher.translate("Wind Farm Technician", "mr") for _ in range(5)))
+
+        assert asyncio.run(scenario()) == ["mr:Wind Farm Technician"] * 5
+        assert translator.calls == ["Wind Farm Technician"]
+        assert batcher.stats()["shared_in_flight"] == 4
+
+    def test_lookup_many_resolves_misses_off_the_loop(self):
+        translator, batches = SlowTranslator(), []
+
+        def lookup_many(texts, lang):
+            batches.append((list(texts), threading.current_thread() is threading.main_thread()))
+            return {"Wind Turbine Technician": "पवन टर्बाइन तकनीशियन"}
+
+        batcher = TranslationBatcher(translator, lookup=lambda text, lang: FALLBACK.get((text, lang)),
+                                     lookup_many=lookup_many)
+        texts = ["Solar Energy Engineer", "Wind Turbine Technician", "Remote"]
+        result = asyncio.run(batcher.translate_many(texts, "hi"))
+        assert result == ["सौर ऊर्जा इंजीनियर", "पवन टर्बाइन तकनीशियन", "hi:Remote"]
+        assert batches == [(["Wind Turbine Technician", "Remote"], False)]
+        assert translator.calls == ["Remote"]
+        assert batcher.stats()["lookup_hits"] == 2
@@ -0,0 +1,45 @@
+"""
+Tests for the compiled fallback translation catalogue
+"""
+from services.translation_catalog import FALLBACK_TRANSLATIONS, TranslationCatalog, fold, translation_catalog
+
+CATALOG = {
+    "hi": {
+        "Solar Energy Engineer": "सौर ऊर्जा इंजीनियर",
+        "Senior Solar Energy Engineer": "सीनियर सौर ऊर्जा इंजीनियर",
+        "Tata Power Renewables": "टाटा पावर रिन्यूएबल्स",
+    }
+}
+
+
+class TestExactLookup:
+    def test_case_and_whitespace_insensitive(self):
+        catalog = TranslationCatalog(CATALOG)
+        assert catalog.get("solar  ENERGY engineer ", "hi") == "सौर ऊर्जा इंजीनियर"
+        assert catalog.get("Solar Energy Engineer", "ta") is None
+        assert fold(" Wind   Farm ") == "wind farm"
+
+    def test_global_catalogue_covers_every_language(self):
+        assert set(translation_catalog.languages()) == set(FALLBACK_TRANSLATIONS)
+        assert translation_catalog.get("eco engineer", "hi") == "इको इंजीनियर"
+
+
+class TestPhraseMatching:
+    def test_longest_phrase_wins_and_separators_are_kept(self):
+        catalog = TranslationCatalog(CATALOG)
+        assert (catalog.lookup("Senior Solar Energy Engineer - Tata Power Renewables", "hi")
+                == "सीनियर सौर ऊर्जा इंजीनियर - टाटा पावर रिन्यूएबल्स")
+        assert catalog.stats()["phrase_hits"] == 1
+
+    def test_partial_cover_respects_threshold(self):
+        strict = TranslationCatalog(CATALOG, phrase_min_coverage=1.0)
+        assert strict.lookup("Solar Energy Engineer (Remote)", "hi") is None
+        assert strict.stats()["misses"] == 1
+
+        lenient = TranslationCatalog(CATALOG, phrase_min_coverage=0.5)
+        assert lenient.lookup("Solar Energy Engineer (Remote)", "hi") == "सौर ऊर्जा इंजीनियर (Remote)"
+
+    def test_disabled(self):
+        catalog = TranslationCatalog(CATALOG, phrase_min_coverage=None)
+        assert catalog.lookup("Solar Energy Engineer, Tata Power Renewables", "hi") is None
+        assert catalog.lookup("Solar Energy Engineer", "hi") == "सौर ऊर्जा इंजीनियर"
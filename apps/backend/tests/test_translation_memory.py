@@ -0,0 +1,88 @@
+"""
+Tests for the persistent translation memory
+"""
+import time
+from services.translation_memory import TranslationMemory, source_hash
+
+
+class TestMemoryTier:
+    def test_put_then_get(self):
+        memory = TranslationMemory(max_entries=10, stripes=1)
+        memory.put("Solar Engineer", "hi", "सौर इंजीनियर")
+        assert memory.get("Solar Engineer", "hi") == "सौर इंजीनियर"
+        assert memory.get("Solar Engineer", "ta") is None
+        assert memory.stats()["hits"] == 1
+        assert memory.stats()["misses"] == 1
+
+    def test_lru_eviction_is_bounded(self):
+        memory = TranslationMemory(max_entries=2, stripes=1)
+        memory.put("a", "hi", "A")
+        memory.put("b", "hi", "B")
+        memory.get("a", "hi")  # a is now most recent
+        memory.put("c", "hi", "C")
+        assert memory.get("b", "hi") is None
+        assert memory.get("a", "hi") == "A"
+        assert memory.stats()["entries"] == 2
+        assert memory.stats()["evictions"] == 1
+
+    def test_expired_entries_are_dropped(self):
+        memory = TranslationMemory(max_entries=10, ttl_seconds=0.05, stripes=1)
+        memory.put("Wind Analyst", "hi", "पवन विश्लेषक")
+        time.sleep(0.1)
+        assert memory.get("Wind Analyst", "hi") is None
+        assert memory.stats()["expirations"] == 1
+
+    def test_source_hash_is_stable(self):
+        assert source_hash("Solar") == source_hash("Solar")
+        assert source_hash("Solar") != source_hash("solar")
+
+
+class TestDiskTier:
+    def test_survives_restart(self, tmp_path):
+        path = str(tmp_path / "memory.db")
+        first = TranslationMemory(max_entries=10, persist_path=path)
+        first.put("Green Architect", "hi", "ग्रीन आर्किटेक्ट")
+        first.flush()
+        first.close()
+
+        second = TranslationMemory(max_entries=10, persist_path=path)
+        assert second.get("Green Architect", "hi") == "ग्रीन आर्किटेक्ट"
+        assert second.stats()["disk_hits"] == 1
+        assert second.get("Green Architect", "hi") == "ग्रीन आर्किटेक्ट"
+        assert second.stats()["hits"] == 1  # promoted into memory
+
+    def test_warm_preloads_memory(self, tmp_path):
+        path = str(tmp_path / "memory.db")
+        first = TranslationMemory(persist_path=path)
+        for i in range(5):
+            first.put(f"text {i}", "ta", f"உரை {i}")
+        first.flush()
+
+        second = TranslationMemory(persist_path=path)
+        assert second.warm() == 5
+        assert second.get("text 3", "ta") == "உரை 3"
+        assert second.stats()["disk_hits"] == 0
+
+    def test_prune_caps_disk_entries(self, tmp_path):
+        memory = TranslationMemory(persist_path=str(tmp_path / "memory.db"), max_disk_entries=3)
+        for i in range(6):
+            memory.put(f"text {i}", "hi", f"पाठ {i}")
+        memory.flush()
+        assert memory.prune() == 3
+        count = memory._connection().execute("SELECT COUNT(*) FROM translation_memory").fetchone()[0]
+        assert count == 3
+
+    def test_get_many_reads_disk_in_one_pass(self, tmp_path):
+        path = str(tmp_path / "memory.db")
+        first = TranslationMemory(persist_path=path)
+        for i in range(3):
+            first.put(f"text {i}", "hi", f"पाठ {i}")
+        first.flush()
+
+        second = TranslationMemory(persist_path=path)
+        assert second.get_memory("text 0", "hi") is None  # memory tier only
+        found = second.get_many(["text 0", "text 2", "unknown"], "hi")
+        assert found == {"text 0": "पाठ 0", "text 2": "पाठ 2"}
+        assert second.stats()["disk_hits"] == 2
+        assert second.stats()["misses"] == 1
+        assert second.get_memory("text 2", "hi") == "पाठ 2"
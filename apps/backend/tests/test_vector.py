@@ -15,6 +15,16 @@ class TestVectorService:
         assert len(embedding) == 768  # SentenceTransformer dimension
         assert all(isinstance(x, float) for x in embedding)
 
+    def test_batch_embeddings_match_single_and_use_the_cache(self):
+        """generate_embeddings agrees with generate_embedding and keeps repeated texts aligned"""
+        texts = ["solar installer", "wind technician", "solar installer", ""]
+        vectors = vector_service.generate_embeddings(texts)
+
+        assert vectors.shape == (4, 768)
+        assert np.allclose(vectors[0], vectors[2])
+        assert not vectors[3].any()
+        assert np.allclose(vectors[1], vector_service.generate_embedding("wind technician"), atol=1e-5)
+
     def test_cosine_similarity(self):
         """Test cosine similarity calculation"""
         vec1 = [1, 0, 0]
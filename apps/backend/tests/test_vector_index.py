@@ -0,0 +1,119 @@
+"""
+Tests for the resident vector matrix index
+"""
+import numpy as np
+from services.vector_index import VectorMatrixIndex
+from services.ann_index import IVFFlatIndex, recall_report
+
+class TestVectorMatrixIndex:
+    def _index(self):
+        index = VectorMatrixIndex(dimension=4, initial_capacity=2)
+        index.build([
+            (1, [1, 0, 0, 0], {"title": "Solar"}),
+            (2, [0, 1, 0, 0], {"title": "Wind"}),
+        ])
+        return index
+
+    def test_search_returns_best_first(self):
+        """Top-k results are ordered by cosine similarity"""
+        index = self._index()
+        index.upsert(3, [1, 1, 0, 0], {"title": "Hybrid"})
+
+        results = index.search([1, 0, 0, 0], top_k=2)
+        assert [item_id for item_id, _, _ in results] == [1, 3]
+        assert abs(results[0][1] - 1.0) < 1e-6
+
+    def test_rows_are_normalized(self):
+        """Stored rows have unit length regardless of input scale"""
+        index = self._index()
+        index.upsert(3, [10, 0, 0, 0])
+        assert np.allclose(np.linalg.norm(index.matrix, axis=1), 1.0)
+
+    def test_remove_keeps_offsets_consistent(self):
+        """Removing a row swaps the last row into its slot"""
+        index = self._index()
+        index.upsert(3, [0, 0, 1, 0], {"title": "EV"})
+        assert index.remove(1)
+
+        assert len(index) == 2
+        assert 1 not in index
+        for item_id, offset in index.id_to_offset.items():
+            assert index.ids[offset] == item_id
+        assert index.get_payload(3) == {"title": "EV"}
+
+    def test_min_score_and_mask(self):
+        """Rows below min_score or outside the mask are excluded"""
+        index = self._index()
+        assert [r[0] for r in index.search([1, 0, 0, 0], top_k=5, min_score=0.5)] == [1]
+
+        mask = np.array([False, True])
+        assert [r[0] for r in index.search([1, 0, 0, 0], top_k=5, mask=mask)] == [2]
+
+    def test_memory_usage(self):
+        """Memory report reflects the float32 matrix size"""
+        usage = self._index().memory_usage()
+        assert usage["rows"] == 2
+        assert usage["matrix_bytes"] == 2 * 4 * 4
+
+    def test_attribute_filters(self):
+        """Filters select rows by exact value, value lists or substring, and survive removals"""
+        index = VectorMatrixIndex(dimension=4, attributes=("location", "experience_level"))
+        index.build([
+            (1, [1, 0, 0, 0], {"location": "Bangalore, KA", "experience_level": "Senior"}),
+            (2, [1, 0.1, 0, 0], {"location": "Pune", "experience_level": "Senior"}),
+            (3, [1, 0.2, 0, 0], {"location": "Bangalore", "experience_level": "Entry"}),
+        ])
+        query = [1, 0, 0, 0]
+
+        hits = index.search(query, top_k=5, filters={"location": {"contains": "bangalore"}, "experience_level": "senior"})
+        assert [r[0] for r in hits] == [1]
+        assert [r[0] for r in index.search(query, top_k=5, filters={"experience_level": ["Entry", "Senior"]})] == [1, 2, 3]
+        assert index.search(query, top_k=5, filters={"location": "Delhi"}) == []
+
+        index.remove(1)
+        assert [r[0] for r in index.search(query, top_k=5, filters={"location": {"contains": "bangalore"}})] == [3]
+
+class TestIVFFlatIndex:
+    def _index(self, n=2000, d=16):
+        rng = np.random.default_rng(0)
+        centers = rng.normal(size=(40, d))
+        vectors = centers[rng.integers(0, 40, n)] + 0.2 * rng.normal(size=(n, d))
+        index = IVFFlatIndex(dimension=d, nprobe=4, min_train_size=500, attributes=("bucket",))
+        index.build((i, vectors[i], {"i": i, "bucket": str(i % 50)}) for i in range(n))
+        return index, vectors
+
+    def test_recall_against_exact(self):
+        """ANN results mostly agree with brute-force search"""
+        index, vectors = self._index()
+        report = recall_report(index, vectors[:20], top_k=5, nprobe_values=(4,))
+        assert index.is_trained
+        assert report["ann"][0]["recall_at_k"] >= 0.8
+
+    def test_incremental_insert_and_remove(self):
+        """Inserted rows are searchable and removed rows disappear"""
+        index, vectors = self._index()
+        index.upsert(99999, vectors[7], {"i": 99999})
+        assert 99999 in [item_id for item_id, _, _ in index.search(vectors[7], top_k=3)]
+
+        index.remove(99999)
+        assert 99999 not in [item_id for item_id, _, _ in index.search(vectors[7], top_k=3)]
+        assert int(index._list_sizes.sum()) == len(index)
+
+    def test_save_and_load(self, tmp_path):
+        """Snapshots round-trip vectors, payloads and centroids"""
+        index, vectors = self._index()
+        index.save(str(tmp_path / "jobs_ivf"))
+
+        restored = IVFFlatIndex(dimension=16)
+        assert restored.load(str(tmp_path / "jobs_ivf"))
+        assert len(restored) == len(index)
+        assert restored.is_trained
+        assert restored.search(vectors[3], top_k=1)[0][0] == index.search(vectors[3], top_k=1)[0][0]
+
+    def test_selective_filter_is_exact(self):
+        """A filter narrower than the probed cells is answered exactly over the selected rows"""
+        index, vectors = self._index()
+        ann = index.search(vectors[3], top_k=5, filters={"bucket": "3"}, nprobe=1)
+        exact = index.exact_search(vectors[3], top_k=5, filters={"bucket": "3"})
+        assert [r[0] for r in ann] == [r[0] for r in exact]
+        assert all(r[2]["bucket"] == "3" for r in ann)
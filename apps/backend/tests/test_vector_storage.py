@@ -0,0 +1,52 @@
+"""
+Tests for binary vector storage and the JSON -> BLOB migration
+"""
+import json
+import sqlite3
+import numpy as np
+from services.vector_storage import encode_vector, decode_vector, vector_from_columns, migrate_json_vectors
+
+class TestVectorCodec:
+    def test_float32_round_trip_is_zero_copy(self):
+        """float32 blobs decode to a read-only view over the original bytes"""
+        vector = np.linspace(-1, 1, 768, dtype=np.float32)
+        blob = encode_vector(vector, fmt="f32")
+
+        decoded = decode_vector(blob, 768)
+        assert len(blob) == 768 * 4
+        assert np.array_equal(decoded, vector)
+        assert not decoded.flags.writeable
+
+    def test_int8_round_trip(self):
+        """int8 blobs are ~4x smaller and close to the original"""
+        vector = np.linspace(-1, 1, 768, dtype=np.float32)
+        blob = encode_vector(vector, fmt="int8")
+
+        assert len(blob) == 768 + 4
+        assert np.max(np.abs(decode_vector(blob, 768) - vector)) < 0.01
+
+    def test_json_fallback_and_dimension_check(self):
+        """Legacy JSON is still readable; mismatched dimensions are rejected"""
+        assert vector_from_columns(None, json.dumps([0.5] * 768), 768).shape == (768,)
+        assert vector_from_columns(None, json.dumps([0.5] * 384), 768) is None
+        assert vector_from_columns(None, None, 768) is None
+
+class TestJsonMigration:
+    def test_migrates_jobs_and_careers(self):
+        """JSON rows are converted in batches and the text is cleared"""
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE jobs (job_id INTEGER PRIMARY KEY, desc_vector_json TEXT, skills_vector_json TEXT)")
+        conn.execute("CREATE TABLE careers (career_id INTEGER PRIMARY KEY, desc_vector_json TEXT, skills_vector_json TEXT)")
+        vector = json.dumps([0.25] * 8)
+        conn.executemany("INSERT INTO jobs VALUES (?, ?, ?)", [(i, vector, vector) for i in range(1, 6)])
+        conn.execute("INSERT INTO careers VALUES (1, ?, NULL)", (vector,))
+
+        report = migrate_json_vectors(conn, use_sqlite=True, batch_size=2, fmt="f32")
+
+        assert report["jobs"] == 10
+        assert report["careers"] == 1
+        blob, text = conn.execute("SELECT desc_vector_blob, desc_vector_json FROM jobs WHERE job_id = 3").fetchone()
+        assert text is None
+        assert np.allclose(decode_vector(blob, 8), 0.25)
+        # Re-running is a no-op
+        assert migrate_json_vectors(conn, use_sqlite=True, fmt="f32")["jobs"] == 0
@@ -40,7 +40,11 @@ CREATE TABLE IF NOT EXISTS jobs (
     status VARCHAR(20) DEFAULT 'active',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     desc_vector_json TEXT,
-    skills_vector_json TEXT
+    skills_vector_json TEXT,
+    desc_vector_blob BLOB,
+    skills_vector_blob BLOB,
+    embedding_source_hash VARCHAR(64),
+    vector_registry_id INTEGER
 )
 ''')
 
@@ -57,7 +61,24 @@ CREATE TABLE IF NOT EXISTS careers (
     category VARCHAR(100) DEFAULT 'Green Energy',
     experience_level VARCHAR(50) DEFAULT 'Mid Level',
     desc_vector_json TEXT,
-    skills_vector_json TEXT
+    skills_vector_json TEXT,
+    desc_vector_blob BLOB,
+    skills_vector_blob BLOB,
+    embedding_source_hash VARCHAR(64),
+    vector_registry_id INTEGER
+)
+''')
+
+# Create vector_registry table (embedding spec behind each stored vector)
+cursor.execute('''
+CREATE TABLE IF NOT EXISTS vector_registry (
+    registry_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    model_name VARCHAR(200) NOT NULL,
+    dimension INTEGER NOT NULL,
+    normalization VARCHAR(20) NOT NULL,
+    version VARCHAR(50) NOT NULL,
+    created_at TIMESTAMP,
+    UNIQUE (model_name, dimension, normalization, version)
 )
 ''')
 